@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the AudioManager output mixer.
+
+Reports the cost of mixing one output chunk for 1 to 16 concurrent producers, using
+both the preallocated AudioMixer and the previous allocate-per-chunk approach, so the
+two can be compared on the target device (Pi Zero 2 W).
+
+Usage:
+    python scripts/benchmark_audio_mixer.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add src directory to the Python path to mimic the application's runtime environment
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+src_path = os.path.join(project_root, 'src')
+sys.path.insert(0, src_path)
+
+from config import AudioBaseConfig
+from utils.audio_processing import AudioMixer
+
+CHUNK_SIZE = AudioBaseConfig.CHUNK_SIZE
+PRODUCER_COUNTS = (1, 2, 4, 8, 16)
+
+
+def legacy_mix(chunks, volumes, master_volume):
+    """The previous output loop: fresh accumulator, per-producer float conversion."""
+    mixed_audio = np.zeros(CHUNK_SIZE, dtype=np.float32)
+    for data, volume in zip(chunks, volumes):
+        if volume != 1.0:
+            data = np.clip(data.astype(np.float32) * volume, -32768, 32767).astype(np.int16)
+        mixed_audio += data.astype(np.float32) * 0.8
+    mixed_audio *= master_volume
+    return np.clip(mixed_audio, -32768, 32767).astype(np.int16).tobytes()
+
+
+def mixer_mix(mixer, chunks, volumes, master_volume):
+    """The preallocated mixer used by AudioManager._output_loop, including the bytes copy PyAudio needs."""
+    mixer.begin()
+    for data, volume in zip(chunks, volumes):
+        mixer.add(data, volume * master_volume)
+    mixer.finish()
+    return mixer.output_bytes
+
+
+def time_per_chunk_us(fn, iterations):
+    # Warm up
+    for _ in range(min(100, iterations)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000, help="Chunks to mix per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mixer = AudioMixer(chunk_size=CHUNK_SIZE)
+    master_volume = 0.9
+    chunk_ms = CHUNK_SIZE / AudioBaseConfig.SAMPLE_RATE * 1000
+
+    print(f"Chunk size: {CHUNK_SIZE} samples ({chunk_ms:.1f} ms), iterations: {args.iterations}")
+    print(f"{'producers':>9} | {'legacy us/chunk':>15} | {'mixer us/chunk':>14} | {'speedup':>7} | {'mixer % of chunk':>16}")
+    for count in PRODUCER_COUNTS:
+        chunks = [rng.integers(-20000, 20000, CHUNK_SIZE, dtype=np.int16) for _ in range(count)]
+        volumes = [0.5 + 0.5 * (i % 2) for i in range(count)]
+        legacy_us = time_per_chunk_us(lambda: legacy_mix(chunks, volumes, master_volume), args.iterations)
+        mixer_us = time_per_chunk_us(lambda: mixer_mix(mixer, chunks, volumes, master_volume), args.iterations)
+        budget_pct = mixer_us / (chunk_ms * 1000) * 100
+        print(f"{count:>9} | {legacy_us:>15.1f} | {mixer_us:>14.1f} | {legacy_us / mixer_us:>6.1f}x | {budget_pct:>15.2f}%")
+
+
+if __name__ == "__main__":
+    main()
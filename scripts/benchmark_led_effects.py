@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Headless frame-rate benchmark for the LEDManager effects.
+
+Renders every effect for both the single strip (LEDManager) and the dual-ring layout
+(LEDManagerRings) and reports frames/sec for render + power cap + strip buffer write.
+Frames are never sent to the LEDs, so this can run on the target device (Pi Zero 2 W)
+without lighting anything. For reference, the first row times the previous per-pixel
+rainbow, which went through colorsys and a per-pixel power-capped show(). Periodic effects
+are also timed when played back from their baked frame tables.
+
+Usage:
+    python scripts/benchmark_led_effects.py [--frames N]
+"""
+
+import argparse
+import asyncio
+import colorsys
+import itertools
+import logging
+import os
+import sys
+import time
+
+# Add src directory to the Python path to mimic the application's runtime environment
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+src_path = os.path.join(project_root, 'src')
+sys.path.insert(0, src_path)
+
+from config import LEDConfig
+from managers.led_manager import LEDManager, LEDManagerRings
+from utils.led_render import cap_power
+
+COLOR_EFFECTS = ("ROTATING_COLOR", "ROTATING_BEACON")
+
+
+def legacy_rainbow_fps(pixels, frames):
+    """The previous rainbow loop: colorsys per pixel, then reading the strip back to cap power."""
+    n = LEDConfig.LED_COUNT
+    start = time.perf_counter()
+    for j in range(frames):
+        for i in range(n):
+            hue = ((i / n) + (j % 255 / 255.0)) % 1.0
+            pixels[i] = tuple(int(x * 255) for x in colorsys.hsv_to_rgb(hue, 1.0, 1.0))
+        current_pixels = [pixels[i] for i in range(n)]
+        total_brightness = sum(sum(p) for p in current_pixels)
+        if total_brightness > LEDConfig.MAX_TOTAL_BRIGHTNESS:
+            scale_factor = LEDConfig.MAX_TOTAL_BRIGHTNESS / total_brightness
+            for i in range(n):
+                pixels[i] = tuple(int(c * scale_factor) for c in current_pixels[i])
+    return frames / (time.perf_counter() - start)
+
+
+def effect_fps(manager, effect, frames, baked=False):
+    """Frames/sec for rendering (or baked playback), capping and writing one effect's frames."""
+    effect_info = manager._EFFECT_MAP[effect]
+    speed = effect_info['default_speed']
+    manager._current_speed = speed
+    args = ("green", speed) if effect in COLOR_EFFECTS else (speed,)
+    method = getattr(manager, effect_info['method'])
+    if baked:
+        # Warm up includes the one-off bake
+        generator = manager._baked_effect(effect, method, args, effect_info['period'])
+    else:
+        generator = method(*args)
+    writer = manager._writer
+    # Warm up
+    for frame, _ in itertools.islice(generator, 10):
+        writer.write(cap_power(frame, LEDConfig.MAX_TOTAL_BRIGHTNESS))
+    start = time.perf_counter()
+    for frame, _ in itertools.islice(generator, frames):
+        writer.write(cap_power(frame, LEDConfig.MAX_TOTAL_BRIGHTNESS))
+    elapsed = time.perf_counter() - start
+    generator.close()
+    return frames / elapsed, speed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=2000, help="Frames to render per effect")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    managers = [LEDManager(), LEDManagerRings()]
+
+    print(f"LEDs: {LEDConfig.LED_COUNT} ({LEDConfig.LED_COUNT_RING1} + {LEDConfig.LED_COUNT_RING2} rings), "
+          f"frames per effect: {args.frames}, bulk strip write: {managers[0]._writer.is_bulk}")
+    print(f"legacy per-pixel RAINBOW: {legacy_rainbow_fps(managers[0].pixels, args.frames):.0f} fps")
+    print(f"{'effect':>22} | {'strip fps':>9} | {'rings fps':>9} | {'rings % of frame period':>23} | "
+          f"{'baked rings fps':>15}")
+    for effect, effect_info in LEDManager._EFFECT_MAP.items():
+        strip_fps, _ = effect_fps(managers[0], effect, args.frames)
+        rings_fps, speed = effect_fps(managers[1], effect, args.frames)
+        # Share of the effect's default frame period spent rendering
+        budget_pct = 100.0 / (rings_fps * speed)
+        baked = f"{effect_fps(managers[1], effect, args.frames, baked=True)[0]:>15.0f}" if 'period' in effect_info else f"{'-':>15}"
+        print(f"{effect:>22} | {strip_fps:>9.0f} | {rings_fps:>9.0f} | {budget_pct:>22.2f}% | {baked}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark for shake detection.
+
+Replays IMU traces through utils.shake_detector.SpectralShakeDetector on its own and through
+the whole AccelerometerManager classifier, and reports whether SHAKE was detected, how long
+after the shake started, and the cost per sample of each. Traces are CSV files as recorded by
+AccelerometerManager when AccelerometerConfig.IMU_TRACE_PATH is set (see utils.imu_trace). A
+trace whose file name starts with "shake_" is expected to be detected as a shake, with the
+shake starting 1 s into the trace; any other trace is expected not to be. Without any traces,
+the fixture suite in tests/fixtures/imu is replayed. --generate-fixtures rewrites that suite
+from the synthetic motions below.
+
+Usage:
+    python scripts/benchmark_shake_detection.py [TRACE.csv ...] [--generate-fixtures]
+"""
+
+import argparse
+import glob
+import logging
+import math
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Add src directory to the Python path to mimic the application's runtime environment
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+src_path = os.path.join(project_root, 'src')
+sys.path.insert(0, src_path)
+
+# The classifier never talks to the sensor, so stub the hardware modules it imports, as the
+# tests do, and the benchmark runs on a dev machine too
+for name in ('board', 'busio', 'adafruit_bno08x', 'adafruit_bno08x.i2c'):
+    sys.modules[name] = MagicMock()
+
+from config import AccelerometerConfig
+from utils.imu_trace import TRACE_HEADER, format_row, load_trace
+from utils.shake_detector import SpectralShakeDetector
+
+FIXTURES_DIR = os.path.join(project_root, 'tests', 'fixtures', 'imu')
+SHAKE_ONSET = 1.0  # Seconds into a shake_ trace that the shake starts
+GRAVITY = 9.81
+
+
+def still(rng, noise=0.05, gyro_noise=0.01):
+    """Lying on a table, or held (with more noise)"""
+    def motion(t):
+        return (tuple(rng.gauss(0, noise) for _ in range(3)),
+                tuple(rng.gauss(0, gyro_noise) for _ in range(3)))
+    return motion
+
+
+def oscillation(rng, frequency, amplitude, axis=(1.0, 0.0, 0.0), noise=1.0, wobble=0.3):
+    """Periodic motion along an axis that drifts a little, as a hand shaking or swinging does"""
+    def motion(t):
+        a = amplitude * math.sin(2 * math.pi * frequency * t)
+        drift = wobble * math.sin(2 * math.pi * 0.3 * t)
+        direction = (axis[0] + drift, axis[1] - drift, axis[2])
+        norm = math.sqrt(sum(c * c for c in direction))
+        linear = tuple(a * c / norm + rng.gauss(0, noise) for c in direction)
+        spin = 3.0 * math.cos(2 * math.pi * frequency * t)
+        return linear, (spin + rng.gauss(0, 0.2), rng.gauss(0, 0.5), rng.gauss(0, 0.5))
+    return motion
+
+
+def walking(rng):
+    """Carried while walking: a bounce per step (~1.8 Hz) with some sway"""
+    def motion(t):
+        step = 2 * math.pi * 1.8 * t
+        linear = (0.8 * math.sin(step / 2) + rng.gauss(0, 0.3), rng.gauss(0, 0.3),
+                  3.0 * abs(math.sin(step)) - 1.9 + rng.gauss(0, 0.4))
+        return linear, (0.3 * math.sin(step / 2), rng.gauss(0, 0.1), rng.gauss(0, 0.1))
+    return motion
+
+
+def dropped(rng, start):
+    """Dropped onto a table: free fall, a sharp impact ringing at ~20 Hz, then still"""
+    def motion(t):
+        t -= start
+        if t < 0:
+            return still(rng)(t)
+        if t < 0.3:
+            return (rng.gauss(0, 0.1), rng.gauss(0, 0.1), -GRAVITY), (1.0, 0.5, 0.2)
+        if t < 0.45:
+            ring = 30.0 * math.exp(-(t - 0.3) * 30) * math.cos(2 * math.pi * 20 * (t - 0.3))
+            return (0.2 * ring, 0.1 * ring, ring), (2.0, 1.0, 0.5)
+        return still(rng)(t)
+    return motion
+
+
+def thrown(rng, start):
+    """Tossed up: a push, free fall while tumbling, caught, and held"""
+    def motion(t):
+        t -= start
+        if t < 0:
+            return still(rng, 0.3, 0.1)(t)
+        if t < 0.15:
+            return (3.0, 0.0, 14.0), (3.0, 3.0, 0.0)
+        if t < 0.65:
+            return (rng.gauss(0, 0.1), rng.gauss(0, 0.1), -GRAVITY), (4.0, 3.0, 1.0)
+        if t < 0.8:
+            return (0.0, 0.0, 18.0 * math.exp(-(t - 0.65) * 20)), (1.0, 1.0, 0.0)
+        return still(rng, 0.3, 0.1)(t)
+    return motion
+
+
+def then(first, second, at):
+    """The first motion until `at` seconds, then the second"""
+    return lambda t: first(t) if t < at else second(t - at)
+
+
+def synthetic_fixtures(seed=0):
+    """{name: (motion, rate, seconds, timing jitter (s), fraction of samples lost)}"""
+    rng = random.Random(seed)
+    return {
+        "still_100hz": (still(rng), 100.0, 3.0, 0.0005, 0.0),
+        "held_100hz": (still(rng, 0.4, 0.2), 100.0, 3.0, 0.0005, 0.0),
+        "walk_carried_100hz": (walking(rng), 100.0, 3.0, 0.0005, 0.0),
+        "wave_slow_100hz": (oscillation(rng, 1.0, 8.0), 100.0, 3.0, 0.0005, 0.0),
+        "swing_vigorous_200hz": (oscillation(rng, 1.2, 16.0, (0.0, 0.6, 0.8)), 200.0, 3.0, 0.0005, 0.0),
+        "drop_impact_100hz": (dropped(rng, 1.0), 100.0, 3.0, 0.0005, 0.0),
+        "throw_200hz": (thrown(rng, 1.0), 200.0, 3.0, 0.0005, 0.0),
+        "shake_3hz_100hz": (then(still(rng, 0.4, 0.2), oscillation(rng, 3.0, 16.0), SHAKE_ONSET),
+                            100.0, 3.0, 0.0005, 0.0),
+        "shake_5hz_200hz": (then(still(rng, 0.4, 0.2), oscillation(rng, 5.0, 18.0, (0.3, 0.2, 1.0)), SHAKE_ONSET),
+                            200.0, 3.0, 0.0005, 0.0),
+        "shake_8hz_200hz": (then(still(rng, 0.4, 0.2), oscillation(rng, 8.0, 15.0, (0.0, 1.0, 0.2)), SHAKE_ONSET),
+                            200.0, 3.0, 0.0005, 0.0),
+        # Reads slowed down and uneven, as when the I2C bus or the event loop is busy
+        "shake_5hz_50hz_jitter": (then(still(rng, 0.4, 0.2), oscillation(rng, 5.0, 18.0), SHAKE_ONSET),
+                                  50.0, 3.0, 0.004, 0.05),
+        "shake_4hz_25hz_slow_reads": (then(still(rng, 0.4, 0.2), oscillation(rng, 4.0, 18.0), SHAKE_ONSET),
+                                      25.0, 3.0, 0.006, 0.05),
+    }
+
+
+def generate_fixtures(directory, seed=0):
+    """Writes the synthetic fixtures as traces, with gravity along z added to the acceleration"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed + 1)
+    for name, (motion, rate, seconds, jitter, loss) in synthetic_fixtures(seed).items():
+        path = os.path.join(directory, name + ".csv")
+        with open(path, "w") as f:
+            f.write(TRACE_HEADER + "\n")
+            for i in range(int(seconds * rate)):
+                if rng.random() < loss:
+                    continue
+                t = i / rate + rng.uniform(-jitter, jitter)
+                linear, gyro = motion(t)
+                acceleration = (linear[0], linear[1], linear[2] + GRAVITY)
+                f.write(format_row({"timestamp": t, "acceleration": acceleration,
+                                    "linear_acceleration": linear, "gyro": gyro}, precision=3))
+        print(f"Wrote {path}")
+
+
+def shake_detector():
+    rate = AccelerometerConfig.SHAKE_RESAMPLE_RATE
+    return SpectralShakeDetector(
+        rate=rate,
+        window=round(AccelerometerConfig.SHAKE_WINDOW * rate),
+        min_frequency=AccelerometerConfig.SHAKE_MIN_FREQUENCY,
+        max_frequency=AccelerometerConfig.SHAKE_MAX_FREQUENCY,
+    )
+
+
+def replay_detector(samples):
+    """Microseconds per sample for the detector alone, reading its measures after every sample"""
+    detector = shake_detector()
+    start = time.perf_counter()
+    for sample in samples:
+        detector.update(sample["timestamp"], sample["linear_acceleration"])
+        detector.band_ratio
+    return (time.perf_counter() - start) / len(samples) * 1e6
+
+
+def replay_classifier(samples):
+    """(us per sample, timestamp of the first SHAKE or None) for the whole classifier"""
+    from managers.accelerometer_manager import AccelerometerManager
+    manager = AccelerometerManager()
+    first_shake = None
+    start = time.perf_counter()
+    for sample in samples:
+        state = manager.process_sample(dict(sample))["current_state"]
+        if state == "SHAKE" and first_shake is None:
+            first_shake = sample["timestamp"]
+    elapsed = time.perf_counter() - start
+    return elapsed / len(samples) * 1e6, first_shake
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("traces", nargs="*", help="Recorded IMU trace CSV files")
+    parser.add_argument("--generate-fixtures", action="store_true",
+                        help=f"Rewrite the synthetic fixtures in {os.path.relpath(FIXTURES_DIR, project_root)}")
+    args = parser.parse_args()
+
+    if args.generate_fixtures:
+        generate_fixtures(FIXTURES_DIR)
+    paths = args.traces or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.csv")))
+    logging.disable(logging.INFO)
+
+    correct = 0
+    print(f"{'trace':>26} | {'samples':>7} | {'expected':>8} | {'detected':>8} | {'latency s':>9} | "
+          f"{'detector us':>11} | {'classifier us':>13}")
+    for path in paths:
+        samples = load_trace(path)
+        if not samples:
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        expected = name.startswith("shake_")
+        detector_us = replay_detector(samples)
+        classifier_us, first_shake = replay_classifier(samples)
+        detected = first_shake is not None
+        correct += detected == expected
+        latency = f"{first_shake - samples[0]['timestamp'] - SHAKE_ONSET:>9.2f}" if detected and expected else f"{'-':>9}"
+        print(f"{name[-26:]:>26} | {len(samples):>7} | {str(expected):>8} | {str(detected):>8} | {latency} | "
+              f"{detector_us:>11.1f} | {classifier_us:>13.1f}")
+    print(f"{correct}/{len(paths)} traces classified as expected")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,8 @@ class CallActivity(BaseService):
     Integrates with AudioManager for local audio input/output and uses Flask/WebSocket/ngrok
     to bridge the local audio with the Twilio call.
     """
+    handled_events = frozenset({"mute_call", "unmute_call"})
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.logger.info("Initializing Call Activity")
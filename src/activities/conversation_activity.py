@@ -6,6 +6,15 @@ from config import ASSISTANT_ID, ASSISTANT_CONFIG
 
 class ConversationActivity(BaseService):
     """Handles conversations with the AI assistant"""
+    handled_events = frozenset({
+        "intent_detection_started",
+        "intent_detection_timeout",
+        "intent_detected",
+        "call_state",
+        "location_changed",
+        "proximity_changed",
+    })
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.conversation_manager = None  # Will be initialized in start()
@@ -30,6 +30,8 @@ class GrandmaPeaActivity(BaseService):
     """
     Service that manages the Grandma Pea activity.
     """
+    handled_events = frozenset()
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self._is_active = False
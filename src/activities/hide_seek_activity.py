@@ -12,6 +12,7 @@ from config import HideSeekConfig, Distance, SoundEffect
 
 class HideSeekActivity(BaseService):
     """Service that manages the hide and seek game activity"""
+    handled_events = frozenset({"proximity_changed"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
@@ -98,12 +99,11 @@ class HideSeekActivity(BaseService):
                     await asyncio.sleep(1.0)  # Check less frequently when waiting for pendant
                     continue
                     
-                # Get current pendant beacon info from global state
-                async with self.global_state_lock:
-                    self.logger.info("Acquired global state lock")
-                    pendant_info = self.global_state.location_beacons.get("pendant", {})
-                    self.logger.info(f"Current pendant info: {pendant_info}")
-                    self.logger.info(f"All beacons in global state: {self.global_state.location_beacons}")
+                # Get current pendant beacon info from the global state snapshot
+                location_beacons = self.state_snapshot.location_beacons
+                pendant_info = location_beacons.get("pendant", {})
+                self.logger.info(f"Current pendant info: {pendant_info}")
+                self.logger.info(f"All beacons in global state: {dict(location_beacons)}")
                 
                 if not pendant_info:
                     # No pendant detected, use max volume
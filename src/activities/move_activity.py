@@ -35,6 +35,7 @@ class MoveActivity(BaseService):
         - STATIONARY: No LED effect
         - Other states: BLUE_BREATHING (static)
     """
+    handled_events = frozenset({"sensor_data"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
@@ -9,6 +9,8 @@ class PlayMusicActivity(BaseService):
     """
     An activity that plays a music track once, waits for a short period, and then ends.
     """
+    handled_events = frozenset({"sound_effect_finished"})
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.logger = get_filter_logger(self.__class__.__name__)
@@ -19,6 +19,7 @@ class ScavengerHuntStep:
 
 class ScavengerHuntActivity(BaseService):
     """Service that manages the scavenger hunt game activity"""
+    handled_events = frozenset({"all_beacons_update", "proximity_changed"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
@@ -162,10 +163,8 @@ class ScavengerHuntActivity(BaseService):
                     self.logger.info("Inactivity detected, providing a hint.")
                     
                     # Get current distance to the beacon
-                    distance = Distance.UNKNOWN
-                    async with self.global_state_lock:
-                        location_info = self.global_state.location_beacons.get(self._current_step.location.beacon_id, {})
-                        distance = location_info.get("distance", Distance.UNKNOWN)
+                    location_info = self.state_snapshot.location_beacons.get(self._current_step.location.beacon_id, {})
+                    distance = location_info.get("distance", Distance.UNKNOWN)
 
                     # Get and format the hint phrase
                     if distance in ScavengerHuntConfig.INACTIVITY_HINT_PHRASES:
@@ -15,6 +15,7 @@ class SleepActivity(BaseService):
     1. Plays the breathing sound effect on loop
     2. Sets the LED effect to rotating pink/blue
     """
+    handled_events = frozenset({"intent_detection_started", "intent_detection_timeout"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
@@ -21,6 +21,7 @@ class SquealingActivity(BaseService):
     1. Plays a bunch of squealing / "where are we" noises / voice lines
     2. On detecting being picked up, stops the activity.
     """
+    handled_events = frozenset({"sensor_data"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
@@ -118,6 +118,11 @@ class LEDConfig:
     USE_RESPEAKER_LEDS = True # Whether to enable the ReSpeaker LED bridge
     RESPEAKER_BRIGHTNESS_BOOST = 1.6 # Multiplier to adjust ReSpeaker brightness relative to NeoPixels (e.g., 1.25 = 25% brighter)
     MAX_TOTAL_BRIGHTNESS = 14000 # Heuristic value to prevent power brownouts. This is the max sum of all RGB values across all pixels. A value of 10000 is a safe starting point.
+    COMPOSITOR_FPS = 100 # Tick rate of the LED compositor thread. Effects still update at their own speed; this bounds how finely they're timed.
+    BAKE_ANIMATIONS = True # Render periodic effects once into frame tables, then play them back from the tables
+    ANIMATION_CACHE_SIZE = 16 # Max baked frame tables kept in memory (each is a few tens of KB)
+    ANIMATION_CACHE_DIR = None # Directory to persist baked frame tables across restarts, or None to keep them in memory only
+    CROSSFADE_MS = 250 # Crossfade time when switching effects, and fade-out time when an effect is stopped or expires
 
 # Audio Amplifier Configuration
 class AudioAmplifierConfig:
@@ -135,6 +140,14 @@ class AudioBaseConfig:
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 640  # Optimized for WebRTC echo cancellation without stuttering
     BUFFER_SIZE = 5   # Minimal buffering to reduce latency
+    # Drive audio I/O from PortAudio stream callbacks instead of blocking read/write threads.
+    # Output latency is then fixed at one chunk, and the output stream is stopped while idle.
+    USE_CALLBACK_STREAMS = False
+    # How far a threaded input consumer may fall behind capture before its newest audio is dropped
+    THREADED_CONSUMER_BUFFER_MS = 1000
+    # Read every sound effect into memory at startup (~7MB). If False, effects are memory-mapped
+    # and paged in from storage on first play.
+    PRELOAD_SOUND_EFFECTS = True
     DEFAULT_VOLUME = 1.0
     CONVERSATION_SFX_VOLUME = 0.5 # Volume for sound effects when a conversation is active
     VOLUME_STEP = 0.2 # Volume step for volume control
@@ -316,6 +329,11 @@ class BLEConfig:
 
     # Bluetooth interface (usually hci0)
     BLUETOOTH_INTERFACE = "hci0"
+
+    # Adapter health monitoring
+    ADAPTER_BACKEND = "dbus"       # "dbus" (BlueZ signals) or "hciconfig" (async polling)
+    ADAPTER_POLL_INTERVAL = 5.0    # Seconds between adapter checks and power-on retries
+    ADAPTER_READY_TIMEOUT = 5.0    # How long start() waits for the adapter before carrying on
     
     # iBeacon UUID for our beacons
     BEACON_UUID = "426C7565-4368-6172-6D42-6561636F6E73"
@@ -349,6 +367,13 @@ class BLEConfig:
     # RSSI hysteresis to prevent location flapping
     RSSI_HYSTERESIS = 12  # Required RSSI difference to switch locations (dB) (was 8)
     
+    # Streaming scan: one long-running scanner reports advertisements as they arrive, and location is
+    # updated every STREAM_UPDATE_INTERVAL instead of once per SCAN_DURATION window
+    STREAMING_SCAN = True
+    STREAMING_SCAN_MODE = "passive"  # Falls back to active if the adapter can't scan passively
+    STREAM_UPDATE_INTERVAL = 0.2     # Matches the beacons' advertising interval
+    STREAM_VISIBILITY_WINDOW = 1.0   # A beacon is visible if heard within this many seconds
+
     # Scan intervals and timeouts (in seconds)
     SCAN_DURATION = 1.0          # Duration for BLE hardware to scan for devices
     SCAN_INTERVAL = 1.5          # Time between periodic scans (was 3.0)
@@ -357,8 +382,14 @@ class BLEConfig:
     #UNKNOWN_PUBLISH_INTERVAL = 60.0  # Minimum time between unknown location publishes
     
     # RSSI smoothing
+    RSSI_FILTER = "kalman"  # Per-beacon RSSI estimator: "kalman" or "ema"
     RSSI_EMA_ALPHA = 0.4  # Exponential moving average alpha (0-1) (was 0.2)
                           # Higher = more weight to recent readings
+    RSSI_KALMAN_PROCESS_NOISE = 4.0       # How fast the true RSSI can change course (dB^2/s^3)
+    RSSI_KALMAN_MEASUREMENT_NOISE = 16.0  # Variance of a single reading (dB^2), i.e. ~4 dB of noise
+    RSSI_OUTLIER_GATE = 3.0   # Reject readings more than this many standard deviations from prediction
+    RSSI_MAX_OUTLIERS = 4     # After this many rejections in a row, restart the filter from the reading
+    RSSI_TRACE_PATH = None    # If set, append every beacon advertisement to this CSV for replay
 
     # Activity thresholds
     NO_ACTIVITY_THRESHOLD = 1000  # Number of empty scans before switching to low power
@@ -374,6 +405,7 @@ class BLEConfig:
     
     # Add minimum consecutive empty scans before unknown
     MIN_EMPTY_SCANS_FOR_UNKNOWN = 50  # Require multiple empty scans (was 4)
+    MIN_EMPTY_UPDATES_FOR_UNKNOWN = 600  # Streaming equivalent: ~2 minutes of updates, like 50 scans
     
     # Add preference for maintaining current location
     CURRENT_LOCATION_RSSI_BONUS = 6  # Add virtual dB to current location (was 5)
@@ -598,8 +630,15 @@ class TouchConfig:
     STROKE_MIN_DECAY_MULTIPLIER = 0.25  # Minimum decay rate multiplier when very active (was 0.25)
     STROKE_ACTIVITY_STROKES_PER_WINDOW = 3  # Expected number of strokes per window for normalization
 
-    # Touch sensor sampling configuration
-    SAMPLE_RATE_HZ = 100  # Default sampling rate in Hz
+    # Touch sensor sampling configuration. The ADS1115 runs in continuous conversion mode at the
+    # data rate matching SAMPLE_RATE_HZ, and a sampler thread reads every conversion.
+    SAMPLE_RATE_HZ = 250  # Default sampling rate in Hz
+    # BCM pin wired to the ADS1115's ALERT/RDY, to read each conversion as it completes, or None to pace reads by the clock
+    ALERT_PIN = None
+    SAMPLE_BUFFER_SIZE = 1024  # Samples the sampler thread can get ahead of the event loop
+    SAMPLE_BATCH_INTERVAL = 0.02  # The event loop is handed samples this often (seconds)
+    SAMPLER_ERROR_BACKOFF = 0.1  # Pause after a failed read (seconds)
+    STATS_INTERVAL = 60.0  # Seconds between sampler stats log lines
 
 
 # Haptic motor configuration
@@ -612,6 +651,11 @@ class HapticConfig:
     PURR_MAX_POWER_BASE = 100  # Base maximum power level
     PURR_MAX_POWER_SCALE = 60  # How much maximum power increases with intensity
     PURR_UPDATE_RATE = 200  # Updates per second (Hz)
+    # Waveform sequence playback. Sequences longer than the DRV2605L's 8 slots are played in chunks,
+    # each started once the chip reports the previous one finished.
+    SEQUENCE_MIN_EFFECT_DURATION = 0.05  # Shortest library effect, in seconds. The player polls the chip only after this.
+    SEQUENCE_POLL_INTERVAL = 0.005  # How often to poll the chip for the end of a chunk, in seconds
+    SEQUENCE_MAX_OVERRUN = 2.0  # Give up waiting for a chunk this long after its shortest play time, in seconds
 
 
 # Battery Monitoring Configuration
@@ -656,8 +700,47 @@ class AccelerometerConfig:
     """Configuration for accelerometer service"""
     # Print debug data to console
     PRINT_DEBUG_DATA = False
-    # Service event publishing interval in seconds (i.e. 5 milliseconds) NOTE: Not the same as the sampling rate, which is hardcoded in the BNO085 interface
+    # Acquisition loop period in seconds (i.e. 5 milliseconds). Each tick classifies every sample read since the
+    # last one, on fixed deadlines. NOTE: Not the same as the sampling rate, which is REPORT_INTERVAL_US
     UPDATE_INTERVAL = 0.005
+    # sensor_data events are published on every state change, and otherwise at most this often (seconds)
+    PUBLISH_INTERVAL = 0.05
+    # How often the service logs its acquisition counters (seconds)
+    STATS_INTERVAL = 60.0
+    # BNO085 report interval for the accelerometer, linear acceleration and gyro (5ms = 200Hz)
+    REPORT_INTERVAL_US = 5000
+    # Read reports on a dedicated thread, decoding whole batches into a ring buffer of samples
+    BATCHED_READS = True
+    # Samples buffered between the reader thread and the service (about 5s at 200Hz)
+    SAMPLE_BUFFER_SIZE = 1024
+    # Most samples decoded per reader wakeup
+    READER_BATCH_SIZE = 64
+    # How long the reader waits before checking the sensor again when it had nothing (seconds)
+    READER_POLL_INTERVAL = 0.002
+    # How long the reader backs off after an I2C error (seconds)
+    READER_ERROR_BACKOFF = 0.1
+    # How long a read waits for the reader to produce a sample before giving up (seconds)
+    SAMPLE_TIMEOUT = 0.1
+    # Low power mode: after LOW_POWER_IDLE_TIMEOUT seconds STATIONARY, turn the high rate reports off and
+    # wait for the BNO085's own stability classifier (every LOW_POWER_CLASSIFIER_INTERVAL_US), shake
+    # detector or tap detector to report motion. Needs BATCHED_READS.
+    LOW_POWER_MODE = True
+    LOW_POWER_IDLE_TIMEOUT = 10.0
+    LOW_POWER_CLASSIFIER_INTERVAL_US = 50000
+    # BCM pin wired to the BNO085's INT (H_INTN) line, or None to poll every LOW_POWER_POLL_INTERVAL
+    # seconds in low power mode instead
+    INT_PIN = None
+    LOW_POWER_POLL_INTERVAL = 0.05
+    # Longest wait for INT before checking the sensor anyway (seconds)
+    LOW_POWER_INT_TIMEOUT = 1.0
+    # Shake detection resamples linear acceleration to this rate (Hz) and analyses the last
+    # SHAKE_WINDOW seconds of it for periodic motion between these frequencies (Hz)
+    SHAKE_RESAMPLE_RATE = 50.0
+    SHAKE_WINDOW = 0.8
+    SHAKE_MIN_FREQUENCY = 2.5
+    SHAKE_MAX_FREQUENCY = 15.0
+    # Record every sample to this CSV file (see utils.imu_trace), or None
+    IMU_TRACE_PATH = None
 
 
 # Movement Activity Configuration
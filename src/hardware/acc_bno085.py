@@ -34,6 +34,20 @@ Classification Reports:
     ]
 - Shake Detector: Detects if the sensor has been shaken
 
+Batched reads:
+With AccelerometerConfig.BATCHED_READS, a reader thread drains every pending packet from the
+sensor at once and decodes the accelerometer, linear acceleration and gyro reports itself, into
+IMU_SAMPLE_DTYPE records stamped with the sensor's own report timestamps. The records go into a
+ring buffer (`samples`) that the event loop consumes in batches.
+
+Low power mode:
+While the toy sits still, `enter_low_power` turns the high rate reports off and enables the
+on-chip stability classifier, shake detector and tap detector instead. The reader then sleeps
+until the sensor's INT line (H_INTN) falls (AccelerometerConfig.INT_PIN), or polls slowly
+without it. As soon as one of those reports shows motion, the reader itself switches the high
+rate reports back on, and `wait_for_wake` returns. hardware.gpio_interrupt.SimulatedInterrupt
+stands in for the INT line in tests.
+
 Docs:
 https://learn.adafruit.com/adafruit-9-dof-orientation-imu-fusion-breakout-bno085/report-types
 https://github.com/adafruit/Adafruit_CircuitPython_BNO08x/tree/main/examples
@@ -64,13 +78,161 @@ from adafruit_bno08x import (
 from adafruit_bno08x.i2c import BNO08X_I2C
 from typing import Dict, Any, Tuple, Optional
 import asyncio
-from struct import pack_into # Re-add pack_into
-from config import get_filter_logger
-# import time # No longer directly used for sleep
+import threading
+import time
+import numpy as np
+from struct import pack_into, unpack_from
+from config import AccelerometerConfig, get_filter_logger
+from utils.ring_buffer import AsyncRingBuffer
+from hardware.gpio_interrupt import InterruptLine, GPIOInterrupt
 
 # Define a timeout for feature enabling (in seconds)
 _FEATURE_ENABLE_TIMEOUT = 3.0 # Restore timeout
 
+# SH-2 wire format, for decoding input reports without going through the library's per-report
+# properties (see the SH-2 Reference Manual, sections 6.5 and 7.2)
+_SH2_CHANNEL_INPUT_REPORTS = 3
+_SH2_REPORT_ACCELEROMETER = 0x01
+_SH2_REPORT_GYROSCOPE = 0x02
+_SH2_REPORT_LINEAR_ACCELERATION = 0x04
+_SH2_REPORT_TAP_DETECTOR = 0x10
+_SH2_REPORT_STABILITY_CLASSIFIER = 0x13
+_SH2_REPORT_SHAKE_DETECTOR = 0x19
+_SH2_TIMESTAMP_REBASE = 0xFA
+_SH2_BASE_TIMESTAMP = 0xFB
+_SH2_TIMESTAMP_REPORT_LENGTH = 5
+_SH2_VECTOR_REPORT_LENGTH = 10
+_SH2_TICK = 100e-6  # Timestamps and report delays are in 100us ticks
+# Q points of the vector reports we decode
+_SH2_VECTOR_SCALARS = {
+    _SH2_REPORT_ACCELEROMETER: 2 ** -8,
+    _SH2_REPORT_LINEAR_ACCELERATION: 2 ** -8,
+    _SH2_REPORT_GYROSCOPE: 2 ** -9,
+}
+# Lengths of the classification reports we decode
+_SH2_EVENT_REPORT_LENGTHS = {
+    _SH2_REPORT_TAP_DETECTOR: 5,
+    _SH2_REPORT_STABILITY_CLASSIFIER: 6,
+    _SH2_REPORT_SHAKE_DETECTOR: 6,
+}
+STABILITY_CLASSIFICATIONS = ("Unknown", "On Table", "Stationary", "Stable", "In motion")
+
+# One IMU sample. timestamp is the time the sensor took the accelerometer reading, on the
+# time.monotonic() clock; the linear acceleration and gyro are the latest reported alongside it.
+IMU_SAMPLE_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("acceleration", np.float32, (3,)),
+    ("linear_acceleration", np.float32, (3,)),
+    ("gyro", np.float32, (3,)),
+])
+
+
+class SH2ReportDecoder:
+    """
+    Decodes SH-2 input report packets into IMU_SAMPLE_DTYPE records.
+
+    Records are written into a preallocated array, one per accelerometer report, so decoding
+    a batch allocates nothing per sample. Report timestamps are rebuilt from the packet's base
+    timestamp and each report's delay, relative to when the packet was read.
+    """
+    def __init__(self, capacity: int):
+        self.records = np.zeros(capacity, dtype=IMU_SAMPLE_DTYPE)
+        self.count = 0
+        self.dropped = 0  # Samples that didn't fit since the last clear
+        self._linear_acceleration = (0.0, 0.0, 0.0)
+        self._gyro = (0.0, 0.0, 0.0)
+        self._pending = []  # (timestamp, x, y, z) accelerometer reports awaiting the rest of their packet
+        self.stability = "Unknown"  # Latest stability classification
+        self.motion_events = []  # (timestamp, report name) for motion the sensor reported since the last clear
+
+    @property
+    def full(self) -> bool:
+        return self.count >= len(self.records)
+
+    def clear(self):
+        self.count = 0
+        self.dropped = 0
+        self.motion_events.clear()
+
+    def decode(self, data, length: int, reference_time: float) -> bool:
+        """
+        Decodes one input report packet's payload.
+
+        Args:
+            data: The packet payload, without the SHTP header
+            length: Payload length in bytes
+            reference_time: time.monotonic() when the packet was read
+        Returns:
+            bool: False if the packet holds reports this decoder can't parse, which should then
+                  be handed to the library instead
+        """
+        base = reference_time
+        index = 0
+        known = True
+        while index < length:
+            report_id = data[index]
+            if report_id == _SH2_BASE_TIMESTAMP or report_id == _SH2_TIMESTAMP_REBASE:
+                if index + _SH2_TIMESTAMP_REPORT_LENGTH > length:
+                    break
+                delta = unpack_from("<i", data, index + 1)[0] * _SH2_TICK
+                # The base delta counts back from the reference; a rebase moves the base on
+                base = reference_time - delta if report_id == _SH2_BASE_TIMESTAMP else base + delta
+                index += _SH2_TIMESTAMP_REPORT_LENGTH
+                continue
+            event_length = _SH2_EVENT_REPORT_LENGTHS.get(report_id)
+            if event_length is not None:
+                if index + event_length > length:
+                    known = False
+                    break
+                self._decode_event(report_id, data, index, base)
+                index += event_length
+                continue
+            scalar = _SH2_VECTOR_SCALARS.get(report_id)
+            if scalar is None or index + _SH2_VECTOR_REPORT_LENGTH > length:
+                known = False
+                break
+            delay = ((data[index + 2] >> 2) << 8 | data[index + 3]) * _SH2_TICK
+            x, y, z = unpack_from("<hhh", data, index + 4)
+            vector = (x * scalar, y * scalar, z * scalar)
+            if report_id == _SH2_REPORT_ACCELEROMETER:
+                self._pending.append((base + delay, vector))
+            elif report_id == _SH2_REPORT_LINEAR_ACCELERATION:
+                self._linear_acceleration = vector
+            else:
+                self._gyro = vector
+            index += _SH2_VECTOR_REPORT_LENGTH
+
+        # Emit after the whole packet, so samples pick up the linear acceleration and gyro
+        # reported in the same batch
+        for timestamp, acceleration in self._pending:
+            if self.full:
+                self.dropped += 1
+                continue
+            record = self.records[self.count]
+            record["timestamp"] = timestamp
+            record["acceleration"] = acceleration
+            record["linear_acceleration"] = self._linear_acceleration
+            record["gyro"] = self._gyro
+            self.count += 1
+        self._pending.clear()
+        return known
+
+    def _decode_event(self, report_id: int, data, index: int, base: float):
+        """Records a classification report, noting it in motion_events if it shows motion"""
+        timestamp = base + ((data[index + 2] >> 2) << 8 | data[index + 3]) * _SH2_TICK
+        if report_id == _SH2_REPORT_STABILITY_CLASSIFIER:
+            classification = data[index + 4]
+            self.stability = (STABILITY_CLASSIFICATIONS[classification]
+                              if classification < len(STABILITY_CLASSIFICATIONS) else "Unknown")
+            if self.stability == "In motion":
+                self.motion_events.append((timestamp, "stability"))
+        elif report_id == _SH2_REPORT_SHAKE_DETECTOR:
+            if unpack_from("<H", data, index + 4)[0] & 0x07:
+                self.motion_events.append((timestamp, "shake"))
+        elif data[index + 4] & 0x3F:  # Tap detector: any axis
+            self.motion_events.append((timestamp, "tap"))
+
+
 class BNO085Interface:
     """
     Hardware interface for the BNO085 9-axis sensor.
@@ -99,7 +261,24 @@ class BNO085Interface:
         self._consecutive_slow_reads = 0
         self._total_reads = 0
         self._slow_read_threshold = 100  # ms
-        
+
+        # Batched report reader. The reader thread owns the I2C bus while it runs; anything else
+        # talking to the sensor takes _bus_lock.
+        self.samples = AsyncRingBuffer(AccelerometerConfig.SAMPLE_BUFFER_SIZE, IMU_SAMPLE_DTYPE)
+        self.dropped_samples = 0  # Samples decoded while the ring buffer was full
+        self._decoder = SH2ReportDecoder(AccelerometerConfig.READER_BATCH_SIZE)
+        self._bus_lock = threading.Lock()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Low power mode: on-chip classification reports only, until one of them shows motion
+        self.low_power = False
+        self.interrupt: Optional[InterruptLine] = None  # The INT line, if wired (AccelerometerConfig.INT_PIN)
+        self.wakeups = 0  # Times motion brought the sensor out of low power mode
+        self.wake_reason: Optional[str] = None  # The report that did, last time
+        self._woken: Optional[asyncio.Event] = None
+
     async def initialize(self) -> bool:
         """
         Initialize the BNO085 sensor connection.
@@ -137,7 +316,17 @@ class BNO085Interface:
             self.logger.info("Enabling sensor reports...")
             await self._enable_sensor_reports()
             self.logger.info("Sensor reports enabled.")
-            
+
+            if AccelerometerConfig.BATCHED_READS:
+                if AccelerometerConfig.INT_PIN is not None and self.interrupt is None:
+                    try:
+                        self.interrupt = GPIOInterrupt(AccelerometerConfig.INT_PIN)
+                        self.logger.info(f"Waking on BNO085 INT (GPIO {AccelerometerConfig.INT_PIN}) in low power mode")
+                    except Exception as e:
+                        self.logger.warning(f"Can't use GPIO {AccelerometerConfig.INT_PIN} for the BNO085 INT line, "
+                                            f"polling in low power mode instead: {e}")
+                self.start_reader()
+
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize BNO085 sensor: {e}", exc_info=True)
@@ -147,6 +336,10 @@ class BNO085Interface:
         """
         Deinitialize the sensor and clean up resources.
         """
+        self.stop_reader()
+        if self.interrupt:
+            self.interrupt.close()
+            self.interrupt = None
         if self.i2c:
             try:
                 # This is a blocking call, but typically fast.
@@ -172,9 +365,10 @@ class BNO085Interface:
 
         # ONLY enable the 3 essential sensors for free fall detection
         # This should significantly reduce I2C overhead
-        await _enable_feature_wrapper(BNO_REPORT_ACCELEROMETER, 20000)        # 20ms (50Hz) - Essential for total acceleration
-        await _enable_feature_wrapper(BNO_REPORT_LINEAR_ACCELERATION, 20000)  # 20ms (50Hz) - Essential for motion without gravity
-        await _enable_feature_wrapper(BNO_REPORT_GYROSCOPE, 20000)            # 20ms (50Hz) - Essential for rotation detection
+        interval_us = AccelerometerConfig.REPORT_INTERVAL_US
+        await _enable_feature_wrapper(BNO_REPORT_ACCELEROMETER, interval_us)        # Essential for total acceleration
+        await _enable_feature_wrapper(BNO_REPORT_LINEAR_ACCELERATION, interval_us)  # Essential for motion without gravity
+        await _enable_feature_wrapper(BNO_REPORT_GYROSCOPE, interval_us)            # Essential for rotation detection
         
         # ALL OTHER SENSORS DISABLED to maximize I2C performance
         # These can be re-enabled if needed for other applications:
@@ -206,19 +400,9 @@ class BNO085Interface:
         # else:
         self.logger.info(f"Enabling feature {feature_id} with interval {interval_us}us")
         
-        # Manually construct the _SET_FEATURE_COMMAND packet
-        set_feature_report = bytearray(17)
-        set_feature_report[0] = _SET_FEATURE_COMMAND # Command
-        set_feature_report[1] = feature_id          # Feature Report ID
-        # Bytes 2-4: Feature flags (default 0)
-        pack_into("<i", set_feature_report, 5, interval_us) # Change Period (LSB) - Use signed int <i
-        # Bytes 9-12: Batch Interval (default 0)
-        # Bytes 13-16: Sensor-specific config
-        pack_into("<I", set_feature_report, 13, sensor_config) # Config uses unsigned int <I
-        
         # Send the packet
         try:
-            await asyncio.to_thread(self.imu._send_packet, _BNO_CHANNEL_CONTROL, set_feature_report)
+            await asyncio.to_thread(self._locked, self._send_feature_command, feature_id, interval_us, sensor_config)
         except Exception as e:
             self.logger.error(f"Failed to send feature command for {feature_id}: {e}", exc_info=True)
             raise RuntimeError(f"Failed sending command for {feature_id}") from e # Re-raise
@@ -228,7 +412,7 @@ class BNO085Interface:
         while (asyncio.get_event_loop().time() - start_time) < _FEATURE_ENABLE_TIMEOUT:
             try:
                 # Process any available packets from the sensor
-                await asyncio.to_thread(self.imu._process_available_packets, max_packets=10)
+                await asyncio.to_thread(self._locked, self.imu._process_available_packets, max_packets=10)
             except Exception as e:
                 # Log errors during packet processing but continue trying
                 self.logger.warning(f"Error processing packets while enabling {feature_id}: {e}")
@@ -245,6 +429,210 @@ class BNO085Interface:
         self.logger.error(f"Timeout: Failed to enable feature {feature_id} within {_FEATURE_ENABLE_TIMEOUT}s. Readings: {self.imu._readings.keys()}")
         raise RuntimeError(f"Was not able to enable feature {feature_id}")
 
+    def _send_feature_command(self, feature_id: int, interval_us: int, sensor_config: int = 0):
+        """Sends a _SET_FEATURE_COMMAND packet without waiting for the response. Caller holds the bus."""
+        # Manually construct the _SET_FEATURE_COMMAND packet
+        set_feature_report = bytearray(17)
+        set_feature_report[0] = _SET_FEATURE_COMMAND # Command
+        set_feature_report[1] = feature_id          # Feature Report ID
+        # Bytes 2-4: Feature flags (default 0)
+        pack_into("<i", set_feature_report, 5, interval_us) # Change Period (LSB) - Use signed int <i
+        # Bytes 9-12: Batch Interval (default 0)
+        # Bytes 13-16: Sensor-specific config
+        pack_into("<I", set_feature_report, 13, sensor_config) # Config uses unsigned int <I
+        self.imu._send_packet(_BNO_CHANNEL_CONTROL, set_feature_report)
+
+    def _set_low_power_reports(self, low_power: bool):
+        """
+        Switches between the high rate reports and the low power classification reports.
+
+        Caller holds the bus. The feature responses come back as control packets, which the
+        reader hands to the library.
+        """
+        high_rate = 0 if low_power else AccelerometerConfig.REPORT_INTERVAL_US
+        classifier = AccelerometerConfig.LOW_POWER_CLASSIFIER_INTERVAL_US if low_power else 0
+        if low_power:
+            # Classification reports first, so motion in between still wakes us
+            for feature_id in (_SH2_REPORT_STABILITY_CLASSIFIER, _SH2_REPORT_SHAKE_DETECTOR, _SH2_REPORT_TAP_DETECTOR):
+                self._send_feature_command(feature_id, classifier)
+        for feature_id in (BNO_REPORT_ACCELEROMETER, BNO_REPORT_LINEAR_ACCELERATION, BNO_REPORT_GYROSCOPE):
+            self._send_feature_command(feature_id, high_rate)
+        if not low_power:
+            for feature_id in (_SH2_REPORT_STABILITY_CLASSIFIER, _SH2_REPORT_SHAKE_DETECTOR, _SH2_REPORT_TAP_DETECTOR):
+                self._send_feature_command(feature_id, classifier)
+        self.low_power = low_power
+
+    async def enter_low_power(self) -> bool:
+        """
+        Turns the high rate reports off until the sensor reports motion.
+
+        Returns:
+            bool: False if low power mode isn't available (it needs the reader thread)
+        """
+        if self._reader_thread is None:
+            return False
+        if not self.low_power:
+            self._woken.clear()
+            await asyncio.to_thread(self._locked, self._set_low_power_reports, True)
+            self.logger.info("BNO085 in low power mode")
+        return True
+
+    async def exit_low_power(self):
+        """Turns the high rate reports back on without waiting for motion"""
+        if self.low_power:
+            await asyncio.to_thread(self._locked, self._set_low_power_reports, False)
+            self._woken.set()
+
+    async def wait_for_wake(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the sensor leaves low power mode.
+
+        Returns:
+            bool: True once out of low power mode, False if the timeout expired first
+        """
+        if not self.low_power or self._woken is None:
+            return True
+        try:
+            await asyncio.wait_for(self._woken.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return not self.low_power
+
+    def _locked(self, function, *args, **kwargs):
+        """Calls a blocking library function while holding the bus, for use with asyncio.to_thread"""
+        with self._bus_lock:
+            return function(*args, **kwargs)
+
+    def start_reader(self):
+        """
+        Starts the reader thread, which drains the sensor's input reports into `samples`.
+
+        Must be called from the event loop that will consume the samples.
+        """
+        if self._reader_thread is not None or not self.imu:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.samples.bind()
+        self._woken = asyncio.Event()
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(target=self._reader_loop, name="bno085-reader", daemon=True)
+        self._reader_thread.start()
+        self.logger.info("BNO085 report reader started")
+
+    def stop_reader(self):
+        """Stops the reader thread, waiting for its current batch to finish"""
+        if self._reader_thread is None:
+            return
+        self._reader_stop.set()
+        if self.interrupt:
+            self.interrupt.wake()
+        self._reader_thread.join(timeout=1.0)
+        self._reader_thread = None
+        self.logger.info("BNO085 report reader stopped")
+
+    @property
+    def reader_running(self) -> bool:
+        return self._reader_thread is not None
+
+    def _reader_loop(self):
+        """
+        Reader thread: drain the sensor whenever it has reports, otherwise wait a little.
+
+        In low power mode, wait for the INT line instead (or poll slowly without one).
+        """
+        while not self._reader_stop.is_set():
+            try:
+                count = self._drain_reports()
+            except Exception as e:
+                self.logger.error(f"Error reading BNO085 reports: {e}", exc_info=True)
+                count = 0
+                self._reader_stop.wait(AccelerometerConfig.READER_ERROR_BACKOFF)
+            if count:
+                continue
+            if not self.low_power:
+                self._reader_stop.wait(AccelerometerConfig.READER_POLL_INTERVAL)
+            elif self.interrupt is not None:
+                # Times out now and then in case an edge was missed
+                self.interrupt.wait(AccelerometerConfig.LOW_POWER_INT_TIMEOUT)
+            else:
+                self._reader_stop.wait(AccelerometerConfig.LOW_POWER_POLL_INTERVAL)
+
+    def _drain_reports(self) -> int:
+        """
+        Reads every pending packet in one go, decoding input reports into the ring buffer.
+
+        Packets on other channels, or with reports the decoder doesn't know, go to the library
+        so its own state (feature responses, calibration status) stays current.
+
+        Returns:
+            int: Number of samples decoded
+        """
+        imu = self.imu
+        decoder = self._decoder
+        decoder.clear()
+        with self._bus_lock:
+            while not decoder.full and imu._data_ready:
+                reference_time = time.monotonic()
+                try:
+                    packet = imu._read_packet()
+                except Exception as e:
+                    # Includes the library's PacketError for a packet that didn't read cleanly
+                    self.logger.debug(f"Skipping unreadable BNO085 packet: {e}")
+                    continue
+                if (packet.channel_number != _SH2_CHANNEL_INPUT_REPORTS or
+                        not decoder.decode(packet.data, packet.header.data_length, reference_time)):
+                    imu._handle_packet(packet)
+                if self.low_power and decoder.motion_events:
+                    # Back to full rate straight away, without a round trip through the event loop
+                    self._set_low_power_reports(False)
+                    self.wakeups += 1
+                    self.wake_reason = decoder.motion_events[0][1]
+                    self._loop.call_soon_threadsafe(self._woken.set)
+
+        count = decoder.count
+        self.dropped_samples += decoder.dropped
+        if count:
+            written = self.samples.publish(decoder.records[:count])
+            if written < count:
+                self.dropped_samples += count - written
+        return count
+
+    async def wait_for_samples(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the reader has samples ready.
+
+        Returns:
+            bool: True if samples are ready, False if timeout expired first
+        """
+        return await self.samples.wait(timeout)
+
+    def read_samples(self, max_count: Optional[int] = None) -> np.ndarray:
+        """
+        Takes the samples decoded so far, oldest first. Consumer side of `samples`.
+
+        Returns:
+            np.ndarray: IMU_SAMPLE_DTYPE records, empty if there are none
+        """
+        return self.samples.take(max_count)
+
+    @staticmethod
+    def sample_to_dict(sample) -> Dict[str, Any]:
+        """One IMU_SAMPLE_DTYPE record as a read_sensor_data_optimized result"""
+        return {
+            "acceleration": tuple(sample["acceleration"].tolist()),
+            "linear_acceleration": tuple(sample["linear_acceleration"].tolist()),
+            "gyro": tuple(sample["gyro"].tolist()),
+            "sensor_timestamp": float(sample["timestamp"]),
+
+            # Set default values for non-essential sensors to maintain compatibility
+            "magnetometer": (0.0, 0.0, 0.0),
+            "rotation_vector": (0.0, 0.0, 0.0, 1.0),
+            "geomagnetic_rotation": (0.0, 0.0, 0.0, 1.0),
+            "game_rotation": (0.0, 0.0, 0.0, 1.0),
+            "stability": "Unknown",
+            "shake": False,
+        }
+
     async def read_sensor_data_optimized(self) -> Dict[str, Any]:
         """
         Optimized sensor reading that only reads essential sensors for free fall detection.
@@ -261,8 +649,17 @@ class BNO085Interface:
         try:
             if not self.imu:
                 return {}
-            
-            import time
+
+            if self._reader_thread is not None:
+                # The reader thread has already decoded everything; just take the newest sample
+                if not await self.wait_for_samples(AccelerometerConfig.SAMPLE_TIMEOUT):
+                    return {}
+                samples = self.read_samples()
+                self._total_reads += 1
+                result = self.sample_to_dict(samples[-1])
+                result["samples"] = len(samples)
+                return result
+
             read_start = time.perf_counter()
                 
             # Read only essential sensors for maximum performance
@@ -292,7 +689,7 @@ class BNO085Interface:
             
             # Single batch read of essential sensors only
             thread_start = time.perf_counter()
-            sensor_data = await asyncio.to_thread(_read_essential_sensors)
+            sensor_data = await asyncio.to_thread(self._locked, _read_essential_sensors)
             thread_end = time.perf_counter()
             
             # Extract timing info
@@ -397,7 +794,6 @@ class BNO085Interface:
             if not self.imu:
                 return {}
             
-            import time
             read_start = time.perf_counter()
                 
             # Batch read all sensor values in a single thread operation to minimize I2C overhead
@@ -440,7 +836,7 @@ class BNO085Interface:
             
             # Single batch read instead of multiple individual reads
             thread_start = time.perf_counter()
-            sensor_data = await asyncio.to_thread(_batch_read_sensors)
+            sensor_data = await asyncio.to_thread(self._locked, _batch_read_sensors)
             thread_end = time.perf_counter()
             
             # Extract timing info
@@ -535,7 +931,7 @@ class BNO085Interface:
             int: Calibration status value (0-3, where 3 is best)
         """
         if self.imu:
-            return await asyncio.to_thread(lambda: self.imu.calibration_status)
+            return await asyncio.to_thread(self._locked, lambda: self.imu.calibration_status)
         return 0
         
     async def get_calibration_status_text(self) -> str:
@@ -547,7 +943,7 @@ class BNO085Interface:
         """
         if not self.imu:
             return "Unknown"
-        status = await asyncio.to_thread(lambda: self.imu.calibration_status)
+        status = await asyncio.to_thread(self._locked, lambda: self.imu.calibration_status)
         return f"{REPORT_ACCURACY_STATUS[status]} ({status})"
     
     async def check_and_calibrate(self) -> bool:
@@ -562,7 +958,7 @@ class BNO085Interface:
                 return False
                 
             # Get current calibration status
-            calibration_status = await asyncio.to_thread(lambda: self.imu.calibration_status)
+            calibration_status = await asyncio.to_thread(self._locked, lambda: self.imu.calibration_status)
             self.logger.info(f"Initial calibration status: {REPORT_ACCURACY_STATUS[calibration_status]} ({calibration_status})")
             
             # If calibration is not good (status < 2), perform calibration
@@ -590,7 +986,7 @@ class BNO085Interface:
                 return
                 
             # Start calibration
-            await asyncio.to_thread(self.imu.begin_calibration)
+            await asyncio.to_thread(self._locked, self.imu.begin_calibration)
             self.logger.info("Calibration started. Please move the device in a figure-8 pattern...")
             
             # Monitor calibration status
@@ -599,7 +995,7 @@ class BNO085Interface:
             
             while not self._calibration_good:
                 current_time = loop.time()
-                calibration_status = await asyncio.to_thread(lambda: self.imu.calibration_status)
+                calibration_status = await asyncio.to_thread(self._locked, lambda: self.imu.calibration_status)
                 self.logger.info(f"Calibration status: {REPORT_ACCURACY_STATUS[calibration_status]} ({calibration_status})")
                 
                 if calibration_status >= 2 and not calibration_good_at:
@@ -608,7 +1004,7 @@ class BNO085Interface:
                     
                 if calibration_good_at and (current_time - calibration_good_at > 5.0):
                     # Save calibration data
-                    await asyncio.to_thread(self.imu.save_calibration_data)
+                    await asyncio.to_thread(self._locked, self.imu.save_calibration_data)
                     self._calibration_good = True
                     self.logger.info("Calibration completed and saved!")
                     break
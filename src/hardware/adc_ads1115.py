@@ -0,0 +1,207 @@
+"""
+ADS1115 Continuous Conversion Sampler
+
+The touch strip's softpot is read through an ADS1115 ADC. In continuous conversion mode the
+ADC converts back to back at its configured data rate and a read only has to fetch the latest
+result, so a sampler thread reads each conversion as it completes: woken by the ALERT/RDY pin
+when it is wired (configured as a conversion ready signal by `enable_conversion_ready`), or
+paced by the clock at the data rate otherwise. Samples are stamped when read and go into a
+ring buffer (`samples`) that the event loop consumes in batches, so it never waits on the I2C
+bus itself.
+
+Docs:
+https://www.ti.com/lit/ds/symlink/ads1115.pdf (section 9.3.8, Conversion Ready Pin)
+https://docs.circuitpython.org/projects/ads1x15/en/latest/api.html
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from config import TouchConfig, get_filter_logger
+from hardware.gpio_interrupt import InterruptLine
+from utils.ring_buffer import AsyncRingBuffer
+
+logger = get_filter_logger(__name__)
+
+# ADS1115 data rates (samples per second)
+ADS1115_DATA_RATES = (8, 16, 32, 64, 128, 250, 475, 860)
+
+# Threshold registers; high MSB set and low MSB clear turn ALERT/RDY into a conversion ready pin
+_ADS1115_REGISTER_LO_THRESH = 0x02
+_ADS1115_REGISTER_HI_THRESH = 0x03
+
+# One touch sample: when it was read (time.time() clock) and the raw ADC value
+TOUCH_SAMPLE_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("value", np.int32),
+])
+
+
+def matching_data_rate(sample_rate: float) -> int:
+    """The slowest ADS1115 data rate that keeps up with `sample_rate` (Hz)"""
+    for rate in ADS1115_DATA_RATES:
+        if rate >= sample_rate:
+            return rate
+    return ADS1115_DATA_RATES[-1]
+
+
+def enable_conversion_ready(ads):
+    """
+    Configures the ADS1115's ALERT/RDY pin to pulse low at the end of every conversion.
+
+    Needs a version of adafruit_ads1x15 with comparator support, which keeps the comparator
+    queue enabled in the config register it writes.
+    """
+    ads.comparator_queue_length = 1
+    ads._write_register(_ADS1115_REGISTER_LO_THRESH, 0x0000)
+    ads._write_register(_ADS1115_REGISTER_HI_THRESH, 0x8000)
+
+
+@dataclass
+class SamplerStats:
+    """Counters for the conversions the sampler has read and what became of them"""
+    samples: int = 0        # Conversions read
+    dropped: int = 0        # Read while the ring buffer was full
+    late: int = 0           # Reads that missed their deadline, so the schedule restarted
+    ready_timeouts: int = 0  # Waits on ALERT/RDY that timed out, so the read went ahead anyway
+    errors: int = 0         # Failed reads
+    read_seconds: float = 0.0  # Total time spent in I2C reads
+    max_read_seconds: float = 0.0
+
+    @property
+    def mean_read_ms(self) -> float:
+        return 1000 * self.read_seconds / self.samples if self.samples else 0.0
+
+
+class ADS1115Sampler:
+    """
+    Reads an ADS1115 channel in continuous conversion mode on a dedicated thread.
+
+    Args:
+        channel: The AnalogIn (or anything else with a `value`) to read. The ADC must already
+                 be in continuous mode at `data_rate`.
+        data_rate: The ADC's data rate (samples per second); one read per conversion
+        ready: The ALERT/RDY line, if wired, to read each conversion as soon as it completes
+    """
+
+    def __init__(self, channel, data_rate: float, ready: Optional[InterruptLine] = None,
+                 capacity: int = TouchConfig.SAMPLE_BUFFER_SIZE,
+                 batch_interval: float = TouchConfig.SAMPLE_BATCH_INTERVAL):
+        self.channel = channel
+        self.data_rate = data_rate
+        self.ready = ready
+        self.samples = AsyncRingBuffer(capacity, TOUCH_SAMPLE_DTYPE)
+        self.stats = SamplerStats()
+        # Samples are handed to the event loop a batch at a time, not one wakeup per conversion
+        self._batch = np.zeros(max(1, round(data_rate * batch_interval)), dtype=TOUCH_SAMPLE_DTYPE)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """
+        Starts the sampler thread.
+
+        Must be called from the event loop that will consume the samples.
+        """
+        if self._thread is not None:
+            return
+        self.samples.bind()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ads1115-sampler", daemon=True)
+        self._thread.start()
+        logger.info(f"ADS1115 sampler started at {self.data_rate} SPS, "
+                    f"{'woken by ALERT/RDY' if self.ready else 'paced by the clock'}")
+
+    def stop(self):
+        """Stops the sampler thread, waiting for its current read to finish"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self.ready:
+            self.ready.wake()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._log_stats()
+        logger.info("ADS1115 sampler stopped")
+
+    def _run(self):
+        period = 1.0 / self.data_rate
+        batch = self._batch
+        count = 0
+        next_tick = time.monotonic()
+        next_stats = next_tick + TouchConfig.STATS_INTERVAL
+        while not self._stop.is_set():
+            if self.ready is not None:
+                # Times out now and then in case an edge was missed
+                if not self.ready.wait(period * 4):
+                    self.stats.ready_timeouts += 1
+                if self._stop.is_set():
+                    break
+            else:
+                next_tick += period
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    if self._stop.wait(delay):
+                        break
+                else:
+                    self.stats.late += 1
+                    next_tick = time.monotonic()
+
+            start = time.monotonic()
+            try:
+                value = self.channel.value
+            except Exception as e:
+                self.stats.errors += 1
+                logger.error(f"Error reading ADS1115: {e}")
+                self._stop.wait(TouchConfig.SAMPLER_ERROR_BACKOFF)
+                next_tick = time.monotonic()
+                continue
+            elapsed = time.monotonic() - start
+            self.stats.samples += 1
+            self.stats.read_seconds += elapsed
+            self.stats.max_read_seconds = max(self.stats.max_read_seconds, elapsed)
+
+            batch[count] = (time.time(), value)
+            count += 1
+            if count == len(batch):
+                self._publish(count)
+                count = 0
+            if start >= next_stats:
+                next_stats += TouchConfig.STATS_INTERVAL
+                self._log_stats()
+        if count:
+            self._publish(count)
+
+    def _publish(self, count: int):
+        written = self.samples.publish(self._batch[:count])
+        self.stats.dropped += count - written
+
+    def _log_stats(self):
+        stats = self.stats
+        logger.debug(f"ADS1115 sampler: {stats.samples} samples, {stats.dropped} dropped, {stats.late} late, "
+                     f"{stats.ready_timeouts} ALERT/RDY timeouts, {stats.errors} errors; reads "
+                     f"{stats.mean_read_ms:.2f}ms mean, {1000 * stats.max_read_seconds:.2f}ms max")
+
+    async def wait_for_samples(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the sampler has samples ready.
+
+        Returns:
+            bool: True if samples are ready, False if timeout expired first
+        """
+        return await self.samples.wait(timeout)
+
+    def read_samples(self, max_count: Optional[int] = None) -> np.ndarray:
+        """
+        Takes the samples read so far, oldest first. Consumer side of `samples`.
+
+        Returns:
+            np.ndarray: TOUCH_SAMPLE_DTYPE records, empty if there are none
+        """
+        return self.samples.take(max_count)
@@ -0,0 +1,254 @@
+"""
+Bluetooth Adapter Health Monitor
+
+Watches whether the Bluetooth adapter is powered, powering it back on when it goes down, and
+caches the answer so BLE scans can check it without forking hciconfig or blocking the event loop.
+
+Two backends are provided:
+- BlueZDBusBackend: reads and sets org.bluez.Adapter1.Powered over the system D-Bus and
+  subscribes to its PropertiesChanged signal, so changes are seen as they happen. Uses
+  dbus_fast, which bleak already depends on under Linux.
+- HciconfigBackend: runs hciconfig as an async subprocess from the monitor's poll loop.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from config import BLEConfig, get_filter_logger
+
+try:
+    from dbus_fast import BusType
+    from dbus_fast.aio import MessageBus
+except ImportError:
+    MessageBus = None
+
+logger = get_filter_logger(__name__)
+
+PowerCallback = Callable[[bool], None]
+
+
+class AdapterBackend(ABC):
+    """Reads and controls adapter power"""
+
+    async def start(self, on_change: PowerCallback) -> None:
+        """Start reporting power changes to on_change, if the backend can be notified of them"""
+
+    @abstractmethod
+    async def is_powered(self) -> bool:
+        ...
+
+    @abstractmethod
+    async def power_on(self) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class HciconfigBackend(AdapterBackend):
+    """Polls the adapter with hciconfig, without blocking the event loop"""
+
+    def __init__(self, interface: str, timeout: float = 5.0):
+        self.interface = interface
+        self.timeout = timeout
+
+    async def _run(self, *command: str) -> str:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}")
+        return stdout.decode(errors="replace")
+
+    async def is_powered(self) -> bool:
+        return "UP RUNNING" in await self._run("hciconfig", self.interface)
+
+    async def power_on(self) -> None:
+        await self._run("sudo", "hciconfig", self.interface, "up")
+        # Give the adapter a moment to initialize
+        await asyncio.sleep(1)
+
+
+class BlueZDBusBackend(AdapterBackend):
+    """Tracks org.bluez.Adapter1.Powered over D-Bus"""
+
+    def __init__(self, interface: str):
+        self.path = f"/org/bluez/{interface}"
+        self._bus = None
+        self._adapter = None
+        self._properties = None  # The proxy our PropertiesChanged handler is registered on
+        self._on_change: Optional[PowerCallback] = None
+
+    async def start(self, on_change: PowerCallback) -> None:
+        self._on_change = on_change
+
+    async def _get_adapter(self):
+        """The adapter's proxy interface, connecting and subscribing to changes if needed"""
+        if self._adapter is None:
+            if self._bus is None:
+                self._bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+            introspection = await self._bus.introspect("org.bluez", self.path)
+            proxy = self._bus.get_proxy_object("org.bluez", self.path, introspection)
+            self._properties = proxy.get_interface("org.freedesktop.DBus.Properties")
+            self._properties.on_properties_changed(self._on_properties_changed)
+            self._adapter = proxy.get_interface("org.bluez.Adapter1")
+        return self._adapter
+
+    def _drop_adapter(self):
+        """Forget the adapter's proxy, unsubscribing from it so a re-lookup doesn't add a second handler"""
+        if self._properties is not None:
+            try:
+                self._properties.off_properties_changed(self._on_properties_changed)
+            except Exception as e:
+                logger.debug(f"Couldn't unsubscribe from adapter property changes: {e}")
+        self._properties = None
+        self._adapter = None
+
+    def _on_properties_changed(self, interface, changed, invalidated):
+        if interface == "org.bluez.Adapter1" and "Powered" in changed and self._on_change:
+            self._on_change(bool(changed["Powered"].value))
+
+    async def is_powered(self) -> bool:
+        try:
+            return bool(await (await self._get_adapter()).get_powered())
+        except Exception:
+            # The adapter may have gone away (e.g. a USB dongle), so look it up again next time
+            self._drop_adapter()
+            raise
+
+    async def power_on(self) -> None:
+        await (await self._get_adapter()).set_powered(True)
+
+    async def close(self) -> None:
+        self._drop_adapter()
+        if self._bus is not None:
+            self._bus.disconnect()
+        self._bus = None
+
+
+def create_adapter_backend(interface: str = BLEConfig.BLUETOOTH_INTERFACE) -> AdapterBackend:
+    """The configured backend, falling back to hciconfig where dbus_fast isn't available"""
+    if BLEConfig.ADAPTER_BACKEND == "dbus" and MessageBus is not None:
+        return BlueZDBusBackend(interface)
+    return HciconfigBackend(interface)
+
+
+class BluetoothAdapterMonitor:
+    """
+    Keeps a cached view of whether the adapter is powered, and powers it on when it isn't.
+
+    The backend is only queried from the monitor's own task, every poll_interval or when the
+    backend reports a change. With no backend the adapter is assumed to always be ready, as
+    on platforms where we don't manage it.
+    """
+    def __init__(self, backend: Optional[AdapterBackend],
+                 poll_interval: float = BLEConfig.ADAPTER_POLL_INTERVAL):
+        self._backend = backend
+        self.poll_interval = poll_interval
+        self._powered = backend is None
+        self._ready = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._failed_power_ons = 0
+        if self._powered:
+            self._ready.set()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the adapter was powered when last checked. Never touches the adapter."""
+        return self._powered
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the adapter is powered
+
+        Returns:
+            bool: True if the adapter is ready, False if timeout expired first
+        """
+        if self._ready.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def start(self) -> None:
+        """Starts monitoring the adapter in the background"""
+        if self._backend is None or self._task is not None:
+            return
+        await self._backend.start(self._on_change)
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops monitoring the adapter"""
+        if self._task is not None:
+            # wait_for can swallow a cancel that races with the event it waits on, so the loop
+            # also checks _running
+            self._running = False
+            self._changed.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._backend is not None:
+            await self._backend.close()
+
+    def _on_change(self, powered: bool) -> None:
+        self._set_powered(powered)
+        self._changed.set()
+
+    def _set_powered(self, powered: bool) -> None:
+        if powered == self._powered:
+            return
+        self._powered = powered
+        if powered:
+            logger.info("Bluetooth adapter is up")
+            self._ready.set()
+        else:
+            logger.warning("Bluetooth adapter is down")
+            self._ready.clear()
+
+    async def _read_powered(self) -> bool:
+        try:
+            return await self._backend.is_powered()
+        except Exception as e:
+            logger.debug(f"Couldn't read Bluetooth adapter state: {e}")
+            return False
+
+    async def _power_on(self) -> bool:
+        logger.info("Bluetooth adapter is down, attempting to power on...")
+        try:
+            await self._backend.power_on()
+        except Exception as e:
+            logger.debug(f"Error powering on Bluetooth adapter: {e}")
+        if await self._read_powered():
+            logger.info("Successfully powered on Bluetooth adapter")
+            self._failed_power_ons = 0
+            return True
+        self._failed_power_ons += 1
+        # Keep retrying every poll, but only report the first failure of a run
+        if self._failed_power_ons == 1:
+            logger.error("Failed to power on Bluetooth adapter")
+        return False
+
+    async def _run(self) -> None:
+        while self._running:
+            self._changed.clear()
+            powered = await self._read_powered()
+            if not powered:
+                powered = await self._power_on()
+            self._set_powered(powered)
+            try:
+                await asyncio.wait_for(self._changed.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
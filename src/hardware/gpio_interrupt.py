@@ -0,0 +1,69 @@
+"""
+Interrupt lines that wake a reader thread when a sensor has data.
+
+Sensors signal with an active-low line: the BNO085's INT (H_INTN) stays low while reports are
+waiting, and the ADS1115's ALERT/RDY pulses low each time a conversion completes. A reader
+thread calls `wait` in place of sleeping until its next poll. SimulatedInterrupt stands in for
+the line in tests.
+"""
+
+import threading
+from typing import Optional
+
+
+class InterruptLine:
+    """
+    Wakeups for a reader thread from a sensor's interrupt line.
+
+    This base class has no pin behind it: only `wake` (from another thread) ends a wait.
+    """
+    def __init__(self):
+        self._edge = threading.Event()
+        self.edges = 0  # Wakeups so far
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the line falls, or the timeout expires.
+
+        Returns:
+            bool: True if woken, False on timeout
+        """
+        woken = self._edge.wait(timeout)
+        self._edge.clear()
+        return woken
+
+    def wake(self):
+        self.edges += 1
+        self._edge.set()
+
+    def close(self):
+        pass
+
+
+class SimulatedInterrupt(InterruptLine):
+    """An interrupt line for tests: assert_line() is the sensor pulling it low"""
+    def assert_line(self):
+        self.wake()
+
+
+class GPIOInterrupt(InterruptLine):
+    """An interrupt line wired to a GPIO pin (BCM numbering), woken on its falling edge"""
+    def __init__(self, pin: int):
+        super().__init__()
+        import RPi.GPIO as GPIO
+        self._gpio = GPIO
+        self.pin = pin
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        GPIO.add_event_detect(pin, GPIO.FALLING, callback=lambda _channel: self.wake())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        # A line still held low has data waiting, so an edge before the wait isn't lost
+        if self._gpio.input(self.pin) == self._gpio.LOW:
+            self._edge.clear()
+            return True
+        return super().wait(timeout)
+
+    def close(self):
+        self._gpio.remove_event_detect(self.pin)
+        self._gpio.cleanup(self.pin)
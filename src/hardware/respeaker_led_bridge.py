@@ -13,6 +13,9 @@ resource-constrained devices like the Raspberry Pi Zero 2 W.
 - It only consumes CPU and power when the NeoPixel LEDs are actually updated.
 - It has zero idle cost, which is critical for battery-powered devices.
 - Updates for both LED systems are perfectly synchronized.
+- Frames pass to the USB worker through a single-slot mailbox, so if USB is slower
+  than the effect, stale frames are dropped and the ReSpeaker stays one frame behind
+  at most. Unchanged frames aren't sent at all.
 
 Primary Interface:
 The main entry point is the `augment_led_manager()` function, which takes an
@@ -22,11 +25,14 @@ instance of `LEDManager` and seamlessly adds ReSpeaker support to it.
 import usb.core
 import usb.util
 import threading
-import queue
 import time
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Optional
 from enum import Enum, auto
-from config import LEDConfig
+import numpy as np
+from config import LEDConfig, get_filter_logger
+
+logger = get_filter_logger(__name__)
 
 
 class MappingMode(Enum):
@@ -39,13 +45,31 @@ class MappingMode(Enum):
     HIGHLIGHT = auto()         # Highlight/accent the main effect
 
 
+@dataclass
+class BridgeStats:
+    """Counters for the frames the bridge has been given and what became of them"""
+    submitted: int = 0      # Frames passed to the bridge
+    skipped: int = 0        # Identical to the previous frame, so never queued
+    dropped: int = 0        # Replaced in the mailbox by a newer frame before they were sent
+    sent: int = 0           # Frames transferred to the ReSpeaker
+    errors: int = 0         # Failed USB transfers
+    transfer_seconds: float = 0.0  # Total time spent in USB transfers
+    max_transfer_seconds: float = 0.0
+
+    @property
+    def mean_transfer_ms(self) -> float:
+        return 1000 * self.transfer_seconds / self.sent if self.sent else 0.0
+
+
 class ReSpeakerLEDBridge:
     """
     Manages the connection and command dispatch to the ReSpeaker USB device.
 
     This class is the core worker of the bridge. It handles:
     - Low-level USB communication in a dedicated, non-blocking thread.
-    - A command queue for sending frames and brightness updates.
+    - A single-slot mailbox for frames, and one for brightness updates. The worker always
+      sends the newest frame and stale ones are dropped, so a slow USB link costs frames,
+      never memory or latency.
     - Sampling and mapping pixel data from the `LEDManager`.
     - Graceful handling of USB connection errors and device presence.
 
@@ -57,6 +81,8 @@ class ReSpeakerLEDBridge:
     USB_VID = 0x2886
     USB_PID = 0x0018
     TIMEOUT = 8000
+    # How often the worker logs its transfer stats, in seconds
+    STATS_INTERVAL = 60.0
     
     # USB Commands
     CMD_SHOW = 6
@@ -67,11 +93,21 @@ class ReSpeakerLEDBridge:
         self.mapping_mode = mapping_mode
         self.enabled = True
         self.dev = None
+        self.stats = BridgeStats()
         self._last_brightness = -1.0 # Initialize to an invalid value to force first update
-        
-        self._command_queue = queue.Queue()
+
+        # The ReSpeaker v2 firmware expects a 4-byte package for each LED: [R, G, B, 0].
+        # Frames are encoded in place into _packet, then copied into the mailbox for the worker.
+        self._packet = np.zeros((self.RESPEAKER_LEDS, 4), dtype=np.uint8)
+        self._mailbox = np.zeros(self._packet.size, dtype=np.uint8)
+        self._sending = bytearray(self._packet.size)
+        self._frame_pending = False
+        self._has_frame = False
+        self._pending_brightness: Optional[int] = None
+        self._condition = threading.Condition()
         self._running = True
-        
+
+        self._layout()
         self._connect()
         
         # Start a single worker thread for non-blocking USB communication
@@ -93,20 +129,45 @@ class ReSpeakerLEDBridge:
             print(f"ReSpeaker LED Bridge: USB connection error: {e}. Bridge is disabled.")
             self.enabled = False
             self.dev = None
-    
+
+    def _layout(self):
+        """Precompute which NeoPixel each ReSpeaker LED samples from, for every mapping mode"""
+        if hasattr(self.led_manager, 'ring1_pixels'):
+            num_outer, num_inner = LEDConfig.LED_COUNT_RING1, LEDConfig.LED_COUNT_RING2
+        else:
+            num_outer, num_inner = getattr(self.led_manager.pixels, 'n', 0), 0
+        self._num_pixels = num_outer + num_inner
+        steps = np.arange(self.RESPEAKER_LEDS)
+        self._outer_index = steps * num_outer // self.RESPEAKER_LEDS if num_outer else None
+        # Modes that need the inner ring fall back to mirroring the outer ring without one
+        self._inner_index = num_outer + steps * num_inner // self.RESPEAKER_LEDS if num_inner else None
+
     def _usb_worker(self):
-        """Worker thread for processing the USB command queue."""
-        while self._running:
+        """Worker thread: send the newest brightness and frame whenever either changes."""
+        next_stats = time.monotonic() + self.STATS_INTERVAL
+        while True:
+            with self._condition:
+                while self._running and not self._frame_pending and self._pending_brightness is None:
+                    self._condition.wait(timeout=1)
+                if not self._running and not self._frame_pending:
+                    return
+                brightness, self._pending_brightness = self._pending_brightness, None
+                frame_pending, self._frame_pending = self._frame_pending, False
+                if frame_pending:
+                    self._sending[:] = self._mailbox.data
             try:
-                cmd, data = self._command_queue.get(timeout=1)
-                if self.dev and self.enabled:
-                    self.dev.ctrl_transfer(
-                        usb.util.CTRL_OUT | usb.util.CTRL_TYPE_VENDOR | usb.util.CTRL_RECIPIENT_DEVICE,
-                        0, cmd, 0x1C, data, self.TIMEOUT
-                    )
-            except queue.Empty:
-                continue
+                if self.dev:
+                    if brightness is not None:
+                        self._transfer(self.CMD_SET_BRIGHTNESS, [brightness])
+                    if frame_pending:
+                        start = time.monotonic()
+                        self._transfer(self.CMD_SHOW, self._sending)
+                        elapsed = time.monotonic() - start
+                        self.stats.sent += 1
+                        self.stats.transfer_seconds += elapsed
+                        self.stats.max_transfer_seconds = max(self.stats.max_transfer_seconds, elapsed)
             except usb.core.USBError as e:
+                self.stats.errors += 1
                 print(f"ReSpeaker LED Bridge: USB error: {e}. Attempting to reconnect.")
                 self._connect()
                 # Give it a moment before continuing
@@ -114,6 +175,21 @@ class ReSpeakerLEDBridge:
             except Exception as e:
                 print(f"ReSpeaker LED Bridge: Unhandled error in USB worker: {e}")
                 self.enabled = False # Disable on unknown error
+            if time.monotonic() >= next_stats:
+                next_stats += self.STATS_INTERVAL
+                self._log_stats()
+
+    def _transfer(self, cmd: int, data):
+        self.dev.ctrl_transfer(
+            usb.util.CTRL_OUT | usb.util.CTRL_TYPE_VENDOR | usb.util.CTRL_RECIPIENT_DEVICE,
+            0, cmd, 0x1C, data, self.TIMEOUT
+        )
+
+    def _log_stats(self):
+        stats = self.stats
+        logger.debug(f"ReSpeaker LED Bridge: {stats.sent} frames sent, {stats.dropped} dropped, "
+                     f"{stats.skipped} unchanged, {stats.errors} errors; transfers "
+                     f"{stats.mean_transfer_ms:.1f}ms mean, {1000 * stats.max_transfer_seconds:.1f}ms max")
                 
     def update(self):
         """
@@ -126,8 +202,7 @@ class ReSpeakerLEDBridge:
         # Set the hardware brightness on the ReSpeaker, if it has changed
         self._set_hardware_brightness()
             
-        frame = self._sample_leds()
-        self._send_frame(frame)
+        self._send_frame(self._sample_leds())
     
     def _set_hardware_brightness(self):
         """Checks for brightness changes and sends a hardware command if needed."""
@@ -140,79 +215,69 @@ class ReSpeakerLEDBridge:
         # Use a small tolerance for float comparison to avoid unnecessary USB commands
         if abs(boosted_brightness - self._last_brightness) > 0.01:
             # The ReSpeaker v2 hardware brightness is controlled by a value from 0-255
-            brightness_val = int(boosted_brightness * 255)
-            self._command_queue.put((self.CMD_SET_BRIGHTNESS, [brightness_val]))
+            with self._condition:
+                self._pending_brightness = int(boosted_brightness * 255)
+                self._condition.notify()
             self._last_brightness = boosted_brightness
 
-    def _sample_leds(self) -> List[Tuple[int, int, int]]:
-        """Sample LEDManager pixels based on the current mapping mode."""
+    def _current_frame(self) -> np.ndarray:
+        """The LEDManager's last frame, before brightness, read back from the strip if it isn't tracked"""
+        writer = getattr(self.led_manager, '_writer', None)
+        if writer is not None and writer.frame is not None:
+            return writer.frame
         pixels = self.led_manager.pixels
-        
-        if hasattr(self.led_manager, 'ring1_pixels'):
-            num_outer = len(self.led_manager.ring1_pixels)
-            num_inner = len(self.led_manager.ring2_pixels)
-            has_dual_rings = True
-        else:
-            num_outer = len(pixels.n) if hasattr(pixels, 'n') else 0
-            num_inner = 0
-            has_dual_rings = False
-        
-        # Select mapping function
-        mapping_functions = {
-            MappingMode.MIRROR_OUTER: lambda: self._mirror_ring(pixels, 0, num_outer),
-            MappingMode.MIRROR_INNER: lambda: self._mirror_ring(pixels, num_outer, num_inner) if has_dual_rings else [],
-            MappingMode.SAMPLE_BOTH: lambda: self._sample_both(pixels, num_outer, num_inner) if has_dual_rings else [],
-            MappingMode.AVERAGE_BOTH: lambda: self._average_both(pixels, num_outer, num_inner) if has_dual_rings else [],
-            MappingMode.COMPLEMENT: lambda: self._complement_ring(pixels, 0, num_outer),
-            MappingMode.HIGHLIGHT: lambda: self._highlight_ring(pixels, 0, num_outer),
-        }
-        
-        # Get frame from mapping function, fallback to mirroring outer ring
-        frame = mapping_functions.get(self.mapping_mode, mapping_functions[MappingMode.MIRROR_OUTER])()
-        return frame if frame else self._mirror_ring(pixels, 0, num_outer)
-
-    def _mirror_ring(self, pixels, start_idx, ring_size):
-        if ring_size == 0: return [(0,0,0)] * self.RESPEAKER_LEDS
-        return [pixels[start_idx + int(i * ring_size / self.RESPEAKER_LEDS)] for i in range(self.RESPEAKER_LEDS)]
-
-    def _sample_both(self, pixels, num_outer, num_inner):
-        outer = self._mirror_ring(pixels, 0, num_outer)
-        inner = self._mirror_ring(pixels, num_outer, num_inner)
-        return [outer[i] if i % 2 == 0 else inner[i] for i in range(self.RESPEAKER_LEDS)]
-
-    def _average_both(self, pixels, num_outer, num_inner):
-        outer = self._mirror_ring(pixels, 0, num_outer)
-        inner = self._mirror_ring(pixels, num_outer, num_inner)
-        return [tuple((o + i) // 2 for o, i in zip(c1, c2)) for c1, c2 in zip(outer, inner)]
-
-    def _complement_ring(self, pixels, start_idx, ring_size):
-        original = self._mirror_ring(pixels, start_idx, ring_size)
-        return [(255 - r, 255 - g, 255 - b) for r, g, b in original]
-
-    def _highlight_ring(self, pixels, start_idx, ring_size):
-        original = self._mirror_ring(pixels, start_idx, ring_size)
-        total_brightness = sum(sum(c) for c in original)
-        if total_brightness == 0: return original
-        
-        avg_brightness = total_brightness / (len(original) * 3)
-        highlighted = []
-        for r, g, b in original:
-            brightness = (r + g + b) / 3
-            if brightness > avg_brightness * 1.2:
-                highlighted.append((min(255, int(r*1.5)), min(255, int(g*1.5)), min(255, int(b*1.5))))
-            else:
-                highlighted.append((int(r*0.4), int(g*0.4), int(b*0.4)))
-        return highlighted
+        return np.array([pixels[i] for i in range(self._num_pixels)], dtype=np.float32).reshape(-1, 3)
+
+    def _sample_leds(self) -> np.ndarray:
+        """Sample LEDManager pixels based on the current mapping mode, as a (12, 3) uint8 array."""
+        if self._outer_index is None:
+            return np.zeros((self.RESPEAKER_LEDS, 3), dtype=np.uint8)
+        frame = self._current_frame()
+        outer = frame[self._outer_index].astype(np.uint8)
+        mode = self.mapping_mode
+        if self._inner_index is not None and mode in (MappingMode.MIRROR_INNER, MappingMode.SAMPLE_BOTH,
+                                                      MappingMode.AVERAGE_BOTH):
+            inner = frame[self._inner_index].astype(np.uint8)
+            if mode == MappingMode.MIRROR_INNER:
+                return inner
+            if mode == MappingMode.SAMPLE_BOTH:
+                outer[1::2] = inner[1::2]
+                return outer
+            return ((outer.astype(np.uint16) + inner) // 2).astype(np.uint8)
+        if mode == MappingMode.COMPLEMENT:
+            return 255 - outer
+        if mode == MappingMode.HIGHLIGHT:
+            return self._highlight(outer)
+        # MIRROR_OUTER, and the modes that need an inner ring when there isn't one
+        return outer
+
+    @staticmethod
+    def _highlight(colors: np.ndarray) -> np.ndarray:
+        """Boost the LEDs noticeably brighter than average and dim the rest"""
+        total_brightness = int(colors.sum())
+        if total_brightness == 0:
+            return colors
+        avg_brightness = total_brightness / colors.size
+        bright = colors.sum(axis=1) / 3 > avg_brightness * 1.2
+        scale = np.where(bright, 1.5, 0.4)[:, None]
+        return np.minimum(colors * scale, 255).astype(np.uint8)
 
-    def _send_frame(self, colors: List[Tuple[int, int, int]]):
-        """Queue a frame of raw colors to be sent to the ReSpeaker."""
-        data = []
-        # Brightness is now handled by the hardware via the _set_hardware_brightness method.
+    def _send_frame(self, colors: np.ndarray):
+        """Encode a frame of raw colors and leave it in the mailbox for the worker, unless it's unchanged."""
+        # Brightness is handled by the hardware via the _set_hardware_brightness method.
         # We send raw, unscaled color values.
-        for r, g, b in colors:
-            # The ReSpeaker v2 firmware expects a 4-byte package for each LED: [R, G, B, 0]
-            data.extend([r, g, b, 0])
-        self._command_queue.put((self.CMD_SHOW, data))
+        self._packet[:, :3] = colors
+        with self._condition:
+            self.stats.submitted += 1
+            if self._has_frame and np.array_equal(self._packet.reshape(-1), self._mailbox):
+                self.stats.skipped += 1
+                return
+            if self._frame_pending:
+                self.stats.dropped += 1
+            self._mailbox[:] = self._packet.reshape(-1)
+            self._has_frame = True
+            self._frame_pending = True
+            self._condition.notify()
 
     def set_mapping_mode(self, mode: MappingMode):
         self.mapping_mode = mode
@@ -229,13 +294,15 @@ class ReSpeakerLEDBridge:
 
     def clear(self):
         if self.dev:
-            self._send_frame([(0, 0, 0)] * self.RESPEAKER_LEDS)
+            self._send_frame(np.zeros((self.RESPEAKER_LEDS, 3), dtype=np.uint8))
 
     def close(self):
         if self._running:
-            self._running = False
             self.clear()
-            self._command_queue.put((None, None)) # Sentinel to unblock worker
+            with self._condition:
+                # The worker sends a pending clear before it exits
+                self._running = False
+                self._condition.notify()
             if self._usb_thread.is_alive():
                 self._usb_thread.join(timeout=1.0)
             if self.dev:
@@ -56,18 +56,21 @@ Other Features:
 - Calculates heading from the rotation vector quaternion (`find_heading`).
 - Calculates a normalized movement energy level (`calculate_energy`).
 - Provides calibration checks via the hardware interface (`check_and_calibrate`).
-- Maintains history buffers (`motion_history`, `pattern_history`) using `deque` for efficient fixed-size storage.
+- Maintains the sample history (`motion_history`) in a fixed-size numpy ring, with the window
+  statistics the checks need (means, variances, peaks) updated incrementally per sample.
 """
 
 import logging
 from typing import Dict, Any, Tuple, List, Optional, Literal
-import statistics
+import numpy as np
 # NOTE: Do NOT change the line below. It is correct.
 from hardware.acc_bno085 import BNO085Interface
 from math import atan2, sqrt, pi, acos
-from config import MoveActivityConfig, get_filter_logger
-from collections import deque
+from config import AccelerometerConfig, MoveActivityConfig, get_filter_logger
 from enum import Enum, auto
+from utils.motion_history import MotionHistory, RollingStats
+from utils.shake_detector import SpectralShakeDetector
+from utils.imu_trace import open_trace, format_row
 import time
 
 class SimplifiedState(Enum):
@@ -95,8 +98,8 @@ class AccelerometerManager:
         self.logger = get_filter_logger(__name__)
 
         # --- History ---
-        # Store recent motion samples.  Needs to be at least as long as `self.shake_history_size`.
-        self.motion_history = deque(maxlen=40)  # 40 samples ≈ 0.2 s at 200 Hz
+        # Store recent motion samples.  Needs to be at least as long as `self.free_fall_peak_window`.
+        self.motion_history = MotionHistory(40)  # 40 samples ≈ 0.2 s at 200 Hz
 
         # --- Thresholds ---
         # Stationary / Held Still (Now determined by BNO085 stability report)
@@ -124,23 +127,41 @@ class AccelerometerManager:
         self.free_fall_start_time = None
         self.free_fall_candidate_start = None
 
-        # Shake detection tuning (enhanced 3D vector approach)
-        self.shake_history_size = 30            # Samples (~0.15–0.2 s at 200 Hz)
+        # Shake detection tuning (spectral, over the last AccelerometerConfig.SHAKE_WINDOW seconds)
         self.peak_magnitude_for_shake = 12.0     # m/s^2 – increased from 11.0 to require stronger motion
         self.min_magnitude_for_shake = 6.0      # m/s^2 – increased from 5.0 to filter out gentle movements
-        self.min_accel_reversals_for_shake = 6  # Increased from 4 - require more direction changes for true shake
+        self.min_shake_band_rms = 3.0           # m/s^2 - RMS acceleration in the shake band
+        self.min_shake_band_ratio = 0.85        # Fraction of the motion's variance that must be in the shake band
+        self.min_shake_frequency = AccelerometerConfig.SHAKE_MIN_FREQUENCY  # Hz
+        self.max_shake_frequency = AccelerometerConfig.SHAKE_MAX_FREQUENCY  # Hz
+
+        # Free fall looks back this many samples for the throw's peak acceleration
+        self.free_fall_peak_window = 20
 
         # --- History ---
-        # Make sure the buffer can always accommodate at least `shake_history_size` samples.
+        # Make sure the buffer can always accommodate at least `free_fall_peak_window` samples.
         # If the constant above is ever increased but `motion_history` was left smaller, resize it here.
-        if self.motion_history.maxlen < self.shake_history_size:
-            new_len = self.shake_history_size * 2  # keep extra headroom for other algorithms
+        history_size = self.free_fall_peak_window
+        if self.motion_history.capacity < history_size:
+            new_len = history_size * 2  # keep extra headroom for other algorithms
             self.logger.warning(
-                "motion_history.maxlen (%s) smaller than shake_history_size (%s); resizing to %s", 
-                self.motion_history.maxlen, self.shake_history_size, new_len
+                "motion_history capacity (%s) smaller than free fall window (%s); resizing to %s",
+                self.motion_history.capacity, history_size, new_len
             )
-            # Recreate deque preserving any samples already stored (should be empty at init time)
-            self.motion_history = deque(self.motion_history, maxlen=new_len)
+            # Nothing has been stored yet at init time
+            self.motion_history = MotionHistory(new_len)
+
+        # --- Window Statistics ---
+        # Updated once per sample in _update_motion_history, so the checks never rebuild windows
+        rate = AccelerometerConfig.SHAKE_RESAMPLE_RATE
+        self._shake_detector = SpectralShakeDetector(
+            rate=rate,
+            window=round(AccelerometerConfig.SHAKE_WINDOW * rate),
+            min_frequency=AccelerometerConfig.SHAKE_MIN_FREQUENCY,
+            max_frequency=AccelerometerConfig.SHAKE_MAX_FREQUENCY,
+        )
+        self._peak_accel_magnitudes = RollingStats(self.free_fall_peak_window, track_extremes=True)
+        self._recent_accel_magnitudes = RollingStats(5, track_extremes=True)
 
         # --- State Tracking ---
         self.last_accel_magnitude = 0.0          # Store previous accel magnitude for impact detection edge
@@ -191,7 +212,10 @@ class AccelerometerManager:
         
         # Stationary state tracking for consistency checking
         self.stationary_candidate_start = None
-        self.stationary_candidate_readings = deque(maxlen=15)  # Store more readings for better variance analysis (was 10)
+        # Linear accel magnitudes of the current candidate; the variance check only looks at the last few
+        self.stationary_candidate_readings = RollingStats(self.stationary_consistency_required)
+
+        self._trace = None  # Open IMU trace file, if recording
 
     async def initialize(self) -> bool:
         """
@@ -200,6 +224,9 @@ class AccelerometerManager:
         Returns:
             bool: True if initialization was successful, False otherwise
         """
+        if AccelerometerConfig.IMU_TRACE_PATH and not self._trace:
+            self._trace = open_trace(AccelerometerConfig.IMU_TRACE_PATH)
+            self.logger.info(f"Recording IMU trace to {AccelerometerConfig.IMU_TRACE_PATH}")
         return await self.interface.initialize()
 
     def deinitialize(self):
@@ -208,6 +235,9 @@ class AccelerometerManager:
         """
         self.logger.info("Deinitializing accelerometer hardware...")
         self.interface.deinitialize()
+        if self._trace:
+            self._trace.close()
+            self._trace = None
         self.logger.info("Accelerometer hardware deinitialized.")
 
     async def read_sensor_data(self) -> Dict[str, Any]:
@@ -218,9 +248,75 @@ class AccelerometerManager:
             Dict[str, Any]: Dictionary containing sensor readings and the detected state name.
         """
         data = await self.interface.read_sensor_data_optimized()
-        current_time = time.time()
-        data['timestamp'] = current_time # Add timestamp immediately
+        data['timestamp'] = time.time() # Add timestamp immediately
+        if self._trace:
+            self._trace.write(format_row(data))
+        return self.process_sample(data)
+
+    async def read_sensor_batch(self) -> List[Dict[str, Any]]:
+        """
+        Classify every sample the sensor has produced since the last call, in order.
+
+        With the BNO085 reader thread running this takes whatever it has buffered without
+        waiting, timestamping each sample from its sensor timestamp (converted to time.time()
+        so it matches read_sensor_data). Otherwise it polls one sample via read_sensor_data.
+
+        Returns:
+            List[Dict[str, Any]]: The samples as read_sensor_data returns them, oldest first
+                                  (empty if the reader has nothing new).
+        """
+        if not self.interface.reader_running:
+            return [await self.read_sensor_data()]
+
+        samples = self.interface.read_samples()
+        if not len(samples):
+            return []
+        clock_offset = time.time() - time.monotonic()
+        batch = []
+        for sample in samples:
+            data = self.interface.sample_to_dict(sample)
+            data['timestamp'] = data['sensor_timestamp'] + clock_offset
+            if self._trace:
+                self._trace.write(format_row(data))
+            batch.append(self.process_sample(data))
+        return batch
+
+    @property
+    def low_power(self) -> bool:
+        """Whether the sensor is in low power mode, waiting for motion"""
+        return self.interface.low_power
+
+    async def enter_low_power(self) -> bool:
+        """
+        Stop high rate sampling until the sensor's own classifiers report motion.
+
+        Returns:
+            bool: False if low power mode isn't available
+        """
+        return await self.interface.enter_low_power()
+
+    async def exit_low_power(self):
+        """Resume high rate sampling without waiting for motion"""
+        await self.interface.exit_low_power()
+
+    async def wait_for_wake(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until motion (or exit_low_power) brings the sensor out of low power mode.
+
+        Returns:
+            bool: True once sampling at full rate again, False if the timeout expired first
+        """
+        return await self.interface.wait_for_wake(timeout)
 
+    def process_sample(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds derived metrics and the motion state to one timestamped sample.
+
+        Args:
+            data: Sensor readings with a 'timestamp', as read by read_sensor_data
+        Returns:
+            Dict[str, Any]: The same dictionary, updated in place.
+        """
         # Skip expensive calculations for performance optimization
         # Only calculate rotation speed (needed for state detection)
         rot_speed = 0.0
@@ -269,8 +365,23 @@ class AccelerometerManager:
         if 'timestamp' not in data:
             data['timestamp'] = time.time()
 
-        # Store in history
-        self.motion_history.append(data)
+        # A failed read has nothing to add to the history
+        accel = data.get("acceleration")
+        linear_accel = data.get("linear_acceleration")
+        if not (isinstance(accel, tuple) and len(accel) == 3 and
+                isinstance(linear_accel, tuple) and len(linear_accel) == 3):
+            return
+        gyro = data.get("gyro")
+        if not (isinstance(gyro, tuple) and len(gyro) == 3):
+            gyro = (0.0, 0.0, 0.0)
+
+        # Store in history, then slide the windows the checks read
+        self.motion_history.append(data['timestamp'], accel, linear_accel, gyro)
+        sample = self.motion_history.get()
+        accel_mag = float(sample["acceleration_magnitude"])
+        self._shake_detector.update(data['timestamp'], linear_accel)
+        self._peak_accel_magnitudes.push(accel_mag)
+        self._recent_accel_magnitudes.push(accel_mag)
 
     def _determine_current_state(self, current_data: Dict[str, Any]) -> SimplifiedState:
         """
@@ -351,7 +462,7 @@ class AccelerometerManager:
 
         # --- Priority 4: STATIONARY/HELD_STILL with hysteresis ---
         candidate_state = self._determine_stable_state(
-            accel_magnitude_linear, gyro_mag, rot_speed_current, previous_state
+            accel_magnitude_linear, gyro_mag, rot_speed_current, previous_state, timestamp
         )
         
         # Apply state stability logic
@@ -360,8 +471,9 @@ class AccelerometerManager:
         self.last_accel_magnitude = accel_magnitude_linear
         return stable_state
 
-    def _determine_stable_state(self, linear_accel_mag: float, gyro_mag: float, 
-                               rot_speed: float, current_state: SimplifiedState) -> SimplifiedState:
+    def _determine_stable_state(self, linear_accel_mag: float, gyro_mag: float,
+                               rot_speed: float, current_state: SimplifiedState,
+                               timestamp: float) -> SimplifiedState:
         """
         Determine if device is in STATIONARY, HELD_STILL, or MOVING state with improved hysteresis
         and realistic STATIONARY detection with consistency checking.
@@ -422,12 +534,12 @@ class AccelerometerManager:
             held_still_rot_threshold = held_still_rot_base
         
         # Enhanced dead zone logic: Ignore tiny changes when in stable states
-        current_time = time.time()
+        current_time = timestamp
         if current_state in [SimplifiedState.STATIONARY, SimplifiedState.HELD_STILL]:
             # Get recent readings for better dead zone analysis
             if len(self.stationary_candidate_readings) >= 3:
-                recent_readings = list(self.stationary_candidate_readings)[-3:]
-                baseline = statistics.median(recent_readings)
+                recent_readings = self.stationary_candidate_readings.values()[-3:].tolist()
+                baseline = sorted(recent_readings)[1]  # Median of three
                 
                 # Check if this is a tiny change that should be ignored
                 change_magnitude = abs(linear_accel_mag - baseline)
@@ -442,7 +554,7 @@ class AccelerometerManager:
                     self.logger.debug(f"Significant change detected: {change_magnitude:.3f} >= {self.dead_zone_threshold:.3f}")
             elif self.stationary_candidate_readings:
                 # Fallback for fewer readings
-                last_reading = self.stationary_candidate_readings[-1]
+                last_reading = self.stationary_candidate_readings.latest
                 change_magnitude = abs(linear_accel_mag - last_reading)
                 
                 if change_magnitude < self.dead_zone_threshold:
@@ -454,10 +566,10 @@ class AccelerometerManager:
                                  gyro_mag < stationary_gyro_threshold and
                                  rot_speed < stationary_rot_threshold)
         
-        # Add readings to the deque BEFORE checking consistency
+        # Add readings to the window BEFORE checking consistency
         # This ensures we accumulate readings even when transitioning states
         if meets_basic_stationary:
-            self.stationary_candidate_readings.append(linear_accel_mag)
+            self.stationary_candidate_readings.push(linear_accel_mag)
             # Start tracking if not already tracking
             if self.stationary_candidate_start is None:
                 self.stationary_candidate_start = current_time
@@ -468,19 +580,18 @@ class AccelerometerManager:
         is_truly_stationary = False
         if meets_basic_stationary:
             is_truly_stationary = self._verify_stationary_consistency(
-                linear_accel_mag, gyro_mag, rot_speed, current_state
+                linear_accel_mag, gyro_mag, rot_speed, current_state, timestamp
             )
         else:
             # Only reset stationary tracking if we've been failing for a while
             # This prevents constant restarting due to brief sensor spikes
             if self.stationary_candidate_start is not None:
-                current_time = time.time()
                 time_since_start = current_time - self.stationary_candidate_start
                 # Only reset if we've been trying for more than 0.5 seconds and still failing
                 if time_since_start > 0.5:
                     # self.logger.debug(f"STATIONARY candidate reset after {time_since_start:.1f}s of failing basic criteria")
                     self.stationary_candidate_start = None
-                    # IMPORTANT: Also clear the readings deque to start fresh
+                    # IMPORTANT: Also clear the readings window to start fresh
                     self.stationary_candidate_readings.clear()
         
         # Check for HELD_STILL (less restrictive)
@@ -524,8 +635,9 @@ class AccelerometerManager:
         
         return candidate_state
     
-    def _verify_stationary_consistency(self, linear_accel_mag: float, gyro_mag: float, 
-                                     rot_speed: float, current_state: SimplifiedState) -> bool:
+    def _verify_stationary_consistency(self, linear_accel_mag: float, gyro_mag: float,
+                                     rot_speed: float, current_state: SimplifiedState,
+                                     timestamp: float) -> bool:
         """
         Verify that the device is truly stationary using consistency and variance checks.
         
@@ -539,11 +651,12 @@ class AccelerometerManager:
             gyro_mag: Current gyroscope magnitude  
             rot_speed: Current rotation speed
             current_state: Current state for tracking
+            timestamp: Current timestamp
             
         Returns:
             bool: True if device is truly stationary
         """
-        current_time = time.time()
+        current_time = timestamp
         
         # Note: stationary_candidate_start should already be set by _determine_stable_state
         # if we meet basic criteria. Don't reset tracking here.
@@ -553,79 +666,62 @@ class AccelerometerManager:
             return False
         
         # Check if we have enough readings for variance analysis
-        if len(self.stationary_candidate_readings) < self.stationary_consistency_required:
+        readings = self.stationary_candidate_readings
+        if len(readings) < self.stationary_consistency_required:
             return False
         
-        # Calculate variance in recent linear acceleration readings
-        recent_readings = list(self.stationary_candidate_readings)[-self.stationary_consistency_required:]
-        if len(recent_readings) >= 3:  # Need at least 3 points for meaningful variance
-            try:
-                variance = statistics.variance(recent_readings)
-                
-                # Debug: Show the actual readings that led to this variance
-                readings_str = ", ".join([f"{r:.4f}" for r in recent_readings])
-                
-                # Only log variance check occasionally to avoid spam
-                duration_so_far = current_time - self.stationary_candidate_start
-                should_log_variance = (duration_so_far < 0.5) or (int(duration_so_far * 10) % 10 == 0)  # Log first 0.5s, then every 0.1s
-                # DISABLE because it's spammy
-                should_log_variance = False
-                
-                if should_log_variance:
-                    self.logger.debug(f"STATIONARY variance check: readings=[{readings_str}], variance={variance:.6f}")
-                
-                # Use realistic variance threshold based on actual sensor behavior
-                # Real stationary devices can have sensor noise fluctuations
-                adjusted_variance_threshold = self.stationary_max_variance
-                
-                # Enhanced variance checking with outlier filtering
-                # Remove outliers before calculating variance to handle brief spikes
-                filtered_readings = self._filter_outliers(recent_readings)
-                
+        # Variance of the recent linear acceleration readings, kept up to date as they arrive
+        duration_so_far = current_time - self.stationary_candidate_start
+        # Log first 0.5s, then every 0.1s. DISABLED because it's spammy
+        should_log_variance = False
+        variance = readings.variance
+        if len(readings) >= 3:  # Need at least 3 points for meaningful variance
+            if should_log_variance:
+                readings_str = ", ".join([f"{r:.4f}" for r in readings.values()])
+                self.logger.debug(f"STATIONARY variance check: readings=[{readings_str}], variance={variance:.6f}")
+            
+            # Use realistic variance threshold based on actual sensor behavior
+            # Real stationary devices can have sensor noise fluctuations
+            adjusted_variance_threshold = self.stationary_max_variance
+            
+            # Enhanced variance checking with outlier filtering
+            # Remove outliers before calculating variance to handle brief spikes. Only needed
+            # when the raw variance is too high, since filtering is there to be more lenient.
+            filtered_variance = variance
+            if variance > adjusted_variance_threshold:
+                filtered_readings = self._filter_outliers(readings.values())
                 if len(filtered_readings) >= 3:
-                    try:
-                        filtered_variance = statistics.variance(filtered_readings)
-                    except statistics.StatisticsError:
-                        filtered_variance = variance  # Fall back to original if filtering fails
-                else:
-                    filtered_variance = variance
+                    filtered_variance = float(np.var(filtered_readings, ddof=1))
+            
+            # Be more lenient with variance - only reject if variance is extremely high
+            if filtered_variance > adjusted_variance_threshold:
+                # Don't immediately restart - be more patient with sensor noise
+                # Only restart if variance is extremely high (15x threshold) or we've been trying for a long time
+                extreme_threshold = adjusted_variance_threshold * 15  # 15x more lenient (was 10x)
                 
-                # Be more lenient with variance - only reject if variance is extremely high
-                if filtered_variance > adjusted_variance_threshold:
-                    # Don't immediately restart - be more patient with sensor noise
-                    # Only restart if variance is extremely high (15x threshold) or we've been trying for a long time
-                    extreme_threshold = adjusted_variance_threshold * 15  # 15x more lenient (was 10x)
-                    
-                    if filtered_variance > extreme_threshold:
-                        self.logger.debug(f"STATIONARY rejected: extreme filtered variance {filtered_variance:.6f} > {extreme_threshold:.6f}")
-                        self.stationary_candidate_start = None
-                        self.stationary_candidate_readings.clear()
-                        return False
-                    elif duration_so_far > self.stationary_variance_timeout:  # After timeout, be stricter (was 8.0) - more patient
-                        self.logger.debug(f"STATIONARY rejected: filtered variance {filtered_variance:.6f} > {adjusted_variance_threshold:.6f} after {duration_so_far:.1f}s")
-                        self.stationary_candidate_start = None
-                        self.stationary_candidate_readings.clear()
-                        return False
-                    else:
-                        # Continue tracking despite high variance - sensor might stabilize
-                        if should_log_variance:
-                            self.logger.debug(f"STATIONARY variance high but continuing: filtered={filtered_variance:.6f}, raw={variance:.6f} > {adjusted_variance_threshold:.6f} (will retry)")
+                if filtered_variance > extreme_threshold:
+                    self.logger.debug(f"STATIONARY rejected: extreme filtered variance {filtered_variance:.6f} > {extreme_threshold:.6f}")
+                    self.stationary_candidate_start = None
+                    self.stationary_candidate_readings.clear()
+                    return False
+                elif duration_so_far > self.stationary_variance_timeout:  # After timeout, be stricter (was 8.0) - more patient
+                    self.logger.debug(f"STATIONARY rejected: filtered variance {filtered_variance:.6f} > {adjusted_variance_threshold:.6f} after {duration_so_far:.1f}s")
+                    self.stationary_candidate_start = None
+                    self.stationary_candidate_readings.clear()
+                    return False
                 else:
+                    # Continue tracking despite high variance - sensor might stabilize
                     if should_log_variance:
-                        self.logger.debug(f"STATIONARY variance good: filtered={filtered_variance:.6f}, raw={variance:.6f} <= {adjusted_variance_threshold:.6f}")
-            except statistics.StatisticsError:
-                return False
+                        self.logger.debug(f"STATIONARY variance high but continuing: filtered={filtered_variance:.6f}, raw={variance:.6f} > {adjusted_variance_threshold:.6f} (will retry)")
+            else:
+                if should_log_variance:
+                    self.logger.debug(f"STATIONARY variance good: filtered={filtered_variance:.6f}, raw={variance:.6f} <= {adjusted_variance_threshold:.6f}")
         
         # Check duration requirement
         duration = current_time - self.stationary_candidate_start
         
         if duration >= self.stationary_min_duration:
-            # Calculate final variance for logging
-            try:
-                final_variance = statistics.variance(recent_readings) if len(recent_readings) >= 3 else 0.0
-            except statistics.StatisticsError:
-                final_variance = 0.0
-            self.logger.debug(f"STATIONARY confirmed: duration={duration:.1f}s, variance={final_variance:.6f}")
+            self.logger.debug(f"STATIONARY confirmed: duration={duration:.1f}s, variance={variance:.6f}")
             return True
         
         # Still building up consistency - show progress occasionally
@@ -633,55 +729,43 @@ class AccelerometerManager:
             self.logger.debug(f"STATIONARY building consistency: duration={duration:.1f}s/{self.stationary_min_duration:.1f}s, variance={variance:.6f}")
         return False
 
-    def _filter_outliers(self, readings: List[float]) -> List[float]:
+    def _filter_outliers(self, readings: np.ndarray) -> np.ndarray:
         """
-        Filter outliers from a list of readings using a simple statistical method.
+        Filter outliers from an array of readings using a simple statistical method.
         
         This helps handle brief spikes in sensor data that shouldn't disqualify
         an otherwise stationary device.
         
         Args:
-            readings: List of sensor readings
+            readings: Array of sensor readings
             
         Returns:
-            List[float]: Filtered readings with outliers removed
+            np.ndarray: Filtered readings with outliers removed
         """
         if len(readings) < 3:
             return readings
         
-        try:
-            # Calculate median and median absolute deviation (MAD)
-            median = statistics.median(readings)
-            deviations = [abs(x - median) for x in readings]
-            mad = statistics.median(deviations)
-            
-            # If MAD is very small, use standard deviation instead
-            if mad < 0.001:
-                try:
-                    std_dev = statistics.stdev(readings)
-                    threshold = median + 2.5 * std_dev  # 2.5 sigma rule
-                    return [x for x in readings if abs(x - median) <= 2.5 * std_dev]
-                except statistics.StatisticsError:
-                    return readings
-            
-            # Use MAD-based outlier detection (more robust than standard deviation)
-            # Modified Z-score: 0.6745 * (x - median) / MAD
-            # Threshold of 3.5 is commonly used for outlier detection
-            threshold = 3.5
-            filtered = []
-            for reading in readings:
-                modified_z_score = 0.6745 * abs(reading - median) / mad
-                if modified_z_score <= threshold:
-                    filtered.append(reading)
-            
-            # Ensure we don't filter out too many readings
-            if len(filtered) >= len(readings) * 0.6:  # Keep at least 60% of readings
-                return filtered
-            else:
-                return readings  # Return original if too many would be filtered
-                
-        except (statistics.StatisticsError, ZeroDivisionError):
-            return readings
+        # Calculate median and median absolute deviation (MAD)
+        median = np.median(readings)
+        deviations = np.abs(readings - median)
+        mad = np.median(deviations)
+        
+        # If MAD is very small, use standard deviation instead
+        if mad < 0.001:
+            std_dev = np.std(readings, ddof=1)
+            return readings[deviations <= 2.5 * std_dev]  # 2.5 sigma rule
+        
+        # Use MAD-based outlier detection (more robust than standard deviation)
+        # Modified Z-score: 0.6745 * (x - median) / MAD
+        # Threshold of 3.5 is commonly used for outlier detection
+        threshold = 3.5
+        filtered = readings[0.6745 * deviations / mad <= threshold]
+        
+        # Ensure we don't filter out too many readings
+        if len(filtered) >= len(readings) * 0.6:  # Keep at least 60% of readings
+            return filtered
+        else:
+            return readings  # Return original if too many would be filtered
 
     def _apply_state_stability(self, candidate_state: SimplifiedState, timestamp: float) -> SimplifiedState:
         """
@@ -795,262 +879,39 @@ class AccelerometerManager:
 
     def _check_shake(self) -> bool:
         """
-        Check if a shake state is detected using enhanced 3D vector analysis.
-        Analyzes acceleration direction changes and oscillation patterns to detect true shaking motion.
+        Check if a shake state is detected from the spectral shake detector's window.
+
+        A shake is strong (peak and mean acceleration), periodic (most of the window's variance
+        falls in the shake band) and at a frequency people actually shake at. All of these are
+        measured over the real time the samples cover, whatever rate they arrived at.
 
         Returns:
             bool: True if shake state detected
         """
-        history_size = self.shake_history_size
-        if len(self.motion_history) < history_size:
-            return False
-
-        # --- Get recent data ---
-        start_index = len(self.motion_history) - history_size
-        recent_history = [self.motion_history[i] for i in range(start_index, len(self.motion_history))]
-        accelerations = [entry.get("linear_acceleration", None) for entry in recent_history]
-
-        # --- Filter invalid entries ---
-        valid_accelerations = [accel for accel in accelerations
-                              if isinstance(accel, tuple) and len(accel) == 3]
-
-        if len(valid_accelerations) < 8:  # Need more points for direction analysis
+        detector = self._shake_detector
+        if not detector.ready:
             return False
 
         # === Magnitude Check (peak-based) ===
-        accel_magnitudes = []
-        for accel in valid_accelerations:
-            try:
-                mag_sq = accel[0]**2 + accel[1]**2 + accel[2]**2
-                if mag_sq >= 0:
-                    accel_magnitudes.append(sqrt(mag_sq))
-            except (TypeError, IndexError):
-                continue
-
-        if len(accel_magnitudes) < 8:
-            return False
-
-        peak_accel_magnitude = max(accel_magnitudes)
-        avg_accel_magnitude = statistics.mean(accel_magnitudes)
-
         # Need at least one strong spike
-        if peak_accel_magnitude < self.peak_magnitude_for_shake:
+        if detector.peak_magnitude < self.peak_magnitude_for_shake:
             return False
 
         # Also reject windows that are nearly still overall
-        if avg_accel_magnitude < self.min_magnitude_for_shake:
+        if detector.mean_magnitude < self.min_magnitude_for_shake:
             return False
 
-        # === Enhanced Direction Change Analysis ===
-        direction_changes = self._count_direction_changes(valid_accelerations)
-        
-        # Require multiple direction changes for shake detection
-        if direction_changes < self.min_accel_reversals_for_shake:
+        # === Band Energy Check ===
+        # Enough oscillation in the shake band to distinguish from sensor noise...
+        if detector.band_rms < self.min_shake_band_rms:
             return False
 
-        # === Additional Oscillation Pattern Check ===
-        # Check for rapid oscillations in acceleration magnitude
-        magnitude_oscillations = self._count_magnitude_oscillations(accel_magnitudes)
-        
-        # Require both direction changes AND magnitude oscillations
-        min_oscillations = max(2, self.min_accel_reversals_for_shake // 2)
-        
-        if magnitude_oscillations < min_oscillations:
+        # ...and most of the motion periodic, unlike a swing, a jolt or an impact
+        if detector.band_ratio < self.min_shake_band_ratio:
             return False
 
-        # === Frequency Analysis ===
-        # Check that the oscillations are in a reasonable frequency range for human shaking
-        return self._validate_shake_frequency(valid_accelerations)
-
-    def _count_direction_changes(self, accel_vectors: List[Tuple[float, float, float]]) -> int:
-        """
-        Count significant changes in acceleration direction (3D vector analysis).
-        
-        This analyzes the actual 3D acceleration vectors to detect when the device
-        changes direction rapidly, which is characteristic of shaking motion.
-        
-        Args:
-            accel_vectors: List of 3D acceleration vectors
-            
-        Returns:
-            int: Number of significant direction changes detected
-        """
-        if len(accel_vectors) < 3:
-            return 0
-        
-        direction_changes = 0
-        min_magnitude_for_direction = 2.0  # m/s² - minimum magnitude to consider direction meaningful
-        min_angle_change = 60.0  # degrees - minimum angle change to count as direction change
-        
-        # Convert angle threshold to cosine for dot product comparison
-        import math
-        cos_threshold = math.cos(math.radians(min_angle_change))
-        
-        prev_vector = None
-        valid_vectors_count = 0
-        
-        for i, current_vector in enumerate(accel_vectors):
-            # Calculate magnitude
-            magnitude = sqrt(sum(x*x for x in current_vector))
-            
-            # Skip vectors that are too small to have meaningful direction
-            if magnitude < min_magnitude_for_direction:
-                continue
-            
-            valid_vectors_count += 1
-            
-            # Normalize the vector
-            normalized = tuple(x / magnitude for x in current_vector)
-            
-            if prev_vector is not None:
-                # Calculate dot product to find angle between vectors
-                dot_product = sum(a * b for a, b in zip(prev_vector, normalized))
-                
-                # Clamp dot product to valid range for numerical stability
-                dot_product = max(-1.0, min(1.0, dot_product))
-                
-                # If dot product is less than threshold, we have a significant direction change
-                if dot_product < cos_threshold:
-                    direction_changes += 1
-            
-            prev_vector = normalized
-        
-        return direction_changes
-
-    def _count_magnitude_oscillations(self, accel_magnitudes: List[float]) -> int:
-        """
-        Count oscillations in acceleration magnitude using peak detection.
-        
-        This detects rapid increases and decreases in acceleration magnitude,
-        which complements the direction change analysis for shake detection.
-        
-        Args:
-            accel_magnitudes: List of acceleration magnitudes over time
-            
-        Returns:
-            int: Number of magnitude oscillations detected
-        """
-        if len(accel_magnitudes) < 5:
-            return 0
-        
-        # Minimum change required to count as a significant oscillation
-        min_oscillation_magnitude = 1.5  # m/s² - increased from 1.0 for more selectivity
-        
-        oscillations = 0
-        trend = None  # 'up', 'down', or None
-        last_extreme = accel_magnitudes[0]
-        consecutive_same_trend = 0  # Track how long we've been in the same trend
-        
-        for i in range(1, len(accel_magnitudes)):
-            current = accel_magnitudes[i]
-            
-            # Determine current trend with hysteresis
-            if current > last_extreme + min_oscillation_magnitude:
-                # Significant increase
-                if trend == 'down' and consecutive_same_trend >= 2:  # Require sustained trend
-                    oscillations += 1
-                    consecutive_same_trend = 0
-                elif trend != 'up':
-                    consecutive_same_trend = 0
-                
-                trend = 'up'
-                last_extreme = current
-                consecutive_same_trend += 1
-                
-            elif current < last_extreme - min_oscillation_magnitude:
-                # Significant decrease
-                if trend == 'up' and consecutive_same_trend >= 2:  # Require sustained trend
-                    oscillations += 1
-                    consecutive_same_trend = 0
-                elif trend != 'down':
-                    consecutive_same_trend = 0
-                
-                trend = 'down'
-                last_extreme = current
-                consecutive_same_trend += 1
-            else:
-                # No significant change, continue current trend
-                consecutive_same_trend += 1
-        
-        return oscillations
-
-    def _validate_shake_frequency(self, accel_vectors: List[Tuple[float, float, float]]) -> bool:
-        """
-        Validate that the detected motion has characteristics consistent with intentional shaking.
-        
-        Human shaking typically occurs at 3-8 Hz. This method checks that the detected
-        oscillations are in a reasonable frequency range and have sufficient regularity.
-        
-        Args:
-            accel_vectors: List of 3D acceleration vectors
-            
-        Returns:
-            bool: True if the frequency characteristics are consistent with shaking
-        """
-        if len(accel_vectors) < 10:
-            return False
-        
-        # Calculate time span (corrected sampling rate: ~50Hz based on 20ms intervals)
-        sampling_rate = 50.0  # Hz - actual sensor sampling rate (20ms intervals)
-        time_span = len(accel_vectors) / sampling_rate  # seconds
-        
-        # Count zero crossings in the dominant acceleration component
-        # Find the component with the highest variance (most active during shaking)
-        x_values = [v[0] for v in accel_vectors]
-        y_values = [v[1] for v in accel_vectors]
-        z_values = [v[2] for v in accel_vectors]
-        
-        try:
-            x_var = statistics.variance(x_values) if len(x_values) > 1 else 0
-            y_var = statistics.variance(y_values) if len(y_values) > 1 else 0
-            z_var = statistics.variance(z_values) if len(z_values) > 1 else 0
-        except statistics.StatisticsError:
-            return False
-        
-        # Use the component with highest variance
-        if x_var >= y_var and x_var >= z_var:
-            dominant_component = x_values
-            dominant_axis = "X"
-        elif y_var >= z_var:
-            dominant_component = y_values
-            dominant_axis = "Y"
-        else:
-            dominant_component = z_values
-            dominant_axis = "Z"
-        
-        # Remove DC component (mean) to focus on oscillations
-        mean_value = statistics.mean(dominant_component)
-        centered_values = [v - mean_value for v in dominant_component]
-        
-        # Count zero crossings
-        zero_crossings = 0
-        for i in range(1, len(centered_values)):
-            if (centered_values[i-1] >= 0) != (centered_values[i] >= 0):
-                zero_crossings += 1
-        
-        # Estimate frequency from zero crossings
-        # Each complete cycle has 2 zero crossings
-        estimated_frequency = (zero_crossings / 2.0) / time_span if time_span > 0 else 0
-        
-        # Human shaking is typically 2-10 Hz, but be more lenient for 50Hz sampling
-        # At 50Hz with 30 samples (0.6s window), we expect 1.2-6 complete cycles for 2-10Hz shaking
-        min_shake_freq = 1.5  # Hz - more lenient lower bound
-        max_shake_freq = 15.0  # Hz - more lenient upper bound for rapid shaking
-        
-        is_valid_frequency = min_shake_freq <= estimated_frequency <= max_shake_freq
-        
-        # Additional check: ensure there's sufficient variation in the dominant component
-        # to distinguish from sensor noise
-        try:
-            std_dev = statistics.stdev(centered_values)
-            min_variation = 1.0  # m/s² - minimum standard deviation for meaningful oscillation
-            has_sufficient_variation = std_dev >= min_variation
-        except statistics.StatisticsError:
-            has_sufficient_variation = False
-        
-        result = is_valid_frequency and has_sufficient_variation
-        
-        return result
+        # === Frequency Check ===
+        return self.min_shake_frequency <= detector.frequency <= self.max_shake_frequency
 
     def _detect_free_fall_multisensor(self, total_accel_mag: float, gyro: Tuple[float, float, float], 
                                     stability: str, timestamp: float) -> bool:
@@ -1093,13 +954,7 @@ class AccelerometerManager:
         # Get linear acceleration from recent history for additional validation
         linear_accel_mag = 0.0
         if len(self.motion_history) > 0:
-            recent_data = self.motion_history[-1]
-            linear_accel = recent_data.get("linear_acceleration", (0, 0, 0))
-            if isinstance(linear_accel, tuple) and len(linear_accel) == 3:
-                try:
-                    linear_accel_mag = sqrt(sum(x*x for x in linear_accel))
-                except (TypeError, ValueError):
-                    linear_accel_mag = 0.0
+            linear_accel_mag = float(self.motion_history.get()["linear_magnitude"])
         
         # Rule out if device is extremely still (stationary detection)
         # Use stricter thresholds than the main stationary detection to avoid conflicts
@@ -1334,31 +1189,9 @@ class AccelerometerManager:
         if len(self.motion_history) < 8:  # Need enough history to detect rapid change
             return False
         
-        # Look back through longer history to find peak acceleration for free fall
-        # Use longer window for free fall detection (20 samples = ~400ms at 50Hz)
-        extended_samples = min(20, len(self.motion_history))  # Look back up to 400ms
-        extended_history = list(self.motion_history)[-extended_samples:]
-        
-        # Extract acceleration magnitudes from extended history
-        accel_magnitudes = []
-        timestamps = []
-        for sample in extended_history:
-            accel_raw = sample.get("acceleration", None)
-            timestamp = sample.get("timestamp", 0)
-            if isinstance(accel_raw, tuple) and len(accel_raw) == 3:
-                try:
-                    accel_mag = sqrt(sum(x*x for x in accel_raw))
-                    accel_magnitudes.append(accel_mag)
-                    timestamps.append(timestamp)
-                except (TypeError, ValueError):
-                    continue
-        
-        if len(accel_magnitudes) < 5:
-            return False
-        
-        # Find the maximum acceleration in extended history
-        max_extended_accel = max(accel_magnitudes)
-        max_index = accel_magnitudes.index(max_extended_accel)
+        # Peak acceleration over the last free_fall_peak_window samples, and when it happened
+        max_extended_accel = self._peak_accel_magnitudes.max
+        peak_time = float(self.motion_history.get(self._peak_accel_magnitudes.max_age)["timestamp"])
         
         # Check for rapid drop: must have dropped significantly from peak
         min_drop_threshold = 8.0  # m/s² - minimum drop to consider "rapid"
@@ -1372,30 +1205,26 @@ class AccelerometerManager:
         
         # Enhanced logic: Check if we're within a reasonable time window after the peak
         # This allows sustained free fall detection even after the initial rapid drop
-        current_time = time.time()
-        if timestamps and max_index < len(timestamps):
-            peak_time = timestamps[max_index]
-            time_since_peak = current_time - peak_time
-            
-            # Allow rapid drop to remain "active" for up to 2 seconds after the peak
-            # This supports sustained free fall detection
-            within_grace_period = time_since_peak <= 2.0
-            
-            # Also check that we're currently in a low-acceleration state
-            # (to avoid false positives during normal motion)
-            currently_low_accel = total_accel_mag < 6.0  # Same as free fall threshold
-            
-            # Rapid drop is valid if:
-            # 1. Traditional criteria are met, OR
-            # 2. We had a significant drop recently and are still in low-accel state
-            rapid_drop_valid = (has_significant_drop and had_high_peak) or \
-                              (within_grace_period and had_high_peak and currently_low_accel and 
-                               max_extended_accel - min(accel_magnitudes[-5:]) >= min_drop_threshold)
-        else:
-            # Fallback to traditional logic if timestamp data is unavailable
-            rapid_drop_valid = has_significant_drop and had_high_peak
+        current_time = float(self.motion_history.get()["timestamp"])
+        time_since_peak = current_time - peak_time
+        
+        # Allow rapid drop to remain "active" for up to 2 seconds after the peak
+        # This supports sustained free fall detection
+        within_grace_period = time_since_peak <= 2.0
+        
+        # Also check that we're currently in a low-acceleration state
+        # (to avoid false positives during normal motion)
+        currently_low_accel = total_accel_mag < 6.0  # Same as free fall threshold
+        
+        # Rapid drop is valid if:
+        # 1. Traditional criteria are met, OR
+        # 2. We had a significant drop recently and are still in low-accel state
+        rapid_drop_valid = (has_significant_drop and had_high_peak) or \
+                          (within_grace_period and had_high_peak and currently_low_accel and 
+                           max_extended_accel - self._recent_accel_magnitudes.min >= min_drop_threshold)
         
         # self.logger.debug(f"Rapid drop check: peak={max_extended_accel:.1f}, current={total_accel_mag:.1f}, "
         #                  f"drop={accel_drop:.1f}(>={min_drop_threshold}), peak_high={had_high_peak}")
         
-        return rapid_drop_valid
\ No newline at end of file
+        return rapid_drop_valid
+
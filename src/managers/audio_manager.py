@@ -1,15 +1,18 @@
 import pyaudio
 import wave
+import asyncio
 import numpy as np
 import threading
 import queue
 import logging
 import time
-import os
 from typing import Optional, Dict, Any, List, Callable, Tuple
 from dataclasses import dataclass
 from contextlib import contextmanager
-from config import SoundEffect, AudioBaseConfig, AudioAmplifierConfig, get_filter_logger
+from config import AudioBaseConfig, AudioAmplifierConfig, get_filter_logger
+from utils.audio_processing import AudioMixer
+from utils.ring_buffer import RingBuffer
+from utils.sound_bank import SoundBank
 
 @dataclass
 class AudioConfig:
@@ -20,6 +23,8 @@ class AudioConfig:
     chunk: int = AudioBaseConfig.CHUNK_SIZE
     input_device_index: Optional[int] = None
     output_device_index: Optional[int] = None
+    use_callback_streams: bool = AudioBaseConfig.USE_CALLBACK_STREAMS
+    preload_sound_effects: bool = AudioBaseConfig.PRELOAD_SOUND_EFFECTS
 
 class AudioBaseConfig:
     """Base audio configuration that all audio components should use"""
@@ -28,6 +33,7 @@ class AudioBaseConfig:
     SAMPLE_RATE = 16000
     CHUNK_SIZE = 640  # Optimized for WebRTC echo cancellation without stuttering
     BUFFER_SIZE = 5   # Minimal buffering to reduce latency
+    THREADED_CONSUMER_BUFFER_MS = 1000  # See config.AudioBaseConfig
     DEFAULT_VOLUME = 1.0
     CONVERSATION_SFX_VOLUME = 0.5 # Volume for sound effects when a conversation is active
     # Calculate time-based values
@@ -35,67 +41,241 @@ class AudioBaseConfig:
     LIKELY_LATENCY_MS = CHUNK_DURATION_MS * BUFFER_SIZE  # Calculate probable latency in milliseconds
 
 
+def _resolve_future(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
 class AudioBuffer:
-    """Minimal thread-safe audio buffer with volume control"""
-    def __init__(self, maxsize: int = AudioBaseConfig.BUFFER_SIZE):
-        self.buffer = queue.Queue(maxsize=maxsize)
-        self._lock = threading.Lock()
-        self._volume = 1.0  # Default volume
-        
-    def put(self, data: np.ndarray):
-        """Put raw audio data into buffer, blocking if full"""
-        self.buffer.put(data)
-            
-    def get(self) -> Optional[np.ndarray]:
-        """Get volume-adjusted audio data from buffer"""
+    """Lock-free single-producer/single-consumer audio buffer over one preallocated int16 ring.
+    Writes and reads can be any length; the output mixer reads it one chunk at a time.
+    Volume is not applied here; the output mixer folds each producer's volume into its gain."""
+    def __init__(self, maxsize: int = AudioBaseConfig.BUFFER_SIZE, chunk_size: int = AudioBaseConfig.CHUNK_SIZE):
+        # maxsize is in chunks, so callers keep sizing buffers the way they always have
+        self.chunk_size = chunk_size
+        self._ring = RingBuffer(maxsize * chunk_size, dtype=np.int16)
+        self._space_available = threading.Event()
+        self._writer_waiting = False
+        # (loop, future, samples wanted) of a coroutine suspended in put_async
+        self._async_waiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Future, int]] = None
+        self.on_put: Optional[Callable[[], None]] = None  # Called after each put, e.g. to wake an idle output stream
+
+    @property
+    def available(self) -> int:
+        """Number of samples waiting to be read"""
+        return self._ring.available
+
+    @property
+    def capacity(self) -> int:
+        """Total number of samples the buffer can hold"""
+        return self._ring.capacity
+
+    def empty(self) -> bool:
+        return self._ring.available == 0
+
+    def write(self, data: np.ndarray) -> int:
+        """Copy as much of `data` as fits without blocking. Returns the number of samples written."""
+        written = self._ring.write(data)
+        if written and self.on_put is not None:
+            self.on_put()
+        return written
+
+    def put(self, data: np.ndarray, timeout: Optional[float] = None) -> bool:
+        """Put raw audio data of any length into the buffer, blocking while it is full.
+        Returns:
+            bool: True if all of `data` was written, False if `timeout` expired first
+        """
+        data = np.asarray(data, dtype=np.int16)
+        written = self.write(data)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while written < len(data):
+            # Announce we're waiting, then re-check, so a read in between can't be missed
+            self._space_available.clear()
+            self._writer_waiting = True
+            if self._ring.free == 0:
+                wait_time = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+                if wait_time <= 0:
+                    self._writer_waiting = False
+                    return False
+                self._space_available.wait(wait_time)
+            self._writer_waiting = False
+            written += self.write(data[written:])
+        return True
+
+    async def put_async(self, data: np.ndarray):
+        """Coroutine version of put. While the buffer is full it suspends the calling task instead of
+        blocking the event loop. The reader resumes it once half the buffer (or everything still to be
+        written) is free, so a long clip goes in with a few large copies rather than one per chunk."""
+        data = np.asarray(data, dtype=np.int16)
+        written = self.write(data)
+        loop = asyncio.get_running_loop()
+        while written < len(data):
+            wanted = min(len(data) - written, self._ring.capacity // 2)
+            future = loop.create_future()
+            self._async_waiter = (loop, future, wanted)
+            try:
+                # Re-check after registering, so a read in between can't be missed. The timeout only
+                # matters if nothing is reading, e.g. while the buffer is being cleared.
+                if self._ring.free < wanted:
+                    await asyncio.wait((future,), timeout=0.1)
+            finally:
+                self._async_waiter = None
+            written += self.write(data[written:])
+
+    def get(self, count: Optional[int] = None, out: Optional[np.ndarray] = None, pad: bool = False) -> Optional[np.ndarray]:
+        """Get `count` samples (default one chunk) from the buffer.
+        Args:
+            count: Number of samples to read
+            out: Optional preallocated destination with at least `count` samples
+            pad: If fewer than `count` samples are buffered, return what there is zero-padded to
+                 `count` instead of None. Used to flush the tail of a finished sound.
+        Returns:
+            np.ndarray: `count` samples, or None if not enough are buffered
+        """
+        if count is None:
+            count = self.chunk_size
+        data = self._ring.read(count, out)
+        if data is None and pad:
+            available = self._ring.available
+            if available > 0:
+                if out is None:
+                    out = np.zeros(count, dtype=np.int16)
+                else:
+                    out[available:count] = 0
+                self._ring.read(available, out)
+                data = out[:count]
+        if self._writer_waiting:
+            self._space_available.set()
+        if self._async_waiter is not None:
+            self._wake_async_writer()
+        return data
+
+    def _wake_async_writer(self):
+        waiter = self._async_waiter
+        if waiter is None or self._ring.free < waiter[2]:
+            return
+        self._async_waiter = None
+        loop, future, _ = waiter
         try:
-            data = self.buffer.get_nowait()
-            if data is not None and self._volume != 1.0:
-                # Convert to float32 for volume adjustment
-                audio_float = data.astype(np.float32) * self._volume
-                # Clip to int16 range and convert back
-                data = np.clip(audio_float, -32768, 32767).astype(np.int16)
-            return data
-        except queue.Empty:
-            return None
-            
+            loop.call_soon_threadsafe(_resolve_future, future)
+        except RuntimeError:
+            pass  # The writer's event loop has closed
+
     def clear(self):
-        """Clear the buffer"""
-        with self._lock:
-            while not self.buffer.empty():
-                try:
-                    self.buffer.get_nowait()
-                except queue.Empty:
-                    break
-                    
-    def set_volume(self, volume: float):
-        """Set the volume to apply during get"""
-        with self._lock:
-            self._volume = max(0.0, min(1.0, volume))
+        """Clear the buffer in O(1). Safe to call from any thread."""
+        self._ring.clear()
+        if self._writer_waiting:
+            self._space_available.set()
 
 class AudioConsumer:
-    """Represents a consumer of audio input data"""
-    def __init__(self, callback: Callable[[np.ndarray], None], chunk_size: Optional[int] = None):
+    """Represents a consumer of audio input data.
+
+    A consumer that asks for its own chunk_size gets a private, preallocated reframing ring, so its
+    remainder never mixes with another consumer's. Frames handed to its callback are read-only views
+    into that ring and are only valid until the callback returns; copy them to keep them.
+
+    A threaded consumer runs its callback on its own worker thread, so a slow or stalled callback
+    can't delay capture or the other consumers. If it falls too far behind, new audio is dropped.
+    """
+    def __init__(self, callback: Callable[[np.ndarray], None], chunk_size: Optional[int] = None,
+                 threaded: bool = False, input_chunk_size: int = AudioBaseConfig.CHUNK_SIZE):
         self.callback = callback
-        self.buffer = AudioBuffer()
         self.active = True
         self.chunk_size = chunk_size
+        self.threaded = threaded
+        self.dropped_samples = 0
+        self.logger = get_filter_logger(__name__)
+        self._frame_size = chunk_size or input_chunk_size
+        self._reframe = chunk_size is not None and chunk_size != input_chunk_size
+        self._ring: Optional[RingBuffer] = None
+        self._worker: Optional[threading.Thread] = None
+        self._data_ready = threading.Event()
+
+        if self._reframe or threaded:
+            # Hold a whole number of frames, so frame reads never wrap and can be handed out as views
+            if threaded:
+                min_samples = AudioBaseConfig.SAMPLE_RATE * AudioBaseConfig.THREADED_CONSUMER_BUFFER_MS // 1000
+            else:
+                min_samples = self._frame_size + input_chunk_size
+            num_frames = max(2, -(-min_samples // self._frame_size))
+            self._ring = RingBuffer(num_frames * self._frame_size, dtype=np.int16)
+
+        if threaded:
+            self._worker = threading.Thread(target=self._worker_loop, name="AudioConsumerThread", daemon=True)
+            self._worker.start()
+
+    def feed(self, audio_data: np.ndarray):
+        """Called from the input thread with each captured chunk"""
+        if self._ring is None:
+            self._deliver(audio_data)
+            return
+
+        if self._ring.free < len(audio_data):
+            # Consumer is behind. Drop the whole chunk rather than leave a hole in the middle of a frame.
+            self.dropped_samples += len(audio_data)
+            return
+        self._ring.write(audio_data)
+
+        if self.threaded:
+            self._data_ready.set()
+        else:
+            self._drain()
+
+    def stop(self):
+        """Stop delivering audio and let the worker thread, if any, exit"""
+        self.active = False
+        self._data_ready.set()
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=1.0)
+        self._worker = None
+
+    def _drain(self):
+        """Deliver every complete frame in the ring"""
+        frame_size = self._frame_size
+        while self.active:
+            frame = self._ring.peek_view(frame_size)
+            if frame is None:
+                break
+            self._deliver(frame)
+            # Only now may the input thread overwrite the frame's samples
+            self._ring.skip(frame_size)
+
+    def _deliver(self, frame: np.ndarray):
+        try:
+            self.callback(frame)
+        except Exception as e:
+            self.logger.error(f"Error in audio consumer callback: {e}", exc_info=True)
+
+    def _worker_loop(self):
+        while self.active:
+            self._data_ready.wait()
+            # Clear before draining, so a chunk written while we drain re-arms the event
+            self._data_ready.clear()
+            self._drain()
 
 class AudioProducer:
     """Represents a producer of audio output data"""
     def __init__(self, name: str, chunk_size: Optional[int] = None, buffer_size: int = 100, is_stream: bool = False):
         self.name = name
-        self.buffer = AudioBuffer(maxsize=buffer_size)
+        self.buffer = AudioBuffer(maxsize=buffer_size, chunk_size=chunk_size or AudioBaseConfig.CHUNK_SIZE)
         self._volume = AudioBaseConfig.DEFAULT_VOLUME
         self.active = True
         self.logger = get_filter_logger(__name__)
         self.chunk_size = chunk_size
-        self._remainder = np.array([], dtype=np.int16)
         self.loop = False  # Whether to loop the audio
-        self._original_audio = None  # Store original audio data for looping
         self.on_finish: Optional[Callable[[str], None]] = None
         self.loading = False
         self.is_stream = is_stream
+        # Set by the output thread once the producer has finished; it is no longer mixed and the
+        # manager removes it off the output thread
+        self.retired = False
+        # Samples played in place by a cursor instead of through the buffer, e.g. from the SoundBank
+        self._source: Optional[np.ndarray] = None
+        self._position = 0  # Next sample of the source to play. Only moved by the output thread.
+        self._pending_seek: Optional[int] = None  # Requested position, applied by the output thread
+        self._loop_start = 0
+        self._loop_end: Optional[int] = None  # None loops at the end of the source
 
     @property
     def volume(self) -> float:
@@ -104,39 +284,134 @@ class AudioProducer:
     @volume.setter
     def volume(self, value: float):
         self._volume = max(0.0, min(1.0, value))
-        self.buffer.set_volume(self._volume)
 
-    def resize_chunk(self, audio_data: np.ndarray) -> List[np.ndarray]:
-        """Resize audio chunk to desired size, handling remainder samples"""
-        if self.chunk_size is None:
-            return [audio_data]
-            
-        if len(self._remainder) > 0:
-            audio_data = np.concatenate([self._remainder, audio_data])
-            
-        chunks = []
-        num_complete_chunks = len(audio_data) // self.chunk_size
-        for i in range(num_complete_chunks):
-            start = i * self.chunk_size
-            end = start + self.chunk_size
-            chunks.append(audio_data[start:end])
-            
-        remainder_start = num_complete_chunks * self.chunk_size
-        self._remainder = audio_data[remainder_start:]
-        
-        return chunks
+    @property
+    def has_source(self) -> bool:
+        return self._source is not None
+
+    @property
+    def position(self) -> int:
+        """Playback position within the source, in samples"""
+        pending = self._pending_seek
+        return pending if pending is not None else self._position
+
+    @property
+    def has_pending_audio(self) -> bool:
+        """Whether anything is left to play, from the buffer or the source"""
+        if not self.buffer.empty():
+            return True
+        source = self._source
+        if source is None:
+            return False
+        return self.loop or self._pending_seek is not None or self._position < len(source)
+
+    @property
+    def source_length(self) -> int:
+        source = self._source
+        return len(source) if source is not None else 0
+
+    def play_source(self, samples: np.ndarray, loop: bool = False, loop_start: int = 0, loop_end: Optional[int] = None):
+        """
+        Play `samples` in place from the start. They are never copied, so they must not change while playing.
+        Args:
+            samples: Source samples
+            loop: Whether to loop
+            loop_start: Sample the loop jumps back to
+            loop_end: Sample the loop jumps back from (exclusive), or None for the end of the source
+        """
+        self.set_loop_points(loop_start, loop_end)
+        self.loop = loop
+        self._pending_seek = 0
+        self._source = samples
+
+    def stop_source(self):
+        """Stop playing the source, leaving anything in the buffer to play"""
+        self._source = None
+        self.loop = False
+
+    def set_loop_points(self, loop_start: int = 0, loop_end: Optional[int] = None):
+        """Set the loop region in samples. Takes effect at the next loop boundary."""
+        self._loop_start = max(0, loop_start)
+        self._loop_end = loop_end
+
+    def seek(self, position: int):
+        """Move the playback cursor to `position` samples. Takes effect from the next output chunk."""
+        self._pending_seek = max(0, position)
+
+    def _loop_region(self, total: int) -> Tuple[int, int]:
+        loop_end = total if self._loop_end is None else min(self._loop_end, total)
+        loop_start = self._loop_start
+        if loop_start >= loop_end:
+            # Degenerate region, loop the whole source instead
+            return 0, total
+        return loop_start, loop_end
+
+    def read_source(self, count: int, out: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Output thread: the next `count` samples of the source, advancing the cursor.
+        Args:
+            count: Number of samples to read
+            out: Scratch array of at least `count` samples, used when the read crosses the end of the source
+                 or a loop boundary
+        Returns:
+            np.ndarray: A view into the source where possible. When looping, the chunk continues from the
+                        loop start on the very next sample after the loop end; otherwise the tail is padded
+                        with silence. None once a non-looping source has played out.
+        """
+        source = self._source
+        if source is None:
+            return None
+        total = len(source)
+        seek = self._pending_seek
+        if seek is not None:
+            self._pending_seek = None
+            self._position = min(seek, total)
+        position = self._position
+
+        if not self.loop:
+            end = position + count
+            if end <= total:
+                self._position = end
+                return source[position:end]
+            remaining = total - position
+            if remaining <= 0:
+                return None
+            out[:remaining] = source[position:]
+            out[remaining:count] = 0
+            self._position = total
+            return out[:count]
+
+        loop_start, loop_end = self._loop_region(total)
+        if loop_end == 0:
+            return None
+        if position >= loop_end:
+            position = loop_start
+        end = position + count
+        if end < loop_end:
+            self._position = end
+            return source[position:end]
+        # Crosses the loop end: wrap the cursor without a gap
+        filled = 0
+        while filled < count:
+            take = min(count - filled, loop_end - position)
+            out[filled:filled + take] = source[position:position + take]
+            filled += take
+            position += take
+            if position >= loop_end:
+                position = loop_start
+        self._position = position
+        return out[:count]
 
     def clear(self):
-        """Clear the buffer and reset the remainder."""
+        """Clear the buffer."""
         self.buffer.clear()
-        self._remainder = np.array([], dtype=np.int16)
         self.logger.info(f"Producer '{self.name}' buffer cleared")
 
     def stop(self):
         """Stop this producer and clean up its resources"""
         self.active = False
         self.clear()
-        self._original_audio = None  # Clear original audio data
+        self._source = None
         self.loop = False  # Reset loop flag
         self.logger.info(f"Producer '{self.name}' stopped and cleaned up")
 
@@ -172,16 +447,25 @@ class AudioManager:
         self._producers: Dict[str, AudioProducer] = {}
         self._consumers_lock = threading.Lock()
         self._producers_lock = threading.Lock()
+        # Immutable copy of _producers, replaced whenever it changes, so the output thread or
+        # PortAudio callback can walk the producers without taking _producers_lock
+        self._mix_producers: Tuple[AudioProducer, ...] = ()
         
-        # Reusable chunk resizer
-        self._chunk_resizer: Optional[AudioProducer] = None
-        self._chunk_resizer_lock = threading.Lock()
-
-        # Queue for requeuing audio data
-        self._requeue_queue = queue.Queue()
-        self._requeue_thread = None
-        self._requeue_stop = threading.Event()
         self.master_volume: float = AudioBaseConfig.DEFAULT_VOLUME # Initialize directly from AudioBaseConfig
+        self._mixer = AudioMixer(chunk_size=self.config.chunk)
+        self.sound_bank = SoundBank(self.config.rate, self.config.channels, preload=self.config.preload_sound_effects)
+        self._sound_bank_loaded = False
+        self._read_scratch = np.zeros(self.config.chunk, dtype=np.int16)  # Reused for every producer read
+
+        # Callback-mode state (see AudioConfig.use_callback_streams)
+        self._input_ring = RingBuffer(self.config.chunk * 8, dtype=np.int16)
+        self._input_ready = threading.Event()
+        self._output_control_queue = queue.SimpleQueue()
+        self._output_idle = True  # Output stream is stopped, the next put must wake it
+        self._silent_chunks = 0
+        self._idle_chunks_before_stop = max(1, int(np.ceil(
+            AudioAmplifierConfig.DISABLE_DELAY * self.config.rate / self.config.chunk
+        )))
         self.amplifier = None
         self._amp_enabled = False
         self._last_audio_activity_time = 0
@@ -194,9 +478,16 @@ class AudioManager:
             self.amplifier.disable()
             self._amp_enabled = False
 
-    def add_consumer(self, callback: Callable[[np.ndarray], None], chunk_size: Optional[int] = None) -> AudioConsumer:
-        """Add a new audio consumer"""
-        consumer = AudioConsumer(callback, chunk_size)
+    def add_consumer(self, callback: Callable[[np.ndarray], None], chunk_size: Optional[int] = None, threaded: bool = False) -> AudioConsumer:
+        """Add a new audio consumer
+        Args:
+            callback: Called with each frame of captured audio. Reframed frames are views that are
+                      only valid until the callback returns.
+            chunk_size: Frame size the callback wants, or None for the native input chunk size
+            threaded: Run the callback on the consumer's own worker thread. Use this for consumers
+                      that do real work per frame, so they can't hold up capture.
+        """
+        consumer = AudioConsumer(callback, chunk_size, threaded=threaded, input_chunk_size=self.config.chunk)
         with self._consumers_lock:
             self._consumers.append(consumer)
         return consumer
@@ -205,8 +496,8 @@ class AudioManager:
         """Remove an audio consumer"""
         with self._consumers_lock:
             if consumer in self._consumers:
-                consumer.active = False
                 self._consumers.remove(consumer)
+        consumer.stop()
                 
     def _create_producer(self, name: str, chunk_size: Optional[int] = None, buffer_size: int = 100, initial_volume: Optional[float] = 1.0, is_stream: bool = False) -> AudioProducer:
         """Create a new producer instance without adding it to the producers dictionary"""
@@ -215,6 +506,8 @@ class AudioManager:
         
         producer = AudioProducer(name, chunk_size=chunk_size, buffer_size=buffer_size, is_stream=is_stream)
         producer.active = True
+        if self.config.use_callback_streams:
+            producer.buffer.on_put = self._wake_output
         if initial_volume is not None:
             producer.volume = initial_volume
         return producer
@@ -225,6 +518,7 @@ class AudioManager:
         
         with self._producers_lock:
             self._producers[name] = producer
+            self._update_mix_producers()
             self.logger.info(f"Producer '{name}' added and activated")
             
         return producer
@@ -236,10 +530,15 @@ class AudioManager:
                 producer = self._producers[name]
                 producer.stop() # Call stop() for full cleanup
                 del self._producers[name]
+                self._update_mix_producers()
                 self.logger.info(f"Producer '{name}' fully stopped and removed")
             else:
                 logging.warning(f"Attempted to remove non-existent producer: {name}")
                 
+    def _update_mix_producers(self):
+        """Publish a new snapshot of the producers to the output thread. Call with _producers_lock held."""
+        self._mix_producers = tuple(self._producers.values())
+
     def set_producer_volume(self, name: str, volume: float):
         """Set volume for a specific producer"""
         with self._producers_lock:
@@ -258,6 +557,11 @@ class AudioManager:
                 return
                 
             try:
+                if not self._sound_bank_loaded:
+                    self.logger.info("Loading sound effects...")
+                    self.sound_bank.load()
+                    self._sound_bank_loaded = True
+
                 self.logger.info("Initializing PyAudio...")
                 self._py_audio = pyaudio.PyAudio()
                 
@@ -267,15 +571,18 @@ class AudioManager:
                 
                 # Start input and output threads
                 self.logger.info("Starting audio threads...")
-                self._input_thread = threading.Thread(target=self._input_loop, name="AudioInputThread")
-                self._output_thread = threading.Thread(target=self._output_loop, name="AudioOutputThread")
-                self._requeue_thread = threading.Thread(target=self._requeue_loop, name="AudioRequeueThread")
+                if self.config.use_callback_streams:
+                    # Streams are serviced by PortAudio callbacks. These threads only fan out input
+                    # and manage output start/stop, and block (no polling) while there's nothing to do.
+                    self._input_thread = threading.Thread(target=self._input_dispatch_loop, name="AudioInputDispatchThread")
+                    self._output_thread = threading.Thread(target=self._output_control_loop, name="AudioOutputControlThread")
+                else:
+                    self._input_thread = threading.Thread(target=self._input_loop, name="AudioInputThread")
+                    self._output_thread = threading.Thread(target=self._output_loop, name="AudioOutputThread")
                 self._input_thread.daemon = True
                 self._output_thread.daemon = True
-                self._requeue_thread.daemon = True
                 self._input_thread.start()
                 self._output_thread.start()
-                self._requeue_thread.start()
                 self.logger.info("AudioManager started successfully")
                 
             except Exception as e:
@@ -286,12 +593,14 @@ class AudioManager:
         """Stop audio processing and cleanup resources"""
         with self._lock:
             self._running = False
-            self._requeue_stop.set()
+            # Wake the callback-mode threads so they notice we're stopping
+            self._input_ready.set()
+            self._output_control_queue.put(("stop", None))
             
             # Stop all consumers and producers
             with self._consumers_lock:
                 for consumer in self._consumers:
-                    consumer.active = False
+                    consumer.stop()
             with self._producers_lock:
                 for producer in self._producers.values():
                     producer.active = False
@@ -301,8 +610,6 @@ class AudioManager:
                 self._input_thread.join(timeout=1.0)
             if self._output_thread and self._output_thread.is_alive():
                 self._output_thread.join(timeout=1.0)
-            if self._requeue_thread and self._requeue_thread.is_alive():
-                self._requeue_thread.join(timeout=1.0)
                 
             self._cleanup_streams()
             
@@ -346,26 +653,33 @@ class AudioManager:
                 if not respeaker_output_found:
                     self.logger.info("No ReSpeaker output device found. Using system default.")
 
+            # In callback mode the output stream is opened stopped and only runs while there's audio
+            use_callbacks = self.config.use_callback_streams
+            input_callback_kwargs = {"stream_callback": self._input_callback} if use_callbacks else {}
+            output_callback_kwargs = {"stream_callback": self._output_callback, "start": False} if use_callbacks else {}
+
             # Setup input stream
-            self.logger.info(f"Opening input stream (Device Index: {self.config.input_device_index})...")
+            self.logger.info(f"Opening input stream (Device Index: {self.config.input_device_index}, callback mode: {use_callbacks})...")
             self._input_stream = self._py_audio.open(
                 format=self.config.format,
                 channels=self.config.channels,
                 rate=self.config.rate,
                 input=True,
                 input_device_index=self.config.input_device_index,
-                frames_per_buffer=self.config.chunk
+                frames_per_buffer=self.config.chunk,
+                **input_callback_kwargs
             )
             
             # Setup output stream
-            self.logger.info(f"Opening output stream (Device Index: {self.config.output_device_index})...")
+            self.logger.info(f"Opening output stream (Device Index: {self.config.output_device_index}, callback mode: {use_callbacks})...")
             self._output_stream = self._py_audio.open(
                 format=self.config.format,
                 channels=self.config.channels,
                 rate=self.config.rate,
                 output=True,
                 output_device_index=self.config.output_device_index,
-                frames_per_buffer=self.config.chunk
+                frames_per_buffer=self.config.chunk,
+                **output_callback_kwargs
             )
             self.logger.info("Audio streams setup successfully")
             
@@ -391,16 +705,6 @@ class AudioManager:
                 logging.error(f"Error closing output stream: {e}")
             self._output_stream = None
             
-    def _get_chunk_resizer(self, chunk_size: int) -> AudioProducer:
-        """Get or create a reusable chunk resizer with the specified chunk size"""
-        with self._chunk_resizer_lock:
-            if self._chunk_resizer is None or self._chunk_resizer.chunk_size != chunk_size:
-                if self._chunk_resizer is not None:
-                    # Clear any existing data
-                    self._chunk_resizer.buffer.clear()
-                self._chunk_resizer = AudioProducer("chunk_resizer", chunk_size=chunk_size)
-            return self._chunk_resizer
-
     def _input_loop(self):
         """Main input processing loop"""
         self.logger.info("Input processing loop started")
@@ -409,92 +713,128 @@ class AudioManager:
                 # Read from input stream
                 data = self._input_stream.read(self.config.chunk, exception_on_overflow=False)
                 audio_data = np.frombuffer(data, dtype=np.int16)
-                
-                # Distribute to all active consumers
-                with self._consumers_lock:
-                    for consumer in self._consumers:
-                        if consumer.active:
-                            if consumer.chunk_size and consumer.chunk_size != len(audio_data):
-                                chunk_resizer = self._get_chunk_resizer(consumer.chunk_size)
-                                resized_chunks = chunk_resizer.resize_chunk(audio_data)
-                                for chunk in resized_chunks:
-                                    consumer.callback(chunk)
-                            else:
-                                consumer.callback(audio_data)
+                self._dispatch_input(audio_data)
                             
             except Exception as e:
                 if self._running:  # Only log if we haven't stopped intentionally
                     logging.error(f"Error in audio input loop: {e}", exc_info=True)
         self.logger.info("Input processing loop stopped")
+
+    def _dispatch_input(self, audio_data: np.ndarray):
+        """Distribute a chunk of captured audio to all active consumers"""
+        with self._consumers_lock:
+            for consumer in self._consumers:
+                if consumer.active:
+                    consumer.feed(audio_data)
+
+    def _input_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio input callback. Hands captured samples to the dispatch thread via the input ring."""
+        self._input_ring.write(np.frombuffer(in_data, dtype=np.int16))
+        self._input_ready.set()
+        return (None, pyaudio.paContinue)
+
+    def _input_dispatch_loop(self):
+        """Callback mode: fan out captured audio from the input ring to consumers"""
+        self.logger.info("Input dispatch loop started")
+        while self._running:
+            try:
+                self._input_ready.wait()
+                # Clear before draining, so a chunk written while we drain re-arms the event
+                self._input_ready.clear()
+                while self._running:
+                    audio_data = self._input_ring.read(self.config.chunk)
+                    if audio_data is None:
+                        break
+                    self._dispatch_input(audio_data)
+            except Exception as e:
+                if self._running:  # Only log if we haven't stopped intentionally
+                    logging.error(f"Error in audio input dispatch loop: {e}", exc_info=True)
+        self.logger.info("Input dispatch loop stopped")
                 
+    def _mix_next_chunk(self) -> Tuple[int, List[Tuple[AudioProducer, Optional[Callable[[str], None]]]]]:
+        """
+        Mix the next chunk from all active producers into the mixer's output buffer.
+
+        Lock-free: walks the current producer snapshot and never takes _producers_lock, logs or
+        blocks, so it is safe to call from the PortAudio callback. Producers that have finished
+        are marked retired and handed back to the caller to be removed off the real-time path.
+        Returns:
+            Tuple of the number of producers mixed, and the (producer, on_finish) pairs retired by
+            this chunk; the caller must pass these to _retire_producers.
+        """
+        mixer = self._mixer
+        mixer.begin()
+        master_volume = self.master_volume
+        retired: List[Tuple[AudioProducer, Optional[Callable[[str], None]]]] = []
+
+        for producer in self._mix_producers:
+            if producer.retired:
+                continue
+            if producer.active:
+                if producer.has_source:
+                    data = producer.read_source(self.config.chunk, self._read_scratch)
+                else:
+                    # Once a sound has been fully loaded, flush its last partial chunk padded with silence
+                    flush_tail = not producer.loading and not producer.is_stream
+                    data = producer.buffer.get(self.config.chunk, out=self._read_scratch, pad=flush_tail)
+                if data is not None:
+                    # Producer volume, master volume and headroom in a single scaled add
+                    mixer.add(data, producer.volume * master_volume)
+                elif producer.buffer.empty():
+                    # Looping sources never run dry, so an empty producer here has finished
+                    if not producer.loop and not producer.loading and not producer.is_stream:
+                        producer.retired = True
+                        retired.append((producer, producer.on_finish))
+            elif producer.buffer.empty():
+                # Producer is inactive, retire it once its buffer is empty
+                producer.retired = True
+                retired.append((producer, None))
+
+        active_producers = mixer.num_sources
+        mixer.finish()
+        return active_producers, retired
+
+    def _retire_producers(self, retired: List[Tuple[AudioProducer, Optional[Callable[[str], None]]]]):
+        """
+        Remove producers retired by the output thread and run their on_finish callbacks.
+        Never called from the PortAudio callback: in callback mode it runs on the control thread.
+        """
+        finished_producer_callbacks: List[Tuple[Callable[[str], None], str]] = []
+        with self._producers_lock:
+            for producer, on_finish in retired:
+                name = producer.name
+                if on_finish:
+                    finished_producer_callbacks.append((on_finish, name))
+                # A sound restarted on this producer just as it finished keeps it alive
+                restarted = producer.active and (producer.loading or producer.has_pending_audio)
+                if restarted and self._producers.get(name) is producer:
+                    producer.retired = False
+                    continue
+                producer.stop()
+                # The name may already have been taken over by a new producer
+                if self._producers.get(name) is producer:
+                    del self._producers[name]
+                    self.logger.info(f"Producer '{name}' finished/inactive and was removed.")
+            self._update_mix_producers()
+
+        # Call callbacks after releasing the lock to avoid deadlocks
+        self._run_finish_callbacks(finished_producer_callbacks)
+
+    def _run_finish_callbacks(self, finished_producer_callbacks: List[Tuple[Callable[[str], None], str]]):
+        """Run producer on_finish callbacks. Must not be called with the producers lock held."""
+        for callback, name in finished_producer_callbacks:
+            try:
+                callback(name)
+            except Exception as e:
+                self.logger.error(f"Error in on_finish callback for producer '{name}': {e}", exc_info=True)
+
     def _output_loop(self):
         """Main output processing loop"""
         self.logger.info("Output processing loop started")
-        last_producer_log = 0  # Track when we last logged producer states
-        no_data_count = 0  # Track consecutive no-data iterations
         
         while self._running:
             try:
-                # Mix audio from all active producers
-                mixed_audio = np.zeros(self.config.chunk, dtype=np.float32)
-                active_producers = 0
-                finished_producer_callbacks: List[Tuple[Callable[[str], None], str]] = []
-
-                with self._producers_lock:
-                    producers_to_remove = []
-                    for name, producer in list(self._producers.items()):
-                        state = {
-                            'name': name,
-                            'active': producer.active,
-                            'buffer_empty': producer.buffer.buffer.empty(),
-                            'chunk_size': producer.chunk_size,
-                            'buffer_size': producer.buffer.buffer.qsize()
-                        }
-                        
-                        if producer.active:
-                            data = producer.buffer.get()  # Volume already applied here
-                            if data is not None:
-                                no_data_count = 0  # Reset no-data counter
-                                if len(data) == self.config.chunk:
-                                    # Pre-scale to prevent clipping when mixing
-                                    mixed_audio += data.astype(np.float32) * 0.8
-                                    active_producers += 1
-                                    state['had_data'] = True
-                                    logging.debug(f"Mixed data from producer '{name}'")
-                                else:
-                                    logging.warning(f"Skipped chunk from '{name}': expected {self.config.chunk} samples, got {len(data)}")
-                            else:
-                                if producer.buffer.buffer.empty():
-                                    # Log when a producer's buffer is empty
-                                    #if name == 'daily_call':
-                                    #    self.logger.warning(f"Producer '{name}' buffer is empty.")
-
-                                    # If looping is enabled and we have original audio data, queue it for requeuing
-                                    if producer.loop and producer._original_audio is not None and producer.active:
-                                        logging.debug(f"Queueing audio data for requeuing producer '{name}' with loop={producer.loop}")
-                                        self._requeue_queue.put((name, producer._original_audio, producer.loop))
-                                    elif not producer.loop and not producer.loading and not producer.is_stream:
-                                        # Sound finished, mark for callback and removal
-                                        if producer.on_finish:
-                                            finished_producer_callbacks.append((producer.on_finish, name))
-                                        producers_to_remove.append(name)
-                        else:
-                            # Producer is inactive, mark for removal once its buffer is empty
-                            if producer.buffer.buffer.empty():
-                                producers_to_remove.append(name)
-                    
-                    # Clean up producers that have finished
-                    for name in producers_to_remove:
-                        if name in self._producers:
-                            self._producers[name].stop()
-                            del self._producers[name]
-                            self.logger.info(f"Producer '{name}' finished/inactive and was removed.")
-
-                # Apply master volume before final clipping and conversion
-                mixed_audio *= self.master_volume
-
-                # Convert back to int16 and clip to prevent overflow
-                mixed_audio = np.clip(mixed_audio, -32768, 32767).astype(np.int16)
+                active_producers, retired_producers = self._mix_next_chunk()
                         
                 if active_producers > 0:
                     self._last_audio_activity_time = time.time()
@@ -507,25 +847,101 @@ class AudioManager:
                         self._amp_enabled = False
 
                 # Write to output stream
-                if active_producers > 0 or np.any(mixed_audio):
-                    logging.debug(f"Writing {len(mixed_audio)} samples to output stream with master_volume {self.master_volume:.2f}")
-                    self._output_stream.write(mixed_audio.tobytes())
+                if active_producers > 0:
+                    self._output_stream.write(self._mixer.output_bytes)
                 else:
                     # Small sleep to prevent spinning too fast when no data
                     time.sleep(0.001)  # 1ms sleep
                 
-                # Call callbacks after releasing the lock to avoid deadlocks
-                for callback, name in finished_producer_callbacks:
-                    try:
-                        callback(name)
-                    except Exception as e:
-                        self.logger.error(f"Error in on_finish callback for producer '{name}': {e}", exc_info=True)
+                if retired_producers:
+                    self._retire_producers(retired_producers)
 
             except Exception as e:
                 if self._running:  # Only log if we haven't stopped intentionally
                     logging.error(f"Error in output loop: {e}", exc_info=True)
                     
         self.logger.info("Output processing loop stopped")
+
+    def _output_callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio output callback. Mixes one chunk per call without taking any lock. Finished
+        producers are handed to the control thread for removal. After DISABLE_DELAY of silence it
+        completes the stream so PortAudio stops calling us, and the control thread powers down the amp.
+        """
+        try:
+            active_producers, retired_producers = self._mix_next_chunk()
+        except Exception as e:
+            logging.error(f"Error in output callback: {e}", exc_info=True)
+            active_producers, retired_producers = 0, []
+            self._mixer.begin()
+            self._mixer.finish()
+
+        if retired_producers:
+            self._output_control_queue.put(("retired", retired_producers))
+
+        if active_producers > 0:
+            self._silent_chunks = 0
+            return (self._mixer.output_bytes, pyaudio.paContinue)
+
+        self._silent_chunks += 1
+        if self._silent_chunks >= self._idle_chunks_before_stop:
+            self._output_control_queue.put(("idle", None))
+            return (self._mixer.output_bytes, pyaudio.paComplete)
+        return (self._mixer.output_bytes, pyaudio.paContinue)
+
+    def _wake_output(self):
+        """Callback mode: restart the output stream if it was stopped while idle. Called on every producer put."""
+        if self._output_idle:
+            self._output_idle = False
+            self._output_control_queue.put(("wake", None))
+
+    def _has_pending_output(self) -> bool:
+        """Whether any producer has audio waiting to be played"""
+        return any(not producer.retired and producer.has_pending_audio for producer in self._mix_producers)
+
+    def _output_control_loop(self):
+        """
+        Callback mode: start/stop the output stream and gate the amplifier.
+        Blocks on its queue, so it costs nothing while the device is idle.
+        """
+        self.logger.info("Output control loop started")
+        while self._running:
+            try:
+                message, payload = self._output_control_queue.get()
+                if message == "stop" or not self._running:
+                    break
+
+                if message == "retired":
+                    self._retire_producers(payload)
+
+                elif message == "wake":
+                    if self._output_stream and not self._output_stream.is_active():
+                        if self.amplifier and not self._amp_enabled:
+                            self.amplifier.enable()
+                            self._amp_enabled = True
+                        self._silent_chunks = 0
+                        # A stream that completed itself must be stopped before it can be restarted
+                        self._output_stream.stop_stream()
+                        self._output_stream.start_stream()
+                        self.logger.debug("Output stream started")
+
+                elif message == "idle":
+                    if self._output_stream:
+                        self._output_stream.stop_stream()
+                    if self.amplifier and self._amp_enabled:
+                        self.amplifier.disable()
+                        self._amp_enabled = False
+                    self.logger.debug("Output stream stopped while idle")
+                    # From here on, producers wake us on their next put. Anything queued while we
+                    # were stopping wouldn't have, so check for it explicitly.
+                    self._output_idle = True
+                    if self._has_pending_output():
+                        self._wake_output()
+
+            except Exception as e:
+                if self._running:  # Only log if we haven't stopped intentionally
+                    logging.error(f"Error in output control loop: {e}", exc_info=True)
+        self.logger.info("Output control loop stopped")
                 
     def play_audio(self, audio_data: np.ndarray, producer_name: str = "default", loop: bool = False):
         """Play audio data through a specific producer
@@ -544,44 +960,33 @@ class AudioManager:
                 
             # Create producer if needed
             with self._producers_lock:
-                if producer_name not in self._producers:
+                producer = self._producers.get(producer_name)
+                if producer is None or producer.retired:
                     self.logger.info(f"Creating new producer '{producer_name}'")
                     producer = self._create_producer(producer_name, chunk_size=self.config.chunk, buffer_size=1000)
                     self._producers[producer_name] = producer
-                producer = self._producers[producer_name]
+                    self._update_mix_producers()
                 
                 if not producer.active:
                     logging.warning(f"Producer '{producer_name}' is not active")
                     return
                     
-                # Set loop flag and store original audio if looping
-                producer.loop = loop
-                if loop:
-                    producer._original_audio = audio_data.copy()
-                else:
-                    producer._original_audio = None  # Clear any previous audio data if not looping
-                    
             # Ensure audio data is int16
             if audio_data.dtype != np.int16:
                 self.logger.info(f"Converting audio data from {audio_data.dtype} to int16")
                 audio_data = np.clip(audio_data * 32767, -32768, 32767).astype(np.int16)
             
-            # Split audio data into chunks matching the configured chunk size
-            num_samples = len(audio_data)
-            chunk_size = self.config.chunk  # Always use config.chunk since output loop expects this
-            num_chunks = (num_samples + chunk_size - 1) // chunk_size  # Round up division
-            
-            chunks_added = 0
-            for i in range(num_chunks):
-                start = i * chunk_size
-                end = min(start + chunk_size, num_samples)
-                chunk = audio_data[start:end]
-                # Pad the last chunk with zeros if needed
-                if len(chunk) < chunk_size:
-                    chunk = np.pad(chunk, (0, chunk_size - len(chunk)), mode='constant')
-                
-                producer.buffer.put(chunk)
-                chunks_added += 1
+            if loop:
+                # Loop over a private copy in place, so the loop restarts without a gap
+                producer.buffer.clear()
+                producer.play_source(audio_data.copy(), loop=True)
+                if self.config.use_callback_streams:
+                    self._wake_output()
+            else:
+                # Stop any loop, then one copy into the producer's ring; the output loop reads it
+                # back a chunk at a time and pads the tail once loading is complete
+                producer.stop_source()
+                producer.buffer.put(audio_data)
             
             # All data has been queued, mark loading as complete
             producer.loading = False
@@ -589,26 +994,47 @@ class AudioManager:
         except Exception as e:
             logging.error(f"Error in play_audio: {str(e)}", exc_info=True)
                 
-    def play_sound(self, effect_name: str, loop: bool = False, on_finish: Optional[Callable[[str], None]] = None) -> bool:
+    def play_sound(self, effect_name: str, loop: bool = False, on_finish: Optional[Callable[[str], None]] = None,
+                   loop_start: float = 0.0, loop_end: Optional[float] = None) -> bool:
         """
         Play a sound effect by name.
         Args:
             effect_name: Name of the sound effect (case-insensitive)
             loop: Whether to loop the sound effect (default: False)
             on_finish: Callback to execute when the sound finishes
+            loop_start: Time in seconds the loop jumps back to (default: start of the sound)
+            loop_end: Time in seconds the loop jumps back from (default: end of the sound)
         Returns:
             bool: True if the sound effect was found and playback started, False otherwise
         """
-        wav_path = SoundEffect.get_file_path(effect_name)
-        if not wav_path:
-            logging.error(f"Unknown sound effect: {effect_name}")
+        if not self._running:
+            logging.error("Cannot play sound effect - AudioManager not running")
             return False
-            
-        if not os.path.exists(wav_path):
-            logging.error(f"Sound effect file not found: {wav_path}")
+
+        samples = self.sound_bank.get(effect_name)
+        if samples is None:
+            logging.error(f"Unknown or unplayable sound effect: {effect_name}")
             return False
-            
-        return self._play_wav_file(wav_path, producer_name=effect_name, loop=loop, on_finish=on_finish)
+
+        # Playback is a cursor over the sound bank, so the output loop picks this up on its next chunk
+        with self._producers_lock:
+            producer = self._producers.get(effect_name)
+            if producer is None or not producer.active or producer.retired:
+                producer = self._create_producer(effect_name, chunk_size=self.config.chunk, buffer_size=1)
+                self._producers[effect_name] = producer
+                self._update_mix_producers()
+            producer.on_finish = on_finish
+            producer.buffer.clear()
+            producer.play_source(
+                samples,
+                loop=loop,
+                loop_start=self._seconds_to_samples(loop_start),
+                loop_end=self._seconds_to_samples(loop_end) if loop_end is not None else None
+            )
+
+        if self.config.use_callback_streams:
+            self._wake_output()
+        return True
 
     def stop_sound(self, effect_name: str):
         """Stop the currently playing sound effect and clean up resources"""
@@ -622,70 +1048,34 @@ class AudioManager:
             else:
                 self.logger.warning(f"Could not stop sound. Producer '{effect_name}' not found. Active producers: {list(self._producers.keys())}")
         
-    def _play_wav_file(self, wav_path: str, producer_name: str, loop: bool = False, on_finish: Optional[Callable[[str], None]] = None) -> bool:
-        """Play a WAV file through the audio system"""
-        if not self._running:
-            logging.error("Cannot play WAV file - AudioManager not running")
-            return False
-
-        # Clear any existing sound effect first
+    def seek_sound(self, effect_name: str, position: float) -> bool:
+        """
+        Move a playing sound effect to `position` seconds from its start.
+        Returns:
+            bool: True if the sound is playing and was moved, False otherwise
+        """
         with self._producers_lock:
-            if producer_name in self._producers:
-                self._producers[producer_name].buffer.clear()
-
-        def _play_in_thread():
-            try:
-                self.logger.info(f"Opening WAV file: {wav_path}")
-                with wave.open(wav_path, "rb") as wf:
-                    # Log WAV file properties
-                    channels = wf.getnchannels()
-                    width = wf.getsampwidth()
-                    rate = wf.getframerate()
-                    frames = wf.getnframes()
-                    
-                    # Verify WAV format matches our configuration
-                    if channels != self.config.channels:
-                        logging.error(f"WAV channels ({channels}) doesn't match config ({self.config.channels})")
-                        return False
-                    if rate != self.config.rate:
-                        logging.error(f"WAV rate ({rate}) doesn't match config ({self.config.rate})")
-                        return False
-                    if width != self._py_audio.get_sample_size(self.config.format):
-                        logging.error(f"WAV width ({width}) doesn't match config format")
-                        return False
-                                        
-                    # Create or get producer and set volume
-                    with self._producers_lock:
-                        if producer_name not in self._producers:
-                            # Get current volume if producer exists
-                            current_volume = None
-                            if producer_name in self._producers:
-                                current_volume = self._producers[producer_name].volume
-                            producer = self._create_producer(producer_name, chunk_size=self.config.chunk, buffer_size=1000, initial_volume=current_volume)
-                            self._producers[producer_name] = producer
-                        producer = self._producers[producer_name]
-                        producer.on_finish = on_finish
-                        producer.loading = True
-                    
-                    audio_data = wf.readframes(frames)
-                    audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                    self.play_audio(audio_array, producer_name=producer_name, loop=loop)
-                    
-            except FileNotFoundError:
-                logging.error(f"WAV file not found: {wav_path}")
+            producer = self._producers.get(effect_name)
+            if producer is None or not producer.active or producer.retired or not producer.has_source:
+                self.logger.warning(f"Cannot seek '{effect_name}': not playing")
                 return False
-            except Exception as e:
-                logging.error(f"Failed to play WAV file {wav_path}: {str(e)}", exc_info=True)
-                return False
-                
+            producer.seek(self._seconds_to_samples(position))
             return True
 
-        # Start playback in a separate thread
-        thread = threading.Thread(target=_play_in_thread, name=f"wav_player_{producer_name}")
-        thread.daemon = True
-        thread.start()
-        return True
-                
+    def get_sound_position(self, effect_name: str) -> Optional[float]:
+        """
+        Get the playback position of a playing sound effect in seconds, or None if it isn't playing.
+        The position is that of the next chunk to be mixed, so it leads the speaker by the output latency.
+        """
+        with self._producers_lock:
+            producer = self._producers.get(effect_name)
+            if producer is None or not producer.active or producer.retired or not producer.has_source:
+                return None
+            return producer.position / float(self.config.rate)
+
+    def _seconds_to_samples(self, seconds: float) -> int:
+        return max(0, int(round(seconds * self.config.rate)))
+
     @contextmanager
     def get_recorder(self, filename: str):
         """Context manager for recording audio to a file"""
@@ -719,52 +1109,6 @@ class AudioManager:
                     devices[i] = device_info['name']
         return devices
 
-    def _requeue_loop(self):
-        """Background thread for handling audio requeuing"""
-        while not self._requeue_stop.is_set():
-            try:
-                # Get the next requeue request with a timeout
-                try:
-                    producer_name, audio_data, _ = self._requeue_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
-
-                # Before re-playing, check if the producer still exists and is supposed to be looping.
-                with self._producers_lock:
-                    if producer_name not in self._producers:
-                        self.logger.debug(f"Ignoring requeue for '{producer_name}': producer removed.")
-                        continue
-                    
-                    producer = self._producers[producer_name]
-                    # Log current state before checking
-                    self.logger.debug(f"Requeue check for '{producer_name}': active={producer.active}, loop={producer.loop}")
-                    if not producer.loop or not producer.active:
-                        self.logger.debug(f"Ignoring requeue for '{producer_name}': looping disabled.")
-                        continue
-                
-                # If we're here, the producer should be refilled directly, not by calling play_audio.
-                # This prevents resetting the loop flag.
-                num_samples = len(audio_data)
-                chunk_size = self.config.chunk
-                num_chunks = (num_samples + chunk_size - 1) // chunk_size
-
-                for i in range(num_chunks):
-                    start = i * chunk_size
-                    end = min(start + chunk_size, num_samples)
-                    chunk = audio_data[start:end]
-                    # Pad the last chunk with zeros if needed
-                    if len(chunk) < chunk_size:
-                        chunk = np.pad(chunk, (0, chunk_size - len(chunk)), mode='constant')
-                    
-                    producer.buffer.put(chunk)
-                
-                self.logger.debug(f"Requeued audio for looping producer '{producer_name}'")
-                self._requeue_queue.task_done()
-                
-            except Exception as e:
-                logging.error(f"Error in requeue loop: {e}", exc_info=True)
-                time.sleep(0.1)  # Prevent tight loop on error
-
     def set_master_volume(self, volume: float):
         """Set the master volume for all audio output, clamping between 0.0 and 1.0."""
         self.master_volume = max(0.0, min(1.0, volume))
@@ -778,16 +1122,8 @@ class AudioManager:
         Returns:
             float: Duration in seconds, or None if not found
         """
-        wav_path = SoundEffect.get_file_path(effect_name)
-        if not wav_path or not os.path.exists(wav_path):
+        info = self.sound_bank.info(effect_name)
+        if info is None:
             logging.error(f"Sound effect not found for duration check: {effect_name}")
             return None
-        try:
-            with wave.open(wav_path, "rb") as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                duration = frames / float(rate)
-                return duration
-        except Exception as e:
-            logging.error(f"Could not read duration from WAV file {wav_path}: {e}")
-            return None
+        return info.duration
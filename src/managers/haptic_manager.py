@@ -7,13 +7,20 @@ of effects with pauses, and managing the haptic motor type.
 
 The DRV2605L supports 123 different haptic effects and can chain up to 8 effects
 in a sequence. Effects can be combined with pauses for complex haptic patterns.
+
+Sequences are compiled into the DRV2605L's own waveform sequencer slots, with pauses as
+wait slots, so the chip times them. Longer sequences are played 8 slots at a time. All
+motor control, sequences and realtime purring alike, runs on a worker thread, so haptic
+timing never depends on how busy the event loop is.
 """
 
 import time
+import math
 import logging
-import asyncio
-from config import PLATFORM
-from typing import List, Union, Optional, Tuple
+import threading
+from dataclasses import dataclass
+from config import PLATFORM, HapticConfig
+from typing import List, Union, Optional
 
 # Only import hardware-specific libraries on Raspberry Pi
 if PLATFORM == "raspberry-pi":
@@ -21,6 +28,11 @@ if PLATFORM == "raspberry-pi":
     import busio
     import adafruit_drv2605
 
+# DRV2605 mode register values (as adafruit_drv2605.MODE_*), so the worker doesn't depend on
+# the driver library being importable
+MODE_INTTRIG = 0x00
+MODE_REALTIME = 0x05
+
 # Type alias for effect sequences
 HapticSequence = List[Union[int, float]]  # int for effect ID, float for pause duration
 
@@ -152,14 +164,253 @@ class WaveformEffect(Enum):
     SMOOTH_HUM_5_10_TO_0 = 123
 
 
+def purr_motor_value(intensity: float, elapsed: float) -> int:
+    """Motor value for a purr at the given stroke intensity, elapsed seconds into the purr
+    
+    Creates a purring effect by combining:
+    1. Slow amplitude modulation (1/PURR_CYCLE_PERIOD Hz) for the breathing-like pattern
+    2. Power level that scales with intensity
+    
+    Args:
+        intensity: Stroke intensity value (0.0 to 1.0)
+        elapsed: Seconds since the purr started
+        
+    Returns:
+        int: Realtime value for unidirectional ERM mode (0 to 127)
+    """
+    # Generate slow modulation wave
+    wave = math.sin(2 * math.pi * elapsed / HapticConfig.PURR_CYCLE_PERIOD)
+    
+    # Transform wave to create longer peaks and shorter troughs
+    # This makes the purr feel more natural with longer "on" periods
+    wave = math.copysign(abs(wave) ** HapticConfig.PURR_WAVE_SHAPING, wave)
+    
+    # Map wave from [-1, 1] to [min_power, max_power]
+    # Higher intensity = higher power range and higher minimum power
+    min_power = int(HapticConfig.PURR_MIN_POWER_BASE + (intensity * HapticConfig.PURR_MIN_POWER_SCALE))
+    max_power = int(HapticConfig.PURR_MAX_POWER_BASE + (intensity * HapticConfig.PURR_MAX_POWER_SCALE))
+    
+    # Linear interpolation between min and max power
+    normalized = (wave + 1) / 2  # Map [-1,1] to [0,1]
+    motor_value = int(min_power + (normalized * (max_power - min_power)))
+    
+    # Ensure we stay within valid range for unidirectional ERM mode (0-127)
+    return max(0, min(127, motor_value))
+
+
+# DRV2605L waveform sequencer registers and slot encoding
+_REG_WAVESEQ1 = 0x04  # First of 8 consecutive sequencer slot registers
+_REG_GO = 0x0C
+WAVEFORM_SLOTS = 8
+_WAIT_SLOT = 0x80     # Bit 7 set: the slot is a wait, in units of 10ms
+_MAX_WAIT_TICKS = 0x7F
+
+
+@dataclass(frozen=True)
+class WaveformChunk:
+    """Up to 8 waveform sequencer slots, played in one go"""
+    slots: bytes      # All 8 slot registers; a 0 slot ends the sequence early
+    duration: float   # The least time the chunk can take to play, in seconds
+
+
+def compile_sequence(sequence: HapticSequence) -> List[WaveformChunk]:
+    """Compile a sequence of effects and pauses for the DRV2605L's waveform sequencer
+    
+    Effects become effect slots, and pauses become wait slots of up to 1.27s each, so
+    longer pauses take several. Slots are split into chunks of 8.
+    
+    Args:
+        sequence: Effect IDs (int or WaveformEffect) and pause durations in seconds (float)
+        
+    Returns:
+        List[WaveformChunk]: Chunks to play one after the other
+        
+    Raises:
+        ValueError: If the sequence has an invalid effect ID or a negative pause
+    """
+    slots: List[int] = []
+    durations: List[float] = []
+    for item in sequence:
+        if isinstance(item, WaveformEffect):
+            item = item.value
+        if isinstance(item, int):
+            if not 1 <= item <= 123:
+                raise ValueError(f"Invalid effect ID in sequence: {item}")
+            slots.append(item)
+            # Effect lengths vary, so only count the shortest; the player waits for the chip to finish
+            durations.append(HapticConfig.SEQUENCE_MIN_EFFECT_DURATION)
+            continue
+        ticks = round(item * 100)
+        if ticks < 0:
+            raise ValueError(f"Invalid pause in sequence: {item}")
+        while ticks > 0:
+            wait = min(ticks, _MAX_WAIT_TICKS)
+            slots.append(_WAIT_SLOT | wait)
+            durations.append(wait / 100)
+            ticks -= wait
+
+    chunks = []
+    for start in range(0, len(slots), WAVEFORM_SLOTS):
+        chunk = slots[start:start + WAVEFORM_SLOTS]
+        chunks.append(WaveformChunk(
+            bytes(chunk + [0] * (WAVEFORM_SLOTS - len(chunk))),
+            sum(durations[start:start + WAVEFORM_SLOTS]),
+        ))
+    return chunks
+
+
+class HapticWorker:
+    """Owns the motor from a dedicated thread, so haptic timing doesn't depend on the event loop
+    
+    Callers post a purr intensity, for which the worker generates the purr envelope at
+    PURR_UPDATE_RATE, a single realtime value, or a compiled waveform sequence. Posts are
+    coalesced: the worker only acts on the newest one, which also cancels whatever was playing.
+    Realtime values are only written when they differ from the last one written.
+    """
+    
+    def __init__(self, driver: "HapticManager", update_rate: float = HapticConfig.PURR_UPDATE_RATE):
+        """
+        Args:
+            driver: Does the register I/O. Its methods return False (or raise nothing) on failure.
+            update_rate: Purr envelope updates per second (Hz)
+        """
+        self._driver = driver
+        self._period = 1.0 / update_rate
+        self._condition = threading.Condition()
+        self._intensity = 0.0
+        self._purr_start = 0.0
+        self._pending_value: Optional[int] = None
+        self._pending_sequence: Optional[List[WaveformChunk]] = None
+        self._pending_halt = False
+        # Bumped by every post, which cancels a playing sequence
+        self._generation = 0
+        self._last_value: Optional[int] = None
+        self._running = True
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name="HapticWorker", daemon=True)
+        self._thread.start()
+        
+    def _post(self, intensity: float = 0.0, value: Optional[int] = None,
+              sequence: Optional[List[WaveformChunk]] = None, halt: bool = False) -> None:
+        # Call with the condition held
+        if intensity > 0 and self._intensity <= 0:
+            self._purr_start = time.monotonic()
+        self._intensity = intensity
+        self._pending_value = value
+        self._pending_sequence = sequence
+        self._pending_halt = halt
+        self._generation += 1
+        self._condition.notify()
+        
+    def set_intensity(self, intensity: float) -> None:
+        """Purr at a stroke intensity (0.0 to 1.0). Changing intensity keeps the purr's rhythm; 0 stops the motor."""
+        intensity = max(0.0, min(1.0, intensity))
+        with self._condition:
+            self._post(intensity=intensity, value=0 if intensity <= 0 else None)
+            
+    def post_value(self, value: int) -> None:
+        """Write a single realtime value"""
+        with self._condition:
+            self._post(value=value)
+            
+    def play(self, chunks: List[WaveformChunk]) -> None:
+        """Play a compiled waveform sequence"""
+        with self._condition:
+            self._post(sequence=chunks)
+            
+    def stop(self) -> None:
+        """Stop whatever is playing"""
+        with self._condition:
+            self._post(halt=True)
+            
+    def invalidate(self) -> None:
+        """Write the next value even if it's the same as the last, e.g. after a mode change"""
+        self._last_value = None
+        
+    def close(self) -> None:
+        """Stop the motor and the worker thread"""
+        with self._condition:
+            self._running = False
+            self._post(halt=True)
+        self._thread.join(timeout=1.0)
+        
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while True:
+            with self._condition:
+                while (self._running and self._intensity <= 0 and self._pending_value is None
+                       and self._pending_sequence is None and not self._pending_halt):
+                    self._condition.wait()
+                    next_tick = time.monotonic()
+                generation = self._generation
+                sequence, self._pending_sequence = self._pending_sequence, None
+                halt, self._pending_halt = self._pending_halt, False
+                purring = self._intensity > 0
+                if purring:
+                    value = purr_motor_value(self._intensity, time.monotonic() - self._purr_start)
+                else:
+                    value = self._pending_value
+                self._pending_value = None
+                running = self._running
+                
+            if halt:
+                self._driver.halt()
+                self._last_value = None
+            if sequence:
+                self._play(sequence, generation)
+            elif value is not None and value != self._last_value and self._driver.set_realtime_value(value):
+                self._last_value = value
+                self.writes += 1
+            if not running:
+                return
+            if purring:
+                # Fixed-rate updates, woken early only by a newer post
+                next_tick += self._period
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    with self._condition:
+                        self._condition.wait(delay)
+                else:
+                    next_tick = time.monotonic()
+                    
+    def _wait_until(self, deadline: float, generation: int) -> bool:
+        """Sleep until the deadline. Returns False if a newer post cancelled the wait."""
+        with self._condition:
+            while self._generation == generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._condition.wait(remaining)
+            return False
+            
+    def _play(self, chunks: List[WaveformChunk], generation: int) -> None:
+        """Play chunks back to back, each starting as soon as the chip has finished the last"""
+        for chunk in chunks:
+            if not self._driver.start_waveform(chunk.slots):
+                return
+            start = time.monotonic()
+            # The chip plays the chunk by itself; sleep through the least time it can take
+            finished = self._wait_until(start + chunk.duration, generation)
+            # Then poll until it has really finished, as effect lengths vary
+            give_up = start + chunk.duration + HapticConfig.SEQUENCE_MAX_OVERRUN
+            while finished and self._driver.waveform_playing() and time.monotonic() < give_up:
+                finished = self._wait_until(time.monotonic() + HapticConfig.SEQUENCE_POLL_INTERVAL, generation)
+            if not finished:
+                self._driver.stop_waveform()
+                return
+
+
 class HapticManager:
     """Main class for controlling haptic feedback effects"""
     
     def __init__(self):
         """Initialize the haptic manager and DRV2605L controller"""
         self.running = False
-        self._current_sequence: Optional[List[Tuple[Union[int, float], bool]]] = None  # (value, is_pause)
-        self._sequence_task = None
+        # The last mode written to the DRV2605L, so it never has to be read back over I2C
+        self._mode: Optional[int] = None
+        # Serializes mode changes and realtime writes from the worker and the event loop
+        self._drv_lock = threading.Lock()
+        self._worker: Optional[HapticWorker] = None
         
         if PLATFORM == "raspberry-pi":
             try:
@@ -188,37 +439,31 @@ class HapticManager:
             logging.warning("No haptic controller available")
             return False
             
-        try:
-            if not 1 <= effect_id <= 123:
-                logging.error(f"Invalid effect ID: {effect_id}")
-                return False
-                
-            self.drv.sequence[0] = adafruit_drv2605.Effect(effect_id)
-            self.drv.play()
-            return True
-        except Exception as e:
-            logging.error(f"Error playing haptic effect {effect_id}: {str(e)}")
+        if not 1 <= effect_id <= 123:
+            logging.error(f"Invalid effect ID: {effect_id}")
             return False
+            
+        self._get_worker().play(compile_sequence([effect_id]))
+        return True
 
     def stop(self) -> None:
         """Stop any currently playing haptic effects"""
-        if self.drv:
-            try:
-                self.drv.stop()
-                if self._sequence_task:
-                    self._sequence_task.cancel()
-                    self._sequence_task = None
-                self._current_sequence = None
-            except Exception as e:
-                logging.error(f"Error stopping haptic effects: {str(e)}")
+        if self._worker:
+            self._worker.stop()
+        elif self.drv:
+            self.halt()
 
     async def play_sequence(self, sequence: HapticSequence) -> bool:
         """Play a sequence of effects and pauses
         
+        The sequence is compiled into the DRV2605L's waveform sequencer slots and played by the
+        haptic worker thread, so this returns as soon as it has started. A new sequence, effect or
+        realtime value replaces one that's still playing.
+        
         Args:
             sequence: List of effect IDs (int) and pause durations (float).
                      Integers are treated as effect IDs, floats as pause durations in seconds.
-                     Maximum 8 effects can be played in a sequence.
+                     Sequences with more than 8 effects and pauses are played 8 at a time.
                      
         Returns:
             bool: True if sequence started playing successfully
@@ -231,68 +476,66 @@ class HapticManager:
             logging.warning("No haptic controller available")
             return False
             
-        # Validate sequence
-        effect_count = sum(1 for x in sequence if isinstance(x, int))
-        if effect_count > 8:
-            logging.error(f"Sequence contains {effect_count} effects, maximum is 8")
+        try:
+            chunks = compile_sequence(sequence)
+        except ValueError as e:
+            logging.error(f"Error starting haptic sequence: {str(e)}")
             return False
             
+        self._get_worker().play(chunks)
+        return True
+
+    def start_waveform(self, slots: bytes) -> bool:
+        """Load the 8 waveform sequencer slots and start playing them
+        
+        Returns:
+            bool: True if playback started
+        """
         try:
-            # Cancel any current sequence
-            if self._sequence_task:
-                self._sequence_task.cancel()
-                
-            # Process sequence into (value, is_pause) tuples
-            self._current_sequence = [(x, isinstance(x, float)) for x in sequence]
-            
-            # Start sequence playback task
-            self._sequence_task = asyncio.create_task(self._play_sequence_task())
+            with self._drv_lock:
+                # Waveforms are triggered with GO, which realtime mode ignores
+                if self._mode != MODE_INTTRIG:
+                    self._set_mode(MODE_INTTRIG)
+                device = getattr(self.drv, "_device", None)
+                if device is not None:
+                    # One auto-incrementing write from the first slot, rather than a transaction per slot
+                    with device as i2c:
+                        i2c.write(bytes([_REG_WAVESEQ1]) + slots)
+                else:
+                    for slot, value in enumerate(slots):
+                        self.drv._write_u8(_REG_WAVESEQ1 + slot, value)
+                self.drv.play()
             return True
-            
         except Exception as e:
-            logging.error(f"Error starting haptic sequence: {str(e)}")
-            self._current_sequence = None
+            logging.error(f"Error playing haptic waveform: {str(e)}")
             return False
 
-    async def _play_sequence_task(self) -> None:
-        """Internal task to play through the current sequence"""
-        if not self._current_sequence:
-            return
-            
+    def waveform_playing(self) -> bool:
+        """Whether the waveform sequencer is still playing"""
+        try:
+            with self._drv_lock:
+                return bool(self.drv._read_u8(_REG_GO) & 0x01)
+        except Exception as e:
+            logging.error(f"Error reading haptic playback state: {str(e)}")
+            return False
+
+    def stop_waveform(self) -> None:
         try:
-            slot = 0
-            for value, is_pause in self._current_sequence:
-                if is_pause:
-                    # Handle pause
-                    await asyncio.sleep(value)
+            with self._drv_lock:
+                self.drv.stop()
+        except Exception as e:
+            logging.error(f"Error stopping haptic waveform: {str(e)}")
+
+    def halt(self) -> None:
+        """Stop the motor in whichever mode it's in"""
+        try:
+            with self._drv_lock:
+                if self._mode == MODE_REALTIME:
+                    self.drv.realtime_value = 0
                 else:
-                    # Handle effect
-                    if not 1 <= value <= 123:
-                        logging.error(f"Invalid effect ID in sequence: {value}")
-                        continue
-                        
-                    self.drv.sequence[slot] = adafruit_drv2605.Effect(value)
-                    slot += 1
-                    
-                    if slot >= 8:
-                        # Play accumulated effects if we hit the slot limit
-                        self.drv.play()
-                        await asyncio.sleep(0.5)  # Wait for effects to complete
-                        slot = 0
-                        
-            # Play any remaining effects
-            if slot > 0:
-                self.drv.play()
-                
-        except asyncio.CancelledError:
-            # Sequence was cancelled
-            self.stop()
+                    self.drv.stop()
         except Exception as e:
-            logging.error(f"Error playing haptic sequence: {str(e)}")
-            self.stop()
-        finally:
-            self._current_sequence = None
-            self._sequence_task = None
+            logging.error(f"Error stopping haptic effects: {str(e)}")
 
     def use_LRA_motor(self) -> bool:
         """Configure for Linear Resonance Actuator (LRA) motor type
@@ -350,18 +593,60 @@ class HapticManager:
                 logging.error(f"Invalid realtime value {value}. Must be between -127 and 255")
                 return False
             
-            # Switch to realtime mode if not already in it
-            if self.drv.mode != adafruit_drv2605.MODE_REALTIME:
-                if not self.start_realtime_mode():
-                    return False
-                
-            self.drv.realtime_value = value
-            logging.info(f"Set realtime value to {value}")
+            with self._drv_lock:
+                # Switch to realtime mode if not already in it
+                if self._mode != MODE_REALTIME:
+                    self._set_mode(MODE_REALTIME)
+                self.drv.realtime_value = value
+            logging.debug(f"Set realtime value to {value}")
             return True
         except Exception as e:
             logging.error(f"Error setting realtime value: {str(e)}")
             return False
 
+    def set_purr_intensity(self, intensity: float) -> None:
+        """Purr at a stroke intensity, or stop purring at 0. Returns immediately.
+        
+        The haptic worker generates the purr envelope and writes it to the motor from its own
+        thread, so frequent intensity changes are cheap to post from the event loop.
+        
+        Args:
+            intensity: Stroke intensity value (0.0 to 1.0)
+        """
+        if not self.drv:
+            return
+        self._get_worker().set_intensity(intensity)
+
+    def post_realtime_value(self, value: int) -> bool:
+        """Like set_realtime_value, but written by the haptic worker. Returns immediately.
+        
+        Values posted faster than they can be written are coalesced, and only the newest is written.
+        """
+        if not self.drv:
+            return False
+        if not -127 <= value <= 255:
+            logging.error(f"Invalid realtime value {value}. Must be between -127 and 255")
+            return False
+        self._get_worker().post_value(value)
+        return True
+
+    def close(self) -> None:
+        """Stop the motor and the haptic worker"""
+        if self._worker:
+            self._worker.close()
+            self._worker = None
+
+    def _get_worker(self) -> HapticWorker:
+        if self._worker is None:
+            self._worker = HapticWorker(self)
+        return self._worker
+
+    def _set_mode(self, mode: int) -> None:
+        self.drv.mode = mode
+        self._mode = mode
+        if self._worker:
+            self._worker.invalidate()
+
     def start_realtime_mode(self) -> bool:
         """Switch to realtime playback mode for direct motor control.
         
@@ -373,7 +658,8 @@ class HapticManager:
             return False
             
         try:
-            self.drv.mode = adafruit_drv2605.MODE_REALTIME
+            with self._drv_lock:
+                self._set_mode(MODE_REALTIME)
             return True
         except Exception as e:
             logging.error(f"Error setting realtime mode: {str(e)}")
@@ -390,7 +676,8 @@ class HapticManager:
             return False
             
         try:
-            self.drv.mode = adafruit_drv2605.MODE_INTTRIG
+            with self._drv_lock:
+                self._set_mode(MODE_INTTRIG)
             return True
         except Exception as e:
             logging.error(f"Error exiting realtime mode: {str(e)}")
@@ -1,13 +1,18 @@
+import sys
 import time
 import colorsys
 import math
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 from config import LEDConfig
 import logging
-import random
 from enum import Enum, auto
 from typing import Union, Optional
-import asyncio
+import numpy as np
+from utils import led_render
+from utils.animation_cache import AnimationCache, play, source_fingerprint
+from utils.led_render import (FRAME_DTYPE, BlendMode, EffectLayer, LayerKind, LayerStack, PixelWriter,
+                              Sparkles, Twinkles, cap_power, hsv_to_rgb, hsv_to_rgb8, ring_distance,
+                              scale_colors)
 
 # Try to import board and neopixel, but don't fail if they're not available, e.g. not on Raspberry Pi
 try:
@@ -38,17 +43,18 @@ COLORS = {
 }
 
 class LEDManager:
-    # Map of effects to their corresponding private methods and default speeds
+    # Map of effects to their corresponding private methods and default speeds. Effects with a
+    # period repeat the same frames every period frames, whatever the speed, so they can be baked.
     _EFFECT_MAP = {
-        "BLUE_BREATHING": {'method': '_blue_breathing_effect', 'default_speed': 0.05},
-        "GREEN_BREATHING": {'method': '_green_breathing_effect', 'default_speed': 0.05},
-        "ROTATING_PINK_BLUE": {'method': '_rotating_pink_blue_effect', 'default_speed': 0.05},
-        "ROTATING_GREEN_YELLOW": {'method': '_rotating_green_yellow_effect', 'default_speed': 0.05},
-        "RAINBOW": {'method': '_rainbow_effect', 'default_speed': 0.02},
+        "BLUE_BREATHING": {'method': '_blue_breathing_effect', 'default_speed': 0.05, 'period': 100},
+        "GREEN_BREATHING": {'method': '_green_breathing_effect', 'default_speed': 0.05, 'period': 100},
+        "ROTATING_PINK_BLUE": {'method': '_rotating_pink_blue_effect', 'default_speed': 0.05, 'period': 100},
+        "ROTATING_GREEN_YELLOW": {'method': '_rotating_green_yellow_effect', 'default_speed': 0.05, 'period': 100},
+        "RAINBOW": {'method': '_rainbow_effect', 'default_speed': 0.02, 'period': 255},
         "TWINKLING": {'method': '_random_twinkling_effect', 'default_speed': 0.03},
         "RAIN": {'method': '_rain_effect', 'default_speed': 0.05},
         "LIGHTNING": {'method': '_lightning_effect', 'default_speed': 0.05},
-        "PURRING": {'method': '_purring_effect', 'default_speed': 0.01},
+        "PURRING": {'method': '_purring_effect', 'default_speed': 0.01, 'period': 100},
         "ROTATING_COLOR": {'method': '_rotating_color_effect', 'default_speed': 0.05},
         "MAGICAL_SPELL": {'method': '_magical_spell_effect', 'default_speed': 0.03},
         "SPARKLING_PINK_BLUE": {'method': '_sparkling_pink_blue_effect', 'default_speed': 0.04},
@@ -56,14 +62,24 @@ class LEDManager:
     }
 
     def __init__(self, initial_brightness=LEDConfig.LED_BRIGHTNESS):
-        self._effect_thread = None
-        self._stop_event = Event()
+        # Speed of the most recently started or updated effect. Effects may read it for live updates.
         self._current_speed = None
-        # Track current effect state (now a string)
-        self._current_effect: Optional[str] = None
         self._base_brightness = max(0.0, min(1.0, initial_brightness)) # Store and clamp base brightness
-        self._current_relative_brightness = 1.0 # Track the relative brightness set by effects (defaults to 1.0)
-        self._loop = asyncio.get_event_loop()
+        self._crossfade = LEDConfig.CROSSFADE_MS / 1000
+        # Effect layers, composited by the compositor thread. _lock guards the stack and the strip.
+        self._layers = LayerStack(LEDConfig.LED_COUNT, fade_seconds=self._crossfade)
+        self._lock = Lock()
+        self._wake = Event()
+        self._shutdown = Event()
+        self._rng = np.random.default_rng()
+        self._num_pixels = LEDConfig.LED_COUNT
+        # Each pixel's position around the strip, 0.0 to 1.0
+        self._positions = np.arange(self._num_pixels) / self._num_pixels
+        # Frame tables of periodic effects, rebaked whenever the effect code changes
+        self._animation_cache = AnimationCache(
+            LEDConfig.ANIMATION_CACHE_SIZE, LEDConfig.ANIMATION_CACHE_DIR,
+            version=source_fingerprint(sys.modules[__name__], led_render),
+        ) if LEDConfig.BAKE_ANIMATIONS else None
         
         # Initialize the NeoPixel object only on Raspberry Pi
         if LEDS_AVAILABLE:
@@ -113,85 +129,71 @@ class LEDManager:
             self.pixels.brightness = self._base_brightness # Set initial mock brightness
             logging.info(f"Mock NeoPixel initialized with {LEDConfig.LED_COUNT} LEDs at base brightness {self._base_brightness:.2f}")
         
-        # Wrap the show() method to implement power capping.
-        self._original_show = self.pixels.show
-        self.pixels.show = self._capped_show
+        # Frames are copied into the strip in one write, then sent with pixels.show()
+        self._writer = PixelWriter(self.pixels)
         
         self.clear()
 
-    def _capped_show(self):
-        """A wrapper for the real show() method that caps total brightness to prevent power issues."""
-        # This check is only meaningful if we have real LEDs that consume power.
-        if not LEDS_AVAILABLE:
-            self._original_show()
-            return
+        # One long-lived thread renders every effect; starting and stopping effects only edits the layer stack
+        self._compositor_thread = Thread(target=self._compositor_loop, name="LEDCompositor", daemon=True)
+        self._compositor_thread.start()
 
-        # Check if the power capping feature is configured.
-        if not hasattr(LEDConfig, 'MAX_TOTAL_BRIGHTNESS') or LEDConfig.MAX_TOTAL_BRIGHTNESS <= 0:
-            self._original_show()
-            return
-            
-        # Calculate the total brightness of the current frame buffer as a proxy for power consumption.
-        try:
-            # Reading the entire buffer into a list first is safer and avoids potential
-            # issues with modifying the buffer while iterating.
-            current_pixels = [self.pixels[i] for i in range(self.pixels.n)]
-            total_brightness = sum(sum(p) for p in current_pixels)
-        except Exception as e:
-            logging.error(f"Could not read pixel buffer for power capping: {e}")
-            self._original_show()
-            return
+    def _show_frame(self, frame: np.ndarray):
+        """Cap the frame's total brightness to prevent power issues, write it to the strip in bulk and show it."""
+        frame = cap_power(frame, getattr(LEDConfig, 'MAX_TOTAL_BRIGHTNESS', 0))
+        self._writer.write(frame)
+        self.pixels.show()
 
-        # If total brightness exceeds the configured maximum, scale all pixel values down.
-        if total_brightness > LEDConfig.MAX_TOTAL_BRIGHTNESS:
-            scale_factor = LEDConfig.MAX_TOTAL_BRIGHTNESS / total_brightness
-            # This logging can be spammy, so keep it at debug level.
-            logging.warning(f"Power capping triggered. Total brightness: {total_brightness}, scaling by: {scale_factor:.2f}")
-            
-            # Apply the scaled pixels back to the hardware buffer from our temporary list.
-            for i in range(self.pixels.n):
-                self.pixels[i] = tuple(int(c * scale_factor) for c in current_pixels[i])
-        
-        # Call the original, hardware-level show() method.
-        self._original_show()
-
-    def _blend_colors(self, color1, color2):
-        """Blend two colors by taking the maximum of each component"""
-        return (
-            max(color1[0], color2[0]),
-            max(color1[1], color2[1]),
-            max(color1[2], color2[2])
-        )
-
-    def _setup_revert_thread(self, previous_effect, duration):
-        """Set up a thread to revert to previous effect after duration.
-        
-        Args:
-            previous_effect: Dictionary containing previous effect state
-            duration: Duration in milliseconds before reverting
-        """
-        def revert_after_duration():
-            time.sleep(duration / 1000)  # Convert ms to seconds
-            if previous_effect and not self._stop_event.is_set():
-                asyncio.run_coroutine_threadsafe(
-                    self.start_effect(
-                        previous_effect['effect'],
-                        previous_effect['speed'],
-                        previous_effect['brightness'] # This is the relative brightness
-                    ),
-                    self._loop
-                )
-                
-        revert_thread = Thread(target=revert_after_duration)
-        revert_thread.daemon = True
-        revert_thread.start()
+    def _blank(self) -> np.ndarray:
+        """A new all-off frame"""
+        return np.zeros((self._num_pixels, 3), dtype=FRAME_DTYPE)
+
+    def _fill(self, color) -> np.ndarray:
+        """A read-only frame with every pixel set to color"""
+        return np.broadcast_to(np.asarray(color, dtype=FRAME_DTYPE), (self._num_pixels, 3))
+
+    def _compositor_loop(self):
+        """Compositor thread: advance every layer at a fixed tick and show the composite whenever it changes."""
+        tick = 1.0 / LEDConfig.COMPOSITOR_FPS
+        next_tick = time.monotonic()
+        while not self._shutdown.is_set():
+            with self._lock:
+                frame = self._layers.render(time.monotonic())
+                if frame is not None:
+                    self._show_frame(frame)
+                idle = not self._layers
+            if idle:
+                # Nothing is animating, so sleep until an effect is started
+                self._wake.wait()
+                self._wake.clear()
+                next_tick = time.monotonic()
+                continue
+            next_tick += tick
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._shutdown.wait(delay)
+            else:
+                # Overran the tick; don't try to make up for lost ticks
+                next_tick = time.monotonic()
+
+    def _push_layer(self, layer: EffectLayer):
+        with self._lock:
+            self._layers.push(layer)
+        self._wake.set()
+
+    def close(self):
+        """Stop the compositor thread and turn off all LEDs"""
+        self._shutdown.set()
+        self._wake.set()
+        self._compositor_thread.join()
+        self.clear()
 
     async def start_or_update_effect(self, effect: str, speed=None, brightness=1.0, duration=None, color: Optional[str] = None):
         """Start an LED effect if it's not already running, or update its parameters if it is.
         
         This function allows for smooth transitions in effect parameters without restarting the effect
         pattern from the beginning. If the requested effect is already running, it will only update
-        the speed and brightness. If it's a different effect, it will start the new effect.
+        the speed and brightness. If it's a different effect, or a duration is given, it will start the new effect.
         
         Args:
             effect: The name (string) of the LEDEffect to start or update
@@ -206,38 +208,35 @@ class LEDManager:
         effect_info = self._EFFECT_MAP[effect]
         effect_speed = speed if speed is not None else effect_info['default_speed']
 
-        # Store current state before any changes
-        previous_effect = None
-        if self._effect_thread is not None:
-            previous_effect = {
-                'effect': self._current_effect,
-                'speed': self._current_speed,
-                'brightness': self._current_relative_brightness # Store relative brightness
-            }
-
-        # If the same effect is already running, just update parameters
-        if effect == self._current_effect and self._effect_thread and self._effect_thread.is_alive():
-            self._current_speed = effect_speed
-            self._current_relative_brightness = brightness # Store new relative brightness
-            self._apply_brightness() # Apply combined brightness
-            logging.debug(f"Updated {effect} parameters: speed={effect_speed}, relative_brightness={brightness}, effective_brightness={self.pixels.brightness:.2f}")
-            
-            # Handle duration-based revert for parameter updates
-            if duration is not None:
-                self._setup_revert_thread(previous_effect, duration)
-        else:
-            # Different effect or no effect running, start new effect
-            await self.start_effect(effect, speed, brightness, duration, color)
+        # If the same effect is already showing, just update its layer's parameters
+        if duration is None:
+            with self._lock:
+                current = self._layers.top()
+                if current is not None and current.name == effect:
+                    # The layer rescales the effect's frame holds to the new speed
+                    current.speed = effect_speed
+                    current.brightness = brightness
+                    self._current_speed = effect_speed
+                    self._layers.invalidate()
+                    logging.debug(f"Updated {effect} parameters: speed={effect_speed}, relative_brightness={brightness}")
+                    return
+        # Different effect, no effect running, or a timed effect: start new effect
+        await self.start_effect(effect, speed, brightness, duration, color)
 
-    async def start_effect(self, effect: str, speed=None, brightness=1.0, duration=None, color: Optional[str] = None):
+    async def start_effect(self, effect: str, speed=None, brightness=1.0, duration=None, color: Optional[str] = None,
+                           blend: BlendMode = BlendMode.NORMAL):
         """Start an LED effect
         
+        Without a duration the effect replaces the current one, crossfading to it. With a duration it plays
+        as an overlay on top of the current effect, then fades out to reveal it again.
+        
         Args:
             effect: The name (string) of the LEDEffect to start
             speed: Speed of the effect (if None, uses effect's default speed)
             brightness: Relative brightness level from 0.0 to 1.0. Multiplied by the LED_BRIGHTNESS from config, and defaults to 1.0
             duration: Optional duration in milliseconds before reverting to previous effect
             color: Optional color name (used by specific effects like ROTATING_COLOR)
+            blend: How the effect combines with the effects below it
         """
         if effect not in self._EFFECT_MAP:
             raise ValueError(f"Unknown effect: {effect}")
@@ -246,24 +245,8 @@ class LEDManager:
         effect_speed = speed if speed is not None else effect_info['default_speed']
         effect_method = getattr(self, effect_info['method'])
 
-        # Store current state before stopping the effect
-        previous_effect = None
-        if self._effect_thread is not None:
-            previous_effect = {
-                'effect': self._current_effect,
-                'speed': self._current_speed,
-                'brightness': self._current_relative_brightness # Store relative brightness
-            }
-            await self.stop_effect()
-            
-        self._stop_event.clear()
-        self._current_speed = effect_speed
-        self._current_effect = effect
-        self._current_relative_brightness = brightness # Store relative brightness
-        self._apply_brightness() # Apply combined brightness
-
-        # --- Conditionally build thread arguments ---
-        thread_args = ()
+        # --- Conditionally build effect arguments ---
+        effect_args = ()
         if effect in ("ROTATING_COLOR", "ROTATING_BEACON"):
             if color is None:
                 if effect == "ROTATING_BEACON":
@@ -273,362 +256,274 @@ class LEDManager:
                     logging.error(f"Color parameter is required for {effect} but was not provided. Stopping.")
                     self.clear()
                     return
-            thread_args = (color, effect_speed)
+            effect_args = (color, effect_speed)
             logging.info(f"Starting {effect} with color '{color}' and speed {effect_speed}")
         else:
             # Default case for effects only needing speed
-            thread_args = (effect_speed,)
+            effect_args = (effect_speed,)
             logging.info(f"Starting {effect} with speed {effect_speed}")
         # --- End conditional arguments ---
 
-        self._effect_thread = Thread(target=effect_method, args=thread_args) # Use dynamic args
-        self._effect_thread.daemon = True
-        self._effect_thread.start()
-        # Logging moved up slightly to be more accurate about what *parameters* were used to start
-        # logging.info(f"Started {effect} effect with speed={effect_speed}, relative_brightness={brightness}, effective_brightness={self.pixels.brightness:.2f}")
-        
-        if duration is not None:
-            self._setup_revert_thread(previous_effect, duration)
+        if 'period' in effect_info and self._animation_cache is not None:
+            frames = self._baked_effect(effect, effect_method, effect_args, effect_info['period'])
+        else:
+            frames = effect_method(*effect_args)
 
-        self.pixels.show()
+        self._current_speed = effect_speed
+        now = time.monotonic()
+        self._push_layer(EffectLayer(
+            effect, frames,
+            kind=LayerKind.BASE if duration is None else LayerKind.OVERLAY,
+            speed=effect_speed, brightness=brightness, blend=blend,
+            expires_at=None if duration is None else now + duration / 1000,
+            fade_in=self._crossfade, now=now))
+
+    def _baked_effect(self, effect, effect_method, effect_args, period):
+        """Play a periodic effect from the animation cache, baking it the first time it's shown"""
+        *frame_args, wait = effect_args
+        # Everything the frames depend on. The speed only sets how long each frame is held.
+        key = (type(self).__name__, LEDConfig.LED_COUNT, LEDConfig.LED_COUNT_RING1, LEDConfig.LED_COUNT_RING2,
+               effect, tuple(frame_args))
+        try:
+            table = self._animation_cache.get(key, lambda: effect_method(*effect_args), period)
+        except ValueError as e:
+            logging.warning(f"Not baking {effect}: {e}. Rendering it live.")
+            yield from effect_method(*effect_args)
+            return
+        yield from play(table, wait)
+
+    def flash(self, color, pulses: int = 2, on_ms: int = 150, off_ms: int = 150, brightness: float = 1.0):
+        """Flash a color on top of whatever effect is running, e.g. for alerts. The flash removes itself when done.
+        
+        Args:
+            color: Color name or RGB tuple
+            pulses: Number of times to flash
+            on_ms: Time each flash is lit, in milliseconds
+            off_ms: Time between flashes, in milliseconds
+            brightness: Relative brightness of the flash from 0.0 to 1.0
+        """
+        rgb = COLORS.get(color, color)
+        self._push_layer(EffectLayer(
+            "FLASH", self._flash_effect(rgb, pulses, on_ms / 1000, off_ms / 1000),
+            kind=LayerKind.FLASH, brightness=brightness, blend=BlendMode.MAX, now=time.monotonic()))
 
     def show_color(self, color):
         """Show a specific color on the LEDs"""
-        self.pixels.fill(color)
-        self.pixels.show()
+        with self._lock:
+            self._show_frame(self._fill(color))
 
     def clear(self):
-        """Turn off all LEDs"""
-        self.pixels.fill((0, 0, 0))
-        self.pixels.show()
+        """Stop all effects and turn off all LEDs"""
+        with self._lock:
+            self._layers.clear()
+            self._show_frame(self._blank())
 
     async def stop_effect(self, effect_name: Optional[str] = None):
-        """Stop any running effect, or specific effect if provided and currently running"""
-        if effect_name is None or effect_name == self._current_effect:
-            self._stop_event.set()
-            if self._effect_thread:
-                await asyncio.to_thread(self._effect_thread.join)
-                self._effect_thread = None
-            self._current_effect = None
+        """Stop all effects, or fade out a specific effect if provided and currently running"""
+        if effect_name is None:
             self._current_speed = None
             self.clear()
-        else:
-            logging.info(f"Skipping stop of '{effect_name}' as it is not currently running. Currently running '{self._current_effect}'")
-
-    def _apply_brightness(self):
-        """Calculate and apply the effective brightness (base * relative) to the pixels."""
-        effective_brightness = max(0.0, min(1.0, self._base_brightness * self._current_relative_brightness))
-        self.pixels.brightness = effective_brightness
-        # No logging here to avoid spamming, logging happens in start/update methods
+            return
+        with self._lock:
+            layers = self._layers.find(effect_name)
+            now = time.monotonic()
+            for layer in layers:
+                layer.fade_out(self._crossfade, now)
+            current = self._layers.top()
+        if not layers:
+            logging.info(f"Skipping stop of '{effect_name}' as it is not currently running. "
+                         f"Currently running '{current.name if current else None}'")
 
     def set_base_brightness(self, new_base_brightness: float):
-        """Set the base brightness level and update the effective brightness."""
+        """Set the base brightness level. Effects' relative brightness is applied on top of it, per layer."""
         self._base_brightness = max(0.0, min(1.0, new_base_brightness)) # Clamp between 0.0 and 1.0
-        self._apply_brightness() # Re-apply brightness immediately
-        logging.info(f"Base brightness set to {self._base_brightness:.2f}. Effective brightness now: {self.pixels.brightness:.2f}")
+        with self._lock:
+            self.pixels.brightness = self._base_brightness
+            self._layers.invalidate()
+        logging.info(f"Base brightness set to {self._base_brightness:.2f}")
 
     def get_base_brightness(self) -> float:
         """Get the current base brightness level."""
         return self._base_brightness
 
     # ********** Effect methods **********
+    # Effects are generators run as layers by the compositor. Each yields (frame, hold): an (N, 3)
+    # uint8 RGB frame and how many seconds to show it for. Removing a layer closes its generator.
+
+    @staticmethod
+    def _gradient_colors(position, hue1, hue2, saturation, value):
+        """Colors for a gradient between two hues along positions 0.0-1.0.
+        Only 75% of the ring is lit, to save power, and it fades out at the edges for a smooth look."""
+        lit = position < 0.75
+        # Scale position to 0-1 for the lit portion of the ring
+        gradient_position = position / 0.75
+        # Interpolate hue there and back across the lit portion
+        hue = np.where(gradient_position < 0.5,
+                       hue1 + (hue2 - hue1) * (gradient_position * 2),
+                       hue2 + (hue1 - hue2) * ((gradient_position - 0.5) * 2)) % 1.0
+        # Use a sine wave for a smooth fade-in/fade-out at the gradient ends. The other 25% is off.
+        current_value = np.where(lit, value * np.sin(np.minimum(gradient_position, 1.0) * math.pi), 0.0)
+        return hsv_to_rgb8(hue, saturation, current_value)
+
+    @staticmethod
+    def _two_color_hsv(color1_name: str, color2_name: str):
+        """Hues of two named colors, with their average saturation and value"""
+        try:
+            rgb1 = COLORS[color1_name]
+            rgb2 = COLORS[color2_name]
+        except KeyError as e:
+            logging.error(f"Invalid color name for two_color_rotation: {e}. Using pink/blue.")
+            rgb1 = COLORS["pink"]
+            rgb2 = COLORS["blue"]
+
+        # Convert RGB to HSV to easily interpolate hues
+        hsv1 = colorsys.rgb_to_hsv(rgb1[0] / 255.0, rgb1[1] / 255.0, rgb1[2] / 255.0)
+        hsv2 = colorsys.rgb_to_hsv(rgb2[0] / 255.0, rgb2[1] / 255.0, rgb2[2] / 255.0)
+        # Use the average saturation and value of the input colors
+        return hsv1[0], hsv2[0], (hsv1[1] + hsv2[1]) / 2.0, (hsv1[2] + hsv2[2]) / 2.0
 
     def _blue_breathing_effect(self, wait):
         """Gentle breathing effect in a soft blue color"""
-        while not self._stop_event.is_set():
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                # Use sine wave for smooth breathing
-                brightness = (math.sin(i * math.pi / 50) + 1) / 2
-                # Soft blue color (R, G, B)
-                color = (int(0 * brightness * 255),
-                        int(0.5 * brightness * 255),
-                        int(brightness * 255))
-                self.pixels.fill(color)
-                self.pixels.show()
-                time.sleep(wait)
+        # Use sine wave for smooth breathing
+        brightness = (np.sin(np.arange(100) * math.pi / 50) + 1) / 2
+        # Soft blue color (R, G, B)
+        colors = scale_colors((0, 0.5 * 255, 255), brightness)
+        while True:
+            for color in colors:
+                yield self._fill(color), wait
 
     def _green_breathing_effect(self, wait):
         """Gentle pulsing green effect indicating active conversation"""
         base_hue = 0.3  # Green in HSV
-        while not self._stop_event.is_set():
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                # Subtle brightness pulsing
-                brightness = 0.5 + 0.3 * (math.sin(i * math.pi / 50) + 1) / 2
-                r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(base_hue, 0.8, brightness)]
-                self.pixels.fill((r, g, b))
-                self.pixels.show()
-                time.sleep(wait)
+        # Subtle brightness pulsing
+        brightness = 0.5 + 0.3 * (np.sin(np.arange(100) * math.pi / 50) + 1) / 2
+        colors = hsv_to_rgb8(base_hue, 0.8, brightness)
+        while True:
+            for color in colors:
+                yield self._fill(color), wait
 
     def _rainbow_effect(self, wait):
         """Generate rainbow colors across all pixels"""
-        while not self._stop_event.is_set():
+        while True:
             for j in range(255):
-                if self._stop_event.is_set():
-                    break
-                for i in range(LEDConfig.LED_COUNT):
-                    hue = (i / LEDConfig.LED_COUNT) + (j / 255.0)
-                    hue = hue % 1.0
-                    r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, 1.0, 1.0)]
-                    self.pixels[i] = (r, g, b)
-                self.pixels.show()
-                time.sleep(wait)
+                yield hsv_to_rgb8((self._positions + j / 255.0) % 1.0, 1.0, 1.0), wait
 
     def _rotating_pink_blue_effect(self, wait):
         """Generate a slow rotating gradient between pink and blue colors"""
         # Call the generalized method
-        self._two_color_rotation_effect("pink", "blue", wait)
+        yield from self._two_color_rotation_effect("pink", "blue", wait)
 
     def _two_color_rotation_effect(self, color1_name: str, color2_name: str, wait: float):
         """Generate a slow rotating gradient between two specified colors"""
-        try:
-            rgb1 = COLORS[color1_name]
-            rgb2 = COLORS[color2_name]
-        except KeyError as e:
-            logging.error(f"Invalid color name for two_color_rotation: {e}. Using pink/blue.")
-            rgb1 = COLORS["pink"]
-            rgb2 = COLORS["blue"]
-
-        # Convert RGB to HSV to easily interpolate hues
-        hsv1 = colorsys.rgb_to_hsv(rgb1[0] / 255.0, rgb1[1] / 255.0, rgb1[2] / 255.0)
-        hsv2 = colorsys.rgb_to_hsv(rgb2[0] / 255.0, rgb2[1] / 255.0, rgb2[2] / 255.0)
-        hue1 = hsv1[0]
-        hue2 = hsv2[0]
-        # Use the average saturation and value of the input colors
-        saturation = (hsv1[1] + hsv2[1]) / 2.0
-        value = (hsv1[2] + hsv2[2]) / 2.0
-
-        while not self._stop_event.is_set():
+        hue1, hue2, saturation, value = self._two_color_hsv(color1_name, color2_name)
+        while True:
             for j in range(100):  # Slower cycle with 100 steps
-                if self._stop_event.is_set():
-                    break
                 # Create a moving gradient across all pixels
-                for i in range(LEDConfig.LED_COUNT):
-                    # Calculate position in the gradient cycle
-                    position = (i / LEDConfig.LED_COUNT + j / 100.0) % 1.0
-
-                    # Modified logic: A portion of the ring is off to save power.
-                    # We light 75% of the ring and fade it out at the edges for a smooth look.
-                    if position < 0.75:
-                        # Scale position to 0-1 for the lit portion of the ring
-                        gradient_position = position / 0.75
-                        
-                        # Interpolate hue across the lit portion
-                        if gradient_position < 0.5:
-                            hue = hue1 + (hue2 - hue1) * (gradient_position * 2)
-                        else:
-                            hue = hue2 + (hue1 - hue2) * ((gradient_position - 0.5) * 2)
-                        hue %= 1.0
-                        
-                        # Use a sine wave for a smooth fade-in/fade-out at the gradient ends.
-                        brightness_multiplier = math.sin(gradient_position * math.pi)
-                        current_value = value * brightness_multiplier
-                        
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, saturation, current_value)]
-                        self.pixels[i] = (r, g, b)
-                    else:
-                        # The other 25% of the ring is off.
-                        self.pixels[i] = (0, 0, 0)
-
-                self.pixels.show()
-                time.sleep(wait)
+                position = (self._positions + j / 100.0) % 1.0
+                yield self._gradient_colors(position, hue1, hue2, saturation, value), wait
 
     def _random_twinkling_effect(self, wait):
         """Create random twinkling pixels with dynamic fade speeds"""
-        # Track the state of each pixel
-        pixel_states = []
-        for _ in range(LEDConfig.LED_COUNT):
-            pixel_states.append({
-                'active': False,
-                'brightness': 0.0,
-                'hue': random.random(),
-                'direction': 1
-            })
-
-        while not self._stop_event.is_set():
-            # Give each inactive pixel a small chance to start twinkling
-            for pixel in pixel_states:
-                if not pixel['active'] and random.random() < 0.01:  # 1% chance per update
-                    pixel['active'] = True
-                    pixel['brightness'] = 0.0
-                    pixel['hue'] = random.random()  # Random hue
-                    pixel['direction'] = 1
-            
-            # Update each active pixel
-            for i, pixel in enumerate(pixel_states):
-                if pixel['active']:
-                    # Calculate speed based on brightness - faster near zero
-                    speed_factor = 1.0 - (pixel['brightness'] ** 2)  # Quadratic falloff
-                    base_step = 0.02
-                    step = base_step + (base_step * 2 * speed_factor)
-                    
-                    # Update brightness
-                    pixel['brightness'] += step * pixel['direction']
-                    
-                    # Check bounds and reverse direction or deactivate
-                    if pixel['brightness'] >= 1.0:
-                        pixel['brightness'] = 1.0
-                        pixel['direction'] = -1
-                    elif pixel['brightness'] <= 0.0:
-                        if pixel['direction'] == -1:  # Only deactivate if we were fading out
-                            pixel['active'] = False
-                        pixel['brightness'] = 0.0
-                    
-                    # Set pixel color
-                    if pixel['active']:
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(pixel['hue'], 1.0, pixel['brightness'])]
-                        self.pixels[i] = (r, g, b)
-                    else:
-                        self.pixels[i] = (0, 0, 0)
-            
-            self.pixels.show()
-            time.sleep(wait)
+        # 1% chance per update for each idle pixel to start twinkling, in a random hue
+        twinkles = Twinkles(self._num_pixels, self._rng, chance=0.01, base_step=0.02)
+        while True:
+            yield twinkles.step(), wait
 
     def _rain_effect(self, wait):
         """Create a rain effect with droplets falling inward on the LED ring"""
-        # Track raindrops - each is a dict with position (0.0 to 1.0) and intensity
-        raindrops = []
-        
-        while not self._stop_event.is_set():
+        n = self._num_pixels
+        # Each raindrop has a position around the ring (0.0 to 1.0, representing 0 to 360 degrees),
+        # a radius that moves from the outer edge (0.0) inward (to 1.0), an intensity and a speed
+        position, radius, intensity, speed = (np.empty(0) for _ in range(4))
+        trail_offsets = np.arange(1, 4)  # Maximum trail length of 3
+
+        while True:
             # Chance to create new raindrop
-            if random.random() < 0.1:  # 10% chance each cycle
-                # Position is now an angle (0.0 to 1.0, representing 0 to 360 degrees)
-                raindrops.append({
-                    'position': random.random(),  # Random position around the ring
-                    'radius': 0.0,  # Start at outer edge (0.0) and move inward (to 1.0)
-                    'intensity': random.uniform(0.5, 1.0),
-                    'speed': random.uniform(0.05, 0.15)  # Speed of inward movement
-                })
-            
-            # Clear all pixels
-            self.pixels.fill((0, 0, 0))
-            
-            # Update existing raindrops
-            new_raindrops = []
-            for drop in raindrops:
-                # Update radius (moving inward)
-                drop['radius'] += drop['speed']
-                
-                # If not yet fully moved to center, draw and keep the drop
-                if drop['radius'] < 1.0:
-                    # Calculate which LED to light based on position around ring
-                    led_position = int(drop['position'] * LEDConfig.LED_COUNT) % LEDConfig.LED_COUNT
-                    intensity = drop['intensity'] * (1.0 - drop['radius'])  # Fade as it moves inward
-                    
-                    # Blue color for the raindrop
-                    blue = int(255 * intensity)
-                    white = int(20 * intensity)
-                    color = (white, white, blue)
-                    
-                    # Draw main drop pixel
-                    self.pixels[led_position] = color
-                    
-                    # Calculate splash size based on how far inward the drop has moved
-                    # No splash at start, maximum splash when halfway in
-                    splash_progress = min(1.0, drop['radius'] * 2)  # Reaches max at radius 0.5
-                    trail_length = int(splash_progress * 3)  # Maximum trail length of 3
-                    
-                    # Only draw trail if we've moved inward enough to start splashing
-                    if trail_length > 0:
-                        for i in range(1, trail_length + 1):
-                            # Calculate trail positions (both clockwise and counter-clockwise)
-                            trail_pos_cw = (led_position + i) % LEDConfig.LED_COUNT
-                            trail_pos_ccw = (led_position - i) % LEDConfig.LED_COUNT
-                            
-                            # Calculate trail intensity - reduces with distance and overall drop intensity
-                            trail_intensity = intensity * (1 - (i / (trail_length + 1))) * splash_progress * 0.7
-                            trail_blue = int(255 * trail_intensity)
-                            trail_white = int(50 * trail_intensity)  # Reduced white for trail
-                            trail_color = (trail_white, trail_white, trail_blue)
-                            
-                            # Apply trail colors
-                            self.pixels[trail_pos_cw] = self._blend_colors(
-                                self.pixels[trail_pos_cw], trail_color)
-                            self.pixels[trail_pos_ccw] = self._blend_colors(
-                                self.pixels[trail_pos_ccw], trail_color)
-                    
-                    new_raindrops.append(drop)
-            
-            raindrops = new_raindrops
-            self.pixels.show()
-            time.sleep(wait)
+            if self._rng.random() < 0.1:  # 10% chance each cycle
+                position = np.append(position, self._rng.random())
+                radius = np.append(radius, 0.0)
+                intensity = np.append(intensity, self._rng.uniform(0.5, 1.0))
+                speed = np.append(speed, self._rng.uniform(0.05, 0.15))
+
+            # Move drops inward, keeping the ones that haven't reached the center
+            radius += speed
+            keep = radius < 1.0
+            position, radius, intensity, speed = position[keep], radius[keep], intensity[keep], speed[keep]
+
+            frame = self._blank()
+            led_position = (position * n).astype(np.intp) % n
+            drop_intensity = intensity * (1.0 - radius)  # Fade as it moves inward
+            # Blue color for the raindrop, with a little white
+            np.maximum.at(frame, led_position, scale_colors((20, 20, 255), drop_intensity))
+
+            # Splash size grows as the drop moves inward: none at the start, maximum when halfway in
+            splash_progress = np.minimum(1.0, radius * 2)
+            trail_length = (splash_progress * 3).astype(np.intp)
+            in_trail = trail_offsets <= trail_length[:, None]
+            # Trail intensity reduces with distance and overall drop intensity
+            trail_intensity = (drop_intensity[:, None] * (1 - trail_offsets / (trail_length[:, None] + 1))
+                               * splash_progress[:, None] * 0.7)
+            trail_colors = scale_colors((50, 50, 255), trail_intensity[in_trail])
+            trail_center = np.broadcast_to(led_position[:, None], in_trail.shape)[in_trail]
+            trail_offset = np.broadcast_to(trail_offsets, in_trail.shape)[in_trail]
+            # Blend the trail both clockwise and counter-clockwise
+            np.maximum.at(frame, (trail_center + trail_offset) % n, trail_colors)
+            np.maximum.at(frame, (trail_center - trail_offset) % n, trail_colors)
+
+            yield frame, wait
 
     def _lightning_effect(self, wait):
         """Create a realistic lightning effect that arcs across the LED ring"""
-        while not self._stop_event.is_set():
+        n = self._num_pixels
+        # Main arc is bright white with a slight blue tint
+        arc_color = (255, 255, 255 * 1.1)
+        # Afterglow - bluish white, then dimmer and dimmer blue
+        afterglow_steps = [
+            (0.5, (100, 100, 120)),
+            (0.3, (50, 50, 80)),
+            (0.2, (20, 20, 35)),
+        ]
+        branch_steps = np.arange(5)
+
+        while True:
             # Determine direction of the lightning (clockwise or counterclockwise)
-            clockwise = random.choice([True, False])
-            
+            direction = 1 if self._rng.random() < 0.5 else -1
             # Choose random starting point
-            start_led = random.randint(0, LEDConfig.LED_COUNT - 1)
-            
+            start_led = int(self._rng.integers(n))
+
             # Main lightning strike
-            for intensity in [1.0, 0.8]:  # Two quick flashes
-                # Clear all pixels first
-                self.pixels.fill((0, 0, 0))
-                
+            for intensity in (1.0, 0.8):  # Two quick flashes
+                frame = self._blank()
+
                 # Calculate arc length (between 1/3 and 2/3 of the ring)
-                arc_length = random.randint(LEDConfig.LED_COUNT // 3, (LEDConfig.LED_COUNT * 2) // 3)
-                
-                # Create the main lightning arc
-                for i in range(arc_length):
-                    if self._stop_event.is_set():
-                        return
-                        
-                    current_pos = (start_led + (i if clockwise else -i)) % LEDConfig.LED_COUNT
-                    
-                    # Add some randomness to the arc path
-                    if random.random() < 0.3:  # 30% chance to create a branch
-                        branch_length = random.randint(2, 5)
-                        branch_direction = random.choice([1, -1])
-                        for j in range(branch_length):
-                            branch_pos = (current_pos + (j * branch_direction)) % LEDConfig.LED_COUNT
-                            # Dimmer branch
-                            brightness = min(1.0, (1 - (j / branch_length)) * intensity * 0.7)
-                            # Ensure blue tint doesn't exceed 255
-                            white_val = int(255 * brightness)
-                            blue_val = min(255, int(255 * brightness * 1.1))  # Reduced blue tint multiplier
-                            self.pixels[branch_pos] = (white_val, white_val, blue_val)
-                    
-                    # Main arc - bright white with slight blue tint
-                    brightness = min(1.0, intensity * (1 - (i / arc_length) * 0.3))  # Ensure brightness doesn't exceed 1.0
-                    # Ensure blue tint doesn't exceed 255
-                    white_val = int(255 * brightness)
-                    blue_val = min(255, int(255 * brightness * 1.1))  # Reduced blue tint multiplier
-                    self.pixels[current_pos] = (white_val, white_val, blue_val)
-                
-                self.pixels.show()
-                time.sleep(0.02)  # Quick flash
-            
-            # Afterglow effect - ensure values stay within range
-            afterglow_steps = [
-                (0.5, (100, 100, min(255, 120))),  # Bluish white
-                (0.3, (50, 50, min(255, 80))),     # Dimmer blue
-                (0.2, (20, 20, min(255, 35)))      # Very dim blue
-            ]
-            
+                arc_length = int(self._rng.integers(n // 3, (n * 2) // 3 + 1))
+                arc_steps = np.arange(arc_length)
+                arc = (start_led + direction * arc_steps) % n
+
+                # Add some randomness to the arc path: 30% chance for each arc pixel to branch
+                branching = self._rng.random(arc_length) < 0.3
+                branch_count = int(branching.sum())
+                if branch_count:
+                    branch_length = self._rng.integers(2, 6, branch_count)[:, None]
+                    branch_direction = self._rng.choice((1, -1), branch_count)[:, None]
+                    in_branch = branch_steps < branch_length
+                    branch_pos = (arc[branching][:, None] + branch_steps * branch_direction) % n
+                    # Dimmer branch
+                    brightness = np.minimum(1.0, (1 - branch_steps / branch_length) * intensity * 0.7)
+                    frame[branch_pos[in_branch]] = scale_colors(arc_color, brightness[in_branch])
+
+                brightness = np.minimum(1.0, intensity * (1 - (arc_steps / arc_length) * 0.3))
+                frame[arc] = scale_colors(arc_color, brightness)
+                yield frame, 0.02  # Quick flash
+
+            # Apply afterglow only to the pixels that were part of the lightning
             for brightness, color in afterglow_steps:
-                if self._stop_event.is_set():
-                    return
-                    
-                # Apply afterglow only to the pixels that were part of the lightning
-                for i in range(arc_length):
-                    current_pos = (start_led + (i if clockwise else -i)) % LEDConfig.LED_COUNT
-                    # Ensure color values stay within range
-                    safe_color = tuple(min(255, int(c * brightness)) for c in color)
-                    self.pixels[current_pos] = safe_color
-                self.pixels.show()
-                time.sleep(0.05)
-            
-            # Clear and wait for next strike
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
-            
-            # Random wait between lightning strikes
-            time.sleep(random.uniform(0.3, 2.0))
+                frame = self._blank()
+                frame[arc] = scale_colors(color, brightness)
+                yield frame, 0.05
+
+            # Clear and wait a random time for the next strike
+            yield self._blank(), self._rng.uniform(0.3, 2.0)
 
     def _purring_effect(self, wait):
         """Create a gentle pulsing effect that simulates a cat's purring.
@@ -636,294 +531,148 @@ class LEDManager:
         A faster stroke will create a more rapid purring effect."""
         # Warm, gentle color for the purr (soft peachy-pink)
         base_color = (255, 180, 147)  # RGB values for a warm, cozy glow
-        
-        while not self._stop_event.is_set():
-            # Create two pulses per cycle to simulate the inhale/exhale of purring
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                    
-                # Use two overlapping sine waves to create a more natural purring rhythm
-                wave1 = math.sin(i * math.pi / 25)  # Faster wave
-                wave2 = math.sin(i * math.pi / 50)  # Slower wave
-                
-                # # Calculate brightness variation - varies between 0.3 and 1.0
-                brightness = 0.3 + (((wave1 + wave2 + 2) / 4) * 0.7)
-
-            #    # Calculate base variation and scale it based on global brightness
-            #     base_variation = ((wave1 + wave2 + 2) / 4)  # Normalized to 0-1 range
-            #     # Scale variation to be proportional to global brightness
-            #     # At low brightness, reduce the variation range to be more subtle
-            #     variation_range = 0.3 * self.pixels.brightness  # Smaller range at lower brightness
-            #     min_brightness = 1.0 - variation_range  # Higher minimum at lower brightness
-            #     brightness = min_brightness + (base_variation * variation_range)
-
-                # Apply brightness to base color
-                color = tuple(int(c * brightness) for c in base_color)
-                self.pixels.fill(color)
-                self.pixels.show()
-                time.sleep(wait)
+        # Two pulses per cycle simulate the inhale/exhale of purring, using two overlapping
+        # sine waves for a more natural rhythm
+        steps = np.arange(100)
+        wave1 = np.sin(steps * math.pi / 25)  # Faster wave
+        wave2 = np.sin(steps * math.pi / 50)  # Slower wave
+        # Brightness varies between 0.3 and 1.0
+        colors = scale_colors(base_color, 0.3 + ((wave1 + wave2 + 2) / 4) * 0.7)
+        while True:
+            for color in colors:
+                yield self._fill(color), wait
 
     def _rotating_color_effect(self, color, wait):
         """Create a rotating color effect that oscillates around the given color"""
-        while not self._stop_event.is_set():
-            rgb_base_color = COLORS[color]
-            for i in range(self.pixels.n):
-                if self._stop_event.is_set():
-                    break
-
-                # Calculate the color for the current pixel
-                hue = (i / self.pixels.n) + (time.time() % 1)
-                hue = hue % 1.0  # Ensure hue stays within [0, 1] range
-                r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                
-                # Apply brightness to the color
-                brightness = self._current_relative_brightness  # Use the current relative brightness
-                r = int(r * rgb_base_color[0] * brightness)
-                g = int(g * rgb_base_color[1] * brightness)
-                b = int(b * rgb_base_color[2] * brightness)
-
-                self.pixels[i] = (r, g, b)
-            
-            self.pixels.show()
-            time.sleep(wait)
+        rgb_base_color = COLORS[color]
+        while True:
+            # Hue rotates with time, and is modulated by the base color. The layer applies relative brightness.
+            hue = (self._positions + (time.time() % 1)) % 1.0
+            colors = hsv_to_rgb(hue, 1.0, 1.0) * rgb_base_color
+            yield colors.astype(FRAME_DTYPE), wait
 
     def _rotating_green_yellow_effect(self, wait):
         """Generate a slow rotating gradient between magic green and magic blue colors"""
         # Call the generalized method with custom colors
-        self._two_color_rotation_effect("magic_green", "magic_blue", wait)
+        yield from self._two_color_rotation_effect("magic_green", "magic_blue", wait)
+
+    # Define magical colors
+    _SPELL_COLORS = np.array([
+        (138, 43, 226),   # Blue Violet
+        (255, 0, 255),    # Magenta
+        (0, 191, 255),    # Deep Sky Blue
+        (255, 20, 147),   # Deep Pink
+        (148, 0, 211),    # Dark Violet
+    ], dtype=np.float64)
 
     def _magical_spell_effect(self, wait):
         """Create a magical spell casting effect with charging, burst, and sparkle phases"""
-        # Define magical colors
-        spell_colors = [
-            (138, 43, 226),   # Blue Violet
-            (255, 0, 255),    # Magenta
-            (0, 191, 255),    # Deep Sky Blue
-            (255, 20, 147),   # Deep Pink
-            (148, 0, 211),    # Dark Violet
-        ]
-        
-        while not self._stop_event.is_set():
+        n = self._num_pixels
+        spell_colors = self._SPELL_COLORS
+        num_colors = len(spell_colors)
+
+        while True:
             # Phase 1: Charging (1-2 seconds)
-            charge_duration = random.uniform(1.0, 2.0)
-            charge_steps = int(charge_duration / wait)
-            
+            charge_steps = int(self._rng.uniform(1.0, 2.0) / wait)
+            frame = self._blank()
             for step in range(charge_steps):
-                if self._stop_event.is_set():
-                    break
-                
                 # Calculate charge intensity (0 to 1)
                 charge_progress = step / charge_steps
-                
-                # Create swirling effect during charge
-                for i in range(LEDConfig.LED_COUNT):
-                    # Multiple color waves at different speeds
-                    wave1 = math.sin((i / LEDConfig.LED_COUNT + step * 0.1) * math.pi * 2) * 0.5 + 0.5
-                    wave2 = math.sin((i / LEDConfig.LED_COUNT - step * 0.15) * math.pi * 3) * 0.5 + 0.5
-                    
-                    # Pick color based on position and time
-                    color_index = int((wave1 + step * 0.05) * len(spell_colors)) % len(spell_colors)
-                    base_color = spell_colors[color_index]
-                    
-                    # Intensity increases as we charge
-                    intensity = charge_progress * wave2 * 0.8
-                    
-                    # Add some random flickering
-                    if random.random() < 0.1:
-                        intensity *= random.uniform(0.7, 1.3)
-                    
-                    intensity = min(1.0, intensity)
-                    
-                    color = tuple(int(c * intensity) for c in base_color)
-                    self.pixels[i] = color
-                
-                self.pixels.show()
-                time.sleep(wait)
-            
-            # Phase 2: Cast burst (0.2-0.4 seconds)
-            burst_duration = random.uniform(0.2, 0.4)
-            burst_steps = max(1, int(burst_duration / wait))
-            burst_center = random.randint(0, LEDConfig.LED_COUNT - 1)
-            
+                # Create swirling effect: multiple color waves at different speeds
+                wave1 = np.sin((self._positions + step * 0.1) * math.pi * 2) * 0.5 + 0.5
+                wave2 = np.sin((self._positions - step * 0.15) * math.pi * 3) * 0.5 + 0.5
+                # Pick color based on position and time
+                color_index = ((wave1 + step * 0.05) * num_colors).astype(np.intp) % num_colors
+                # Intensity increases as we charge, with some random flickering
+                intensity = charge_progress * wave2 * 0.8
+                flicker = self._rng.random(n) < 0.1
+                intensity[flicker] *= self._rng.uniform(0.7, 1.3, int(flicker.sum()))
+                frame = scale_colors(spell_colors[color_index], np.minimum(1.0, intensity))
+                yield frame, wait
+
+            # Phase 2: Cast burst (0.2-0.4 seconds), an expanding ring blended over the charge
+            burst_steps = max(1, int(self._rng.uniform(0.2, 0.4) / wait))
+            burst_center = int(self._rng.integers(n))
+            # Normalized distance from burst center
+            norm_distance = ring_distance(np.arange(n), burst_center, n) / (n / 2)
+            ring_width = 0.3
             for step in range(burst_steps):
-                if self._stop_event.is_set():
-                    break
-                
                 burst_progress = step / burst_steps
-                
-                # Create expanding ring effect
-                for i in range(LEDConfig.LED_COUNT):
-                    # Calculate distance from burst center
-                    distance = min(abs(i - burst_center), 
-                                 abs(i - burst_center + LEDConfig.LED_COUNT),
-                                 abs(i - burst_center - LEDConfig.LED_COUNT))
-                    
-                    # Normalize distance
-                    norm_distance = distance / (LEDConfig.LED_COUNT / 2)
-                    
-                    # Calculate if this pixel is in the current ring
-                    ring_position = burst_progress * 1.5  # Ring expands beyond 1.0
-                    ring_width = 0.3
-                    
-                    if abs(norm_distance - ring_position) < ring_width:
-                        # Pixel is in the ring
-                        ring_intensity = 1.0 - abs(norm_distance - ring_position) / ring_width
-                        ring_intensity *= (1.0 - burst_progress * 0.5)  # Fade as it expands
-                        
-                        # Bright white-ish color for the burst
-                        color = (int(255 * ring_intensity),
-                                int(200 * ring_intensity),
-                                int(255 * ring_intensity))
-                    else:
-                        color = (0, 0, 0)
-                    
-                    self.pixels[i] = self._blend_colors(self.pixels[i], color)
-                
-                self.pixels.show()
-                time.sleep(wait)
-            
+                ring_position = burst_progress * 1.5  # Ring expands beyond 1.0
+                ring_offset = np.abs(norm_distance - ring_position)
+                # Fade as it expands
+                ring_intensity = np.where(ring_offset < ring_width,
+                                          (1.0 - ring_offset / ring_width) * (1.0 - burst_progress * 0.5), 0.0)
+                # Bright white-ish color for the burst
+                frame = np.maximum(frame, scale_colors((255, 200, 255), ring_intensity))
+                yield frame, wait
+
             # Phase 3: Magical sparkles (1-2 seconds)
-            sparkle_duration = random.uniform(1.0, 2.0)
-            sparkle_steps = int(sparkle_duration / wait)
-            
-            # Initialize sparkle particles
-            sparkles = []
-            for _ in range(random.randint(10, 20)):
-                sparkles.append({
-                    'position': random.randint(0, LEDConfig.LED_COUNT - 1),
-                    'lifetime': random.uniform(0.3, 1.0),
-                    'age': 0.0,
-                    'color': random.choice(spell_colors),
-                    'twinkle_speed': random.uniform(5, 15)
-                })
-            
+            sparkle_steps = int(self._rng.uniform(1.0, 2.0) / wait)
+            sparkles = Sparkles()
+            count = int(self._rng.integers(10, 21))
+            sparkles.add(self._rng.integers(0, n, count), self._rng.uniform(0.3, 1.0, count),
+                         spell_colors[self._rng.integers(0, num_colors, count)], self._rng.uniform(5, 15, count))
             for step in range(sparkle_steps):
-                if self._stop_event.is_set():
-                    break
-                
-                # Clear pixels
-                self.pixels.fill((0, 0, 0))
-                
-                # Update and draw sparkles
-                active_sparkles = []
-                for sparkle in sparkles:
-                    sparkle['age'] += wait
-                    
-                    if sparkle['age'] < sparkle['lifetime']:
-                        # Calculate sparkle intensity
-                        age_factor = 1.0 - (sparkle['age'] / sparkle['lifetime'])
-                        twinkle = (math.sin(sparkle['age'] * sparkle['twinkle_speed']) + 1) / 2
-                        intensity = age_factor * twinkle
-                        
-                        # Apply color
-                        color = tuple(int(c * intensity) for c in sparkle['color'])
-                        pos = sparkle['position']
-                        self.pixels[pos] = self._blend_colors(self.pixels[pos], color)
-                        
-                        # Small chance to create a new sparkle nearby
-                        if random.random() < 0.05 and len(active_sparkles) < 30:
-                            new_pos = (pos + random.randint(-2, 2)) % LEDConfig.LED_COUNT
-                            active_sparkles.append({
-                                'position': new_pos,
-                                'lifetime': random.uniform(0.2, 0.5),
-                                'age': 0.0,
-                                'color': sparkle['color'],
-                                'twinkle_speed': random.uniform(8, 20)
-                            })
-                        
-                        active_sparkles.append(sparkle)
-                
-                sparkles = active_sparkles
-                self.pixels.show()
-                time.sleep(wait)
-            
+                colors = sparkles.step(wait)
+                frame = self._blank()
+                np.maximum.at(frame, sparkles.position, colors)
+
+                # Small chance to create a new sparkle nearby, up to 30 in total
+                spawning = np.flatnonzero(self._rng.random(len(sparkles)) < 0.05)[:max(0, 30 - len(sparkles))]
+                if len(spawning):
+                    count = len(spawning)
+                    sparkles.add((sparkles.position[spawning] + self._rng.integers(-2, 3, count)) % n,
+                                 self._rng.uniform(0.2, 0.5, count), sparkles.color[spawning],
+                                 self._rng.uniform(8, 20, count))
+                yield frame, wait
+
             # Brief pause before next spell
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
-            time.sleep(random.uniform(0.3, 0.8))
+            yield self._blank(), self._rng.uniform(0.3, 0.8)
 
     def _sparkling_pink_blue_effect(self, wait):
         """A low-power twinkling effect using a pink and blue palette."""
-        pixel_states = [{'active': False, 'brightness': 0.0, 'hue': 0.0, 'direction': 1} for _ in range(LEDConfig.LED_COUNT)]
-        
         # Pre-calculate pink and blue hues
         pink_hue = colorsys.rgb_to_hsv(*[c/255.0 for c in COLORS["pink"]])[0]
         blue_hue = colorsys.rgb_to_hsv(*[c/255.0 for c in COLORS["blue"]])[0]
-        palette = [pink_hue, blue_hue]
-
-        while not self._stop_event.is_set():
-            # Chance for inactive pixels to start twinkling
-            for pixel in pixel_states:
-                if not pixel['active'] and random.random() < 0.02: # Slightly higher activation chance
-                    pixel['active'] = True
-                    pixel['brightness'] = 0.0
-                    pixel['hue'] = random.choice(palette)
-                    pixel['direction'] = 1
-            
-            # Update active pixels
-            for i, pixel in enumerate(pixel_states):
-                if pixel['active']:
-                    speed_factor = 1.0 - (pixel['brightness'] ** 2)
-                    base_step = 0.03 # A bit faster twinkling
-                    step = base_step + (base_step * 2 * speed_factor)
-                    
-                    pixel['brightness'] += step * pixel['direction']
-                    
-                    if pixel['brightness'] >= 1.0:
-                        pixel['brightness'] = 1.0
-                        pixel['direction'] = -1
-                    elif pixel['brightness'] <= 0.0:
-                        if pixel['direction'] == -1:
-                            pixel['active'] = False
-                        pixel['brightness'] = 0.0
-                    
-                    if pixel['active']:
-                        # Use a fixed saturation for more vibrant colors
-                        saturation = 0.85 
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(pixel['hue'], saturation, pixel['brightness'])]
-                        self.pixels[i] = (r, g, b)
-                    else:
-                        self.pixels[i] = (0, 0, 0)
-            
-            self.pixels.show()
-            time.sleep(wait)
+        # Slightly higher activation chance, a bit faster twinkling and a fixed saturation
+        # for more vibrant colors
+        twinkles = Twinkles(self._num_pixels, self._rng, chance=0.02, base_step=0.03,
+                            saturation=0.85, palette=[pink_hue, blue_hue])
+        while True:
+            yield twinkles.step(), wait
 
     def _rotating_beacon_effect(self, color_name, wait):
         """A rotating light with a fading tail, in a specified color."""
         if color_name not in COLORS:
             logging.error(f"Invalid color name '{color_name}' for rotating_beacon. Defaulting to green.")
             color_name = 'green'
-        
+
+        n = self._num_pixels
         head_color = COLORS[color_name]
         trail_length = 8
-        
+        trail_offsets = np.arange(1, trail_length + 1)
         # Create a color palette for the trail with exponential decay
-        trail_colors = [tuple(int(c * math.pow(0.65, i)) for c in head_color) for i in range(1, trail_length + 1)]
+        trail_colors = scale_colors(head_color, np.power(0.65, trail_offsets))
 
         position = 0
-        while not self._stop_event.is_set():
-            if self._stop_event.is_set():
-                break
-
-            self.pixels.fill((0, 0, 0))
-
-            # Draw the head
-            head_pixel_index = int(position) % LEDConfig.LED_COUNT
-            self.pixels[head_pixel_index] = head_color
-
-            # Draw the trail
-            for i in range(trail_length):
-                pixel_index = (int(position) - 1 - i + LEDConfig.LED_COUNT) % LEDConfig.LED_COUNT
-                if i < len(trail_colors):
-                    self.pixels[pixel_index] = trail_colors[i]
-            
-            self.pixels.show()
-
-            # Using self._current_speed allows for dynamic updates from start_or_update_effect.
-            # A lower speed value (wait time) means a faster rotation.
-            time.sleep(self._current_speed)
-            position = (position + 1) % LEDConfig.LED_COUNT
+        while True:
+            frame = self._blank()
+            # Draw the head, then the trail behind it
+            frame[position] = head_color
+            frame[(position - trail_offsets) % n] = trail_colors
+
+            # A lower speed value (wait time) means a faster rotation
+            yield frame, wait
+            position = (position + 1) % n
+
+    def _flash_effect(self, color, pulses, on_seconds, off_seconds):
+        """Pulses of a solid color, played by flash() as a transient layer over the current effect"""
+        lit = self._fill(color)
+        dark = self._blank()
+        for _ in range(pulses):
+            yield lit, on_seconds
+            yield dark, off_seconds
 
 class LEDManagerRings(LEDManager):
     """
@@ -935,6 +684,9 @@ class LEDManagerRings(LEDManager):
         super().__init__(initial_brightness)
         if LEDConfig.LED_COUNT != (LEDConfig.LED_COUNT_RING1 + LEDConfig.LED_COUNT_RING2):
             logging.warning(f"LED_COUNT ({LEDConfig.LED_COUNT}) does not match sum of RING1 ({LEDConfig.LED_COUNT_RING1}) and RING2 ({LEDConfig.LED_COUNT_RING2}). Ring slicing might be incorrect.")
+        # Each pixel's position around its own ring, 0.0 to 1.0
+        self._ring1_positions = np.arange(LEDConfig.LED_COUNT_RING1) / max(1, LEDConfig.LED_COUNT_RING1)
+        self._ring2_positions = np.arange(LEDConfig.LED_COUNT_RING2) / max(1, LEDConfig.LED_COUNT_RING2)
         logging.info(f"LEDManagerRings initialized for dual rings: Ring 1 ({LEDConfig.LED_COUNT_RING1} LEDs), Ring 2 ({LEDConfig.LED_COUNT_RING2} LEDs)")
 
     @property
@@ -947,284 +699,102 @@ class LEDManagerRings(LEDManager):
         """Returns a slice representing the pixels of the second (inner) ring."""
         return self.pixels[LEDConfig.LED_COUNT_RING1:LEDConfig.LED_COUNT]
 
+    def _rings_frame(self, outer, inner) -> np.ndarray:
+        """A frame from the colors of each ring: a single color for the whole ring or one per pixel."""
+        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
+        frame = self._blank()
+        frame[:num_leds_ring1] = outer
+        frame[num_leds_ring1:num_leds_ring1 + LEDConfig.LED_COUNT_RING2] = inner
+        return frame
+
     def _blue_breathing_effect(self, wait):
         """Gentle blue breathing, inner ring slightly out of phase."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-        
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Blue breathing effect requires both rings to have LEDs. Falling back to default.")
-            return super()._blue_breathing_effect(wait)
+            yield from super()._blue_breathing_effect(wait)
+            return
 
         phase_offset = math.pi / 2 # 90 degrees out of phase
+        angle_outer = np.arange(100) * math.pi / 50
+        angle_inner = angle_outer + phase_offset
+        colors_outer = scale_colors((0, 0.5 * 255, 255), (np.sin(angle_outer) + 1) / 2)
+        colors_inner = scale_colors((0, 0.5 * 255, 255), (np.sin(angle_inner) + 1) / 2)
 
-        while not self._stop_event.is_set():
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                
-                # Calculate brightness for outer ring
-                angle_outer = i * math.pi / 50
-                brightness_outer = (math.sin(angle_outer) + 1) / 2
-                color_outer = (int(0 * brightness_outer * 255),
-                               int(0.5 * brightness_outer * 255),
-                               int(brightness_outer * 255))
-
-                # Calculate brightness for inner ring (out of phase)
-                angle_inner = angle_outer + phase_offset
-                brightness_inner = (math.sin(angle_inner) + 1) / 2
-                color_inner = (int(0 * brightness_inner * 255),
-                               int(0.5 * brightness_inner * 255),
-                               int(brightness_inner * 255))
-
-                # Apply colors to rings
-                for idx in range(num_leds_ring1):
-                    self.pixels[idx] = color_outer
-                for idx in range(num_leds_ring2):
-                    self.pixels[num_leds_ring1 + idx] = color_inner
-                    
-                self.pixels.show()
-                time.sleep(wait)
+        while True:
+            for color_outer, color_inner in zip(colors_outer, colors_inner):
+                yield self._rings_frame(color_outer, color_inner), wait
 
     def _green_breathing_effect(self, wait):
         """Override: Gentle green breathing, inner ring slightly out of phase."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Green breathing effect requires both rings to have LEDs. Falling back to default.")
-            return super()._green_breathing_effect(wait)
+            yield from super()._green_breathing_effect(wait)
+            return
 
         base_hue = 0.3  # Green in HSV
         phase_offset = math.pi / 2 # 90 degrees out of phase
+        angle_outer = np.arange(100) * math.pi / 50
+        angle_inner = angle_outer + phase_offset
+        # Subtle brightness pulsing (0.5 to 0.8)
+        colors_outer = hsv_to_rgb8(base_hue, 0.8, 0.5 + 0.3 * (np.sin(angle_outer) + 1) / 2)
+        colors_inner = hsv_to_rgb8(base_hue, 0.8, 0.5 + 0.3 * (np.sin(angle_inner) + 1) / 2)
 
-        while not self._stop_event.is_set():
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                
-                # Calculate brightness for outer ring
-                angle_outer = i * math.pi / 50
-                # Subtle brightness pulsing (0.5 to 0.8)
-                brightness_outer = 0.5 + 0.3 * (math.sin(angle_outer) + 1) / 2
-                r_outer, g_outer, b_outer = [int(x * 255) for x in colorsys.hsv_to_rgb(base_hue, 0.8, brightness_outer)]
-                color_outer = (r_outer, g_outer, b_outer)
-
-                # Calculate brightness for inner ring (out of phase)
-                angle_inner = angle_outer + phase_offset
-                brightness_inner = 0.5 + 0.3 * (math.sin(angle_inner) + 1) / 2
-                r_inner, g_inner, b_inner = [int(x * 255) for x in colorsys.hsv_to_rgb(base_hue, 0.8, brightness_inner)]
-                color_inner = (r_inner, g_inner, b_inner)
-
-                # Apply colors to rings
-                for idx in range(num_leds_ring1):
-                    self.pixels[idx] = color_outer
-                for idx in range(num_leds_ring2):
-                    self.pixels[num_leds_ring1 + idx] = color_inner
-                    
-                self.pixels.show()
-                time.sleep(wait)
+        while True:
+            for color_outer, color_inner in zip(colors_outer, colors_inner):
+                yield self._rings_frame(color_outer, color_inner), wait
 
     def _rotating_pink_blue_effect(self, wait):
         """Override: Generate rotating gradients between pink and blue, counter-rotating on the inner ring."""
         # Call the generalized method for rings
-        self._two_color_rotation_effect("pink", "blue", wait)
+        yield from self._two_color_rotation_effect("pink", "blue", wait)
 
     def _two_color_rotation_effect(self, color1_name: str, color2_name: str, wait: float):
         """Override: Generate rotating gradients between two specified colors, counter-rotating on the inner ring."""
-        try:
-            rgb1 = COLORS[color1_name]
-            rgb2 = COLORS[color2_name]
-        except KeyError as e:
-            logging.error(f"Invalid color name for two_color_rotation (rings): {e}. Using pink/blue.")
-            rgb1 = COLORS["pink"]
-            rgb2 = COLORS["blue"]
+        hue1, hue2, saturation, value = self._two_color_hsv(color1_name, color2_name)
 
-        # Convert RGB to HSV
-        hsv1 = colorsys.rgb_to_hsv(rgb1[0] / 255.0, rgb1[1] / 255.0, rgb1[2] / 255.0)
-        hsv2 = colorsys.rgb_to_hsv(rgb2[0] / 255.0, rgb2[1] / 255.0, rgb2[2] / 255.0)
-        hue1 = hsv1[0]
-        hue2 = hsv2[0]
-        # Use the average saturation and value of the input colors
-        saturation = (hsv1[1] + hsv2[1]) / 2.0
-        value = (hsv1[2] + hsv2[2]) / 2.0
-
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Two color rotation effect requires both rings to have LEDs. Stopping effect.")
-            self.clear()
             return
 
-        while not self._stop_event.is_set():
+        while True:
             for j in range(100):  # Cycle steps
-                if self._stop_event.is_set():
-                    break
-
-                # Outer ring (Ring 1) - Normal rotation
-                for i in range(num_leds_ring1):
-                    position = (i / num_leds_ring1 + j / 100.0) % 1.0
-                    if position < 0.75:
-                        gradient_position = position / 0.75
-                        if gradient_position < 0.5:
-                            hue = hue1 + (hue2 - hue1) * (gradient_position * 2)
-                        else:
-                            hue = hue2 + (hue1 - hue2) * ((gradient_position - 0.5) * 2)
-                        hue %= 1.0
-                        brightness_multiplier = math.sin(gradient_position * math.pi)
-                        current_value = value * brightness_multiplier
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, saturation, current_value)]
-                        self.pixels[i] = (r, g, b)
-                    else:
-                        self.pixels[i] = (0, 0, 0)
-
-                # Inner ring (Ring 2) - Counter-rotation
-                for i in range(num_leds_ring2):
-                    # Use negative j for counter-rotation
-                    position = (i / num_leds_ring2 - j / 100.0) % 1.0
-                    if position < 0.75:
-                        gradient_position = position / 0.75
-                        if gradient_position < 0.5:
-                            hue = hue1 + (hue2 - hue1) * (gradient_position * 2)
-                        else:
-                            hue = hue2 + (hue1 - hue2) * ((gradient_position - 0.5) * 2)
-                        hue %= 1.0
-                        brightness_multiplier = math.sin(gradient_position * math.pi)
-                        current_value = value * brightness_multiplier
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, saturation, current_value)]
-                        # Apply to the correct slice of pixels
-                        self.pixels[num_leds_ring1 + i] = (r, g, b)
-                    else:
-                        self.pixels[num_leds_ring1 + i] = (0, 0, 0)
-
-                self.pixels.show()
-                time.sleep(wait)
+                # Outer ring (Ring 1) - Normal rotation. Inner ring (Ring 2) - Counter-rotation
+                position_outer = (self._ring1_positions + j / 100.0) % 1.0
+                position_inner = (self._ring2_positions - j / 100.0) % 1.0
+                yield self._rings_frame(
+                    self._gradient_colors(position_outer, hue1, hue2, saturation, value),
+                    self._gradient_colors(position_inner, hue1, hue2, saturation, value),
+                ), wait
 
     def _rainbow_effect(self, wait):
         """Override: Generate counter-rotating rainbow colors on the two rings."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Rotating rainbow effect requires both rings to have LEDs. Falling back to default.")
             # Fallback to the original implementation if rings aren't configured properly
-            return super()._rainbow_effect(wait)
+            yield from super()._rainbow_effect(wait)
+            return
 
-        while not self._stop_event.is_set():
+        while True:
             for j in range(255):
-                if self._stop_event.is_set():
-                    break
-
-                # Outer ring (Ring 1) - Clockwise rotation
-                for i in range(num_leds_ring1):
-                    hue = (i / num_leds_ring1 + j / 255.0) % 1.0
-                    r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, 1.0, 1.0)]
-                    self.pixels[i] = (r, g, b)
-
-                # Inner ring (Ring 2) - Counter-clockwise rotation
-                for i in range(num_leds_ring2):
-                    # Use negative j for counter-rotation
-                    hue = (i / num_leds_ring2 - j / 255.0) % 1.0
-                    r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(hue, 1.0, 1.0)]
-                    # Apply to the correct slice of pixels
-                    self.pixels[num_leds_ring1 + i] = (r, g, b)
-
-                self.pixels.show()
-                time.sleep(wait)
+                # Outer ring (Ring 1) - Clockwise rotation. Inner ring (Ring 2) - Counter-clockwise rotation
+                yield self._rings_frame(
+                    hsv_to_rgb8((self._ring1_positions + j / 255.0) % 1.0, 1.0, 1.0),
+                    hsv_to_rgb8((self._ring2_positions - j / 255.0) % 1.0, 1.0, 1.0),
+                ), wait
 
     def _random_twinkling_effect(self, wait):
-        """Override: Create random twinkling pixels on the outer ring and a slow white pulse on the inner ring."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        """Override: Create random twinkling pixels on the outer ring and faster colorful twinkling on the inner ring."""
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Random twinkling effect requires both rings to have LEDs. Falling back to default.")
-            return super()._random_twinkling_effect(wait)
-
-        # Track the state of each pixel for the outer ring
-        pixel_states_ring1 = [{'active': False, 'brightness': 0.0, 'hue': random.random(), 'direction': 1} for _ in range(num_leds_ring1)]
-        # Track the state of each pixel for the inner ring
-        pixel_states_ring2 = [{'active': False, 'brightness': 0.0, 'hue': random.random(), 'direction': 1} for _ in range(num_leds_ring2)]
-        # Parameters for inner ring twinkling
-        inner_ring_activation_chance = 0.02 # Double the chance of the outer ring (0.01)
-        inner_ring_base_step = 0.04 # Double the base speed of the outer ring (0.02)
-
-        while not self._stop_event.is_set():
-            # Update Ring 1 (Outer Ring) - Twinkling
-            for i, pixel in enumerate(pixel_states_ring1):
-                # Chance to activate
-                if not pixel['active'] and random.random() < 0.01: # Outer ring activation chance
-                    pixel['active'] = True
-                    pixel['brightness'] = 0.0
-                    pixel['hue'] = random.random()
-                    pixel['direction'] = 1
-
-                # Update active pixel
-                if pixel['active']:
-                    speed_factor = 1.0 - (pixel['brightness'] ** 2)
-                    base_step = 0.02 # Outer ring base step
-                    step = base_step + (base_step * 2 * speed_factor)
-                    pixel['brightness'] += step * pixel['direction']
-
-                    # Check bounds
-                    if pixel['brightness'] >= 1.0:
-                        pixel['brightness'] = 1.0
-                        pixel['direction'] = -1
-                    elif pixel['brightness'] <= 0.0:
-                        if pixel['direction'] == -1:
-                             # Only deactivate when fading out
-                            pixel['active'] = False
-                        pixel['brightness'] = 0.0
-
-                    # Set pixel color
-                    if pixel['active']:
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(pixel['hue'], 1.0, pixel['brightness'])]
-                        self.pixels[i] = (r, g, b)
-                    else:
-                         # Ensure pixel is off when deactivated after fading
-                        self.pixels[i] = (0, 0, 0)
-                elif not pixel['active']: # Ensure inactive pixels are off
-                    self.pixels[i] = (0, 0, 0)
-
-            # Update Ring 2 (Inner Ring) - Faster Colorful Twinkling
-            for i, pixel in enumerate(pixel_states_ring2):
-                pixel_index_in_strip = num_leds_ring1 + i
-                # Chance to activate
-                if not pixel['active'] and random.random() < inner_ring_activation_chance:
-                    pixel['active'] = True
-                    pixel['brightness'] = 0.0
-                    pixel['hue'] = random.random()
-                    pixel['direction'] = 1
-
-                # Update active pixel
-                if pixel['active']:
-                    speed_factor = 1.0 - (pixel['brightness'] ** 2)
-                    step = inner_ring_base_step + (inner_ring_base_step * 2 * speed_factor)
-                    pixel['brightness'] += step * pixel['direction']
-
-                    # Check bounds
-                    if pixel['brightness'] >= 1.0:
-                        pixel['brightness'] = 1.0
-                        pixel['direction'] = -1
-                    elif pixel['brightness'] <= 0.0:
-                        if pixel['direction'] == -1:
-                             # Only deactivate when fading out
-                            pixel['active'] = False
-                        pixel['brightness'] = 0.0
-
-                    # Set pixel color
-                    if pixel['active']:
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(pixel['hue'], 1.0, pixel['brightness'])]
-                        self.pixels[pixel_index_in_strip] = (r, g, b)
-                    else:
-                         # Ensure pixel is off when deactivated after fading
-                        self.pixels[pixel_index_in_strip] = (0, 0, 0)
-                elif not pixel['active']: # Ensure inactive pixels are off
-                    self.pixels[pixel_index_in_strip] = (0, 0, 0)
-
-            self.pixels.show()
-            time.sleep(wait)
+            yield from super()._random_twinkling_effect(wait)
+            return
+
+        twinkles_ring1 = Twinkles(LEDConfig.LED_COUNT_RING1, self._rng, chance=0.01, base_step=0.02)
+        # Inner ring twinkles with double the chance and double the base speed of the outer ring
+        twinkles_ring2 = Twinkles(LEDConfig.LED_COUNT_RING2, self._rng, chance=0.02, base_step=0.04)
+
+        while True:
+            yield self._rings_frame(twinkles_ring1.step(), twinkles_ring2.step()), wait
 
     def _rain_effect(self, wait):
         """Override: Rain appears as a splash on the inner ring, then falls to the outer ring and fades."""
@@ -1232,102 +802,68 @@ class LEDManagerRings(LEDManager):
         num_leds_ring2 = LEDConfig.LED_COUNT_RING2
         if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
             logging.warning("Rain effect requires both rings to have LEDs. Falling back to default.")
-            return super()._rain_effect(wait)
+            yield from super()._rain_effect(wait)
+            return
 
-        raindrops = [] # List to store active raindrops
-        # Phase durations (these are relative multipliers for 'wait')
-        splash_duration_factor = 15
-        fall_duration_factor = 10
-        fade_duration_factor = 50
+        # Drop phases, with durations that are relative multipliers for 'wait'
+        INNER_SPLASH, OUTER_FALL, OUTER_FADE, DONE = range(4)
+        phase_duration_factors = np.array([15, 10, 50])
 
         # Splash visual parameters
         splash_color = (180, 255, 255) # Bright cyan/white
         splash_spread = 1 # Number of LEDs adjacent to center to light up
+        splash_offsets = np.arange(-splash_spread, splash_spread + 1)
+        # Fade intensity with distance from center
+        splash_dist_factor = 1.0 - (np.abs(splash_offsets) / (splash_spread + 1))
 
         # Fall/Fade visual parameters
         fall_color = (50, 50, 255) # Blue
 
-        while not self._stop_event.is_set():
+        # Each raindrop has an angle (0.0 to 1.0), a phase, normalized progress within that
+        # phase (0.0 to 1.0) and a slight speed variation
+        angle, progress, speed = np.empty(0), np.empty(0), np.empty(0)
+        phase = np.empty(0, dtype=np.intp)
+
+        while True:
             # Chance to create new raindrop
-            if random.random() < 0.08: # Adjust probability as needed
-                raindrops.append({
-                    'angle': random.random(), # 0.0 to 1.0
-                    'phase': 'inner_splash',
-                    'progress': 0.0, # Normalized progress within phase (0.0 to 1.0)
-                    'speed': random.uniform(0.8, 1.2) # Slight speed variation per drop
-                })
-
-            # Clear all pixels (using temporary buffer for blending)
-            current_pixels = [(0, 0, 0)] * LEDConfig.LED_COUNT
-
-            new_raindrops = []
-            for drop in raindrops:
-                # Update progress
-                phase_duration = 1.0 # Default, will be overridden
-                if drop['phase'] == 'inner_splash':
-                    phase_duration = splash_duration_factor * wait
-                elif drop['phase'] == 'outer_fall':
-                    phase_duration = fall_duration_factor * wait
-                elif drop['phase'] == 'outer_fade':
-                    phase_duration = fade_duration_factor * wait
-
-                # Avoid division by zero if wait is very small or zero
-                if phase_duration > 0:
-                     drop['progress'] += (drop['speed'] * wait) / phase_duration
-                else: # If duration is zero, instantly finish phase
-                     drop['progress'] = 1.0
-
-                keep_drop = True
-                if drop['phase'] == 'inner_splash':
-                    if drop['progress'] >= 1.0:
-                        drop['phase'] = 'outer_fall'
-                        drop['progress'] = 0.0
-                    else:
-                        # Calculate splash effect - peak brightness mid-phase
-                        brightness = math.sin(drop['progress'] * math.pi) # 0 -> 1 -> 0
-                        center_led = int(drop['angle'] * num_leds_ring2) % num_leds_ring2
-                        for i in range(-splash_spread, splash_spread + 1):
-                            led_index_inner = (center_led + i) % num_leds_ring2
-                            # Fade intensity with distance from center
-                            dist_factor = 1.0 - (abs(i) / (splash_spread + 1))
-                            current_brightness = brightness * dist_factor
-                            color = tuple(int(c * current_brightness) for c in splash_color)
-                            # Apply to inner ring slice
-                            pixel_index_in_strip = num_leds_ring1 + led_index_inner
-                            current_pixels[pixel_index_in_strip] = self._blend_colors(
-                                current_pixels[pixel_index_in_strip], color)
-
-                elif drop['phase'] == 'outer_fall':
-                    if drop['progress'] >= 1.0:
-                        drop['phase'] = 'outer_fade'
-                        drop['progress'] = 0.0
-                    else:
-                        # Light up the single LED on the outer ring
-                        led_index_outer = int(drop['angle'] * num_leds_ring1) % num_leds_ring1
-                        current_pixels[led_index_outer] = self._blend_colors(
-                            current_pixels[led_index_outer], fall_color)
-
-                elif drop['phase'] == 'outer_fade':
-                    if drop['progress'] >= 1.0:
-                        keep_drop = False # Drop fades out completely
-                    else:
-                        # Fade out the LED on the outer ring
-                        brightness = 1.0 - drop['progress']
-                        led_index_outer = int(drop['angle'] * num_leds_ring1) % num_leds_ring1
-                        color = tuple(int(c * brightness) for c in fall_color)
-                        current_pixels[led_index_outer] = self._blend_colors(
-                            current_pixels[led_index_outer], color)
-
-                if keep_drop:
-                    new_raindrops.append(drop)
-
-            raindrops = new_raindrops
-
-            # Update the actual pixels
-            for i in range(LEDConfig.LED_COUNT):
-                self.pixels[i] = current_pixels[i]
-            self.pixels.show()
-            time.sleep(wait)
+            if self._rng.random() < 0.08: # Adjust probability as needed
+                angle = np.append(angle, self._rng.random())
+                phase = np.append(phase, INNER_SPLASH)
+                progress = np.append(progress, 0.0)
+                speed = np.append(speed, self._rng.uniform(0.8, 1.2))
+
+            # Update progress. Phase durations are multiples of wait, so wait cancels out.
+            if wait > 0:
+                progress += speed / phase_duration_factors[np.minimum(phase, OUTER_FADE)]
+            else: # If duration is zero, instantly finish phase
+                progress[:] = 1.0
+
+            # Drops that finish a phase move on to the next, and aren't drawn this frame
+            finished = progress >= 1.0
+            phase[finished] += 1
+            progress[finished] = 0.0
+            keep = phase < DONE # Drop fades out completely
+            angle, phase, progress, speed, finished = angle[keep], phase[keep], progress[keep], speed[keep], finished[keep]
+
+            frame = self._blank()
+
+            # Splash on the inner ring - peak brightness mid-phase
+            splashing = ~finished & (phase == INNER_SPLASH)
+            if splashing.any():
+                brightness = np.sin(progress[splashing] * math.pi) # 0 -> 1 -> 0
+                center_led = (angle[splashing] * num_leds_ring2).astype(np.intp) % num_leds_ring2
+                led_index_inner = (center_led[:, None] + splash_offsets) % num_leds_ring2
+                colors = scale_colors(splash_color, (brightness[:, None] * splash_dist_factor).ravel())
+                np.maximum.at(frame, num_leds_ring1 + led_index_inner.ravel(), colors)
+
+            # Light up a single LED on the outer ring, then fade it out
+            on_outer = ~finished & (phase >= OUTER_FALL)
+            if on_outer.any():
+                led_index_outer = (angle[on_outer] * num_leds_ring1).astype(np.intp) % num_leds_ring1
+                brightness = np.where(phase[on_outer] == OUTER_FALL, 1.0, 1.0 - progress[on_outer])
+                np.maximum.at(frame, led_index_outer, scale_colors(fall_color, brightness))
+
+            yield frame, wait
 
     def _lightning_effect(self, wait):
         """Override: Lightning originates with a flicker on the inner ring, then arcs across the outer ring."""
@@ -1335,150 +871,108 @@ class LEDManagerRings(LEDManager):
         num_leds_ring2 = LEDConfig.LED_COUNT_RING2
         if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
             logging.warning("Lightning effect requires both rings to have LEDs. Falling back to default.")
-            return super()._lightning_effect(wait)
+            yield from super()._lightning_effect(wait)
+            return
 
         flicker_color = (220, 220, 255) # Very light blue/white
-        arc_color_base = (255, 255, 255)
-        arc_color_tint = (0, 0, 50) # Slight blue tint added to arc
+        # White, with a slight blue tint added to arc
+        arc_color = (255, 255, 255 + 50)
         afterglow_colors = [
             (150, 150, 180), # Bluish white
             (80, 80, 120),   # Dimmer blue
             (30, 30, 50)     # Very dim blue
         ]
+        branch_steps = np.arange(4)
 
-        while not self._stop_event.is_set():
+        while True:
             # Choose origin angle and calculate corresponding LEDs
-            origin_angle = random.random()
+            origin_angle = self._rng.random()
             origin_led_inner = int(origin_angle * num_leds_ring2) % num_leds_ring2
             start_led_outer = int(origin_angle * num_leds_ring1) % num_leds_ring1
 
             # 1. Inner Ring Flicker
-            flicker_frames = random.randint(2, 4)
-            for frame in range(flicker_frames):
-                if self._stop_event.is_set(): return
-                self.pixels.fill((0, 0, 0))
+            frame = self._blank()
+            for _ in range(int(self._rng.integers(2, 5))):
+                frame = self._blank()
                 # Light up 1 or 2 pixels around origin
-                flicker_brightness = random.uniform(0.6, 1.0)
-                color = tuple(int(c * flicker_brightness) for c in flicker_color)
-                inner_idx1 = num_leds_ring1 + origin_led_inner
-                self.pixels[inner_idx1] = color
+                color = scale_colors(flicker_color, self._rng.uniform(0.6, 1.0))
+                frame[num_leds_ring1 + origin_led_inner] = color
                 # Occasionally light adjacent pixel too
-                if random.random() < 0.5:
-                    adj_offset = random.choice([-1, 1])
-                    inner_idx2 = num_leds_ring1 + (origin_led_inner + adj_offset) % num_leds_ring2
-                    self.pixels[inner_idx2] = color
-                self.pixels.show()
-                time.sleep(0.015) # Very quick flicker frames
-
-            # 2. Outer Ring Arc (adapting parent logic)
-            clockwise = random.choice([True, False])
-            arc_length = random.randint(num_leds_ring1 // 3, (num_leds_ring1 * 2) // 3)
-
-            for intensity_factor in [1.0, 0.8]: # Two quick flashes
-                if self._stop_event.is_set(): return
-                # Clear only outer ring for the arc drawing phase
-                for i in range(num_leds_ring1):
-                    self.pixels[i] = (0, 0, 0)
-                # Keep inner flicker briefly visible during first arc flash if desired
-                # Or clear inner ring too: self.pixels.fill((0,0,0))
-
-                arc_pixels_indices = set()
-                for i in range(arc_length):
-                    if self._stop_event.is_set(): return
-                    current_pos_outer = (start_led_outer + (i if clockwise else -i)) % num_leds_ring1
-                    arc_pixels_indices.add(current_pos_outer)
-
-                    # Branching logic (applied to outer ring)
-                    if random.random() < 0.3:
-                        branch_length = random.randint(2, 4)
-                        branch_direction = random.choice([1, -1])
-                        for j in range(branch_length):
-                            branch_pos_outer = (current_pos_outer + (j * branch_direction)) % num_leds_ring1
-                            arc_pixels_indices.add(branch_pos_outer)
-                            brightness = max(0, min(1.0, (1 - (j / branch_length)) * intensity_factor * 0.7))
-                            color = tuple(min(255, int(base * brightness + tint * brightness)) for base, tint in zip(arc_color_base, arc_color_tint))
-                            self.pixels[branch_pos_outer] = self._blend_colors(self.pixels[branch_pos_outer], color)
-
-                    # Main arc segment (applied to outer ring)
-                    brightness = max(0, min(1.0, intensity_factor * (1 - (i / arc_length) * 0.3)))
-                    color = tuple(min(255, int(base * brightness + tint * brightness)) for base, tint in zip(arc_color_base, arc_color_tint))
-                    self.pixels[current_pos_outer] = self._blend_colors(self.pixels[current_pos_outer], color)
-
-                self.pixels.show()
-                time.sleep(0.025) # Quick flash
-
-            # 3. Afterglow (Outer Ring focus)
-            # Store final arc pixels before clearing inner ring
-            final_arc_pixels = {idx: self.pixels[idx] for idx in arc_pixels_indices}
-            self.pixels.fill((0, 0, 0)) # Clear everything before afterglow
-
+                if self._rng.random() < 0.5:
+                    adj_offset = self._rng.choice((-1, 1))
+                    frame[num_leds_ring1 + (origin_led_inner + adj_offset) % num_leds_ring2] = color
+                yield frame, 0.015 # Very quick flicker frames
+
+            # 2. Outer Ring Arc
+            direction = 1 if self._rng.random() < 0.5 else -1
+            arc_length = int(self._rng.integers(num_leds_ring1 // 3, (num_leds_ring1 * 2) // 3 + 1))
+            arc_steps = np.arange(arc_length)
+            arc = (start_led_outer + direction * arc_steps) % num_leds_ring1
+
+            for intensity_factor in (1.0, 0.8): # Two quick flashes
+                # Clear only outer ring for the arc drawing phase, keeping the inner flicker visible
+                frame = frame.copy()
+                frame[:num_leds_ring1] = 0
+                arc_pixels_indices = arc
+
+                # Branching logic (applied to outer ring)
+                branching = self._rng.random(arc_length) < 0.3
+                branch_count = int(branching.sum())
+                if branch_count:
+                    branch_length = self._rng.integers(2, 5, branch_count)[:, None]
+                    branch_direction = self._rng.choice((1, -1), branch_count)[:, None]
+                    in_branch = branch_steps < branch_length
+                    branch_pos = ((arc[branching][:, None] + branch_steps * branch_direction) % num_leds_ring1)[in_branch]
+                    brightness = np.clip((1 - branch_steps / branch_length) * intensity_factor * 0.7, 0, 1.0)
+                    np.maximum.at(frame, branch_pos, scale_colors(arc_color, brightness[in_branch]))
+                    arc_pixels_indices = np.concatenate((arc, branch_pos))
+
+                # Main arc segment (applied to outer ring)
+                brightness = np.clip(intensity_factor * (1 - (arc_steps / arc_length) * 0.3), 0, 1.0)
+                np.maximum.at(frame, arc, scale_colors(arc_color, brightness))
+                yield frame, 0.025 # Quick flash
+
+            # 3. Afterglow on the pixels that were part of the outer arc
             for i, ag_color in enumerate(afterglow_colors):
-                if self._stop_event.is_set(): return
-                # Apply afterglow to the pixels that were part of the outer arc
-                for idx in arc_pixels_indices:
-                     # Use the brightness of the final arc pixel to scale the afterglow color?
-                     # Or just apply the afterglow color directly? Let's try direct first.
-                    self.pixels[idx] = ag_color
-                # Optional: very faint quick afterglow on inner origin
-                if i == 0: # Only on first step
-                     inner_idx = num_leds_ring1 + origin_led_inner
-                     self.pixels[inner_idx] = tuple(int(c*0.3) for c in afterglow_colors[-1]) # Faint version of last afterglow color
-
-                self.pixels.show()
-                time.sleep(0.06)
-
-            # 4. Clear and Wait
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
-            time.sleep(random.uniform(0.5, 2.5)) # Wait for next strike
+                frame = self._blank()
+                frame[arc_pixels_indices] = ag_color
+                # Very faint quick afterglow on inner origin, only on first step
+                if i == 0:
+                    frame[num_leds_ring1 + origin_led_inner] = scale_colors(afterglow_colors[-1], 0.3)
+                yield frame, 0.06
+
+            # 4. Clear and Wait for next strike
+            yield self._blank(), self._rng.uniform(0.5, 2.5)
 
     def _purring_effect(self, wait):
         """Override: Outer ring pulses warm color, inner ring steady warm glow."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Purring effect requires both rings to have LEDs. Falling back to default.")
-            return super()._purring_effect(wait)
+            yield from super()._purring_effect(wait)
+            return
 
         base_color = (255, 180, 147)  # Warm peachy-pink
         inner_ring_brightness = 0.2 # Dim steady glow for inner ring
-        inner_ring_color = tuple(int(c * inner_ring_brightness) for c in base_color)
-        
-        while not self._stop_event.is_set():
-            # Calculate purring brightness for outer ring
-            for i in range(0, 100, 1):
-                if self._stop_event.is_set():
-                    break
-                    
-                # Use two overlapping sine waves for outer ring pulse
-                wave1 = math.sin(i * math.pi / 25)  # Faster wave
-                wave2 = math.sin(i * math.pi / 50)  # Slower wave
-                
-                # Brightness varies between 0.3 and 1.0 for outer ring
-                brightness_outer = 0.3 + (((wave1 + wave2 + 2) / 4) * 0.7)
-                color_outer = tuple(int(c * brightness_outer) for c in base_color)
-
-                # Apply colors
-                # Outer ring - pulsing purr
-                for idx in range(num_leds_ring1):
-                    self.pixels[idx] = color_outer
-                # Inner ring - steady dim glow
-                for idx in range(num_leds_ring2):
-                    self.pixels[num_leds_ring1 + idx] = inner_ring_color
-                    
-                self.pixels.show()
-                time.sleep(wait)
+        inner_ring_color = scale_colors(base_color, inner_ring_brightness)
+
+        # Use two overlapping sine waves for outer ring pulse
+        steps = np.arange(100)
+        wave1 = np.sin(steps * math.pi / 25)  # Faster wave
+        wave2 = np.sin(steps * math.pi / 50)  # Slower wave
+        # Brightness varies between 0.3 and 1.0 for outer ring
+        colors_outer = scale_colors(base_color, 0.3 + ((wave1 + wave2 + 2) / 4) * 0.7)
+
+        while True:
+            for color_outer in colors_outer:
+                yield self._rings_frame(color_outer, inner_ring_color), wait
 
     def _rotating_color_effect(self, color, wait):
         """Override: Rotates hues around a base color, counter-rotating on inner ring."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Rotating color effect requires both rings to have LEDs. Falling back to default.")
             # Call super, but need to pass the color argument
-            return super()._rotating_color_effect(color, wait) 
+            yield from super()._rotating_color_effect(color, wait)
+            return
 
         if color not in COLORS:
             logging.error(f"Invalid color name '{color}' for rotating_color_effect. Falling back to white.")
@@ -1486,353 +980,178 @@ class LEDManagerRings(LEDManager):
         else:
             rgb_base_color = COLORS[color]
 
-        # Normalize base color components to 0-1 range for multiplication
-        rgb_base_normalized = tuple(c / 255.0 for c in rgb_base_color)
-
         offset = 0.0
-        while not self._stop_event.is_set():
-            # Outer ring - Clockwise rotation
-            for i in range(num_leds_ring1):
-                # Calculate hue based on position and time offset
-                hue = (i / num_leds_ring1 + offset) % 1.0
-                # Convert hue to RGB (full saturation and value)
-                r_hue, g_hue, b_hue = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                # Modulate by base color and apply global brightness implicitly via self.pixels.brightness
-                r = int(r_hue * rgb_base_color[0])
-                g = int(g_hue * rgb_base_color[1])
-                b = int(b_hue * rgb_base_color[2])
-                self.pixels[i] = (r, g, b)
-
-            # Inner ring - Counter-clockwise rotation
-            for i in range(num_leds_ring2):
-                # Negative offset for counter-rotation
-                hue = (i / num_leds_ring2 - offset) % 1.0 
-                r_hue, g_hue, b_hue = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                r = int(r_hue * rgb_base_color[0])
-                g = int(g_hue * rgb_base_color[1])
-                b = int(b_hue * rgb_base_color[2])
-                self.pixels[num_leds_ring1 + i] = (r, g, b)
-            
-            self.pixels.show()
+        while True:
+            # Hues at full saturation and value, modulated by base color. Global brightness is applied
+            # by the strip. Outer ring rotates clockwise, inner ring counter-clockwise.
+            colors_outer = hsv_to_rgb((self._ring1_positions + offset) % 1.0, 1.0, 1.0) * rgb_base_color
+            colors_inner = hsv_to_rgb((self._ring2_positions - offset) % 1.0, 1.0, 1.0) * rgb_base_color
+            yield self._rings_frame(colors_outer.astype(FRAME_DTYPE), colors_inner.astype(FRAME_DTYPE)), wait
             # Increment offset based on speed (wait time)
             # Adjust the multiplier (e.g., 10) to control rotation speed relative to 'wait'
-            offset += (wait * 10) 
+            offset += (wait * 10)
             offset %= 1.0 # Keep offset within [0, 1]
-            time.sleep(wait) # Use the actual wait time for frame delay
 
     # Correctly placed override for green/yellow rotation
     def _rotating_green_yellow_effect(self, wait):
         """Override: Generate rotating magic green/blue gradients, counter-rotating on the inner ring."""
         # Call the generalized method for rings with custom colors
-        self._two_color_rotation_effect("magic_green", "magic_blue", wait)
+        yield from self._two_color_rotation_effect("magic_green", "magic_blue", wait)
 
     def _magical_spell_effect(self, wait):
         """Override: Magical spell with inner ring charging and outer ring burst"""
         num_leds_ring1 = LEDConfig.LED_COUNT_RING1
         num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-        
+
         if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
             logging.warning("Magical spell effect requires both rings to have LEDs. Falling back to default.")
-            return super()._magical_spell_effect(wait)
-        
-        # Define magical colors
-        spell_colors = [
-            (138, 43, 226),   # Blue Violet
-            (255, 0, 255),    # Magenta
-            (0, 191, 255),    # Deep Sky Blue
-            (255, 20, 147),   # Deep Pink
-            (148, 0, 211),    # Dark Violet
-        ]
-        
-        while not self._stop_event.is_set():
+            yield from super()._magical_spell_effect(wait)
+            return
+
+        spell_colors = self._SPELL_COLORS
+        num_colors = len(spell_colors)
+        inner_indices = np.arange(num_leds_ring2)
+
+        while True:
             # Phase 1: Inner ring charges with swirling energy
-            charge_duration = random.uniform(1.5, 2.5)
-            charge_steps = int(charge_duration / wait)
-            
+            charge_steps = int(self._rng.uniform(1.5, 2.5) / wait)
+            inner = np.zeros((num_leds_ring2, 3), dtype=FRAME_DTYPE)
             for step in range(charge_steps):
-                if self._stop_event.is_set():
-                    break
-                
                 charge_progress = step / charge_steps
-                
+
                 # Inner ring - intense swirling charge
-                for i in range(num_leds_ring2):
-                    wave = math.sin((i / num_leds_ring2 - step * 0.2) * math.pi * 4) * 0.5 + 0.5
-                    color_index = int((i + step * 0.1) * len(spell_colors)) % len(spell_colors)
-                    base_color = spell_colors[color_index]
-                    
-                    # Intensity builds up
-                    intensity = charge_progress * wave
-                    if random.random() < 0.2:  # More frequent flickers
-                        intensity *= random.uniform(0.8, 1.2)
-                    intensity = min(1.0, intensity)
-                    
-                    color = tuple(int(c * intensity) for c in base_color)
-                    self.pixels[num_leds_ring1 + i] = color
-                
-                # Outer ring - subtle anticipation glow
+                wave = np.sin((self._ring2_positions - step * 0.2) * math.pi * 4) * 0.5 + 0.5
+                color_index = ((inner_indices + step * 0.1) * num_colors).astype(np.intp) % num_colors
+                # Intensity builds up, with more frequent flickers
+                intensity = charge_progress * wave
+                flicker = self._rng.random(num_leds_ring2) < 0.2
+                intensity[flicker] *= self._rng.uniform(0.8, 1.2, int(flicker.sum()))
+                inner = scale_colors(spell_colors[color_index], np.minimum(1.0, intensity))
+
+                # Outer ring - subtle anticipation glow, faintly pulsing in sync with charge
                 outer_glow = charge_progress * 0.2
-                for i in range(num_leds_ring1):
-                    # Faint pulsing in sync with charge
-                    pulse = (math.sin(step * 0.1) + 1) / 2
-                    intensity = outer_glow * pulse
-                    color_index = (step // 10) % len(spell_colors)
-                    base_color = spell_colors[color_index]
-                    color = tuple(int(c * intensity) for c in base_color)
-                    self.pixels[i] = color
-                
-                self.pixels.show()
-                time.sleep(wait)
-            
+                pulse = (math.sin(step * 0.1) + 1) / 2
+                outer = scale_colors(spell_colors[(step // 10) % num_colors], outer_glow * pulse)
+
+                yield self._rings_frame(outer, inner), wait
+
             # Phase 2: Energy transfers from inner to outer ring
             transfer_steps = int(0.3 / wait)  # Quick transfer
-            
+            outer = np.zeros((num_leds_ring1, 3), dtype=FRAME_DTYPE)
             for step in range(transfer_steps):
-                if self._stop_event.is_set():
-                    break
-                
                 transfer_progress = step / transfer_steps
-                
                 # Inner ring fades
-                for i in range(num_leds_ring2):
-                    current_color = self.pixels[num_leds_ring1 + i]
-                    fade_factor = 1.0 - transfer_progress
-                    new_color = tuple(int(c * fade_factor) for c in current_color)
-                    self.pixels[num_leds_ring1 + i] = new_color
-                
-                # Outer ring brightens with energy waves
-                for i in range(num_leds_ring1):
-                    # Create wave effect moving outward
-                    wave_pos = transfer_progress * 2 * math.pi
-                    wave = (math.sin(i / num_leds_ring1 * math.pi * 2 + wave_pos) + 1) / 2
-                    intensity = transfer_progress * wave
-                    
-                    # Mix of colors for energy transfer
-                    r = int(255 * intensity)
-                    g = int(200 * intensity * 0.8)
-                    b = int(255 * intensity)
-                    self.pixels[i] = (r, g, b)
-                
-                self.pixels.show()
-                time.sleep(wait)
-            
+                inner = (inner * (1.0 - transfer_progress)).astype(FRAME_DTYPE)
+                # Outer ring brightens with energy waves moving outward, in a mix of colors
+                wave_pos = transfer_progress * 2 * math.pi
+                wave = (np.sin(self._ring1_positions * math.pi * 2 + wave_pos) + 1) / 2
+                outer = scale_colors((255, 200 * 0.8, 255), transfer_progress * wave)
+                yield self._rings_frame(outer, inner), wait
+
             # Phase 3: Outer ring explosion with inner ring echo
             explosion_steps = int(0.5 / wait)
-            explosion_center = random.randint(0, num_leds_ring1 - 1)
-            
+            explosion_center = int(self._rng.integers(num_leds_ring1))
+            norm_distance = ring_distance(np.arange(num_leds_ring1), explosion_center, num_leds_ring1) / (num_leds_ring1 / 2)
+            # Colorful aftermath colors
+            aftermath_colors = spell_colors[(norm_distance * num_colors).astype(np.intp) % num_colors]
+            wave_width = 0.4
+            echo_delay = 0.2
+
             for step in range(explosion_steps):
-                if self._stop_event.is_set():
-                    break
-                
                 explosion_progress = step / explosion_steps
-                
-                # Outer ring - main explosion
-                for i in range(num_leds_ring1):
-                    distance = min(abs(i - explosion_center),
-                                 abs(i - explosion_center + num_leds_ring1),
-                                 abs(i - explosion_center - num_leds_ring1))
-                    norm_distance = distance / (num_leds_ring1 / 2)
-                    
-                    # Expanding shockwave
-                    wave_position = explosion_progress * 2
-                    wave_width = 0.4
-                    
-                    if abs(norm_distance - wave_position) < wave_width:
-                        wave_intensity = 1.0 - abs(norm_distance - wave_position) / wave_width
-                        wave_intensity *= (1.0 - explosion_progress * 0.7)
-                        
-                        # Bright explosion colors
-                        if explosion_progress < 0.3:
-                            # Initial white flash
-                            color = tuple(int(255 * wave_intensity) for _ in range(3))
-                        else:
-                            # Colorful aftermath
-                            color_index = int(norm_distance * len(spell_colors)) % len(spell_colors)
-                            base_color = spell_colors[color_index]
-                            color = tuple(int(c * wave_intensity) for c in base_color)
-                        
-                        self.pixels[i] = color
-                    else:
-                        self.pixels[i] = (0, 0, 0)
-                
-                # Inner ring - echo effect
-                echo_delay = 0.2
+
+                # Outer ring - main explosion, an expanding shockwave
+                wave_position = explosion_progress * 2
+                wave_offset = np.abs(norm_distance - wave_position)
+                wave_intensity = np.where(wave_offset < wave_width,
+                                          (1.0 - wave_offset / wave_width) * (1.0 - explosion_progress * 0.7), 0.0)
+                # Initial white flash, then colorful aftermath
+                outer = scale_colors((255, 255, 255) if explosion_progress < 0.3 else aftermath_colors, wave_intensity)
+
+                # Inner ring - echo effect, a radial pulse
                 if explosion_progress > echo_delay:
                     echo_progress = (explosion_progress - echo_delay) / (1.0 - echo_delay)
                     echo_intensity = (1.0 - echo_progress) * 0.6
-                    
-                    for i in range(num_leds_ring2):
-                        # Radial pulse on inner ring
-                        angle = i / num_leds_ring2 * math.pi * 2
-                        pulse = (math.sin(echo_progress * math.pi * 3 + angle) + 1) / 2
-                        intensity = echo_intensity * pulse
-                        
-                        color_index = (i + int(echo_progress * 10)) % len(spell_colors)
-                        base_color = spell_colors[color_index]
-                        color = tuple(int(c * intensity) for c in base_color)
-                        self.pixels[num_leds_ring1 + i] = color
-                
-                self.pixels.show()
-                time.sleep(wait)
-            
+                    angle = self._ring2_positions * math.pi * 2
+                    pulse = (np.sin(echo_progress * math.pi * 3 + angle) + 1) / 2
+                    color_index = (inner_indices + int(echo_progress * 10)) % num_colors
+                    inner = scale_colors(spell_colors[color_index], echo_intensity * pulse)
+
+                yield self._rings_frame(outer, inner), wait
+
             # Phase 4: Magical sparkles on both rings
-            sparkle_duration = random.uniform(1.5, 2.5)
-            sparkle_steps = int(sparkle_duration / wait)
-            
-            # Initialize sparkles for both rings
-            sparkles = []
+            sparkle_steps = int(self._rng.uniform(1.5, 2.5) / wait)
+            sparkles = Sparkles()
             # More sparkles on outer ring
-            for _ in range(random.randint(15, 25)):
-                sparkles.append({
-                    'ring': 1,
-                    'position': random.randint(0, num_leds_ring1 - 1),
-                    'lifetime': random.uniform(0.3, 1.2),
-                    'age': 0.0,
-                    'color': random.choice(spell_colors),
-                    'twinkle_speed': random.uniform(5, 15)
-                })
+            count = int(self._rng.integers(15, 26))
+            sparkles.add(self._rng.integers(0, num_leds_ring1, count), self._rng.uniform(0.3, 1.2, count),
+                         spell_colors[self._rng.integers(0, num_colors, count)], self._rng.uniform(5, 15, count))
             # Fewer sparkles on inner ring
-            for _ in range(random.randint(5, 10)):
-                sparkles.append({
-                    'ring': 2,
-                    'position': random.randint(0, num_leds_ring2 - 1),
-                    'lifetime': random.uniform(0.5, 1.5),
-                    'age': 0.0,
-                    'color': random.choice(spell_colors),
-                    'twinkle_speed': random.uniform(3, 10)
-                })
-            
+            count = int(self._rng.integers(5, 11))
+            sparkles.add(num_leds_ring1 + self._rng.integers(0, num_leds_ring2, count), self._rng.uniform(0.5, 1.5, count),
+                         spell_colors[self._rng.integers(0, num_colors, count)], self._rng.uniform(3, 10, count))
+
             for step in range(sparkle_steps):
-                if self._stop_event.is_set():
-                    break
-                
-                self.pixels.fill((0, 0, 0))
-                
-                active_sparkles = []
-                for sparkle in sparkles:
-                    sparkle['age'] += wait
-                    
-                    if sparkle['age'] < sparkle['lifetime']:
-                        age_factor = 1.0 - (sparkle['age'] / sparkle['lifetime'])
-                        twinkle = (math.sin(sparkle['age'] * sparkle['twinkle_speed']) + 1) / 2
-                        intensity = age_factor * twinkle
-                        
-                        color = tuple(int(c * intensity) for c in sparkle['color'])
-                        
-                        if sparkle['ring'] == 1:
-                            self.pixels[sparkle['position']] = color
-                        else:
-                            self.pixels[num_leds_ring1 + sparkle['position']] = color
-                        
-                        active_sparkles.append(sparkle)
-                
-                sparkles = active_sparkles
-                self.pixels.show()
-                time.sleep(wait)
-            
+                colors = sparkles.step(wait)
+                frame = self._blank()
+                frame[sparkles.position] = colors
+                yield frame, wait
+
             # Clear and pause
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
-            time.sleep(random.uniform(0.5, 1.0))
+            yield self._blank(), self._rng.uniform(0.5, 1.0)
 
     def _sparkling_pink_blue_effect(self, wait):
         """Override: Pink and blue sparkles on outer ring, with a soft, slow blue/pink pulse on the inner ring."""
-        num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
-
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if LEDConfig.LED_COUNT_RING1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Sparkling pink/blue effect requires both rings to have LEDs. Falling back to default.")
-            return super()._sparkling_pink_blue_effect(wait)
+            yield from super()._sparkling_pink_blue_effect(wait)
+            return
 
         # --- Ring 1: Outer Ring Sparkles ---
-        pixel_states_ring1 = [{'active': False, 'brightness': 0.0, 'hue': 0.0, 'direction': 1} for _ in range(num_leds_ring1)]
         pink_hue = colorsys.rgb_to_hsv(*[c/255.0 for c in COLORS["pink"]])[0]
         blue_hue = colorsys.rgb_to_hsv(*[c/255.0 for c in COLORS["blue"]])[0]
-        palette = [pink_hue, blue_hue]
-        
+        twinkles = Twinkles(LEDConfig.LED_COUNT_RING1, self._rng, chance=0.03, base_step=0.03,
+                            saturation=0.9, palette=[pink_hue, blue_hue])
+
         # --- Ring 2: Inner Ring slow pulse ---
-        # Will interpolate between pink and a soft blue
-        inner_color1 = COLORS["pink"]
-        inner_color2 = (30, 80, 200) # A soft, darker blue to save power
-        
-        cycle_step = 0
-        while not self._stop_event.is_set():
-            # --- Update Ring 1 (Outer Ring) - Sparkles ---
-            for pixel in pixel_states_ring1:
-                if not pixel['active'] and random.random() < 0.03: # Activation chance
-                    pixel['active'] = True
-                    pixel['brightness'] = 0.0
-                    pixel['hue'] = random.choice(palette)
-                    pixel['direction'] = 1
-
-            for i, pixel in enumerate(pixel_states_ring1):
-                if pixel['active']:
-                    pixel['brightness'] += (0.03 + (0.03 * 2 * (1.0 - (pixel['brightness'] ** 2)))) * pixel['direction']
-
-                    if pixel['brightness'] >= 1.0: 
-                        pixel['brightness'], pixel['direction'] = 1.0, -1
-                    elif pixel['brightness'] <= 0.0 and pixel['direction'] == -1: 
-                        pixel['active'], pixel['brightness'] = False, 0.0
-                    
-                    if pixel['active']:
-                        r, g, b = [int(x * 255) for x in colorsys.hsv_to_rgb(pixel['hue'], 0.9, pixel['brightness'])]
-                        self.pixels[i] = (r, g, b)
-                    else: 
-                        self.pixels[i] = (0, 0, 0)
-                else: 
-                    self.pixels[i] = (0, 0, 0)
-                
-            # --- Update Ring 2 (Inner Ring) - Slow Pulse ---
-            # Use a sine wave to smoothly transition between the two colors.
-            pulse_pos = (math.sin(cycle_step * math.pi / 100) + 1) / 2 # Normalized to 0-1
-            
-            # Linear interpolation between the two colors
-            r = int(inner_color1[0] * (1 - pulse_pos) + inner_color2[0] * pulse_pos)
-            g = int(inner_color1[1] * (1 - pulse_pos) + inner_color2[1] * pulse_pos)
-            b = int(inner_color1[2] * (1 - pulse_pos) + inner_color2[2] * pulse_pos)
-            
-            for i in range(num_leds_ring2):
-                self.pixels[num_leds_ring1 + i] = (r, g, b)
-
-            cycle_step = (cycle_step + 1) % 200
-            
-            self.pixels.show()
-            time.sleep(wait)
+        # Interpolates between pink and a soft, darker blue to save power, using a sine wave
+        # to smoothly transition between the two colors
+        inner_color1 = np.array(COLORS["pink"], dtype=np.float64)
+        inner_color2 = np.array((30, 80, 200), dtype=np.float64)
+        pulse_pos = ((np.sin(np.arange(200) * math.pi / 100) + 1) / 2)[:, None] # Normalized to 0-1
+        inner_colors = (inner_color1 * (1 - pulse_pos) + inner_color2 * pulse_pos).astype(FRAME_DTYPE)
+
+        while True:
+            for inner_color in inner_colors:
+                yield self._rings_frame(twinkles.step(), inner_color), wait
 
     def _rotating_beacon_effect(self, color_name, wait):
         """Override: Rotating beacon on outer ring, with inner ring pulsing based on speed."""
         num_leds_ring1 = LEDConfig.LED_COUNT_RING1
-        num_leds_ring2 = LEDConfig.LED_COUNT_RING2
 
-        if num_leds_ring1 <= 0 or num_leds_ring2 <= 0:
+        if num_leds_ring1 <= 0 or LEDConfig.LED_COUNT_RING2 <= 0:
             logging.warning("Rotating beacon effect requires both rings. Falling back to default.")
-            return super()._rotating_beacon_effect(color_name, wait)
+            yield from super()._rotating_beacon_effect(color_name, wait)
+            return
 
         if color_name not in COLORS:
             logging.error(f"Invalid color name '{color_name}' for rotating_beacon. Defaulting to green.")
             color_name = 'green'
         head_color = COLORS[color_name]
-        
+
         trail_length = 6
+        trail_offsets = np.arange(1, trail_length + 1)
         # Create trail colors based on head color
-        trail_colors = [tuple(int(c * math.pow(0.6, i)) for c in head_color) for i in range(1, trail_length + 1)]
+        trail_colors = scale_colors(head_color, np.power(0.6, trail_offsets))
 
         position = 0
         cycle_step = 0
-        while not self._stop_event.is_set():
+        while True:
             # --- Outer Ring: Beacon ---
-            # Clear only the outer ring part of the pixel buffer
-            for i in range(num_leds_ring1):
-                self.pixels[i] = (0,0,0)
-
-            head_pos = int(position) % num_leds_ring1
-            self.pixels[head_pos] = head_color
-            for i in range(trail_length):
-                trail_pos = (head_pos - 1 - i + num_leds_ring1) % num_leds_ring1
-                # Make sure we don't try to access a negative index in trail_colors
-                if i < len(trail_colors):
-                    self.pixels[trail_pos] = trail_colors[i]
-            
+            outer = np.zeros((num_leds_ring1, 3), dtype=FRAME_DTYPE)
+            outer[position] = head_color
+            outer[(position - trail_offsets) % num_leds_ring1] = trail_colors
+
             # --- Inner Ring: Pulse ---
             # Pulse speed is related to rotation speed. Faster rotation = faster pulse.
             # self._current_speed is the delay, so smaller is faster.
@@ -1840,14 +1159,9 @@ class LEDManagerRings(LEDManager):
             pulse_rate_factor = 0.1 / self._current_speed if self._current_speed > 0.001 else 100
             pulse_pos = (math.sin(cycle_step * math.pi * pulse_rate_factor / 50) + 1) / 2 # 0 to 1
             brightness = 0.1 + (pulse_pos * 0.5) # Varies from 0.1 to 0.6
-            inner_color = tuple(int(c * brightness) for c in head_color)
-            
-            for i in range(num_leds_ring2):
-                self.pixels[num_leds_ring1 + i] = inner_color
-
-            self.pixels.show()
-            
-            time.sleep(self._current_speed)
-            
+            inner_color = scale_colors(head_color, brightness)
+
+            yield self._rings_frame(outer, inner_color), wait
+
             position = (position + 1) % num_leds_ring1
-            cycle_step += 1
\ No newline at end of file
+            cycle_step += 1
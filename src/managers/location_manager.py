@@ -1,19 +1,46 @@
 import os
 import time
 import logging
+import heapq
 import struct
 import asyncio
-import subprocess
 from typing import Dict, Optional, List, Tuple, Any
 from collections import defaultdict
+from uuid import UUID
 from config import BLEConfig, PLATFORM, Distance, get_filter_logger
 from bleak import BleakScanner
+from hardware.bluetooth_adapter import BluetoothAdapterMonitor, create_adapter_backend
+from utils.rssi_filter import RSSIEstimator, create_rssi_estimator, estimate_distance
+
+try:
+    # Lets BlueZ match our beacons' advertisements itself, which passive scanning requires
+    from bleak.backends.bluezdbus.advertisement_monitor import OrPattern
+except ImportError:
+    OrPattern = None
+
+APPLE_COMPANY_ID = 0x004C
+IBEACON_TYPE = bytes([0x02, 0x15])
+MANUFACTURER_DATA_AD_TYPE = 0xFF
+
+# Inverted BLEConfig.BEACON_LOCATIONS, for mapping a location back to its beacon
+LOCATION_BEACONS = {location: beacon_key for beacon_key, location in BLEConfig.BEACON_LOCATIONS.items()}
 
 class LocationManager:
     """Manages BLE scanning and location tracking"""
     def __init__(self):
         self.logger = get_filter_logger(__name__)
         self._scanner = None
+        # We only manage the adapter's power on the Pi; elsewhere it's assumed ready
+        self._adapter = BluetoothAdapterMonitor(
+            create_adapter_backend(BLEConfig.BLUETOOTH_INTERFACE) if PLATFORM == "raspberry-pi" else None
+        )
+        # Streaming scan state. Apple manufacturer data for our beacons starts with this prefix,
+        # followed by the big-endian major and minor.
+        self._stream_scanner = None
+        self._beacon_prefix = IBEACON_TYPE + UUID(BLEConfig.BEACON_UUID).bytes
+        self._heard: Dict[Tuple[int, int], Tuple[int, float]] = {}  # (major, minor) -> (smoothed RSSI, monotonic time)
+        self.min_empty_scans = (BLEConfig.MIN_EMPTY_UPDATES_FOR_UNKNOWN if BLEConfig.STREAMING_SCAN
+                                else BLEConfig.MIN_EMPTY_SCANS_FOR_UNKNOWN)
         self._last_location = {
             "location": "unknown",
             "distance": Distance.UNKNOWN,
@@ -24,74 +51,22 @@ class LocationManager:
         self._beacon_empty_counts = defaultdict(int)  # Track empty scans per beacon
         self._is_running = False
         self._scanning_lock = asyncio.Lock()  # Add lock for scan coordination
-        # Initialize RSSI smoothing
-        self._rssi_ema = defaultdict(lambda: None)  # Stores EMA for each beacon
+        # Per-beacon RSSI smoothing
+        self._rssi_filters: Dict[Tuple[int, int], RSSIEstimator] = {}
+        self._trace = None  # Open RSSI trace file, if recording
         self._consecutive_readings = defaultdict(int)
         self._last_seen_timestamps = defaultdict(float)
         self._last_location_change_time = 0.0
         self._last_strongest = None  # Tracks the last strongest beacon for hysteresis
         
-    def _ensure_bluetooth_powered(self) -> bool:
-        """Ensures Bluetooth adapter is powered on
-        
-        Returns:
-            bool: True if adapter is powered on, False otherwise
-        """
-        if PLATFORM != "raspberry-pi":
-            return True
-            
-        try:
-            # Check adapter status
-            result = subprocess.run(
-                ['hciconfig', BLEConfig.BLUETOOTH_INTERFACE], 
-                capture_output=True, 
-                text=True
-            )
-            
-            if "UP RUNNING" not in result.stdout:
-                self.logger.info("Bluetooth adapter is down, attempting to power on...")
-                # Try to power on the adapter
-                subprocess.run(
-                    ['sudo', 'hciconfig', BLEConfig.BLUETOOTH_INTERFACE, 'up'],
-                    check=True
-                )
-                # Wait a moment for the adapter to initialize
-                time.sleep(1)
-                
-                # Check again
-                result = subprocess.run(
-                    ['hciconfig', BLEConfig.BLUETOOTH_INTERFACE], 
-                    capture_output=True, 
-                    text=True
-                )
-                if "UP RUNNING" not in result.stdout:
-                    self.logger.error("Failed to power on Bluetooth adapter")
-                    return False
-                    
-                self.logger.info("Successfully powered on Bluetooth adapter")
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Error managing Bluetooth adapter: {e}")
-            return False
-        except Exception as e:
-            self.logger.error(f"Unexpected error managing Bluetooth adapter: {e}")
-            return False
-            
-    def _update_rssi_ema(self, addr: str, rssi: int) -> float:
-        """Updates and returns the exponential moving average for a beacon's RSSI"""
-        current_ema = self._rssi_ema[addr]
-        
-        if current_ema is None:
-            # First measurement for this beacon
-            self._rssi_ema[addr] = float(rssi)
-            return float(rssi)
-            
-        # Calculate new EMA
-        alpha = BLEConfig.RSSI_EMA_ALPHA
-        new_ema = (alpha * rssi) + ((1 - alpha) * current_ema)
-        self._rssi_ema[addr] = new_ema
-        return new_ema
+    def _update_rssi(self, beacon_key: Tuple[int, int], rssi: int, timestamp: float) -> float:
+        """Feeds a reading to the beacon's RSSI estimator and returns the smoothed RSSI"""
+        estimator = self._rssi_filters.get(beacon_key)
+        if estimator is None:
+            estimator = self._rssi_filters[beacon_key] = create_rssi_estimator()
+        if self._trace:
+            self._trace.write(f"{timestamp:.3f},{beacon_key[0]},{beacon_key[1]},{rssi}\n")
+        return estimator.update(rssi, timestamp)
         
     def parse_ibeacon_data(self, mfg_data: bytes) -> Optional[Tuple[str, int, int]]:
         """Parse manufacturer data to extract iBeacon information"""
@@ -129,8 +104,8 @@ class LocationManager:
         #     return []
             
         try:
-            # Ensure Bluetooth is powered on
-            if not self._ensure_bluetooth_powered():
+            # Skip the scan while the adapter is down
+            if not self._adapter.is_ready:
                 return []
                 
             # Create scanner if needed
@@ -205,7 +180,7 @@ class LocationManager:
                                 
                             beacon_key = (major, minor)
                             if beacon_key in BLEConfig.BEACON_LOCATIONS:
-                                smoothed_rssi = int(self._update_rssi_ema(f"{major}:{minor}", adv.rssi))
+                                smoothed_rssi = int(self._update_rssi(beacon_key, adv.rssi, time.monotonic()))
                                 smoothed_devices.append((beacon_key, smoothed_rssi))
                                 self.logger.debug(
                                     f"Matched beacon {major}:{minor} ({BLEConfig.BEACON_LOCATIONS[beacon_key]}): Raw RSSI={adv.rssi}, Smoothed={smoothed_rssi}"
@@ -224,6 +199,79 @@ class LocationManager:
             self.logger.error(f"Error scanning for BLE devices: {e}")
             return []
             
+    def _on_advertisement(self, device, adv) -> None:
+        """Detection callback for the streaming scanner, called for every advertisement received.
+
+        Anything that isn't one of our beacons is rejected with a dict lookup and a prefix
+        compare before any parsing, since most advertisements nearby aren't ours.
+        """
+        data = adv.manufacturer_data.get(APPLE_COMPANY_ID)
+        if data is None or len(data) < 22 or not data.startswith(self._beacon_prefix):
+            return
+        beacon_key = struct.unpack_from(">HH", data, 18)
+        if beacon_key not in BLEConfig.BEACON_LOCATIONS:
+            return
+        now = time.monotonic()
+        self._heard[beacon_key] = (int(self._update_rssi(beacon_key, adv.rssi, now)), now)
+
+    async def _start_streaming(self) -> bool:
+        """Starts the long-running streaming scanner if it isn't already running
+
+        Returns:
+            bool: True if the scanner is running
+        """
+        if not self._adapter.is_ready:
+            # A scanner running when the adapter went down is dead; restart it once it's back
+            await self._stop_streaming()
+            return False
+        if self._stream_scanner:
+            return True
+
+        modes = [BLEConfig.STREAMING_SCAN_MODE]
+        if BLEConfig.STREAMING_SCAN_MODE != "active":
+            modes.append("active")
+        for mode in modes:
+            kwargs = {}
+            if mode == "passive" and OrPattern is not None:
+                kwargs["bluez"] = {"or_patterns": [OrPattern(
+                    0, MANUFACTURER_DATA_AD_TYPE,
+                    APPLE_COMPANY_ID.to_bytes(2, "little") + self._beacon_prefix
+                )]}
+            try:
+                scanner = BleakScanner(
+                    adapter=BLEConfig.BLUETOOTH_INTERFACE,
+                    detection_callback=self._on_advertisement,
+                    scanning_mode=mode,
+                    **kwargs
+                )
+                await scanner.start()
+            except Exception as e:
+                self.logger.warning(f"Failed to start {mode} streaming BLE scan: {e}")
+                continue
+            self._stream_scanner = scanner
+            self.logger.info(f"Started {mode} streaming BLE scan on {BLEConfig.BLUETOOTH_INTERFACE}")
+            return True
+        return False
+
+    async def _stop_streaming(self) -> None:
+        """Stops the streaming scanner"""
+        if not self._stream_scanner:
+            return
+        try:
+            await self._stream_scanner.stop()
+        except Exception as e:
+            self.logger.error(f"Error stopping streaming scanner: {e}")
+        finally:
+            self._stream_scanner = None
+            self._heard.clear()
+
+    def _visible_beacons(self) -> List[Tuple[Tuple[int, int], int]]:
+        """Returns ((major, minor), smoothed RSSI) for beacons heard within the visibility window"""
+        cutoff = time.monotonic() - BLEConfig.STREAM_VISIBILITY_WINDOW
+        for beacon_key in [key for key, (_, heard_at) in self._heard.items() if heard_at < cutoff]:
+            del self._heard[beacon_key]
+        return [(beacon_key, rssi) for beacon_key, (rssi, _) in self._heard.items()]
+
     async def scan_discovery(self) -> None:
         """Perform a discovery scan for all nearby BLE devices"""
         # if PLATFORM != "raspberry-pi":
@@ -231,8 +279,7 @@ class LocationManager:
         #     return
             
         try:
-            # Ensure Bluetooth is powered on
-            if not self._ensure_bluetooth_powered():
+            if not self._adapter.is_ready:
                 self.logger.error("Cannot perform discovery scan: Bluetooth adapter is not powered on")
                 return
                 
@@ -336,7 +383,16 @@ class LocationManager:
             self._scanner = None
             
     async def scan_once(self) -> Dict[str, Any]:
-        """Performs a single scan cycle and returns location info"""
+        """Performs a single scan cycle and returns location info
+
+        In streaming mode this doesn't scan: the scanner runs continuously, and location is
+        updated from the beacons it has heard recently.
+        """
+        if BLEConfig.STREAMING_SCAN:
+            if not await self._start_streaming():
+                return self._last_location
+            return self._update_location(self._visible_beacons())
+
         try:
             # Check if a scan is already in progress
             if self._scanning_lock.locked():
@@ -355,7 +411,11 @@ class LocationManager:
         except Exception as e:
             self.logger.debug(f"Skipping scan - {str(e)}")
             return self._last_location
-            
+
+        return self._update_location(devices)
+
+    def _update_location(self, devices: List[Tuple[Tuple[int, int], int]]) -> Dict[str, Any]:
+        """Updates location and proximity from the beacons currently visible, with their smoothed RSSI"""
         if not devices:
             # Increment empty scan counters
             self._empty_scan_count += 1
@@ -370,7 +430,7 @@ class LocationManager:
                     return self._last_location
             
             # Only declare unknown after minimum number of empty scans
-            if self._empty_scan_count < BLEConfig.MIN_EMPTY_SCANS_FOR_UNKNOWN:
+            if self._empty_scan_count < self.min_empty_scans:
                 return self._last_location
             
             self._consecutive_readings.clear()
@@ -409,16 +469,15 @@ class LocationManager:
 
             # Process all visible beacons
             all_beacons = {}
-            for addr, rssi in devices:
-                location = BLEConfig.BEACON_LOCATIONS[addr]
-                smoothed_rssi = int(self._update_rssi_ema(f"{addr[0]}:{addr[1]}", rssi))
-                distance = self._estimate_distance(smoothed_rssi)
-                all_beacons[location] = {
+            for beacon_addr, beacon_rssi in devices:
+                beacon_location = BLEConfig.BEACON_LOCATIONS[beacon_addr]
+                distance = self._estimate_distance(beacon_rssi)
+                all_beacons[beacon_location] = {
                     "distance": distance,
-                    "rssi": rssi,  # Keep raw RSSI for debugging
-                    "smoothed_rssi": smoothed_rssi
+                    "rssi": beacon_rssi,
+                    "smoothed_rssi": beacon_rssi  # Already smoothed when the beacon was heard
                 }
-                self.logger.debug(f"Found beacon for {location}: RSSI={rssi}, Smoothed={smoothed_rssi}, Distance={distance}")
+                self.logger.debug(f"Found beacon for {beacon_location}: Smoothed RSSI={beacon_rssi}, Distance={distance}")
 
             # Only change location after minimum consecutive readings
             if (self._consecutive_readings[location] >= BLEConfig.MIN_READINGS_FOR_CHANGE and
@@ -426,7 +485,7 @@ class LocationManager:
                 self._last_location_change_time = time.time()
                 self._last_location = {
                     "location": location,
-                    "distance": self._estimate_distance(smoothed_rssi),
+                    "distance": self._estimate_distance(rssi),
                     "all_beacons": all_beacons
                 }
             else:
@@ -446,12 +505,21 @@ class LocationManager:
         #     self.logger.info("Location tracking not available on this platform")
         #     return
             
-        # Ensure Bluetooth is powered on before starting
-        if not self._ensure_bluetooth_powered():
-            self.logger.error("Failed to start location manager: Bluetooth adapter is not powered on")
-            return
+        # Wait briefly for the adapter, but don't fail if it's down: the monitor keeps trying to
+        # power it on, and scans resume once it's up
+        await self._adapter.start()
+        if not await self._adapter.wait_ready(BLEConfig.ADAPTER_READY_TIMEOUT):
+            self.logger.error("Bluetooth adapter is not powered on; scanning will start once it is")
             
         self._is_running = True
+
+        if BLEConfig.RSSI_TRACE_PATH and not self._trace:
+            # Line buffered, so a trace survives the app being killed
+            self._trace = open(BLEConfig.RSSI_TRACE_PATH, "a", buffering=1)
+            self.logger.info(f"Recording beacon RSSI trace to {BLEConfig.RSSI_TRACE_PATH}")
+
+        if BLEConfig.STREAMING_SCAN:
+            await self._start_streaming()
             
         self.logger.info("Location manager started")
         
@@ -472,6 +540,7 @@ class LocationManager:
     async def stop(self) -> None:
         """Stops the location manager"""
         self._is_running = False
+        await self._stop_streaming()
         if self._scanner:
             try:
                 # Stop any ongoing scan
@@ -480,9 +549,13 @@ class LocationManager:
                 self.logger.error(f"Error stopping scanner: {e}")
             finally:
                 self._scanner = None
+        await self._adapter.stop()
                 
         # Clear RSSI history
-        self._rssi_ema.clear()
+        self._rssi_filters.clear()
+        if self._trace:
+            self._trace.close()
+            self._trace = None
         self.logger.info("Location manager stopped")
         
     @property
@@ -492,67 +565,33 @@ class LocationManager:
 
     def _estimate_distance(self, rssi: int) -> Distance:
         """Estimates distance category based on RSSI value"""
-        if rssi >= BLEConfig.RSSI_IMMEDIATE:
-            return Distance.IMMEDIATE
-        elif rssi >= BLEConfig.RSSI_VERY_NEAR:
-            return Distance.VERY_NEAR
-        elif rssi >= BLEConfig.RSSI_NEAR:
-            return Distance.NEAR
-        elif rssi >= BLEConfig.RSSI_FAR:
-            return Distance.FAR
-        elif rssi >= BLEConfig.RSSI_VERY_FAR:
-            return Distance.VERY_FAR
-        else:
-            return Distance.UNKNOWN
+        return estimate_distance(rssi)
             
     def _get_strongest_beacon(self, devices: List[Tuple[Tuple[int, int], int]]) -> Optional[Tuple[Tuple[int, int], int]]:
         """Returns the strongest beacon considering hysteresis and equidistant cases"""
         if not devices:
             return None
             
-        # Sort by RSSI
-        sorted_devices = sorted(devices, key=lambda x: x[1], reverse=True)
-        
         # Add bonus to current location if it exists
-        current_location = self._last_location.get("location")
-        if current_location and current_location != "unknown":
-            current_addr = next(
-                (addr for addr, loc in BLEConfig.BEACON_LOCATIONS.items() 
-                 if loc == current_location), 
-                None
-            )
-            if current_addr:
-                sorted_devices = [(addr, rssi + (BLEConfig.CURRENT_LOCATION_RSSI_BONUS if addr == current_addr else 0))
-                                for addr, rssi in sorted_devices]
-                sorted_devices.sort(key=lambda x: x[1], reverse=True)
+        current_addr = LOCATION_BEACONS.get(self._last_location.get("location"))
+        if current_addr:
+            devices = [(addr, rssi + BLEConfig.CURRENT_LOCATION_RSSI_BONUS) if addr == current_addr else (addr, rssi)
+                       for addr, rssi in devices]
+
+        # Only the top two matter
+        top = heapq.nlargest(2, devices, key=lambda x: x[1])
         
         # Check if top beacons are within equality threshold
-        if len(sorted_devices) >= 2:
-            rssi_diff = abs(sorted_devices[0][1] - sorted_devices[1][1])
-            if rssi_diff <= BLEConfig.RSSI_EQUALITY_THRESHOLD:
-                # If equidistant, maintain current location if it's one of them
-                if current_location and current_location != "unknown":
-                    current_addr = next(
-                        (addr for addr, loc in BLEConfig.BEACON_LOCATIONS.items() 
-                         if loc == current_location), 
-                        None
-                    )
-                    if current_addr in [addr for addr, _ in sorted_devices[:2]]:
-                        return next(
-                            device for device in sorted_devices 
-                            if device[0] == current_addr
-                        )
-                
-                # Otherwise, maintain previous strongest if it's one of them
-                if self._last_strongest and self._last_strongest[0] in [addr for addr, _ in sorted_devices[:2]]:
-                    return next(
-                        device for device in sorted_devices 
-                        if device[0] == self._last_strongest[0]
-                    )
+        if len(top) == 2 and abs(top[0][1] - top[1][1]) <= BLEConfig.RSSI_EQUALITY_THRESHOLD:
+            # If equidistant, maintain current location if it's one of them, otherwise the previous strongest
+            for addr in (current_addr, self._last_strongest[0] if self._last_strongest else None):
+                for device in top:
+                    if addr and device[0] == addr:
+                        return device
         
         # Update last strongest and return
-        self._last_strongest = sorted_devices[0]
-        return sorted_devices[0]
+        self._last_strongest = top[0]
+        return top[0]
         
     def get_current_location(self) -> Dict[str, Any]:
         """Returns the current location information"""
@@ -566,6 +605,6 @@ class LocationManager:
         
     def get_scan_interval(self) -> int:
         """Returns the current scan interval based on activity"""
-        return (BLEConfig.LOW_POWER_SCAN_INTERVAL 
-                if self._no_activity_count >= BLEConfig.NO_ACTIVITY_THRESHOLD 
-                else BLEConfig.SCAN_INTERVAL) 
\ No newline at end of file
+        if self._no_activity_count >= BLEConfig.NO_ACTIVITY_THRESHOLD:
+            return BLEConfig.LOW_POWER_SCAN_INTERVAL
+        return BLEConfig.STREAM_UPDATE_INTERVAL if BLEConfig.STREAMING_SCAN else BLEConfig.SCAN_INTERVAL
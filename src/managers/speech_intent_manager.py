@@ -19,7 +19,6 @@ class SpeechIntentManager:
         self.running = False
         self._audio_consumer = None
         self._lock = threading.Lock()
-        self._remainder = np.array([], dtype=np.int16)
         self._loop = None
         self.rhino = None
         self._initialize_rhino()
@@ -86,8 +85,12 @@ class SpeechIntentManager:
                 
             self.running = True
             self._loop = asyncio.get_running_loop()
+            # Receive exactly one Rhino frame per call, on a worker thread so inference never
+            # holds up audio capture
             self._audio_consumer = self.audio_manager.add_consumer(
-                self._process_audio
+                self._process_audio,
+                chunk_size=self.rhino.frame_length,
+                threaded=True
             )
             logging.info("Speech intent detection started")
 
@@ -105,28 +108,11 @@ class SpeechIntentManager:
             return
             
         try:
-            # Combine with any remainder from last time
-            if len(self._remainder) > 0:
-                audio_data = np.concatenate([self._remainder, audio_data])
-                
-            # Process complete frames
-            frame_length = self.rhino.frame_length
-            num_complete_frames = len(audio_data) // frame_length
-            
-            for i in range(num_complete_frames):
-                start = i * frame_length
-                end = start + frame_length
-                frame = audio_data[start:end]
-                
-                # Process the frame
-                is_finalized = self.rhino.process(frame)
-                if is_finalized:
-                    inference = self.rhino.get_inference()
-                    self._handle_inference(inference)
-                    
-            # Store remainder samples for next time
-            remainder_start = num_complete_frames * frame_length
-            self._remainder = audio_data[remainder_start:]
+            # The audio manager delivers exactly one Rhino frame per call
+            is_finalized = self.rhino.process(audio_data)
+            if is_finalized:
+                inference = self.rhino.get_inference()
+                self._handle_inference(inference)
             
         except Exception as e:
             logging.error(f"Error processing audio in speech intent detection: {e}")
@@ -1,5 +1,9 @@
 """
 Core sensor functionality for reading and processing touch sensor data.
+
+The ADS1115 runs in continuous conversion mode and hardware.adc_ads1115.ADS1115Sampler reads
+every conversion on its own thread. The samples are processed here in batches, each with the
+time it was read, so stroke timing doesn't depend on when the event loop gets round to them.
 """
 
 import time
@@ -10,6 +14,8 @@ import platform
 import random
 import math
 from typing import Callable, Optional, List, Awaitable, Union
+from hardware.adc_ads1115 import ADS1115Sampler, enable_conversion_ready, matching_data_rate
+from hardware.gpio_interrupt import GPIOInterrupt
 
 # Only import hardware-specific libraries on Raspberry Pi
 if PLATFORM == "raspberry-pi":
@@ -45,6 +51,9 @@ class TouchManager:
         self.recent_strokes = []  # List of (timestamp, intensity_increase) tuples
         self.activity_window = TouchConfig.STROKE_ACTIVITY_WINDOW  # Track strokes in last N seconds
         
+        self.sampler: Optional[ADS1115Sampler] = None  # Reads the ADC while started
+        self._processing_task: Optional[asyncio.Task] = None
+        
         if PLATFORM == "raspberry-pi":
             self.ads, self.chan = self._setup_adc()
         else:
@@ -65,9 +74,9 @@ class TouchManager:
             # Create the ADC object using the I2C bus
             ads = ADS.ADS1115(i2c)  # Change to ADS1015 if using that model
 
-            # Set the ADC to continuous conversion mode
-            # TODO: Uncomment this to test when everything else works
-            # ads.mode = Mode.CONTINUOUS
+            # Set the ADC to continuous conversion mode, so each read just fetches the latest
+            # conversion. The data rate is set to match the sample rate in start().
+            ads.mode = Mode.CONTINUOUS
             
             # Create single-ended input on channel 0
             chan = AnalogIn(ads, ADS.P0)
@@ -215,89 +224,121 @@ class TouchManager:
         return min(TouchConfig.STROKE_INTENSITY_MAX_INCREASE, max(0.0, increase))
     
     async def start(self, sample_rate_hz: float = TouchConfig.SAMPLE_RATE_HZ):
-        """Start the sensor reading loop
+        """Start sampling the sensor and processing the samples
+        
+        The ADC is read on the sampler thread; the event loop only processes its samples, a
+        batch at a time, and never waits on the I2C bus.
         
         Args:
-            sample_rate_hz: Sampling rate in Hz (defaults to TouchConfig.SAMPLE_RATE_HZ)
+            sample_rate_hz: Sampling rate in Hz (defaults to TouchConfig.SAMPLE_RATE_HZ). On the
+                            ADS1115 this is rounded up to the nearest data rate it supports.
         """
         if self.running:
             return
             
         self.running = True
-        interval = 1.0 / sample_rate_hz
-        
-        # Create a separate task for processing callbacks
-        async def process_callbacks():
-            while self.running:
-                try:
-                    value = self.chan.value
-                    was_touching = self.touch_state.is_touching
-                    is_touching = self.touch_state.update(value)
-                    
-                    # Update stroke intensity level and notify if changed
-                    if self._update_stroke_intensity_level():
-                        await self._notify_intensity_update()
-                    
-                    # Notify touch state changes
-                    if is_touching != was_touching:
-                        await self._execute_callbacks(self.touch_callbacks, is_touching)
-                    
-                    # Process point and check for strokes
-                    stroke_detected, direction = self.stroke_detector.add_point(value, is_touching)
-                    
-                    if is_touching:
-                        # Calculate normalized position
-                        position = ((value - TouchConfig.LEFT_MIN) / (TouchConfig.RIGHT_MAX - TouchConfig.LEFT_MIN))
-                        position = max(0, min(position, 1.0))
-                        
-                        # Notify position updates
-                        await self._execute_callbacks(self.position_callbacks, position)
-                    
-                    if stroke_detected:
-                        # Get stroke metrics from detector
-                        times = [t for t, p in self.stroke_detector.touch_history]
-                        positions = [p for t, p in self.stroke_detector.touch_history]
-                        total_distance = abs(positions[-1] - positions[0])
-                        total_time = times[-1] - times[0]
-                        speed = total_distance / total_time if total_time > 0 else 0
-                        
-                        # Calculate and apply stroke intensity increase based on stroke metrics
-                        increase = self._calculate_stroke_intensity_increase(total_distance, speed)
-                        self.stroke_intensity_level = min(1.0, self.stroke_intensity_level + increase)
-                        now = time.time()
-                        self.last_stroke_intensity_update = now
-                        
-                        # Track this stroke for activity level calculation
-                        self.recent_strokes.append((now, increase))
-                        
-                        # Log the stroke intensity calculation
-                        logging.info(f"Stroke intensity increase: {increase:.3f} (distance: {total_distance:.3f}, speed: {speed:.3f})")
-                        
-                        # Notify stroke detection and intensity update
-                        await self._execute_callbacks(self.stroke_callbacks, direction)
-                        await self._notify_intensity_update()
-                    
-                except Exception as e:
-                    logging.error(f"Error reading sensor: {str(e)}")
-                
-                await asyncio.sleep(interval)
-        
         try:
-            # Start the callback processing task but don't await it
-            self._processing_task = asyncio.create_task(process_callbacks())
-            # Return immediately to not block the event loop
-            return
+            self.sampler = self._create_sampler(sample_rate_hz)
+            self.sampler.start()
+            # Start the sample processing task but don't await it
+            self._processing_task = asyncio.create_task(self._process_samples())
         except Exception as e:
             logging.error(f"Failed to start touch processing: {str(e)}")
-            self.running = False
+            self.stop()
             raise
+
+    def _create_sampler(self, sample_rate_hz: float) -> ADS1115Sampler:
+        """Set the ADC's data rate to match the sample rate, and wire up ALERT/RDY if configured"""
+        if self.ads is None:
+            return ADS1115Sampler(self.chan, sample_rate_hz)
+        data_rate = matching_data_rate(sample_rate_hz)
+        self.ads.data_rate = data_rate
+        ready = None
+        if TouchConfig.ALERT_PIN is not None:
+            try:
+                enable_conversion_ready(self.ads)
+                ready = GPIOInterrupt(TouchConfig.ALERT_PIN)
+                logging.info(f"Reading touch conversions on ADS1115 ALERT/RDY (GPIO {TouchConfig.ALERT_PIN})")
+            except Exception as e:
+                logging.warning(f"Can't use GPIO {TouchConfig.ALERT_PIN} for the ADS1115 ALERT/RDY line, "
+                                f"pacing touch reads by the clock instead: {str(e)}")
+        return ADS1115Sampler(self.chan, data_rate, ready)
+
+    async def _process_samples(self):
+        """Process the sampler's samples as they arrive, each at the time it was read"""
+        while self.running:
+            try:
+                # Times out so intensity keeps decaying even if the sampler stalls
+                await self.sampler.wait_for_samples(timeout=0.1)
+                
+                # Update stroke intensity level and notify if changed
+                if self._update_stroke_intensity_level():
+                    await self._notify_intensity_update()
+                
+                value = None
+                for timestamp, value in self.sampler.read_samples().tolist():
+                    await self._process_sample(value, timestamp)
+                
+                if value is not None and self.touch_state.is_touching and self.position_callbacks:
+                    # Calculate normalized position of the latest sample
+                    position = ((value - TouchConfig.LEFT_MIN) / (TouchConfig.RIGHT_MAX - TouchConfig.LEFT_MIN))
+                    position = max(0, min(position, 1.0))
+                    
+                    # Notify position updates, once per batch
+                    await self._execute_callbacks(self.position_callbacks, position)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error processing touch samples: {str(e)}")
+                await asyncio.sleep(0.1)
+
+    async def _process_sample(self, value: int, timestamp: float):
+        """Update touch state and stroke detection with one sample"""
+        was_touching = self.touch_state.is_touching
+        is_touching = self.touch_state.update(value, timestamp)
+        
+        # Notify touch state changes
+        if is_touching != was_touching:
+            await self._execute_callbacks(self.touch_callbacks, is_touching)
+        
+        # Process point and check for strokes
+        stroke_detected, direction = self.stroke_detector.add_point(value, is_touching, timestamp)
+        
+        if stroke_detected:
+            # Get stroke metrics from detector
+            times = [t for t, p in self.stroke_detector.touch_history]
+            positions = [p for t, p in self.stroke_detector.touch_history]
+            total_distance = abs(positions[-1] - positions[0])
+            total_time = times[-1] - times[0]
+            speed = total_distance / total_time if total_time > 0 else 0
+            
+            # Calculate and apply stroke intensity increase based on stroke metrics
+            increase = self._calculate_stroke_intensity_increase(total_distance, speed)
+            self.stroke_intensity_level = min(1.0, self.stroke_intensity_level + increase)
+            now = time.time()
+            self.last_stroke_intensity_update = now
+            
+            # Track this stroke for activity level calculation
+            self.recent_strokes.append((now, increase))
+            
+            # Log the stroke intensity calculation
+            logging.info(f"Stroke intensity increase: {increase:.3f} (distance: {total_distance:.3f}, speed: {speed:.3f})")
+            
+            # Notify stroke detection and intensity update
+            await self._execute_callbacks(self.stroke_callbacks, direction)
+            await self._notify_intensity_update()
     
     def stop(self):
-        """Stop the sensor reading loop"""
+        """Stop the sampler thread and the processing task"""
         self.running = False
         # Cancel the processing task if it exists
         if hasattr(self, '_processing_task') and self._processing_task:
             self._processing_task.cancel()
+        if self.sampler:
+            self.sampler.stop()
+            if self.sampler.ready:
+                self.sampler.ready.close()
+            self.sampler = None
 
 class StrokeDetector:
     """Class to detect stroking motions on the touch sensor"""
@@ -307,24 +348,25 @@ class StrokeDetector:
         self.was_touching = False  # Track previous touch state
         self.pending_stroke = None  # Store detected stroke until next touch
         
-    def add_point(self, value, is_touching):
+    def add_point(self, value, is_touching, timestamp=None):
         """Add a touch point to history and check for stroke on release
         
         Args:
             value (int): Raw sensor value
             is_touching (bool): Current touch state
+            timestamp (float): When the value was read (time.time() clock), or None for now
             
         Returns:
             tuple: (bool: stroke detected, str: stroke direction if detected) or (False, None)
         """
-        now = time.time()
+        now = time.time() if timestamp is None else timestamp
         
         # Handle touch state transition
         if is_touching != self.was_touching:
             if self.was_touching and not is_touching:  # Finger lifted
                 # Check for stroke only when finger is lifted
                 if len(self.touch_history) >= TouchConfig.MIN_STROKE_POINTS:
-                    self.pending_stroke = self._check_stroke()
+                    self.pending_stroke = self._check_stroke(now)
             else:  # New touch started
                 self.touch_history = []  # Clear history only on new touch
                 self.pending_stroke = None
@@ -353,9 +395,12 @@ class StrokeDetector:
         
         return False, None
     
-    def _check_stroke(self):
+    def _check_stroke(self, now):
         """Internal method to check if the completed touch was a stroke
         
+        Args:
+            now (float): When the finger was lifted
+            
         Returns:
             tuple: (bool: stroke detected, str: stroke direction if detected)
         """
@@ -411,7 +456,6 @@ class StrokeDetector:
         logging.info(f"Positions from {positions[0]:.3f} to {positions[-1]:.3f} over {total_time:.3f}s")
         
         # Check if stroke criteria are met
-        now = time.time()
         if total_distance < TouchConfig.MIN_STROKE_DISTANCE:
             logging.info(f"Distance too small: {total_distance:.3f} < {TouchConfig.MIN_STROKE_DISTANCE}")
         elif not is_monotonic:
@@ -491,16 +535,17 @@ class TouchState:
         self.last_value = 0
         self.stable_start = 0  # Time when stable count started
         
-    def update(self, value):
+    def update(self, value, timestamp=None):
         """Update touch state with hysteresis to prevent rapid switching
         
         Args:
             value (int): Raw sensor value
+            timestamp (float): When the value was read (time.time() clock), or None for now
             
         Returns:
             bool: True if touching, False if not
         """
-        now = time.time()
+        now = time.time() if timestamp is None else timestamp
         
         # Check if value has changed significantly from last reading
         if value < TouchConfig.NO_TOUCH_THRESHOLD:
@@ -546,7 +591,7 @@ class MockAnalogIn:
         self._last_update = now
         
         # Randomly start/stop touch sequences
-        if not self._touch_active and random.random() < 0.001:  # 0.1% chance to start touch
+        if not self._touch_active and random.random() < elapsed * 0.1:  # 10% chance per second to start touch
             self._touch_active = True
             self._touch_position = random.random()  # Random start position
             self._touch_direction = 1 if random.random() > 0.5 else -1
@@ -5,7 +5,7 @@ print("Importing elevenlabs.client. This is very slow...")
 from elevenlabs.client import ElevenLabs, AsyncElevenLabs
 print("Imported elevenlabs.client.")
 from config import ElevenLabsConfig, AudioBaseConfig, get_filter_logger
-from utils.audio_processing import pitch_shift_audio, pcm_bytes_to_numpy, PYRUBBERBAND_AVAILABLE
+from utils.audio_processing import pitch_shift_stream
 
 logger = get_filter_logger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -37,7 +37,8 @@ class VoiceManager:
                        Value between 0.0 and 1.0. Defaults to None (api default).
             style: The style of the voice. A value between 0.0 and 1.0.
             use_speaker_boost: Whether to use speaker boost.
-            pitch: Pitch shift in semitones. Can be positive or negative. Requires pyrubberband.
+            pitch: Pitch shift in semitones. Can be positive or negative. Applied to the stream as it
+                   arrives, so it only delays the first audio by one STFT frame.
 
         Returns:
             An async iterator yielding audio chunks (bytes).
@@ -71,44 +72,12 @@ class VoiceManager:
 
             audio_stream_generator = self._async_client.text_to_speech.stream(**stream_params)
             
-            if pitch != 0.0 and PYRUBBERBAND_AVAILABLE:
-                logger.info(f"Applying pitch shift of {pitch} semitones.")
-                # Buffer the entire audio stream. This adds latency but is necessary for pitch shifting.
-                audio_bytes = b"".join([chunk async for chunk in audio_stream_generator])
-                
-                # Convert to numpy array
-                audio_array = pcm_bytes_to_numpy(audio_bytes)
+            if pitch != 0.0:
+                logger.info(f"Applying streaming pitch shift of {pitch} semitones.")
+                return pitch_shift_stream(audio_stream_generator, pitch, AudioBaseConfig.SAMPLE_RATE)
 
-                if audio_array.size == 0:
-                    logger.warning("Received empty audio stream from ElevenLabs.")
-                    async def empty_generator():
-                        yield b''
-                    return empty_generator()
-
-                # Pitch shift
-                pitch_shifted_array = pitch_shift_audio(
-                    audio_array, 
-                    pitch,
-                    AudioBaseConfig.SAMPLE_RATE
-                )
-
-                # Convert back to bytes
-                pitch_shifted_bytes = pitch_shifted_array.tobytes()
-                
-                # Create a new async generator for the pitch-shifted audio
-                async def shifted_audio_generator():
-                    # We can chunk it to simulate the original stream behavior
-                    chunk_size = 4096 # A reasonable chunk size
-                    for i in range(0, len(pitch_shifted_bytes), chunk_size):
-                        yield pitch_shifted_bytes[i:i+chunk_size]
-
-                logger.info("Audio stream generation with pitch shift started.")
-                return shifted_audio_generator()
-            else:
-                if pitch != 0.0 and not PYRUBBERBAND_AVAILABLE:
-                    logger.warning("Pitch shifting requested but pyrubberband is not installed. Ignoring pitch shift.")
-                logger.info("Audio stream generation started.")
-                return audio_stream_generator
+            logger.info("Audio stream generation started.")
+            return audio_stream_generator
         except Exception as e:
             logger.error(f"Error generating audio stream from ElevenLabs: {e}")
             return None
@@ -19,7 +19,6 @@ class WakeWordManager:
         self.running = False
         self._audio_consumer = None
         self._lock = threading.Lock()
-        self._remainder = np.array([], dtype=np.int16)  # Store remainder samples
         self._loop = None  # Store event loop reference
         
         # Initialize Porcupine
@@ -60,9 +59,12 @@ class WakeWordManager:
             self.running = True
             # Store the event loop reference from the main thread
             self._loop = asyncio.get_running_loop()
-            # Register as an audio consumer without specifying chunk size
+            # Register as an audio consumer that receives exactly one Porcupine frame per call,
+            # on its own thread so inference never holds up audio capture
             self._audio_consumer = self.audio_manager.add_consumer(
-                self._process_audio
+                self._process_audio,
+                chunk_size=self.porcupine.frame_length,
+                threaded=True
             )
             logging.info("Wake word detection started")
 
@@ -77,27 +79,10 @@ class WakeWordManager:
             return
             
         try:
-            # Combine with any remainder from last time
-            if len(self._remainder) > 0:
-                audio_data = np.concatenate([self._remainder, audio_data])
-                
-            # Process complete frames
-            frame_length = self.porcupine.frame_length
-            num_complete_frames = len(audio_data) // frame_length
-            
-            for i in range(num_complete_frames):
-                start = i * frame_length
-                end = start + frame_length
-                frame = audio_data[start:end]
-                
-                # Process the frame
-                result = self.porcupine.process(frame)
-                if result >= 0:
-                    self._handle_wake_word_detected()
-                    
-            # Store remainder samples for next time
-            remainder_start = num_complete_frames * frame_length
-            self._remainder = audio_data[remainder_start:]
+            # The audio manager delivers exactly one Porcupine frame per call
+            result = self.porcupine.process(audio_data)
+            if result >= 0:
+                self._handle_wake_word_detected()
             
         except Exception as e:
             logging.error(f"Error processing audio in wake word detection: {e}")
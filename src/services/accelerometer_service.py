@@ -6,6 +6,16 @@ The accelerometer is a BNO085 sensor, a 9-axis sensor that combines an accelerom
 This service uses the AccelerometerManager to handle low-level sensor interactions and focuses on event publishing
 and higher-level application logic.
 
+Acquisition and publishing are decoupled. Sampling runs on its own loop with fixed deadlines every `update_interval`
+(scheduled from the previous deadline, not from when the tick finished, so it doesn't drift), and the motion
+classifier sees every sample. sensor_data events go to a queue drained by a separate publisher task: one for every
+state change, and otherwise the newest sample at most every `publish_interval`. A slow event handler therefore only
+delays events, never the next read, and periodic updates it hasn't caught up with are coalesced.
+
+Low power mode:
+Once the state has been STATIONARY for AccelerometerConfig.LOW_POWER_IDLE_TIMEOUT, the loop puts the sensor in low
+power mode and stops ticking altogether until the sensor's on-chip classifiers report motion (see BNO085Interface).
+
 Motion Vectors:
 These reports return calibrated X, Y, and Z axis measurements for the given sensor measurement type.
 - Acceleration Vector / Accelerometer: Three axes of acceleration from gravity and linear motion, in m/s^2
@@ -53,32 +63,68 @@ https://docs.circuitpython.org/projects/bno08x/en/latest/api.html
 """
 
 import asyncio
-from typing import Dict, Any
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Deque, Optional, Tuple
 from services.service import BaseService
 from managers.accelerometer_manager import AccelerometerManager
 from config import AccelerometerConfig
 
+@dataclass
+class AcquisitionStats:
+    """Counters for the acquisition loop and the events it publishes"""
+    ticks: int = 0              # Acquisition loop iterations
+    samples: int = 0            # Samples classified
+    missed_deadlines: int = 0   # Ticks that finished after the next one was due
+    max_lateness_seconds: float = 0.0  # Worst overrun past a deadline
+    state_changes: int = 0      # State change events queued
+    published: int = 0          # sensor_data events published
+    coalesced: int = 0          # Periodic events replaced by a newer one before they were published
+    low_power_periods: int = 0  # Times the sensor was put in low power mode
+    low_power_seconds: float = 0.0  # Total time spent in low power mode
+
+    @property
+    def missed_deadline_ratio(self) -> float:
+        return self.missed_deadlines / self.ticks if self.ticks else 0.0
+
+
 class AccelerometerService(BaseService):
     """
     Service for reading accelerometer data and publishing it to the event bus.
     
     This service abstracts the hardware details and focuses on:
-    1. Publishing sensor data at regular intervals
-    2. Processing sensor events
+    1. Reading and classifying sensor data on a fixed schedule
+    2. Publishing state changes, and sensor data at a decimated rate
     3. Handling service lifecycle
     """
-    def __init__(self, service_manager, update_interval=AccelerometerConfig.UPDATE_INTERVAL):
+    handled_events = frozenset()
+
+    def __init__(self, service_manager, update_interval=AccelerometerConfig.UPDATE_INTERVAL,
+                 publish_interval=AccelerometerConfig.PUBLISH_INTERVAL):
         """
         Initialize the AccelerometerService.
         
         Args:
             service_manager: Service manager instance that handles event bus
-            update_interval: How often to read and publish sensor data in seconds
+            update_interval: How often to read and classify sensor data in seconds
+            publish_interval: Longest gap between sensor_data events while the state doesn't change, in seconds
         """
         super().__init__(service_manager)
         self.update_interval = update_interval
+        self.publish_interval = publish_interval
         self.manager = AccelerometerManager()
         self.read_task = None
+        self.publish_task = None
+        self.stats = AcquisitionStats()
+        # (sample, periodic) pairs waiting for the publisher, oldest first
+        self._pending: Deque[Tuple[Dict[str, Any], bool]] = deque()
+        self._pending_ready = asyncio.Event()
+        self._last_state: Optional[str] = None
+        self._stationary_since: Optional[float] = None  # When the state last became STATIONARY (monotonic)
+        # The acquisition loop's clock and sleep, so tests can run its schedule on simulated time
+        self._clock = time.monotonic
+        self._sleep = asyncio.sleep
         
     async def start(self):
         """
@@ -90,7 +136,8 @@ class AccelerometerService(BaseService):
         
         # Initialize the sensor via the manager
         if await self.manager.initialize():
-            # Start continuous reading
+            # Start continuous reading, and publishing what it queues
+            self.publish_task = asyncio.create_task(self._publish_loop())
             self.read_task = asyncio.create_task(self._read_loop())
             self.logger.info("Accelerometer service started")
         else:
@@ -108,6 +155,11 @@ class AccelerometerService(BaseService):
             #     await self.read_task
             # except asyncio.CancelledError:
             #     pass
+        if self.publish_task:
+            self.publish_task.cancel()
+        self._log_stats()
+        if self.manager.low_power:
+            await self.manager.exit_low_power()
                 
         # Deinitialize the sensor
         self.logger.info("Deinitializing accelerometer service...")
@@ -118,33 +170,121 @@ class AccelerometerService(BaseService):
         
     async def _read_loop(self):
         """
-        Continuous loop to read accelerometer data and publish events.
+        Acquisition loop: classify every new sample once per tick, on fixed deadlines.
         """
+        next_tick = self._clock()
+        next_stats = next_tick + AccelerometerConfig.STATS_INTERVAL
+        next_publish = next_tick
         try:
             while True:
-                # Read data from accelerometer via manager
-                data = await self.manager.read_sensor_data()
-                
-                # Print data to console for debugging
-                if AccelerometerConfig.PRINT_DEBUG_DATA:
-                    self.manager.print_data(data)
-                
-                # Publish sensor data event
-                await self.publish({
-                    "type": "sensor_data",
-                    "sensor": "accelerometer",
-                    "data": data,
-                    "silent": True
-                })
-                
-                # Wait for the update interval
-                await asyncio.sleep(self.update_interval)
+                # Read and classify everything since the last tick via manager
+                batch = await self.manager.read_sensor_batch()
+                self.stats.ticks += 1
+                self.stats.samples += len(batch)
+
+                queued = None
+                for data in batch:
+                    # Print data to console for debugging
+                    if AccelerometerConfig.PRINT_DEBUG_DATA:
+                        self.manager.print_data(data)
+                    state = data.get("current_state")
+                    if state != self._last_state:
+                        self._last_state = state
+                        self.stats.state_changes += 1
+                        self._queue_event(data, periodic=False)
+                        queued = data
+
+                now = self._clock()
+                if self._last_state != "STATIONARY":
+                    self._stationary_since = None
+                elif self._stationary_since is None:
+                    self._stationary_since = now
+                elif (AccelerometerConfig.LOW_POWER_MODE and
+                      now - self._stationary_since >= AccelerometerConfig.LOW_POWER_IDLE_TIMEOUT):
+                    await self._sleep_until_motion()
+                    next_tick = next_publish = self._clock()
+                    continue
+                if batch and now >= next_publish:
+                    if batch[-1] is not queued:
+                        self._queue_event(batch[-1], periodic=True)
+                    next_publish = now + self.publish_interval
+
+                if now >= next_stats:
+                    next_stats += AccelerometerConfig.STATS_INTERVAL
+                    self._log_stats()
+
+                # Sleep until the next deadline, measured from the last one so the rate doesn't drift
+                next_tick += self.update_interval
+                delay = next_tick - self._clock()
+                if delay > 0:
+                    await self._sleep(delay)
+                else:
+                    # Overran the tick; don't try to make up for lost ticks
+                    self.stats.missed_deadlines += 1
+                    self.stats.max_lateness_seconds = max(self.stats.max_lateness_seconds, -delay)
+                    next_tick = self._clock()
+                    await asyncio.sleep(0)
 
         except asyncio.CancelledError:
             raise
         except Exception as e:
             self.logger.error(f"Error reading accelerometer: {e}")
             raise
+
+    async def _sleep_until_motion(self):
+        """Hand over to the sensor's low power mode until it reports motion"""
+        if not await self.manager.enter_low_power():
+            # Not available (e.g. without the reader thread); don't ask again until the state changes
+            self._stationary_since = float("inf")
+            return
+        self.stats.low_power_periods += 1
+        start = self._clock()
+        await self.manager.wait_for_wake()
+        self.stats.low_power_seconds += self._clock() - start
+        self._stationary_since = None
+        self.logger.debug(f"Accelerometer woke after {self._clock() - start:.1f}s in low power mode "
+                          f"({self.manager.interface.wake_reason})")
+
+    def _queue_event(self, data: Dict[str, Any], periodic: bool):
+        """Queue a sample for the publisher, replacing a periodic one it hasn't got to yet"""
+        if periodic and self._pending and self._pending[-1][1]:
+            self._pending[-1] = (data, True)
+            self.stats.coalesced += 1
+        else:
+            self._pending.append((data, periodic))
+        self._pending_ready.set()
+
+    async def _publish_loop(self):
+        """
+        Publisher: publish queued samples in order, so slow event handlers never hold up reading.
+        """
+        while True:
+            await self._pending_ready.wait()
+            self._pending_ready.clear()
+            while self._pending:
+                data, _ = self._pending.popleft()
+                try:
+                    # Publish sensor data event
+                    await self.publish({
+                        "type": "sensor_data",
+                        "sensor": "accelerometer",
+                        "data": data,
+                        "silent": True
+                    })
+                    self.stats.published += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Error publishing accelerometer data: {e}")
+
+    def _log_stats(self):
+        stats = self.stats
+        self.logger.debug(f"Accelerometer: {stats.samples} samples in {stats.ticks} ticks, "
+                          f"{stats.missed_deadlines} missed deadlines ({100 * stats.missed_deadline_ratio:.1f}%, "
+                          f"{1000 * stats.max_lateness_seconds:.1f}ms worst), {stats.state_changes} state changes, "
+                          f"{stats.published} events published, {stats.coalesced} coalesced, "
+                          f"{stats.low_power_periods} low power periods ({stats.low_power_seconds:.0f}s), "
+                          f"{self.manager.interface.dropped_samples} samples dropped by the reader")
             
     async def handle_event(self, event: Dict[str, Any]):
         """
@@ -55,6 +55,26 @@ class ActivityService(BaseService):
     Coordinates starting and stopping activities based on events from other services.
     Also manages the lifecycle of activity-specific services.
     """
+    handled_events = frozenset({
+        "application_startup_completed",
+        "intent_detected",
+        "activity_ended",
+        "conversation_ended",
+        "scavenger_hunt_won",
+        "squealing_ended",
+        "grandma_activity_ended",
+        "hide_seek_won",
+        "touch_stroke_intensity",
+        "start_sensing_phoenix_distance",
+        "stop_sensing_phoenix_distance",
+        "pstn_call_initiated",
+        "pstn_call_ended",
+        "pstn_call_error",
+        "pstn_call_already_ended",
+        "pstn_call_not_found",
+        "pstn_call_completed_remotely",
+    })
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.current_activity: Optional[ActivityType] = None
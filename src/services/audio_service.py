@@ -9,6 +9,14 @@ from hardware.amp_pam8302a import Amplifier
 
 class AudioService(BaseService):
     """Service to manage the AudioManager lifecycle"""
+    handled_events = frozenset({
+        "play_sound",
+        "stop_sound",
+        "intent_detection_started",
+        "touch_stroke_intensity",
+        "intent_detected",
+    })
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.audio_manager = None
@@ -247,10 +255,9 @@ class AudioService(BaseService):
                 # Schedule the async function to run on the event loop from the background thread
                 event_loop.call_soon_threadsafe(asyncio.create_task, finish_actions())
 
-            # Start playing the sound first
-            success = await event_loop.run_in_executor(
-                None,
-                self.audio_manager.play_sound,
+            # Start playing the sound first. Sounds are served from the preloaded sound bank, so this
+            # doesn't block and needs no executor hop.
+            success = self.audio_manager.play_sound(
                 effect_name,
                 loop,
                 on_finish_sync_callback if not loop else None # Only set callback if not looping
@@ -33,6 +33,7 @@ class BatteryService(BaseService):
     - Analog comparator can be disabled if battery removal detection isn't needed
     - Service will continue running in a dormant state if no battery monitor is detected
     """
+    handled_events = frozenset({"device_sleep", "device_wake"})
     
     def __init__(self, service_manager: ServiceManager):
         super().__init__(service_manager)
@@ -4,23 +4,20 @@ Provides high-level haptic patterns and responds to system events to create imme
 """
 
 import logging
-import asyncio
-import math
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from services.service import BaseService, ServiceManager
-from managers.haptic_manager import HapticManager, WaveformEffect
-from config import HapticConfig
+from managers.haptic_manager import HapticManager
 
 class HapticService(BaseService):
     """
     Service for managing haptic feedback patterns and responding to system events.
     Creates immersive haptic feedback patterns like purring in response to petting.
     """
+    handled_events = frozenset({"touch_stroke_intensity"})
     
     def __init__(self, service_manager: ServiceManager):
         super().__init__(service_manager)
         self.haptic_manager = HapticManager()
-        self._purr_task: Optional[asyncio.Task] = None
         self._current_intensity = 0.0
         
     async def start(self):
@@ -37,78 +34,18 @@ class HapticService(BaseService):
         
     async def stop(self):
         """Stop the haptic service and any ongoing effects"""
-        if self._purr_task:
-            self._purr_task.cancel()
-            self._purr_task = None
-            
-        # Stop motor and exit realtime mode
-        self.haptic_manager.set_realtime_value(0)
+        # Stop motor and the haptic worker, then exit realtime mode
+        self.haptic_manager.close()
         self.haptic_manager.exit_realtime_mode()
         await super().stop()
         self.logger.info("HapticService stopped")
-
-    async def _generate_purr_sequence(self, intensity: float) -> None:
-        """Generate a continuous purring effect that varies with intensity using realtime control
-        
-        Creates a purring effect by combining:
-        1. Slow amplitude modulation (1/PURR_CYCLE_PERIOD Hz) for the breathing-like pattern
-        2. Power level that scales with intensity
-        
-        Args:
-            intensity: Stroke intensity value (0.0 to 1.0)
-        """
-        try:
-            # Fixed modulation frequency based on configured cycle period
-            mod_freq = 1.0 / HapticConfig.PURR_CYCLE_PERIOD
-            
-            # Time tracking
-            start_time = asyncio.get_event_loop().time()
-            
-            while True:
-                # Skip if intensity is 0
-                if intensity <= 0:
-                    self.haptic_manager.set_realtime_value(0)
-                    await asyncio.sleep(0.01)
-                    continue
-                
-                current_time = asyncio.get_event_loop().time()
-                elapsed = current_time - start_time
-                
-                # Generate slow modulation wave
-                wave = math.sin(2 * math.pi * mod_freq * elapsed)
-                
-                # Transform wave to create longer peaks and shorter troughs
-                # This makes the purr feel more natural with longer "on" periods
-                wave = math.copysign(abs(wave) ** HapticConfig.PURR_WAVE_SHAPING, wave)
-                
-                # Map wave from [-1, 1] to [min_power, max_power]
-                # Higher intensity = higher power range and higher minimum power
-                min_power = int(HapticConfig.PURR_MIN_POWER_BASE + (intensity * HapticConfig.PURR_MIN_POWER_SCALE))
-                max_power = int(HapticConfig.PURR_MAX_POWER_BASE + (intensity * HapticConfig.PURR_MAX_POWER_SCALE))
-                
-                # Linear interpolation between min and max power
-                normalized = (wave + 1) / 2  # Map [-1,1] to [0,1]
-                motor_value = int(min_power + (normalized * (max_power - min_power)))
-                
-                # Ensure we stay within valid range for unidirectional ERM mode (0-127)
-                # We're using unidirectional mode so we only use positive values
-                motor_value = max(0, min(127, motor_value))
-                
-                # Set motor value
-                self.haptic_manager.set_realtime_value(motor_value)
-                
-                # Small delay for update rate
-                await asyncio.sleep(1.0 / HapticConfig.PURR_UPDATE_RATE)
-                
-        except asyncio.CancelledError:
-            self.haptic_manager.set_realtime_value(0)
-        except Exception as e:
-            self.logger.error(f"Error in purr sequence generation: {str(e)}")
-            self.haptic_manager.set_realtime_value(0)
             
     def _update_purr_effect(self, intensity: float):
         """Update the purring effect based on new intensity value
         
+        The haptic manager's worker thread generates the purr and drives the motor, so this
+        only posts the new intensity to it. An intensity of 0 stops the purr.
+        
         Args:
             intensity: New stroke intensity value (0.0 to 1.0)
         """
@@ -116,18 +53,7 @@ class HapticService(BaseService):
             return
             
         self._current_intensity = intensity
-        
-        # Stop current purr task if intensity is 0
-        if intensity == 0 and self._purr_task:
-            self._purr_task.cancel()
-            self._purr_task = None
-            return
-            
-        # Start new purr task if none exists
-        if not self._purr_task or self._purr_task.done():
-            self._purr_task = asyncio.create_task(
-                self._generate_purr_sequence(intensity)
-            )
+        self.haptic_manager.set_purr_intensity(intensity)
         
     async def handle_event(self, event: Dict[str, Any]):
         """Handle incoming events from other services
@@ -139,52 +65,3 @@ class HapticService(BaseService):
             if self.haptic_manager.drv:
                 intensity = event["intensity"]
                 self._update_purr_effect(intensity)
-
-# Original waveform-based implementation (commented out for reference)
-"""
-    async def _generate_purr_sequence(self, intensity: float) -> None:
-        try:
-            while True:
-                # Skip if intensity is 0
-                if intensity <= 0:
-                    await asyncio.sleep(0.1)
-                    continue
-                    
-                # Base sequence on intensity level
-                if intensity < 0.3:
-                    # Very gentle purr
-                    sequence = [
-                        WaveformEffect.SMOOTH_HUM_5_10_TO_0.value,  # Light continuous hum
-                        0.2,  # Short pause
-                        WaveformEffect.PULSING_MEDIUM_2_60.value,  # Gentle pulse
-                        0.3   # Longer pause for slower rhythm
-                    ]
-                elif intensity < 0.6:
-                    # Medium purr
-                    sequence = [
-                        WaveformEffect.SMOOTH_HUM_3_30_TO_0.value,  # Medium continuous hum
-                        0.15,  # Shorter pause
-                        WaveformEffect.PULSING_MEDIUM_1_100.value,  # Stronger pulse
-                        0.25   # Medium pause for moderate rhythm
-                    ]
-                else:
-                    # Strong purr
-                    sequence = [
-                        WaveformEffect.SMOOTH_HUM_1_50_TO_0.value,  # Strong continuous hum
-                        0.1,   # Quick pause
-                        WaveformEffect.PULSING_STRONG_1_100.value,  # Strong pulse
-                        0.2    # Short pause for faster rhythm
-                    ]
-                    
-                # Play the sequence
-                await self.haptic_manager.play_sequence(sequence)
-                
-                # Small delay between sequences
-                await asyncio.sleep(0.1)
-                
-        except asyncio.CancelledError:
-            self.haptic_manager.stop()
-        except Exception as e:
-            self.logger.error(f"Error in purr sequence generation: {str(e)}")
-            self.haptic_manager.stop()
-""" 
\ No newline at end of file
@@ -25,6 +25,14 @@ class LEDService(BaseService):
     - SPARKLING_PINK_BLUE
     - ROTATING_BEACON (requires 'color' parameter in event data, e.g., 'red', 'green')
     """
+    handled_events = frozenset({
+        "start_led_effect",
+        "start_or_update_effect",
+        "stop_led_effect",
+        "battery_alert",
+        "touch_stroke_intensity",
+    })
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.led_controller = None
@@ -66,7 +74,7 @@ class LEDService(BaseService):
         """Stop the LED service and clean up"""
         if self.led_controller:
             await self.led_controller.stop_effect()
-            self.led_controller.clear()
+            self.led_controller.close()
             self.logger.info("LED service stopped")
 
     async def handle_event(self, event):
@@ -90,6 +98,8 @@ class LEDService(BaseService):
             effect_name = event.get('data', {}).get('effect_name').upper()
             speed = event.get('data', {}).get('speed', 0.02)
             brightness = event.get('data', {}).get('brightness', 1.0)
+            # Optional, in milliseconds: play the effect over the current one, then revert to it
+            duration = event.get('data', {}).get('duration')
             # --- Extract color for effects that require it ---
             # TODO: Hacky, need to refactor to handle effect-specific parameters generically, e.g. via kwargs
             color = None
@@ -109,7 +119,7 @@ class LEDService(BaseService):
             elif effect_name in self.led_controller._EFFECT_MAP: 
                 # Pass the string name directly
                 # Call start_or_update_effect, which handles both starting and updating
-                await self.led_controller.start_or_update_effect(effect_name, speed=speed, brightness=brightness, color=color)
+                await self.led_controller.start_or_update_effect(effect_name, speed=speed, brightness=brightness, duration=duration, color=color)
                 # Logging for start/update is handled within the manager now
                 # self.logger.info(f"Started/Updated {effect_name} effect with speed {speed}, brightness {brightness}" + (f" and color {color}" if color else ""))
             else:
@@ -126,6 +136,8 @@ class LEDService(BaseService):
         elif event_type == "battery_alert":
             alerts = event.get('data', {}).get('alerts', [])
             if "voltage_low" in alerts:
+                # Flash over whatever effect is running, without interrupting it
+                self.led_controller.flash("orange", pulses=2)
                 current_base_brightness = self.led_controller.get_base_brightness()
                 new_base_brightness = max(0.0, current_base_brightness - 0.05) # Decrease by 0.05, ensuring it doesn't go below 0
                 if new_base_brightness < current_base_brightness: # Only update if there's a change
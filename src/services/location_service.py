@@ -8,6 +8,8 @@ from config import BLEConfig, PLATFORM, Distance, get_filter_logger
 
 class LocationService(BaseService):
     """Service for managing location tracking and updates"""
+    handled_events = frozenset({"force_scan"})
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.logger = get_filter_logger(__name__)
@@ -87,7 +89,7 @@ class LocationService(BaseService):
         for location in list(self._last_distances.keys()):
             if location not in seen_beacons:
                 # Only publish unknown state after minimum empty scans
-                if self._location_manager._beacon_empty_counts[location] >= BLEConfig.MIN_EMPTY_SCANS_FOR_UNKNOWN:
+                if self._location_manager._beacon_empty_counts[location] >= self._location_manager.min_empty_scans:
                     previous = self._last_distances[location]
                     await self.publish({
                         "type": "proximity_changed",
@@ -13,6 +13,7 @@ class SensorService(BaseService):
     Service for managing hardware sensors and providing sensor data to other services.
     Currently manages touch input, with architecture to support additional sensors.
     """
+    handled_events = frozenset()
     
     def __init__(self, service_manager: ServiceManager):
         super().__init__(service_manager)
@@ -1,11 +1,33 @@
 import logging
 import asyncio
-from typing import Dict, Any, Set, Callable, Awaitable, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Set, Callable, Awaitable, Optional, FrozenSet, Mapping, Tuple, Union
 from collections import defaultdict
 from config import Distance, AudioBaseConfig, get_filter_logger
 
 
-EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+# Handlers may be coroutine functions or plain functions. Plain (sync) handlers are
+# called inline by `ServiceManager.publish` and must be quick and non-blocking.
+EventHandler = Callable[[Dict[str, Any]], Union[Awaitable[None], None]]
+
+# Subscription key that receives every event
+WILDCARD_EVENT = "*"
+
+
+class _Route:
+    """Precomputed, immutable handler lists for a single event type"""
+    __slots__ = ("sync_handlers", "async_handlers")
+
+    def __init__(self, sync_handlers: Tuple[EventHandler, ...], async_handlers: Tuple[EventHandler, ...]):
+        self.sync_handlers = sync_handlers
+        self.async_handlers = async_handlers
+
+    def __bool__(self):
+        return bool(self.sync_handlers or self.async_handlers)
+
+
+_EMPTY_ROUTE = _Route((), ())
 
 
 class GlobalState:
@@ -31,6 +53,131 @@ class GlobalState:
         self.touch_state: bool = False
         self.touch_position: Optional[float] = None
         self.touch_stroke_intensity: Optional[float] = None
+        self.accelerometer_state: Optional[Dict[str, Any]] = None
+        self.conversation_error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class GlobalStateSnapshot:
+    """Read-only copy of GlobalState, tagged with the state version it was taken at"""
+    version: int
+    current_location: str
+    location_beacons: Mapping[str, Dict[str, Any]]
+    conversation_active: bool
+    assistant_speaking: bool
+    user_speaking: bool
+    is_muted: bool
+    volume: float
+    acceleration: Optional[tuple]
+    gyro: Optional[tuple]
+    temperature: Optional[float]
+    touch_state: bool
+    touch_position: Optional[float]
+    touch_stroke_intensity: Optional[float]
+    accelerometer_state: Optional[Dict[str, Any]]
+    conversation_error: Optional[str]
+
+    @classmethod
+    def from_state(cls, state: GlobalState, version: int) -> 'GlobalStateSnapshot':
+        return cls(
+            version=version,
+            current_location=state.current_location,
+            location_beacons=MappingProxyType(dict(state.location_beacons)),
+            conversation_active=state.conversation_active,
+            assistant_speaking=state.assistant_speaking,
+            user_speaking=state.user_speaking,
+            is_muted=state.is_muted,
+            volume=state.volume,
+            acceleration=state.acceleration,
+            gyro=state.gyro,
+            temperature=state.temperature,
+            touch_state=state.touch_state,
+            touch_position=state.touch_position,
+            touch_stroke_intensity=state.touch_stroke_intensity,
+            accelerometer_state=state.accelerometer_state,
+            conversation_error=state.conversation_error,
+        )
+
+
+# --- Global state reducers ---
+# Each reducer applies a single event type to the global state. They run synchronously on the
+# event loop, once per published event, before the event is handed to any subscribers.
+
+def _reduce_location_changed(state: GlobalState, event: Dict[str, Any]):
+    state.current_location = event["data"]["location"]
+
+
+def _reduce_proximity_changed(state: GlobalState, event: Dict[str, Any]):
+    location = event["data"]["location"]
+    distance = event["data"]["distance"]
+    
+    if distance == Distance.UNKNOWN:
+        state.location_beacons.pop(location, None)
+    else:
+        state.location_beacons[location] = {
+            "distance": distance,
+            "rssi": event["data"]["rssi"]
+        }
+
+
+def _reduce_conversation_starting(state: GlobalState, event: Dict[str, Any]):
+    state.conversation_active = True
+    state.conversation_error = None
+
+
+def _reduce_conversation_stopped(state: GlobalState, event: Dict[str, Any]):
+    state.conversation_active = False
+    state.assistant_speaking = False
+    state.user_speaking = False
+
+
+def _reduce_speech_update(state: GlobalState, event: Dict[str, Any]):
+    role = event["role"]
+    is_speaking = event["status"] == "started"
+    if role == "assistant":
+        state.assistant_speaking = is_speaking
+    elif role == "user":
+        state.user_speaking = is_speaking
+
+
+def _reduce_sensor_data(state: GlobalState, event: Dict[str, Any]):
+    state.accelerometer_state = event["data"]
+
+
+def _reduce_touch_state(state: GlobalState, event: Dict[str, Any]):
+    state.touch_state = event["is_touching"]
+
+
+def _reduce_touch_position(state: GlobalState, event: Dict[str, Any]):
+    state.touch_position = event["position"]
+
+
+def _reduce_touch_stroke_intensity(state: GlobalState, event: Dict[str, Any]):
+    state.touch_stroke_intensity = event["intensity"]
+
+
+def _reduce_volume_changed(state: GlobalState, event: Dict[str, Any]):
+    state.volume = event["volume"]
+
+
+def _reduce_microphone_state(state: GlobalState, event: Dict[str, Any]):
+    state.is_muted = event["is_muted"]
+
+
+_STATE_REDUCERS: Dict[str, Callable[[GlobalState, Dict[str, Any]], None]] = {
+    "location_changed": _reduce_location_changed,
+    "proximity_changed": _reduce_proximity_changed,
+    "conversation_starting": _reduce_conversation_starting,
+    "conversation_ended": _reduce_conversation_stopped,
+    "conversation_error": _reduce_conversation_stopped,
+    "speech-update": _reduce_speech_update,
+    "sensor_data": _reduce_sensor_data,
+    "touch_state": _reduce_touch_state,
+    "touch_position": _reduce_touch_position,
+    "touch_stroke_intensity": _reduce_touch_stroke_intensity,
+    "volume_changed": _reduce_volume_changed,
+    "microphone_state": _reduce_microphone_state,
+}
 
 
 class ServiceManager:
@@ -38,11 +185,15 @@ class ServiceManager:
     def __init__(self):
         self.services = {}
         self._subscribers: Dict[str, Set[EventHandler]] = defaultdict(set)
+        # Copy-on-write routing table, rebuilt on (un)subscribe and read lock-free by publish()
+        self._routes: Mapping[str, _Route] = MappingProxyType({})
+        self._wildcard_route: _Route = _EMPTY_ROUTE
         self._should_run = True
         self._lock = asyncio.Lock()
         self.logger = get_filter_logger(__name__)
         self.global_state = GlobalState()  # Shared global state
-        self.global_state_lock = asyncio.Lock()  # Lock for global state access
+        self._state_version = 0
+        self._state_snapshot = GlobalStateSnapshot.from_state(self.global_state, self._state_version)
         
     def _log_global_state(self):
         """Log the complete current state of the global state object"""
@@ -73,80 +224,57 @@ class ServiceManager:
         }
         self.logger.info(f"Current global state: {state_dict}")
 
-    async def _handle_state_change(self, event: Dict[str, Any]):
-        """Handle global state changes based on events"""
-        event_type = event.get("type")
+    def _handle_state_change(self, event: Dict[str, Any]):
+        """Apply an event to the global state.
         
-        async with self.global_state_lock:
-            if event_type == "location_changed":
-                self.global_state.current_location = event["data"]["location"]
-                
-            elif event_type == "proximity_changed":
-                location = event["data"]["location"]
-                distance = event["data"]["distance"]
-                
-                if distance == Distance.UNKNOWN:
-                    self.global_state.location_beacons.pop(location, None)
-                else:
-                    self.global_state.location_beacons[location] = {
-                        "distance": distance,
-                        "rssi": event["data"]["rssi"]
-                    }
-                    
-            elif event_type == "conversation_starting":
-                self.global_state.conversation_active = True
-                self.global_state.conversation_error = None
-                
-            elif event_type == "conversation_ended":
-                self.global_state.conversation_active = False
-                self.global_state.assistant_speaking = False
-                self.global_state.user_speaking = False
-                
-            elif event_type == "conversation_error":
-                self.global_state.conversation_active = False
-                self.global_state.assistant_speaking = False
-                self.global_state.user_speaking = False
-                
-            elif event_type == "speech-update":
-                role = event["role"]
-                is_speaking = event["status"] == "started"
-                if role == "assistant":
-                    self.global_state.assistant_speaking = is_speaking
-                elif role == "user":
-                    self.global_state.user_speaking = is_speaking
-                    
-            elif event_type == "sensor_data":
-                self.global_state.accelerometer_state = event["data"]
-                    
-            elif event_type == "touch_state":
-                self.global_state.touch_state = event["is_touching"]
-                
-            elif event_type == "touch_position":
-                self.global_state.touch_position = event["position"]
-                
-            elif event_type == "touch_stroke_intensity":
-                self.global_state.touch_stroke_intensity = event["intensity"]
-                
-            elif event_type == "volume_changed":
-                self.global_state.volume = event["volume"]
-                
-            elif event_type == "microphone_state":
-                self.global_state.is_muted = event["is_muted"]
-            
-            # Log the complete state after any change
-            # self._log_global_state()
+        Runs once per published event, before fan-out. Reducers are plain functions executed
+        on the event loop thread, so no lock is needed and each event costs at most one dict
+        lookup and one mutation.
+        """
+        reducer = _STATE_REDUCERS.get(event.get("type"))
+        if reducer is None:
+            return
+        reducer(self.global_state, event)
+        self._state_version += 1
+        
+        # Log the complete state after any change
+        # self._log_global_state()
+
+    @property
+    def state_snapshot(self) -> 'GlobalStateSnapshot':
+        """Immutable, versioned view of the global state.
+        
+        Rebuilt lazily on first read after a change, so high-rate events that touch the
+        state don't pay for a copy unless someone actually reads it.
+        """
+        snapshot = self._state_snapshot
+        if snapshot.version != self._state_version:
+            snapshot = GlobalStateSnapshot.from_state(self.global_state, self._state_version)
+            self._state_snapshot = snapshot
+        return snapshot
             
     async def _safe_handle_event(self, handler: EventHandler, event: Dict[str, Any]):
-        """Safely execute an event handler and update global state"""
+        """Safely execute an async event handler"""
         try:
-            # First update the global state
-            await self._handle_state_change(event)
-            # Then call the service's handler
             await handler(event)
         except Exception as e:
             self.logger.error(f"Error in event handler {handler.__qualname__}: {e}", exc_info=True)
             raise
 
+    def _safe_call_sync_handler(self, handler: EventHandler, event: Dict[str, Any]):
+        """Safely execute a sync event handler inline"""
+        try:
+            handler(event)
+        except Exception as e:
+            self.logger.error(f"Error in event handler {handler.__qualname__}: {e}", exc_info=True)
+
+    @staticmethod
+    def _service_event_types(service: 'BaseService') -> Tuple[str, ...]:
+        """Get the event types a service's handle_event should be subscribed to"""
+        if service.handled_events is None:
+            return (WILDCARD_EVENT,)
+        return tuple(service.handled_events)
+
     async def start_service(self, name: str, service: 'BaseService', **kwargs):
         """Start a service and store it in the manager"""
         # Set the service's global state to our shared instance
@@ -154,8 +282,9 @@ class ServiceManager:
         await service.start(**kwargs)
         self.services[name] = service
         
-        # Auto-subscribe the service's handle_event method
-        await self.subscribe("*", service.handle_event)
+        # Auto-subscribe the service's handle_event method to the event types it declares
+        for event_type in self._service_event_types(service):
+            await self.subscribe(event_type, service.handle_event)
         self.logger.debug(f"Started service: {name}")
         
     async def stop_service(self, name: str):
@@ -173,7 +302,8 @@ class ServiceManager:
         # Perform the actual stop operations outside the lock to avoid deadlock
         try:
             # Unsubscribe from all events
-            await self.unsubscribe("*", service.handle_event)
+            for event_type in self._service_event_types(service):
+                await self.unsubscribe(event_type, service.handle_event)
             self.logger.info(f"Stopping service implementation for {name}...")
             await service.stop()
             self.logger.info(f"Successfully stopped service implementation for {name}.")
@@ -189,10 +319,31 @@ class ServiceManager:
         for name in list(self.services.keys()):
             await self.stop_service(name)
             
+    def _rebuild_routes(self):
+        """Rebuild the immutable routing table from the subscriber sets.
+        
+        Must be called with self._lock held. The new table is swapped in with a single
+        assignment, so publish() can read it without taking the lock.
+        """
+        def make_route(handlers) -> _Route:
+            sync_handlers = tuple(h for h in handlers if not asyncio.iscoroutinefunction(h))
+            async_handlers = tuple(h for h in handlers if asyncio.iscoroutinefunction(h))
+            return _Route(sync_handlers, async_handlers)
+
+        wildcard_handlers = self._subscribers.get(WILDCARD_EVENT, set())
+        routes = {
+            event_type: make_route(handlers | wildcard_handlers)
+            for event_type, handlers in self._subscribers.items()
+            if event_type != WILDCARD_EVENT
+        }
+        self._wildcard_route = make_route(wildcard_handlers)
+        self._routes = MappingProxyType(routes)
+
     async def subscribe(self, event_type: str, handler: EventHandler):
         """Subscribe to an event type. Use '*' for all events."""
         async with self._lock:
             self._subscribers[event_type].add(handler)
+            self._rebuild_routes()
             self.logger.debug(f"Subscribed to {event_type}: {handler.__qualname__}")
             
     async def unsubscribe(self, event_type: str, handler: EventHandler):
@@ -202,10 +353,15 @@ class ServiceManager:
                 self._subscribers[event_type].discard(handler)
                 if not self._subscribers[event_type]:
                     del self._subscribers[event_type]
+                self._rebuild_routes()
                 self.logger.debug(f"Unsubscribed from {event_type}: {handler.__qualname__}")
                 
     async def publish(self, event: Dict[str, Any]):
-        """Publish an event to subscribers"""
+        """Publish an event to subscribers.
+        
+        Sync handlers are called inline. A single async handler is awaited directly, and
+        only when several async handlers are subscribed are they run concurrently.
+        """
         if not self._should_run:
             return
             
@@ -216,26 +372,35 @@ class ServiceManager:
             
         if not event.get("silent", False):
             self.logger.debug(f"Publishing event: {event}")
+
+        # Global state is updated once per event, whether or not anyone is subscribed
+        try:
+            self._handle_state_change(event)
+        except Exception as e:
+            self.logger.error(f"Error updating global state for event {event_type}: {e}", exc_info=True)
         
-        async with self._lock:
-            # Get both specific handlers and wildcard handlers
-            handlers = self._subscribers.get(event_type, set()) | self._subscribers.get("*", set())
-            
-        if not handlers:
-            self.logger.debug(f"No handlers for event type: {event_type}")
+        # Lock-free lookup: the routing table is only ever replaced, never mutated
+        route = self._routes.get(event_type, self._wildcard_route)
+        if not route:
+            if not event.get("silent", False):
+                self.logger.debug(f"No handlers for event type: {event_type}")
             return
-            
-        # self.logger.debug(f"Found handlers for {event_type}: {[h.__qualname__ for h in handlers]}")
-        
-        # Create tasks for all handlers
-        tasks = []
-        for handler in handlers:
-            task = asyncio.create_task(self._safe_handle_event(handler, event))
-            tasks.append(task)
-            
-        # Wait for all handlers to complete
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for handler in route.sync_handlers:
+            self._safe_call_sync_handler(handler, event)
+
+        async_handlers = route.async_handlers
+        if len(async_handlers) == 1:
+            try:
+                await self._safe_handle_event(async_handlers[0], event)
+            except Exception:
+                # Already logged by _safe_handle_event
+                pass
+        elif async_handlers:
+            results = await asyncio.gather(
+                *(self._safe_handle_event(handler, event) for handler in async_handlers),
+                return_exceptions=True
+            )
             
             # Log any errors
             for result in results:
@@ -244,14 +409,17 @@ class ServiceManager:
 
 class BaseService:
     """Base class for all services"""
+
+    # Event types this service's handle_event receives. None subscribes to all events ('*');
+    # an empty set means the service is not subscribed to any events.
+    handled_events: Optional[FrozenSet[str]] = None
+
     def __init__(self, service_manager: ServiceManager):
         self._service_manager = service_manager
         self._running = False
         # Create a logger with the full module path and class name
         self.logger = get_filter_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
         self.global_state: GlobalState | None = None  # Will be set by ServiceManager
-        # Initialize lock for thread-safe access to global_state
-        self.global_state_lock = asyncio.Lock()
         
     async def start(self, **kwargs):
         """Start the service"""
@@ -264,6 +432,11 @@ class BaseService:
         self._running = False
         self.logger.info(f"Stop done, exiting stop() for service: {self.__class__.__name__}")
         
+    @property
+    def state_snapshot(self) -> GlobalStateSnapshot:
+        """Lock-free, read-only view of the global state"""
+        return self._service_manager.state_snapshot
+
     async def publish(self, event: Dict[str, Any]):
         """Helper method to publish events"""
         await self._service_manager.publish(event) 
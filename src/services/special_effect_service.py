@@ -58,6 +58,7 @@ class SpecialEffect(str, Enum):
 
 class SpecialEffectService(BaseService):
     """Service for playing combined special effects (sound and/or LED)"""
+    handled_events = frozenset({"play_special_effect"})
     
     def __init__(self, service_manager):
         super().__init__(service_manager)
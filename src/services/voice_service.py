@@ -110,6 +110,8 @@ logger.info("Imported VoiceManager.")
 
 class VoiceService(BaseService):
     """Service to manage Text-to-Speech using VoiceManager and AudioManager."""
+    handled_events = frozenset({"speak_audio"})
+
     TTS_CACHE_DIR = "data/tts_cache"  # Directory to store cached TTS audio files
     PRE_CACHE_DIR = "assets/tts_cache" # Directory for pre-cached audio files
     TTS_PRODUCER_NAME = "elevenlabs_tts" # A constant name for the TTS audio producer
@@ -233,9 +235,10 @@ class VoiceService(BaseService):
         except Exception as e:
             logger.error(f"Error saving audio to cache {cache_path}: {e}")
 
-    def _process_and_buffer_audio_chunk(self, tts_producer, audio_chunk_bytes: bytes) -> bool:
+    async def _process_and_buffer_audio_chunk(self, tts_producer, audio_chunk_bytes: bytes) -> bool:
         """
         Process audio chunk bytes and buffer them for playback.
+        While the producer's buffer is full this suspends the calling task, not the event loop.
         
         Args:
             tts_producer: The audio producer to use for this TTS request
@@ -252,13 +255,8 @@ class VoiceService(BaseService):
         audio_np_array = pcm_bytes_to_numpy(audio_chunk_bytes)
         
         if audio_np_array.size > 0:
-            # Resize the chunk using the producer's own resizer method
-            resized_chunks = tts_producer.resize_chunk(audio_np_array)
-            for chunk_to_put in resized_chunks:
-                try:
-                    tts_producer.buffer.put(chunk_to_put)
-                except asyncio.QueueFull:
-                    logger.warning(f"TTS audio producer buffer full for '{tts_producer.name}'. Audio chunk dropped.")
+            # The producer's buffer takes any length; the output loop reads it back a chunk at a time
+            await tts_producer.buffer.put_async(audio_np_array)
             return True
         else:
             logger.warning("Received empty audio array after conversion.")
@@ -386,21 +384,13 @@ class VoiceService(BaseService):
         tts_producer.is_stream = False
 
     async def _play_cached_audio(self, tts_producer, audio_data: bytes):
-        """Play cached audio data chunk by chunk to allow for cancellation."""
+        """Play cached audio data, suspending (and staying cancellable) while the producer's buffer is full."""
         try:
             logger.info(f"Playing cached TTS audio for producer '{tts_producer.name}'...")
-            audio_np_array = pcm_bytes_to_numpy(audio_data)
-            
-            processing_chunk_size = AudioBaseConfig.CHUNK_SIZE * 10 
-
-            for i in range(0, len(audio_np_array), processing_chunk_size):
-                await asyncio.sleep(0)
-                
-                chunk_np = audio_np_array[i:i + processing_chunk_size]
-                
-                if not self._process_and_buffer_audio_chunk(tts_producer, chunk_np.tobytes()):
-                    logger.warning(f"Failed to process a chunk of cached audio for '{tts_producer.name}'.")
-                    break
+            # Backpressure from the producer's buffer paces this at playback speed, and suspends
+            # only this task (which stays cancellable) while the buffer is full
+            if not await self._process_and_buffer_audio_chunk(tts_producer, audio_data):
+                logger.warning(f"Failed to process cached audio for '{tts_producer.name}'.")
             
             logger.info(f"Finished queuing cached TTS audio for '{tts_producer.name}'.")
             # Mark the producer as no longer loading, so it can be cleaned up when buffer is empty
@@ -441,7 +431,7 @@ class VoiceService(BaseService):
             async for audio_chunk_bytes in audio_stream_iterator:
                 if audio_chunk_bytes:
                     all_audio_chunks.append(audio_chunk_bytes)
-                    self._process_and_buffer_audio_chunk(tts_producer, audio_chunk_bytes)
+                    await self._process_and_buffer_audio_chunk(tts_producer, audio_chunk_bytes)
                         
             logger.info(f"Finished streaming TTS audio for '{tts_producer.name}'.")
             
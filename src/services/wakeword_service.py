@@ -6,6 +6,8 @@ from managers.wakeword_manager import WakeWordManager
 
 class WakeWordService(BaseService):
     """Handles wake word detection"""
+    handled_events = frozenset()
+
     def __init__(self, service_manager):
         super().__init__(service_manager)
         self.detector = None
@@ -0,0 +1,141 @@
+"""
+Baked LED animations.
+
+Periodic effects (breathing, rotations, the rainbow) repeat the same frames forever. Baking
+renders one period of such an effect into a (period, N, 3) uint8 frame table, and playback
+then just indexes into the table, so an idle animation costs a lookup per frame rather than
+a render. Tables are kept in a bounded LRU and can be persisted to disk across restarts.
+"""
+
+import hashlib
+import itertools
+import os
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterator, Optional, Tuple
+import numpy as np
+from config import get_filter_logger
+from utils.led_render import FRAME_DTYPE
+
+logger = get_filter_logger(__name__)
+
+Frames = Iterator[Tuple[np.ndarray, float]]
+
+
+def bake(frames: Frames, period: int) -> np.ndarray:
+    """
+    Render one period of an effect into a frame table.
+
+    Returns:
+        np.ndarray: Read-only (period, N, 3) uint8 table
+
+    Raises:
+        ValueError: If the effect ends before completing a period
+    """
+    table = None
+    count = 0
+    try:
+        for count, (frame, _) in enumerate(itertools.islice(frames, period), start=1):
+            if table is None:
+                table = np.empty((period,) + frame.shape, dtype=FRAME_DTYPE)
+            table[count - 1] = frame
+    finally:
+        frames.close()
+    if count < period:
+        raise ValueError(f"Effect ended after {count} of {period} frames")
+    table.flags.writeable = False
+    return table
+
+
+def play(table: np.ndarray, hold: float) -> Frames:
+    """Loop over a baked table, yielding (frame, hold) like the effect it was baked from"""
+    while True:
+        for frame in table:
+            yield frame, hold
+
+
+def source_fingerprint(*modules) -> str:
+    """A digest of the modules' source files, so animations persisted by older code get re-baked"""
+    digest = hashlib.sha1()
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class AnimationCache:
+    """
+    Bounded LRU of baked frame tables, optionally persisted to a directory.
+
+    Tables are keyed by whatever determines an effect's frames, e.g. the effect, its color and
+    the LED layout. Not thread-safe; the LED compositor thread is its only user.
+    """
+    def __init__(self, max_tables: int, directory: Optional[str] = None, version: str = ""):
+        self.max_tables = max_tables
+        self.directory = directory
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._tables: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._tables)
+
+    def get(self, key: Hashable, render: Callable[[], Frames], period: int) -> np.ndarray:
+        """
+        The baked table for key, loading it from disk or baking it from render() if not cached.
+
+        Raises:
+            ValueError: If the rendered effect ends before completing a period
+        """
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return table
+
+        self.misses += 1
+        table = self._load(key, period)
+        if table is None:
+            table = bake(render(), period)
+            self._save(key, table)
+        self._tables[key] = table
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def clear(self):
+        self._tables.clear()
+
+    def _path(self, key: Hashable) -> str:
+        name = hashlib.sha1(repr((self.version, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _load(self, key: Hashable, period: int) -> Optional[np.ndarray]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = np.load(path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable baked animation {path}: {e}")
+            return None
+        if table.dtype != FRAME_DTYPE or table.ndim != 3 or len(table) != period:
+            logger.warning(f"Ignoring baked animation {path} with unexpected shape {table.shape}")
+            return None
+        table.flags.writeable = False
+        return table
+
+    def _save(self, key: Hashable, table: np.ndarray):
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so a crash never leaves a truncated table behind
+            with open(f"{path}.tmp", "wb") as f:
+                np.save(f, table)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Couldn't persist baked animation to {path}: {e}")
@@ -1,5 +1,6 @@
 import logging
 import numpy as np
+from typing import AsyncIterator
 from config import AudioBaseConfig, get_filter_logger
 
 logger = get_filter_logger(__name__)
@@ -12,14 +13,6 @@ except ImportError:
     PYRUBBERBAND_AVAILABLE = False
     logger.warning("pyrubberband not found, pitch shifting is disabled. To enable, run: pip install pyrubberband")
 
-try:
-    from stftpitchshift import StftPitchShift
-    STFTPITCHSHIFT_AVAILABLE = True
-    logger.info("stftpitchshift found, streaming pitch shifting is available.")
-except ImportError:
-    STFTPITCHSHIFT_AVAILABLE = False
-    logger.warning("stftpitchshift not found, streaming pitch shifting is disabled. To enable, run: pip install stftpitchshift")
-
 def pcm_bytes_to_numpy(pcm_bytes: bytes) -> np.ndarray:
     """Converts PCM audio bytes (expected int16) to a numpy array."""
     try:
@@ -51,62 +44,228 @@ def pitch_shift_audio(audio_array: np.ndarray, n_steps: float, sample_rate: int
     )
     return pitch_shifted_array.astype(np.int16)
 
+class AudioMixer:
+    """
+    Fixed-size mixer for int16 audio chunks.
+
+    All working buffers are allocated once up front. Each source is folded into the float32
+    accumulator with a single scaled add, where the gain already combines the source
+    volume, the master volume and the mixing headroom. `finish` clips in place and
+    converts into a preallocated int16 output chunk. The only per-chunk allocation is the
+    `output_bytes` copy that PyAudio requires.
+
+    Usage per output chunk:
+        mixer.begin()
+        for samples, volume in sources:
+            mixer.add(samples, volume * master_volume)
+        output = mixer.finish()
+    """
+    def __init__(self, chunk_size: int = AudioBaseConfig.CHUNK_SIZE, headroom: float = 0.8):
+        self.chunk_size = chunk_size
+        self.headroom = headroom  # Pre-scale applied to every source to reduce clipping when mixing
+        self.num_sources = 0
+        self._accumulator = np.zeros(chunk_size, dtype=np.float32)
+        self._scratch = np.zeros(chunk_size, dtype=np.float32)
+        self._output = np.zeros(chunk_size, dtype=np.int16)
+        # PyAudio only accepts `bytes` (not memoryviews or arrays), both for stream.write() and
+        # from stream callbacks, so each mixed chunk costs one copy. Silence is shared.
+        self._silence_bytes = bytes(self._output.nbytes)
+        self._output_bytes = self._silence_bytes
+
+    @property
+    def output_bytes(self) -> bytes:
+        """The most recent output chunk as bytes, ready to hand to PyAudio."""
+        return self._output_bytes
+
+    def begin(self):
+        """Reset the accumulator for a new output chunk."""
+        self._accumulator.fill(0.0)
+        self.num_sources = 0
+
+    def add(self, samples: np.ndarray, gain: float = 1.0):
+        """Scale `samples` by `gain` and add them to the accumulator."""
+        np.multiply(samples, np.float32(gain * self.headroom), out=self._scratch)
+        np.add(self._accumulator, self._scratch, out=self._accumulator)
+        self.num_sources += 1
+
+    def finish(self) -> np.ndarray:
+        """
+        Clip the accumulated mix and convert it to int16.
+        Returns:
+            np.ndarray: The preallocated output chunk. Only valid until the next `finish`.
+        """
+        if self.num_sources == 0:
+            self._output.fill(0)
+            self._output_bytes = self._silence_bytes
+            return self._output
+        np.clip(self._accumulator, -32768, 32767, out=self._accumulator)
+        np.copyto(self._output, self._accumulator, casting='unsafe')
+        self._output_bytes = self._output.tobytes()
+        return self._output
+
+
 class StreamingPitchShifter:
-    """A wrapper for stftpitchshift to handle streaming audio data."""
-    def __init__(self, pitch_factor: float, sample_rate: int = AudioBaseConfig.SAMPLE_RATE, chunk_size: int = AudioBaseConfig.CHUNK_SIZE):
-        if not STFTPITCHSHIFT_AVAILABLE:
-            raise ImportError("stftpitchshift library not found.")
-            
+    """
+    Streaming phase-vocoder pitch shifter for int16 audio.
+
+    Audio is analysed with a Hann-windowed STFT (frame_size samples, hop_size apart). Each frame's
+    bin magnitudes and instantaneous frequencies are resampled by the pitch factor, re-synthesised
+    with accumulated phase, and overlap-added into the output. Only one frame of input is held back,
+    so the first output is available as soon as frame_size samples have been fed in, and the output
+    is exactly as long as the input once `flush` has been called.
+
+    All working buffers are preallocated; feed it any number of samples at a time.
+    """
+    def __init__(self, pitch_factor: float, sample_rate: int = AudioBaseConfig.SAMPLE_RATE,
+                 frame_size: int = 1024, hop_size: int = None):
+        if pitch_factor <= 0:
+            raise ValueError("pitch_factor must be positive")
         self.pitch_factor = pitch_factor
         self.sample_rate = sample_rate
-        self.chunk_size = chunk_size
-        
-        # stftpitchshift expects float32 input
-        self.pitchshifter = StftPitchShift(
-            framesize=chunk_size,
-            hopsize=chunk_size // 4, # A common overlap for STFT
-            samplerate=sample_rate
-        )
-        self._input_buffer = np.array([], dtype=np.float32)
-        self._output_buffer = np.array([], dtype=np.int16)
-        logger.debug(f"StreamingPitchShifter initialized with pitch_factor={pitch_factor}, sample_rate={sample_rate}, chunk_size={chunk_size}")
+        self.frame_size = frame_size
+        self.hop_size = hop_size or frame_size // 4
+
+        n, hop = self.frame_size, self.hop_size
+        num_bins = n // 2 + 1
+        self._window = np.hanning(n + 1)[:n].astype(np.float32)  # Periodic Hann
+        # Analysis and synthesis windows overlap-add to a constant; divide it out
+        self._ola_gain = np.float32(1.0 / (np.sum(self._window ** 2) / hop))
+        bins = np.arange(num_bins, dtype=np.float32)
+        self._expected_advance = (2.0 * np.pi * hop / n) * bins  # Phase advance of each bin centre per hop
+        # Output bin j takes its magnitude and frequency from input bin j / pitch_factor
+        self._source_bins = bins / np.float32(pitch_factor)
+        self._bin_valid = self._source_bins <= num_bins - 1
+
+        self._input = np.zeros(n, dtype=np.float32)      # Sliding analysis frame
+        self._input_fill = n - hop                       # Frame starts with (n - hop) samples of silence
+        self._output = np.zeros(n, dtype=np.float32)     # Overlap-add accumulator
+        self._last_phase = np.zeros(num_bins, dtype=np.float32)
+        self._synth_phase = np.zeros(num_bins, dtype=np.float32)
+        # The silent lead-in shows up as (n - hop) samples of output latency. Skip it so output
+        # lines up with input.
+        self._skip = n - hop
+        self._samples_in = 0
+        self._samples_out = 0
+        logger.debug(f"StreamingPitchShifter initialized with pitch_factor={pitch_factor}, sample_rate={sample_rate}, frame_size={n}, hop_size={hop}")
+
+    @classmethod
+    def from_semitones(cls, semitones: float, sample_rate: int = AudioBaseConfig.SAMPLE_RATE, **kwargs) -> 'StreamingPitchShifter':
+        return cls(2.0 ** (semitones / 12.0), sample_rate=sample_rate, **kwargs)
+
+    @property
+    def latency(self) -> int:
+        """Input samples that must be fed before the first output sample is produced"""
+        return self.frame_size
 
     def process_chunk(self, audio_chunk: np.ndarray) -> np.ndarray:
         """
-        Process a chunk of audio, returning any available pitch-shifted chunks of the correct size.
-        Handles internal buffering to ensure continuous processing.
-        Args:
-            audio_chunk (np.ndarray): Input audio chunk (int16).
+        Feed a chunk of int16 audio of any length.
         Returns:
-            List[np.ndarray]: A list of pitch-shifted audio chunks, each of the configured chunk_size.
+            np.ndarray: The pitch-shifted int16 samples that are ready; possibly empty.
         """
         if audio_chunk.dtype != np.int16:
             raise ValueError("Input audio chunk must be of type np.int16")
+        self._samples_in += len(audio_chunk)
+        return self._feed(audio_chunk.astype(np.float32) * np.float32(1.0 / 32768.0))
 
-        # Convert to float32 for processing
-        audio_chunk_float = audio_chunk.astype(np.float32) / 32768.0
-        
-        # Perform pitch shifting
-        shifted_chunk_float = self.pitchshifter.shiftpitch(
-            audio_chunk_float, 
-            factors=self.pitch_factor
-        )
-        
-        # Convert back to int16
-        shifted_chunk_int16 = (shifted_chunk_float * 32767).astype(np.int16)
-        
-        # Add new data to the internal output buffer
-        self._output_buffer = np.concatenate([self._output_buffer, shifted_chunk_int16])
-
-        # Extract as many full chunks as possible
-        chunks_to_return = []
-        while len(self._output_buffer) >= self.chunk_size:
-            chunks_to_return.append(self._output_buffer[:self.chunk_size])
-            self._output_buffer = self._output_buffer[self.chunk_size:]
-        
-        return chunks_to_return
+    def flush(self) -> np.ndarray:
+        """Push the remaining input through with silence and return the rest of the output."""
+        remaining = self._samples_in - self._samples_out
+        if remaining <= 0:
+            return np.zeros(0, dtype=np.int16)
+        out = self._feed(np.zeros(self.frame_size, dtype=np.float32))
+        out = out[:remaining]
+        self._samples_out = self._samples_in
+        return out
 
     def clear(self):
-        """Clear the internal buffer."""
-        self._input_buffer = np.array([], dtype=np.float32) 
-        self._output_buffer = np.array([], dtype=np.int16) 
\ No newline at end of file
+        """Reset to the initial state, dropping any buffered audio."""
+        self._input.fill(0.0)
+        self._output.fill(0.0)
+        self._last_phase.fill(0.0)
+        self._synth_phase.fill(0.0)
+        self._input_fill = self.frame_size - self.hop_size
+        self._skip = self.frame_size - self.hop_size
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def _feed(self, samples: np.ndarray) -> np.ndarray:
+        n, hop = self.frame_size, self.hop_size
+        produced = []
+        offset = 0
+        while offset < len(samples):
+            take = min(n - self._input_fill, len(samples) - offset)
+            self._input[self._input_fill:self._input_fill + take] = samples[offset:offset + take]
+            self._input_fill += take
+            offset += take
+            if self._input_fill == n:
+                produced.append(self._process_frame())
+                # Slide the frame along by one hop
+                self._input[:n - hop] = self._input[hop:]
+                self._input_fill = n - hop
+
+        if not produced:
+            return np.zeros(0, dtype=np.int16)
+        out = np.concatenate(produced) if len(produced) > 1 else produced[0]
+        if self._skip:
+            skipped = min(self._skip, len(out))
+            out = out[skipped:]
+            self._skip -= skipped
+        self._samples_out += len(out)
+        np.clip(out, -1.0, 32767.0 / 32768.0, out=out)
+        return (out * np.float32(32768.0)).astype(np.int16)
+
+    def _process_frame(self) -> np.ndarray:
+        """Analyse, shift and re-synthesise the current frame. Returns the next hop of finished output."""
+        n, hop = self.frame_size, self.hop_size
+        spectrum = np.fft.rfft(self._input * self._window)
+        magnitude = np.abs(spectrum).astype(np.float32)
+        phase = np.angle(spectrum).astype(np.float32)
+
+        # Instantaneous frequency of each bin, as a phase advance per hop
+        deviation = phase - self._last_phase - self._expected_advance
+        self._last_phase = phase
+        deviation -= np.float32(2.0 * np.pi) * np.round(deviation / np.float32(2.0 * np.pi))
+        advance = self._expected_advance + deviation
+
+        # Move every partial to pitch_factor times its frequency
+        shifted_magnitude = np.interp(self._source_bins, np.arange(len(magnitude)), magnitude)
+        shifted_advance = np.interp(self._source_bins, np.arange(len(advance)), advance) * self.pitch_factor
+        shifted_magnitude[~self._bin_valid] = 0.0
+
+        self._synth_phase += shifted_advance.astype(np.float32)
+        self._synth_phase -= np.float32(2.0 * np.pi) * np.round(self._synth_phase / np.float32(2.0 * np.pi))
+        frame = np.fft.irfft(shifted_magnitude * np.exp(1j * self._synth_phase), n).astype(np.float32)
+
+        self._output += frame * self._window * self._ola_gain
+        ready = self._output[:hop].copy()
+        self._output[:n - hop] = self._output[hop:]
+        self._output[n - hop:] = 0.0
+        return ready
+
+
+async def pitch_shift_stream(stream: AsyncIterator[bytes], semitones: float,
+                             sample_rate: int = AudioBaseConfig.SAMPLE_RATE) -> AsyncIterator[bytes]:
+    """
+    Pitch shift a stream of int16 PCM byte chunks as it arrives.
+    Each network chunk is yielded as soon as the shifter has output for it, so the first audio
+    comes one STFT frame after the first chunk rather than after the whole stream.
+    """
+    shifter = StreamingPitchShifter.from_semitones(semitones, sample_rate=sample_rate)
+    leftover = b""
+    async for chunk in stream:
+        if not chunk:
+            continue
+        if leftover:
+            chunk = leftover + chunk
+        # Chunks can split a sample; carry the odd byte into the next one
+        usable = len(chunk) - (len(chunk) % 2)
+        leftover = chunk[usable:]
+        if usable == 0:
+            continue
+        shifted = shifter.process_chunk(np.frombuffer(chunk[:usable], dtype=np.int16))
+        if shifted.size:
+            yield shifted.tobytes()
+    tail = shifter.flush()
+    if tail.size:
+        yield tail.tobytes()
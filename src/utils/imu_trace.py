@@ -0,0 +1,49 @@
+"""
+IMU sample traces for replaying the motion classifier offline.
+
+A trace is a CSV file with a header row and one row per sample: its timestamp, then the
+acceleration, linear acceleration and gyro vectors. AccelerometerManager records one when
+AccelerometerConfig.IMU_TRACE_PATH is set, and scripts/benchmark_shake_detection.py and the
+tests replay them (tests/fixtures/imu).
+"""
+
+import csv
+from typing import Any, Dict, List, TextIO
+
+TRACE_HEADER = "timestamp,ax,ay,az,lx,ly,lz,gx,gy,gz"
+
+
+def open_trace(path: str) -> TextIO:
+    """Opens a trace for appending, writing the header if the file is new or empty"""
+    trace = open(path, "a", buffering=1)
+    if trace.tell() == 0:
+        trace.write(TRACE_HEADER + "\n")
+    return trace
+
+
+def format_row(data: Dict[str, Any], precision: int = 4) -> str:
+    """One trace line for a sample as read by AccelerometerManager, or "" if the read failed"""
+    values = [data.get("timestamp")]
+    for key in ("acceleration", "linear_acceleration", "gyro"):
+        vector = data.get(key)
+        if not (isinstance(vector, tuple) and len(vector) == 3):
+            return ""
+        values.extend(vector)
+    return f"{values[0]:.6f}," + ",".join(f"{value:.{precision}f}" for value in values[1:]) + "\n"
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """The samples in a trace, as dictionaries ready for AccelerometerManager.process_sample"""
+    samples = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) != 10 or row[0] == "timestamp":
+                continue
+            values = [float(value) for value in row]
+            samples.append({
+                "timestamp": values[0],
+                "acceleration": tuple(values[1:4]),
+                "linear_acceleration": tuple(values[4:7]),
+                "gyro": tuple(values[7:10]),
+            })
+    return samples
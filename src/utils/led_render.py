@@ -0,0 +1,397 @@
+import numpy as np
+from enum import Enum, IntEnum, auto
+from typing import Iterator, List, Optional, Sequence, Tuple
+from config import get_filter_logger
+
+logger = get_filter_logger(__name__)
+
+# Frames are (N, 3) uint8 RGB arrays, one row per pixel
+FRAME_DTYPE = np.uint8
+
+
+# Per-channel phase offsets for the closed-form HSV to RGB conversion
+_HSV_CHANNEL_OFFSETS = np.array([5.0, 3.0, 1.0])
+
+
+def hsv_to_rgb(h, s, v) -> np.ndarray:
+    """
+    Vectorized colorsys.hsv_to_rgb. Inputs broadcast against each other.
+    Returns:
+        np.ndarray: float64 array of shape (..., 3) with components in 0.0-1.0
+    """
+    h = np.asarray(h, dtype=np.float64)[..., None]
+    s = np.asarray(s, dtype=np.float64)[..., None]
+    v = np.asarray(v, dtype=np.float64)[..., None]
+    # Each channel is a trapezoid of hue, shifted by a third of the circle per channel
+    k = (_HSV_CHANNEL_OFFSETS + h * 6.0) % 6.0
+    return v - v * s * np.minimum(np.maximum(np.minimum(k, 4.0 - k), 0.0), 1.0)
+
+
+def hsv_to_rgb8(h, s, v) -> np.ndarray:
+    """hsv_to_rgb scaled to 0-255 and truncated like int(x * 255)"""
+    return (hsv_to_rgb(h, s, v) * 255).astype(FRAME_DTYPE)
+
+
+def scale_colors(colors, intensity) -> np.ndarray:
+    """
+    Scale RGB colors by per-pixel intensities, truncating like int(c * intensity).
+    Args:
+        colors: A single (3,) color or an (N, 3) array of colors
+        intensity: A scalar or (N,) array of multipliers
+    """
+    scaled = np.asarray(colors, dtype=np.float64) * np.asarray(intensity, dtype=np.float64)[..., None]
+    return np.clip(scaled, 0, 255).astype(FRAME_DTYPE)
+
+
+def ring_distance(indices: np.ndarray, center: int, ring_size: int) -> np.ndarray:
+    """Distance in pixels from center to each index, going the short way around a ring"""
+    distance = np.abs(indices - center) % ring_size
+    return np.minimum(distance, ring_size - distance)
+
+
+def cap_power(frame: np.ndarray, max_total: int) -> np.ndarray:
+    """
+    Scale a frame down if the sum of all its RGB values exceeds max_total, which is used
+    as a proxy for the strip's current draw. Returns the frame unchanged if it is under the cap.
+    """
+    if max_total <= 0:
+        return frame
+    total = frame.sum()
+    if total <= max_total:
+        return frame
+    scale_factor = max_total / total
+    logger.debug(f"Power capping triggered. Total brightness: {total:.0f}, scaling by: {scale_factor:.2f}")
+    return (frame * scale_factor).astype(frame.dtype)
+
+
+class PixelWriter:
+    """
+    Writes whole frames into a NeoPixel strip's buffers in one vectorized copy.
+
+    Adafruit's PixelBuf keeps the raw colors (once brightness has been changed) and the
+    brightness-scaled bytes it transmits, both in the strip's byte order. Setting pixels one
+    at a time goes through Python for every byte; this writes the same bytes with numpy.
+    Pixel objects without those buffers (the mock strip, RGBW or DotStar strips) fall back to a
+    single slice assignment. The last frame written is kept, before brightness, as `frame`.
+    """
+    def __init__(self, pixels):
+        self.pixels = pixels
+        self.num_pixels = pixels.n
+        self.frame: Optional[np.ndarray] = None
+        self._order = None
+        buffer = getattr(pixels, "_post_brightness_buffer", None)
+        if (buffer is not None and getattr(pixels, "_bpp", None) == 3
+                and not getattr(pixels, "_dotstar_mode", False)):
+            self._order = list(pixels._byteorder[:3])
+            self._offset = pixels._offset
+            self._post = self._view(buffer)
+
+    @property
+    def is_bulk(self) -> bool:
+        """Whether frames are copied straight into the strip's byte buffers"""
+        return self._order is not None
+
+    def _view(self, buffer) -> np.ndarray:
+        return np.frombuffer(buffer, dtype=np.uint8, count=self.num_pixels * 3,
+                             offset=self._offset).reshape(self.num_pixels, 3)
+
+    def write(self, frame: np.ndarray):
+        """Write a uint8 frame, or a float frame which is truncated to 0-255 once, after brightness"""
+        self.frame = frame
+        if self._order is None:
+            self.pixels[0:self.num_pixels] = [tuple(color) for color in frame.astype(FRAME_DTYPE).tolist()]
+            return
+
+        # The raw buffer only exists once brightness has been set to something other than 1.0
+        pre_buffer = self.pixels._pre_brightness_buffer
+        if pre_buffer is not None:
+            self._view(pre_buffer)[:, self._order] = frame
+        brightness = self.pixels._brightness
+        if brightness >= 1.0:
+            self._post[:, self._order] = frame
+        else:
+            self._post[:, self._order] = (frame * brightness).astype(FRAME_DTYPE)
+
+
+class Twinkles:
+    """
+    State for a field of independently twinkling pixels.
+
+    Idle pixels start twinkling at random with the given chance per frame, fade in to full
+    brightness and back out, moving fastest near black.
+    """
+    def __init__(self, num_pixels: int, rng: np.random.Generator, chance: float, base_step: float,
+                 saturation: float = 1.0, palette: Optional[Sequence[float]] = None):
+        self.rng = rng
+        self.chance = chance
+        self.base_step = base_step
+        self.saturation = saturation
+        self.palette = None if palette is None else np.asarray(palette, dtype=np.float64)
+        self.active = np.zeros(num_pixels, dtype=bool)
+        self.brightness = np.zeros(num_pixels)
+        self.direction = np.ones(num_pixels)
+        self.hue = self._random_hues(num_pixels)
+
+    def _random_hues(self, count: int) -> np.ndarray:
+        if self.palette is None:
+            return self.rng.random(count)
+        return self.rng.choice(self.palette, count)
+
+    def step(self) -> np.ndarray:
+        """Advance one frame and return the field's colors as an (N, 3) uint8 array"""
+        starting = ~self.active & (self.rng.random(len(self.active)) < self.chance)
+        if starting.any():
+            self.active |= starting
+            self.brightness[starting] = 0.0
+            self.direction[starting] = 1
+            self.hue[starting] = self._random_hues(int(starting.sum()))
+
+        active = self.active
+        step = self.base_step + self.base_step * 2 * (1.0 - self.brightness ** 2)
+        self.brightness[active] += step[active] * self.direction[active]
+
+        peaked = active & (self.brightness >= 1.0)
+        self.brightness[peaked] = 1.0
+        self.direction[peaked] = -1
+        faded = active & (self.brightness <= 0.0)
+        # Only deactivate pixels that were fading out
+        self.active[faded & (self.direction < 0)] = False
+        self.brightness[faded] = 0.0
+
+        colors = hsv_to_rgb8(self.hue, self.saturation, self.brightness)
+        colors[~self.active] = 0
+        return colors
+
+
+class Sparkles:
+    """Short-lived sparkles at fixed pixels that twinkle while fading out over their lifetime"""
+    def __init__(self):
+        self.position = np.empty(0, dtype=np.intp)
+        self.lifetime = np.empty(0)
+        self.age = np.empty(0)
+        self.color = np.empty((0, 3))
+        self.twinkle_speed = np.empty(0)
+
+    def __len__(self):
+        return len(self.position)
+
+    def add(self, position, lifetime, color, twinkle_speed):
+        """Add sparkles; arguments are arrays with one entry (or color row) per sparkle"""
+        self.position = np.concatenate((self.position, np.asarray(position, dtype=np.intp)))
+        self.lifetime = np.concatenate((self.lifetime, lifetime))
+        self.age = np.concatenate((self.age, np.zeros(len(lifetime))))
+        self.color = np.concatenate((self.color, color))
+        self.twinkle_speed = np.concatenate((self.twinkle_speed, twinkle_speed))
+
+    def step(self, dt: float) -> np.ndarray:
+        """Age every sparkle by dt seconds, drop expired ones and return the colors of the rest"""
+        self.age += dt
+        alive = self.age < self.lifetime
+        if not alive.all():
+            self.position = self.position[alive]
+            self.lifetime = self.lifetime[alive]
+            self.age = self.age[alive]
+            self.color = self.color[alive]
+            self.twinkle_speed = self.twinkle_speed[alive]
+        age_factor = 1.0 - self.age / self.lifetime
+        twinkle = (np.sin(self.age * self.twinkle_speed) + 1) / 2
+        return scale_colors(self.color, age_factor * twinkle)
+
+
+class BlendMode(Enum):
+    """How a layer combines with the layers below it"""
+    NORMAL = auto()  # Cover the layers below, in proportion to the layer's opacity
+    ADD = auto()     # Add the layer's light to the layers below
+    MAX = auto()     # Keep the brighter of the layer and the layers below, per channel
+
+
+class LayerKind(IntEnum):
+    """What a layer is for. Layers stack in this order, bottom to top."""
+    BASE = 0     # The current effect. Starting a new one crossfades to it and retires the old one.
+    OVERLAY = 1  # A timed effect over the base, which fades out when it expires
+    FLASH = 2    # A short alert on top of everything, removed once its frames run out
+
+
+class EffectLayer:
+    """
+    One effect in a LayerStack: the effect's (frame, hold) generator plus how to blend it.
+    Opacity fades linearly between targets, so layers can crossfade in and out.
+
+    `speed` is the frame hold the effect was started with. Changing it later stretches or
+    shrinks every hold in proportion, so a running effect speeds up or slows down in place.
+    """
+    # Frames an effect may skip in one tick to catch up before it is resynced instead
+    MAX_CATCH_UP_FRAMES = 4
+
+    def __init__(self, name: str, frames: Iterator[Tuple[np.ndarray, float]], kind: LayerKind = LayerKind.BASE,
+                 speed: Optional[float] = None, brightness: float = 1.0, blend: BlendMode = BlendMode.NORMAL,
+                 expires_at: Optional[float] = None, fade_in: float = 0.0, now: float = 0.0):
+        self.name = name
+        self.frames = frames
+        self.kind = kind
+        self.speed = speed
+        self._frames_speed = speed  # The speed the generator's holds are for
+        self.brightness = brightness
+        self.blend = blend
+        self.expires_at = expires_at
+        self.frame: Optional[np.ndarray] = None
+        self.finished = False
+        self.removing = False
+        self._next_frame_at = now
+        self._fade_from = 0.0 if fade_in > 0 else 1.0
+        self._fade_to = 1.0
+        self._fade_start = now
+        self._fade_duration = fade_in
+
+    def opacity(self, now: float) -> float:
+        if self._fade_duration <= 0:
+            return self._fade_to
+        progress = min(1.0, (now - self._fade_start) / self._fade_duration)
+        return self._fade_from + (self._fade_to - self._fade_from) * progress
+
+    def is_fading(self, now: float) -> bool:
+        return self._fade_duration > 0 and now < self._fade_start + self._fade_duration
+
+    def fade_to(self, opacity: float, duration: float, now: float):
+        self._fade_from = self.opacity(now)
+        self._fade_to = opacity
+        self._fade_start = now
+        self._fade_duration = duration
+
+    def fade_out(self, duration: float, now: float):
+        """Fade the layer out, after which its stack removes it"""
+        if not self.removing:
+            self.removing = True
+            self.fade_to(0.0, duration, now)
+
+    @property
+    def hold_scale(self) -> float:
+        """How much longer than the effect asked for each frame is held, after a speed change"""
+        if self.speed and self._frames_speed:
+            return self.speed / self._frames_speed
+        return 1.0
+
+    def advance(self, now: float) -> bool:
+        """Pull the effect's next frame if the current one has been held long enough. Returns True if it changed."""
+        if self.finished or now < self._next_frame_at:
+            return False
+        try:
+            scale = self.hold_scale
+            for _ in range(self.MAX_CATCH_UP_FRAMES):
+                self.frame, hold = next(self.frames)
+                self._next_frame_at += hold * scale
+                if self._next_frame_at > now:
+                    break
+            else:
+                # Too far behind to catch up; carry on from now
+                self._next_frame_at = now
+        except StopIteration:
+            self.finished = True
+        except Exception as e:
+            logger.error(f"Error in LED effect {self.name}: {e}", exc_info=True)
+            self.finished = True
+        return True
+
+    def close(self):
+        self.frames.close()
+
+
+class LayerStack:
+    """
+    Effect layers, bottom to top, composited into one frame.
+
+    render() advances every layer's effect, expires and retires layers, and blends the
+    result into a preallocated float canvas. It returns None when nothing has changed since
+    the last frame, so a compositor ticking faster than its effects only shows new frames.
+    """
+    def __init__(self, num_pixels: int, fade_seconds: float = 0.0):
+        self.layers: List[EffectLayer] = []
+        self.fade_seconds = fade_seconds
+        self._canvas = np.zeros((num_pixels, 3), dtype=np.float32)
+        self._scratch = np.zeros((num_pixels, 3), dtype=np.float32)
+        self._dirty = True
+        self._was_fading = False
+
+    def __len__(self):
+        return len(self.layers)
+
+    def push(self, layer: EffectLayer):
+        """Add a layer above the others of its kind, and below any of a higher kind"""
+        index = len(self.layers)
+        while index > 0 and self.layers[index - 1].kind > layer.kind:
+            index -= 1
+        self.layers.insert(index, layer)
+        self._dirty = True
+
+    def top(self, max_kind: LayerKind = LayerKind.OVERLAY) -> Optional[EffectLayer]:
+        """The topmost layer that isn't on its way out, ignoring kinds above max_kind"""
+        for layer in reversed(self.layers):
+            if layer.kind <= max_kind and not layer.removing:
+                return layer
+        return None
+
+    def find(self, name: str) -> List[EffectLayer]:
+        return [layer for layer in self.layers if layer.name == name and not layer.removing]
+
+    def invalidate(self):
+        """Re-render on the next call even if no effect has a new frame, e.g. after a brightness change"""
+        self._dirty = True
+
+    def remove(self, layer: EffectLayer):
+        layer.close()
+        self.layers.remove(layer)
+        self._dirty = True
+
+    def clear(self):
+        for layer in self.layers:
+            layer.close()
+        self.layers.clear()
+        self._dirty = True
+
+    def _retire(self, now: float):
+        top_base = self.top(LayerKind.BASE)
+        # An older base is hidden once the base above it has fully faded in
+        covered = top_base is not None and not top_base.is_fading(now)
+        for layer in list(self.layers):
+            if layer.expires_at is not None and now >= layer.expires_at:
+                # Fade from the expiry time, even if this tick came late
+                layer.fade_out(self.fade_seconds, layer.expires_at)
+            if (layer.finished
+                    or (layer.removing and not layer.is_fading(now))
+                    or (covered and layer.kind == LayerKind.BASE and layer is not top_base)):
+                self.remove(layer)
+
+    def render(self, now: float) -> Optional[np.ndarray]:
+        """
+        Returns:
+            np.ndarray: The composited (N, 3) float32 frame, valid until the next call,
+            or None if it would be the same as the last one
+        """
+        changed = self._dirty
+        for layer in self.layers:
+            changed |= layer.advance(now)
+        self._retire(now)
+        fading = any(layer.is_fading(now) for layer in self.layers)
+        # Render once more after a fade ends, to land on its final opacity
+        changed |= self._dirty or fading or self._was_fading
+        self._was_fading = fading
+        if not changed:
+            return None
+        self._dirty = False
+
+        canvas, scratch = self._canvas, self._scratch
+        canvas.fill(0.0)
+        for layer in self.layers:
+            opacity = layer.opacity(now)
+            if layer.frame is None or opacity <= 0.0:
+                continue
+            np.multiply(layer.frame, layer.brightness * opacity, out=scratch)
+            if layer.blend is BlendMode.NORMAL:
+                canvas *= 1.0 - opacity
+                canvas += scratch
+            elif layer.blend is BlendMode.ADD:
+                canvas += scratch
+            else:
+                np.maximum(canvas, scratch, out=canvas)
+        np.minimum(canvas, 255.0, out=canvas)
+        return canvas
@@ -0,0 +1,182 @@
+"""
+Fixed-size motion history with incrementally maintained window statistics.
+
+The accelerometer classifier runs on every IMU sample (200 Hz), so nothing here rebuilds a
+window to answer a question about it:
+
+- MotionHistory: the most recent IMU samples in one preallocated structured numpy array,
+  overwriting the oldest, with each sample's vector magnitudes computed once on the way in.
+- RollingStats: sum, sum of squares, and optionally the max and min of the last `size`
+  values pushed, each updated in O(1) (amortized, for the extremes) per value.
+"""
+
+from collections import deque
+from math import fsum, sqrt
+from typing import Optional
+import numpy as np
+
+MOTION_SAMPLE_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("acceleration", np.float64, (3,)),
+    ("linear_acceleration", np.float64, (3,)),
+    ("gyro", np.float64, (3,)),
+    ("acceleration_magnitude", np.float64),
+    ("linear_magnitude", np.float64),
+    ("gyro_magnitude", np.float64),
+])
+
+
+class MotionHistory:
+    """The last `capacity` IMU samples, oldest first"""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("MotionHistory capacity must be positive")
+        self.capacity = capacity
+        self._samples = np.zeros(capacity, dtype=MOTION_SAMPLE_DTYPE)
+        self._count = 0  # Total samples ever appended
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, timestamp: float, acceleration, linear_acceleration, gyro):
+        """Stores one sample, overwriting the oldest once full"""
+        sample = self._samples[self._count % self.capacity]
+        sample["timestamp"] = timestamp
+        sample["acceleration"] = acceleration
+        sample["linear_acceleration"] = linear_acceleration
+        sample["gyro"] = gyro
+        ax, ay, az = acceleration
+        lx, ly, lz = linear_acceleration
+        gx, gy, gz = gyro
+        sample["acceleration_magnitude"] = sqrt(ax * ax + ay * ay + az * az)
+        sample["linear_magnitude"] = sqrt(lx * lx + ly * ly + lz * lz)
+        sample["gyro_magnitude"] = sqrt(gx * gx + gy * gy + gz * gz)
+        self._count += 1
+
+    def get(self, age: int = 0):
+        """The sample `age` samples before the latest (0 for the latest)"""
+        if not 0 <= age < len(self):
+            raise IndexError("MotionHistory index out of range")
+        return self._samples[(self._count - 1 - age) % self.capacity]
+
+    def last(self, count: int, field: Optional[str] = None) -> np.ndarray:
+        """
+        The last `count` samples (or just one field of them), oldest first.
+
+        Returns a view when the samples don't wrap around the end of the buffer, else a copy;
+        either way it's only valid until the next append.
+        """
+        count = min(count, len(self))
+        data = self._samples if field is None else self._samples[field]
+        start = (self._count - count) % self.capacity
+        if start + count <= self.capacity:
+            return data[start:start + count]
+        return np.concatenate((data[start:], data[:start + count - self.capacity]))
+
+    def clear(self):
+        self._count = 0
+
+
+class RollingStats:
+    """
+    Running statistics over the last `size` values pushed.
+
+    The sums are updated by adding the new value and subtracting the one leaving the window,
+    and recomputed from scratch once per pass over the window so rounding errors can't build
+    up. With track_extremes, the window's max and min are kept in monotonic queues.
+    """
+
+    def __init__(self, size: int, track_extremes: bool = False):
+        if size <= 0:
+            raise ValueError("RollingStats size must be positive")
+        self.size = size
+        self.track_extremes = track_extremes
+        self._values = [0.0] * size  # A list, since indexing a numpy array per value is slower
+        self._pushed = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        # (sequence number, value) pairs, values decreasing (max) or increasing (min)
+        self._maxima = deque()
+        self._minima = deque()
+
+    def __len__(self) -> int:
+        return min(self._pushed, self.size)
+
+    def push(self, value: float):
+        seq = self._pushed
+        slot = seq % self.size
+        if seq >= self.size:
+            old = self._values[slot]
+            self.sum -= old
+            self.sum_sq -= old * old
+        self._values[slot] = value
+        self._pushed += 1
+        if slot == self.size - 1:
+            self.sum = fsum(self._values)
+            self.sum_sq = fsum(v * v for v in self._values)
+        else:
+            self.sum += value
+            self.sum_sq += value * value
+
+        if self.track_extremes:
+            oldest = seq - self.size
+            maxima, minima = self._maxima, self._minima
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+            maxima.append((seq, value))
+            if maxima[0][0] <= oldest:
+                maxima.popleft()
+            while minima and minima[-1][1] >= value:
+                minima.pop()
+            minima.append((seq, value))
+            if minima[0][0] <= oldest:
+                minima.popleft()
+
+    @property
+    def mean(self) -> float:
+        count = len(self)
+        return self.sum / count if count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1), as statistics.variance"""
+        count = len(self)
+        if count < 2:
+            return 0.0
+        return max(0.0, (self.sum_sq - self.sum * self.sum / count) / (count - 1))
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    @property
+    def max(self) -> float:
+        return self._maxima[0][1] if self._maxima else 0.0
+
+    @property
+    def min(self) -> float:
+        return self._minima[0][1] if self._minima else 0.0
+
+    @property
+    def latest(self) -> float:
+        """The value pushed last"""
+        return self._values[(self._pushed - 1) % self.size] if self._pushed else 0.0
+
+    @property
+    def max_age(self) -> int:
+        """How many values have been pushed since the window's max (0 if it's the latest)"""
+        return self._pushed - 1 - self._maxima[0][0] if self._maxima else 0
+
+    def values(self) -> np.ndarray:
+        """The window's values, oldest first (a copy)"""
+        count = len(self)
+        start = (self._pushed - count) % self.size
+        return np.array(self._values[start:] + self._values[:start])[:count]
+
+    def clear(self):
+        self._pushed = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self._maxima.clear()
+        self._minima.clear()
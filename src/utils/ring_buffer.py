@@ -0,0 +1,187 @@
+import asyncio
+import numpy as np
+from typing import Optional
+
+
+class RingBuffer:
+    """
+    Single-producer/single-consumer ring buffer backed by one preallocated numpy array.
+
+    The producer only ever advances the write position and the consumer only ever advances
+    the read position. Both are plain Python ints that only grow, so each side can read the
+    other's position without a lock: under the GIL a position update is a single atomic store,
+    and the data it covers is always written before the position is published.
+
+    Exactly one thread may write and exactly one thread may read. `clear` may be called from
+    any thread: it only records a discard position, which the consumer applies on its next access.
+    Any dtype is supported, including structured dtypes for multi-field records.
+    """
+    def __init__(self, capacity: int, dtype=np.int16):
+        if capacity <= 0:
+            raise ValueError("RingBuffer capacity must be positive")
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(capacity, dtype=self.dtype)
+        self._write_pos = 0  # Total items ever written. Only modified by the producer.
+        self._read_pos = 0   # Total items ever read. Only modified by the consumer.
+        self._discard_pos = 0  # Everything written before this position has been cleared
+
+    @property
+    def available(self) -> int:
+        """Number of items ready to be read."""
+        return self._write_pos - max(self._read_pos, self._discard_pos)
+
+    @property
+    def free(self) -> int:
+        """Number of items that can be written without overwriting unread data."""
+        return self.capacity - (self._write_pos - self._read_pos)
+
+    def write(self, data: np.ndarray) -> int:
+        """
+        Producer side: copy as much of `data` as fits into the buffer.
+        Returns:
+            int: Number of items written.
+        """
+        count = min(len(data), self.free)
+        if count <= 0:
+            return 0
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start:start + first] = data[:first]
+        if first < count:
+            self._data[:count - first] = data[first:count]
+        # Publish only after the data is in place
+        self._write_pos += count
+        return count
+
+    def read(self, count: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Consumer side: read exactly `count` items.
+        Args:
+            count: Number of items to read
+            out: Optional preallocated destination with at least `count` items
+        Returns:
+            np.ndarray: The items read (`out[:count]` if given), or None if fewer than
+                        `count` items are available.
+        """
+        self._apply_discard()
+        if self.available < count:
+            return None
+        if out is None:
+            out = np.empty(count, dtype=self.dtype)
+        self._copy_out(out, count)
+        self._read_pos += count
+        return out[:count]
+
+    def peek(self, count: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Consumer side: like `read`, but without consuming the items."""
+        self._apply_discard()
+        if self.available < count:
+            return None
+        if out is None:
+            out = np.empty(count, dtype=self.dtype)
+        self._copy_out(out, count)
+        return out[:count]
+
+    def peek_view(self, count: int) -> Optional[np.ndarray]:
+        """
+        Consumer side: the next `count` items without copying or consuming them.
+        Returns:
+            np.ndarray: A read-only view into the buffer, valid until the items are consumed with
+                        `skip`; a copy only if the items wrap around the end of the buffer. None if
+                        fewer than `count` items are available.
+        """
+        self._apply_discard()
+        if self.available < count:
+            return None
+        start = self._read_pos % self.capacity
+        if start + count > self.capacity:
+            return self.peek(count)
+        view = self._data[start:start + count]
+        view.flags.writeable = False
+        return view
+
+    def skip(self, count: int) -> int:
+        """Consumer side: drop up to `count` items. Returns the number dropped."""
+        self._apply_discard()
+        count = min(count, self.available)
+        self._read_pos += count
+        return count
+
+    def clear(self):
+        """
+        Drop everything currently buffered in O(1). Safe to call from any thread; the space is
+        handed back to the producer once the consumer next touches the buffer.
+        """
+        self._discard_pos = self._write_pos
+
+    def _apply_discard(self):
+        # Consumer side: only the consumer ever moves the read position
+        discard_pos = self._discard_pos
+        if discard_pos > self._read_pos:
+            self._read_pos = discard_pos
+
+    def _copy_out(self, out: np.ndarray, count: int):
+        start = self._read_pos % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if first < count:
+            out[first:count] = self._data[:count - first]
+
+
+class AsyncRingBuffer(RingBuffer):
+    """
+    RingBuffer filled by a thread and drained by a coroutine.
+
+    The producer thread writes with `publish`, which wakes the consumer's event loop. The
+    consumer awaits `wait` and then `take`s whatever has arrived, so it handles a batch per
+    wakeup and never blocks on the producer. Call `bind` from the consuming event loop before
+    the producer starts.
+    """
+    def __init__(self, capacity: int, dtype=np.int16):
+        super().__init__(capacity, dtype)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def bind(self):
+        """Consumer side: wake the running event loop when items are published"""
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def publish(self, data: np.ndarray) -> int:
+        """
+        Producer side: `write`, then wake the consumer if anything was written.
+        Returns:
+            int: Number of items written.
+        """
+        written = self.write(data)
+        if written and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        return written
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Consumer side: wait until items are available.
+        Returns:
+            bool: True if items are available, False if the timeout expired first
+        """
+        if self.available:
+            return True
+        if self._ready is None:
+            return False
+        self._ready.clear()
+        # The producer may have published between the check and the clear
+        if self.available:
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.available > 0
+
+    def take(self, max_count: Optional[int] = None) -> np.ndarray:
+        """Consumer side: read everything available (at most `max_count`), oldest first"""
+        count = self.available
+        if max_count is not None:
+            count = min(count, max_count)
+        return self.read(count)
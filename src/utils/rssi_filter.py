@@ -0,0 +1,157 @@
+"""
+Per-beacon RSSI estimators.
+
+A beacon's RSSI is noisy (several dB from one advertisement to the next, with occasional
+deep fades) and arrives at irregular times, since advertisements get lost. Each beacon gets
+its own estimator, fed (rssi, timestamp) pairs as they arrive:
+
+- KalmanRSSIEstimator: constant-velocity Kalman filter over (RSSI, dB/s). Uses the real time
+  between updates, so a gap widens its uncertainty instead of counting as one step, and gates
+  out readings that are implausible given the prediction.
+- EMARSSIEstimator: the fixed-alpha exponential moving average used previously.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Optional
+from config import BLEConfig, Distance
+
+
+class RSSIEstimator(ABC):
+    """Smooths one beacon's RSSI"""
+
+    def __init__(self):
+        self.value: Optional[float] = None  # Latest estimate, None until the first reading
+        self.updated_at: Optional[float] = None
+
+    @abstractmethod
+    def update(self, rssi: float, timestamp: float) -> float:
+        """Adds a reading taken at timestamp (seconds, monotonic) and returns the new estimate"""
+
+    def reset(self):
+        self.value = None
+        self.updated_at = None
+
+
+class EMARSSIEstimator(RSSIEstimator):
+    """Exponential moving average with a fixed weight per reading, regardless of timing"""
+
+    def __init__(self, alpha: float = BLEConfig.RSSI_EMA_ALPHA):
+        super().__init__()
+        self.alpha = alpha
+
+    def update(self, rssi: float, timestamp: float) -> float:
+        if self.value is None:
+            self.value = float(rssi)
+        else:
+            self.value = self.alpha * rssi + (1 - self.alpha) * self.value
+        self.updated_at = timestamp
+        return self.value
+
+
+class KalmanRSSIEstimator(RSSIEstimator):
+    """
+    Constant-velocity Kalman filter over RSSI and its rate of change.
+
+    process_noise is the white-noise acceleration spectral density (dB^2/s^3): how quickly the
+    true RSSI can change course as the toy is carried around. measurement_noise is the variance
+    of a single reading (dB^2). Readings more than outlier_gate standard deviations from the
+    prediction are rejected, unless max_outliers arrive in a row, in which case the beacon
+    really has changed and the filter restarts from the latest reading.
+
+    The 2x2 covariance is kept as three scalars, since this runs for every advertisement.
+    """
+
+    def __init__(self, process_noise: float = BLEConfig.RSSI_KALMAN_PROCESS_NOISE,
+                 measurement_noise: float = BLEConfig.RSSI_KALMAN_MEASUREMENT_NOISE,
+                 outlier_gate: float = BLEConfig.RSSI_OUTLIER_GATE,
+                 max_outliers: int = BLEConfig.RSSI_MAX_OUTLIERS):
+        super().__init__()
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.outlier_gate = outlier_gate
+        self.max_outliers = max_outliers
+        self.rejected = 0  # Total readings rejected as outliers
+        self._velocity = 0.0
+        self._p00 = self._p01 = self._p11 = 0.0
+        self._outliers = 0
+
+    def _start(self, rssi: float, timestamp: float) -> float:
+        self.value = float(rssi)
+        self.updated_at = timestamp
+        self._velocity = 0.0
+        self._p00 = self.measurement_noise
+        self._p01 = 0.0
+        # Allow for the beacon approaching or receding at a few dB/s
+        self._p11 = 10.0
+        self._outliers = 0
+        return self.value
+
+    def update(self, rssi: float, timestamp: float) -> float:
+        if self.value is None:
+            return self._start(rssi, timestamp)
+
+        # Predict forward by the real time since the last update
+        dt = max(0.0, timestamp - self.updated_at)
+        x = self.value + self._velocity * dt
+        q = self.process_noise
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + q * dt ** 3 / 3
+        p01 = self._p01 + dt * self._p11 + q * dt ** 2 / 2
+        p11 = self._p11 + q * dt
+
+        innovation = rssi - x
+        s = p00 + self.measurement_noise
+        if innovation * innovation > self.outlier_gate ** 2 * s:
+            self._outliers += 1
+            self.rejected += 1
+            if self._outliers >= self.max_outliers:
+                return self._start(rssi, timestamp)
+            # Keep the prediction; the next reading will be judged against it
+            self.value, self.updated_at = x, timestamp
+            self._p00, self._p01, self._p11 = p00, p01, p11
+            return self.value
+
+        self._outliers = 0
+        k0 = p00 / s
+        k1 = p01 / s
+        self.value = x + k0 * innovation
+        self._velocity += k1 * innovation
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        self.updated_at = timestamp
+        return self.value
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of the current estimate (dB)"""
+        return math.sqrt(self._p00)
+
+    def reset(self):
+        super().reset()
+        self._outliers = 0
+
+
+def create_rssi_estimator(kind: str = BLEConfig.RSSI_FILTER) -> RSSIEstimator:
+    """A new estimator of the given kind ("kalman" or "ema")"""
+    if kind == "kalman":
+        return KalmanRSSIEstimator()
+    if kind == "ema":
+        return EMARSSIEstimator()
+    raise ValueError(f"Unknown RSSI filter: {kind}")
+
+
+def estimate_distance(rssi: float) -> Distance:
+    """Estimates distance category based on RSSI value"""
+    if rssi >= BLEConfig.RSSI_IMMEDIATE:
+        return Distance.IMMEDIATE
+    elif rssi >= BLEConfig.RSSI_VERY_NEAR:
+        return Distance.VERY_NEAR
+    elif rssi >= BLEConfig.RSSI_NEAR:
+        return Distance.NEAR
+    elif rssi >= BLEConfig.RSSI_FAR:
+        return Distance.FAR
+    elif rssi >= BLEConfig.RSSI_VERY_FAR:
+        return Distance.VERY_FAR
+    else:
+        return Distance.UNKNOWN
@@ -0,0 +1,158 @@
+"""
+Spectral shake detection over the real sample timestamps.
+
+IMU samples don't arrive at a fixed rate: the report rate, I2C latency and the event loop all
+move it around. So the detector first resamples linear acceleration onto a fixed time grid,
+interpolating between the samples either side of each grid point, and then keeps a sliding DFT
+of the last `window` grid samples for just the bins in the shake band. Each grid sample updates
+those bins in O(1), and the DFT is recomputed from the window once per pass over it so rounding
+errors can't build up.
+
+From the bins it reports how much of the motion's energy is periodic in the shake band, at which
+frequency, and how strong it is, alongside the window's peak and mean acceleration magnitude.
+Those are only worked out when read, so samples that are never classified cost nothing extra.
+"""
+
+from math import ceil, floor, pi, sqrt
+from typing import Optional, Tuple
+import numpy as np
+from utils.motion_history import RollingStats
+
+
+class SpectralShakeDetector:
+    """
+    Band energy of linear acceleration between min_frequency and max_frequency (Hz).
+
+    Args:
+        rate: Resampling rate (Hz)
+        window: Number of resampled samples analysed (window / rate seconds)
+        max_gap: A gap between samples longer than this (seconds) restarts the window, rather
+                 than interpolating across it
+    """
+
+    def __init__(self, rate: float = 50.0, window: int = 32, min_frequency: float = 2.5,
+                 max_frequency: float = 15.0, max_gap: float = 0.25):
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self.window = window
+        self.max_gap = max_gap
+        first_bin = max(1, ceil(min_frequency * window / rate))
+        last_bin = min(window // 2 - 1, floor(max_frequency * window / rate))
+        if last_bin < first_bin:
+            raise ValueError("Shake band doesn't cover any DFT bins")
+        bins = np.arange(first_bin, last_bin + 1)
+        self.frequencies = bins * rate / window
+        self._twiddle = np.exp(2j * pi * bins / window)
+        # DFT basis with index 0 at the oldest sample in the window, matching the sliding updates
+        self._basis = np.exp(-2j * pi * np.outer(np.arange(window), bins) / window)
+
+        self._samples = np.zeros((window, 3))
+        self._bins = np.zeros((3, len(bins)), dtype=complex)
+        self._axes = [RollingStats(window) for _ in range(3)]
+        self._magnitudes = RollingStats(window, track_extremes=True)
+        self._pushed = 0
+        self._last_time: Optional[float] = None
+        self._last_value = np.zeros(3)
+        self._next_time = 0.0
+        self._measures: Optional[Tuple[float, float, float]] = None  # (band_rms, band_ratio, frequency)
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full window has been resampled"""
+        return self._pushed >= self.window
+
+    @property
+    def band_rms(self) -> float:
+        """RMS acceleration in the shake band (m/s²)"""
+        return self._measure()[0]
+
+    @property
+    def band_ratio(self) -> float:
+        """Fraction of the window's variance in the shake band"""
+        return self._measure()[1]
+
+    @property
+    def frequency(self) -> float:
+        """Strongest frequency in the band (Hz)"""
+        return self._measure()[2]
+
+    @property
+    def peak_magnitude(self) -> float:
+        """Highest linear acceleration magnitude in the window (m/s²)"""
+        return self._magnitudes.max
+
+    @property
+    def mean_magnitude(self) -> float:
+        """Mean linear acceleration magnitude over the window (m/s²)"""
+        return self._magnitudes.mean
+
+    def reset(self):
+        self._pushed = 0
+        self._samples[:] = 0
+        self._bins[:] = 0
+        for axis in self._axes:
+            axis.clear()
+        self._magnitudes.clear()
+        self._last_time = None
+        self._measures = None
+
+    def update(self, timestamp: float, linear_acceleration: Tuple[float, float, float]) -> int:
+        """
+        Adds one sample.
+
+        Returns:
+            int: The number of grid samples it completed (usually 0 or 1)
+        """
+        value = np.array(linear_acceleration, dtype=float)
+        last_time = self._last_time
+        if last_time is None or timestamp - last_time > self.max_gap:
+            self.reset()
+            self._push(value)
+            self._last_time, self._last_value = timestamp, value
+            self._next_time = timestamp + self.interval
+            return 1
+        if timestamp <= last_time:
+            return 0
+
+        added = 0
+        span = timestamp - last_time
+        while self._next_time <= timestamp:
+            fraction = (self._next_time - last_time) / span
+            self._push(self._last_value + fraction * (value - self._last_value))
+            self._next_time += self.interval
+            added += 1
+        self._last_time, self._last_value = timestamp, value
+        return added
+
+    def _push(self, value: np.ndarray):
+        slot = self._pushed % self.window
+        delta = value - self._samples[slot]
+        self._samples[slot] = value
+        self._pushed += 1
+        x, y, z = value.tolist()
+        self._axes[0].push(x)
+        self._axes[1].push(y)
+        self._axes[2].push(z)
+        self._magnitudes.push(sqrt(x * x + y * y + z * z))
+        self._measures = None
+
+        if slot == self.window - 1:
+            # The window has just wrapped, so the oldest sample is back in slot 0: recompute
+            self._bins = self._samples.T @ self._basis
+        else:
+            self._bins += delta[:, None]
+            self._bins *= self._twiddle
+
+    def _measure(self) -> Tuple[float, float, float]:
+        if self._measures is None:
+            if not self.ready:
+                return 0.0, 0.0, 0.0
+            n = self.window
+            squares = self._bins.view(float) ** 2
+            power = squares.reshape(3, -1, 2).sum(axis=(0, 2))
+            # Each band bin has a mirror at negative frequency, hence the factor of 2 (Parseval)
+            band_energy = 2.0 * float(power.sum()) / n
+            total_energy = sum(axis.variance for axis in self._axes) * (n - 1)
+            band_ratio = min(1.0, band_energy / total_energy) if total_energy > 1e-9 else 0.0
+            self._measures = (sqrt(band_energy / n), band_ratio, float(self.frequencies[int(power.argmax())]))
+        return self._measures
@@ -0,0 +1,182 @@
+import os
+import struct
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+from config import SoundEffect, get_filter_logger
+
+logger = get_filter_logger(__name__)
+
+WAVE_FORMAT_PCM = 1
+
+
+@dataclass(frozen=True)
+class SoundInfo:
+    """Metadata for a sound in the bank, read from its WAV header"""
+    path: str
+    num_samples: int
+    sample_rate: int
+    channels: int
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / float(self.sample_rate)
+
+
+def read_wav_header(path: str) -> Tuple[int, int, int, int, int]:
+    """
+    Walk the RIFF chunks of a WAV file to find its format and sample data.
+    Returns:
+        Tuple of (channels, sample_rate, bits_per_sample, data_offset, data_bytes)
+    Raises:
+        ValueError: If the file isn't an uncompressed PCM WAV
+    """
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path} is not a WAV file")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path} has a data chunk before its fmt chunk")
+                audio_format, channels, sample_rate, _, _, bits_per_sample = fmt
+                if audio_format != WAVE_FORMAT_PCM:
+                    raise ValueError(f"{path} is not uncompressed PCM (format {audio_format})")
+                # Some writers leave the size unset on streamed files; trust the file length instead
+                data_offset = f.tell()
+                data_bytes = min(chunk_size, os.fstat(f.fileno()).st_size - data_offset)
+                return channels, sample_rate, bits_per_sample, data_offset, data_bytes
+            else:
+                # Chunks are word aligned
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+class SoundBank:
+    """
+    Decoded int16 PCM for every SoundEffect, ready to play without touching the filesystem.
+
+    With preload=True every effect is read once into a single contiguous int16 buffer, and each
+    sound is a read-only slice of it. With preload=False each file's sample data is memory-mapped
+    instead, so pages are only read (and can be evicted again) when a sound is actually played.
+    Either way playback never copies: producers read directly from the returned arrays.
+    """
+    def __init__(self, sample_rate: int, channels: int = 1, preload: bool = True):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.preload = preload
+        self._bank: Optional[np.ndarray] = None
+        self._samples: Dict[str, np.ndarray] = {}
+        self._info: Dict[str, SoundInfo] = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load every SoundEffect. Files that are missing or in the wrong format are logged and skipped."""
+        headers = {}
+        for effect in SoundEffect:
+            path = SoundEffect.get_file_path(effect)
+            if path in self._info or path in headers:
+                continue
+            header = self._read_compatible_header(path)
+            if header is not None:
+                headers[path] = header
+
+        with self._lock:
+            if self.preload:
+                total_samples = sum(data_bytes // 2 for _, data_bytes in headers.values())
+                self._bank = np.empty(total_samples, dtype=np.int16)
+                offset = 0
+                for path, (data_offset, data_bytes) in headers.items():
+                    num_samples = data_bytes // 2
+                    samples = self._bank[offset:offset + num_samples]
+                    with open(path, "rb") as f:
+                        f.seek(data_offset)
+                        f.readinto(memoryview(samples).cast("B"))
+                    self._add(path, samples)
+                    offset += num_samples
+            else:
+                for path, (data_offset, data_bytes) in headers.items():
+                    self._add(path, self._map(path, data_offset, data_bytes))
+
+        total_seconds = sum(info.duration for info in self._info.values())
+        logger.info(f"Sound bank loaded {len(self._info)} sounds ({total_seconds:.1f}s of audio, preload={self.preload})")
+
+    def get(self, effect_name: Union[str, SoundEffect]) -> Optional[np.ndarray]:
+        """
+        Get the samples of a sound effect.
+        Args:
+            effect_name: Name of the sound effect (case-insensitive) or SoundEffect value
+        Returns:
+            np.ndarray: Read-only int16 samples, or None if the sound is unknown or unplayable
+        """
+        path = SoundEffect.get_file_path(effect_name)
+        if not path:
+            return None
+        samples = self._samples.get(path)
+        if samples is None:
+            samples = self._load_late(path)
+        return samples
+
+    def info(self, effect_name: Union[str, SoundEffect]) -> Optional[SoundInfo]:
+        """Get a sound effect's metadata without reading its samples"""
+        path = SoundEffect.get_file_path(effect_name)
+        if not path:
+            return None
+        if path not in self._info:
+            self._load_late(path)
+        return self._info.get(path)
+
+    def _load_late(self, path: str) -> Optional[np.ndarray]:
+        """Memory-map a sound that wasn't available when the bank was loaded"""
+        header = self._read_compatible_header(path)
+        if header is None:
+            return None
+        with self._lock:
+            if path not in self._samples:
+                self._add(path, self._map(path, *header))
+            return self._samples[path]
+
+    def _read_compatible_header(self, path: str) -> Optional[Tuple[int, int]]:
+        """Returns (data_offset, data_bytes) if the file can be played as-is, otherwise logs why and returns None"""
+        if not os.path.exists(path):
+            logger.error(f"Sound effect file not found: {path}")
+            return None
+        try:
+            channels, rate, bits, data_offset, data_bytes = read_wav_header(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Could not read sound effect {path}: {e}")
+            return None
+        if channels != self.channels:
+            logger.error(f"WAV channels ({channels}) doesn't match config ({self.channels}): {path}")
+            return None
+        if rate != self.sample_rate:
+            logger.error(f"WAV rate ({rate}) doesn't match config ({self.sample_rate}): {path}")
+            return None
+        if bits != 16:
+            logger.error(f"WAV width ({bits} bits) doesn't match config format: {path}")
+            return None
+        return data_offset, data_bytes
+
+    def _map(self, path: str, data_offset: int, data_bytes: int) -> np.ndarray:
+        if data_bytes < 2:
+            return np.zeros(0, dtype=np.int16)
+        return np.memmap(path, dtype="<i2", mode="r", offset=data_offset, shape=(data_bytes // 2,))
+
+    def _add(self, path: str, samples: np.ndarray):
+        samples.flags.writeable = False
+        self._samples[path] = samples
+        self._info[path] = SoundInfo(
+            path=path,
+            num_samples=len(samples),
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+        )
@@ -8,6 +8,7 @@ without requiring physical hardware.
 import unittest
 from unittest.mock import patch, MagicMock, AsyncMock
 import asyncio
+import heapq
 import sys
 import os
 
@@ -18,7 +19,7 @@ sys.modules['adafruit_bno08x'] = MagicMock()
 sys.modules['adafruit_bno08x.i2c'] = MagicMock()
 
 # Add src directory to path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 # Now import with hardware mocked
 with patch('hardware.acc_bno085.BNO085Interface'):
@@ -44,8 +45,9 @@ class TestAccelerometerService(unittest.TestCase):
         self.mock_manager_class.return_value = self.mock_manager
         
         # Configure the mock manager's methods
-        self.mock_manager.initialize.return_value = True
-        self.mock_manager.read_sensor_data.return_value = {
+        self.mock_manager.initialize = AsyncMock(return_value=True)
+        self.mock_manager.low_power = False
+        self.mock_manager.read_sensor_batch = AsyncMock(return_value=[{
             'acceleration': (0.1, 0.2, 9.8),
             'linear_acceleration': (0.1, 0.2, 0.3),
             'gyro': (0.01, 0.02, 0.03),
@@ -54,8 +56,9 @@ class TestAccelerometerService(unittest.TestCase):
             'game_rotation': (0.1, 0.2, 0.3, 0.9),
             'heading': 45.0,
             'energy': 0.2,
+            'current_state': 'STATIONARY',
             'timestamp': 12345.6789
-        }
+        }])
         
         # Create an accelerometer service with test config
         self.update_interval = 0.01  # Fast interval for tests
@@ -93,8 +96,8 @@ class TestAccelerometerService(unittest.TestCase):
         # Wait a bit to allow the service to read and publish data
         await asyncio.sleep(self.update_interval * 3)
         
-        # Check that read_sensor_data was called
-        self.mock_manager.read_sensor_data.assert_called()
+        # Check that read_sensor_batch was called
+        self.mock_manager.read_sensor_batch.assert_called()
         
         # Check that data was published to the event bus
         self.mock_service_manager.publish.assert_called()
@@ -122,6 +125,198 @@ class TestAccelerometerService(unittest.TestCase):
         self.assertTrue(result)
         self.mock_manager.check_and_calibrate.assert_called_once()
 
+class SimulatedClock:
+    """
+    Simulated time for the acquisition loop.
+
+    `sleep` waits until `run_until` advances the clock to its wake time; time spent blocking
+    the event loop is simulated by advancing `now` directly. Between steps the event loop gets a
+    few iterations to run everything that's ready, so no test depends on real timing.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._count = 0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        wake = asyncio.get_running_loop().create_future()
+        self._count += 1
+        heapq.heappush(self._sleepers, (self.now + delay, self._count, wake))
+        await wake
+
+    async def run_until(self, end):
+        while True:
+            for _ in range(10):
+                await asyncio.sleep(0)
+            if self.now >= end:
+                return
+            if not self._sleepers or self._sleepers[0][0] > end:
+                self.now = end
+                return
+            wake_time, _, wake = heapq.heappop(self._sleepers)
+            self.now = max(self.now, wake_time)
+            if not wake.done():
+                wake.set_result(None)
+
+
+class FakeManager:
+    """Stands in for AccelerometerManager, handing out one classified sample per read"""
+    def __init__(self, states, clock, read_time=0.0, blocking_read_time=0.0):
+        self.states = list(states)
+        self.clock = clock
+        self.read_time = read_time
+        self.blocking_read_time = blocking_read_time
+        self.reads = 0
+        self.interface = MagicMock(dropped_samples=0)
+        self.low_power = False
+        self.low_power_available = True
+        self.woken = asyncio.Event()
+
+    async def enter_low_power(self):
+        self.low_power = self.low_power_available
+        return self.low_power
+
+    async def exit_low_power(self):
+        self.low_power = False
+        self.woken.set()
+
+    async def wait_for_wake(self, timeout=None):
+        await self.woken.wait()
+        self.woken.clear()
+        self.low_power = False
+        return True
+
+    async def initialize(self):
+        return True
+
+    def deinitialize(self):
+        pass
+
+    async def read_sensor_batch(self):
+        if self.read_time:
+            await self.clock.sleep(self.read_time)
+        if self.blocking_read_time:
+            # Holds up the event loop
+            self.clock.now += self.blocking_read_time
+        state = self.states[min(self.reads, len(self.states) - 1)]
+        self.reads += 1
+        return [{"current_state": state, "sample": self.reads}]
+
+
+class TestAccelerometerAcquisition(unittest.TestCase):
+    """Sampling should keep its schedule whatever the event handlers do."""
+
+    def setUp(self):
+        self.clock = SimulatedClock()
+
+    def create_service(self, manager, update_interval=0.01, publish_interval=0.05, handler_time=0.0):
+        published = []
+
+        async def publish(event):
+            published.append(event["data"])
+            if handler_time:
+                await self.clock.sleep(handler_time)
+
+        service_manager = MagicMock()
+        service_manager.publish = publish
+        with patch('services.accelerometer_service.AccelerometerManager', return_value=manager):
+            service = AccelerometerService(service_manager, update_interval=update_interval,
+                                           publish_interval=publish_interval)
+        service._clock = self.clock.monotonic
+        service._sleep = self.clock.sleep
+        return service, published
+
+    def run_service(self, manager, seconds, **kwargs):
+        service, published = self.create_service(manager, **kwargs)
+
+        async def run():
+            await service.start()
+            await self.clock.run_until(seconds)
+            await service.stop()
+
+        asyncio.run(run())
+        return service, published
+
+    def test_slow_handlers_do_not_delay_sampling(self):
+        manager = FakeManager(["STATIONARY"] * 10 + ["SHAKE"], self.clock)
+        service, published = self.run_service(manager, 0.5, handler_time=0.1)
+        # A tick every 10ms, not one per 100ms handler as a read-publish-sleep loop would manage
+        self.assertAlmostEqual(manager.reads, 51, delta=1)
+        self.assertEqual(service.stats.samples, manager.reads)
+        self.assertEqual(service.stats.missed_deadlines, 0)
+        # Both states made it out, in order, and stale periodic updates were dropped
+        names = [data["current_state"] for data in published]
+        self.assertEqual(names[0], "STATIONARY")
+        self.assertEqual(names[names.index("SHAKE"):], ["SHAKE"] * (len(names) - names.index("SHAKE")))
+        self.assertGreater(service.stats.coalesced, 0)
+        self.assertLess(len(published), 10)
+
+    def test_publishes_every_state_change_and_decimates_the_rest(self):
+        states = ["UNKNOWN", "STATIONARY", "STATIONARY", "HELD_STILL", "MOVING"] + ["SHAKE"] * 100
+        service, published = self.run_service(FakeManager(states, self.clock), 0.5, publish_interval=0.1)
+        names = [data["current_state"] for data in published]
+        self.assertEqual(names[:5], ["UNKNOWN", "STATIONARY", "HELD_STILL", "MOVING", "SHAKE"])
+        self.assertEqual(service.stats.state_changes, 5)
+        # Periodic updates at 10 Hz, rather than one per sample
+        self.assertIn(len(names) - 5, (4, 5))
+
+    def test_deadlines_do_not_drift(self):
+        # Reads take 4ms of a 10ms tick: the loop still runs at 100 Hz, not 1 / 14ms
+        manager = FakeManager(["STATIONARY"], self.clock, read_time=0.004)
+        service, _ = self.run_service(manager, 0.5)
+        self.assertAlmostEqual(manager.reads, 50, delta=1)
+        self.assertEqual(service.stats.missed_deadlines, 0)
+        self.assertEqual(service.stats.max_lateness_seconds, 0.0)
+
+    def test_counts_missed_deadlines(self):
+        # Reads block for 15ms of a 10ms tick: every deadline is missed by 5ms, and the
+        # schedule restarts from the overrun rather than trying to catch up
+        manager = FakeManager(["STATIONARY"], self.clock, blocking_read_time=0.015)
+        service, _ = self.run_service(manager, 0.3)
+        self.assertGreater(service.stats.ticks, 0)
+        self.assertEqual(service.stats.missed_deadlines, service.stats.ticks)
+        self.assertAlmostEqual(service.stats.max_lateness_seconds, 0.005)
+
+    def test_low_power_while_stationary(self):
+        async def run():
+            manager = FakeManager(["STATIONARY"], self.clock)
+            service, _ = self.create_service(manager)
+            with patch.object(AccelerometerConfig, 'LOW_POWER_IDLE_TIMEOUT', 0.1):
+                await service.start()
+                await self.clock.run_until(0.3)
+                # Asleep after 0.1s of STATIONARY, and no more reads while the sensor is
+                self.assertTrue(manager.low_power)
+                reads = manager.reads
+                self.assertAlmostEqual(reads, 11, delta=1)
+                await self.clock.run_until(0.5)
+                self.assertEqual(manager.reads, reads)
+
+                # Motion: ticking again straight away
+                manager.woken.set()
+                await self.clock.run_until(0.55)
+                self.assertFalse(manager.low_power)
+                self.assertAlmostEqual(manager.reads - reads, 6, delta=1)
+                await service.stop()
+            self.assertEqual(service.stats.low_power_periods, 1)
+            self.assertAlmostEqual(service.stats.low_power_seconds, 0.4, delta=0.02)
+
+        asyncio.run(run())
+
+    def test_low_power_unavailable(self):
+        manager = FakeManager(["STATIONARY"], self.clock)
+        manager.low_power_available = False
+        with patch.object(AccelerometerConfig, 'LOW_POWER_IDLE_TIMEOUT', 0.05):
+            service, _ = self.run_service(manager, 0.3)
+        self.assertAlmostEqual(manager.reads, 31, delta=1)
+        self.assertEqual(service.stats.low_power_periods, 0)
+
+
 def run_tests():
     """Run the tests asynchronously."""
     async def run_async_tests():
@@ -0,0 +1,124 @@
+"""
+Unit tests for baked LED animations.
+
+These tests check that every periodic effect really repeats with its declared period, so
+playback from a baked table matches the live effect frame for frame, and exercise the
+AnimationCache's LRU bound and on-disk persistence.
+"""
+
+import asyncio
+import itertools
+import tempfile
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Use the mock strip even where the NeoPixel libraries are installed
+sys.modules['board'] = None
+sys.modules['neopixel'] = None
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from utils.animation_cache import AnimationCache, bake, play
+from managers.led_manager import LEDManager, LEDManagerRings
+
+
+def counter(n=4, frames=None):
+    """An effect whose frame i is filled with i % 256"""
+    for i in itertools.count() if frames is None else range(frames):
+        yield np.full((n, 3), i % 256, dtype=np.uint8), 0.01
+
+
+class TestBakedEffects(unittest.TestCase):
+    """Baked playback should be indistinguishable from rendering the effect live."""
+
+    @classmethod
+    def setUpClass(cls):
+        asyncio.set_event_loop(asyncio.new_event_loop())
+
+    def check_effects(self, manager):
+        periodic = {name: info for name, info in manager._EFFECT_MAP.items() if 'period' in info}
+        self.assertIn("RAINBOW", periodic)
+        for effect, effect_info in periodic.items():
+            with self.subTest(manager=type(manager).__name__, effect=effect):
+                method = getattr(manager, effect_info['method'])
+                period = effect_info['period']
+                live = method(0.05)
+                baked = manager._baked_effect(effect, method, (0.05,), period)
+                for (live_frame, _), (baked_frame, hold) in itertools.islice(zip(live, baked), 2 * period + 1):
+                    np.testing.assert_array_equal(baked_frame, live_frame)
+                    self.assertEqual(hold, 0.05)
+                live.close()
+                baked.close()
+        manager.close()
+
+    def test_strip_effects(self):
+        self.check_effects(LEDManager())
+
+    def test_ring_effects(self):
+        self.check_effects(LEDManagerRings())
+
+    def test_speed_shares_one_table(self):
+        manager = LEDManager()
+        cache = manager._animation_cache
+        method = manager._rainbow_effect
+        for speed in (0.01, 0.02, 0.05):
+            next(manager._baked_effect("RAINBOW", method, (speed,), 255))
+        self.assertEqual((cache.misses, cache.hits, len(cache)), (1, 2, 1))
+        manager.close()
+
+    def test_finite_effect_is_rendered_live(self):
+        manager = LEDManager()
+        frames = list(manager._baked_effect("COUNTER", lambda wait: counter(frames=3), (0.01,), 10))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(len(manager._animation_cache), 0)
+        manager.close()
+
+
+class TestAnimationCache(unittest.TestCase):
+    """Test cases for the AnimationCache class."""
+
+    def test_bake_and_play(self):
+        table = bake(counter(), 5)
+        self.assertEqual(table.shape, (5, 4, 3))
+        self.assertFalse(table.flags.writeable)
+        played = [frame[0, 0] for frame, _ in itertools.islice(play(table, 0.01), 12)]
+        self.assertEqual(played, [0, 1, 2, 3, 4] * 2 + [0, 1])
+
+    def test_bake_rejects_short_effect(self):
+        with self.assertRaises(ValueError):
+            bake(counter(frames=3), 5)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = AnimationCache(max_tables=2)
+        cache.get("a", counter, 5)
+        cache.get("b", counter, 5)
+        cache.get("a", counter, 5)
+        cache.get("c", counter, 5)
+        self.assertEqual(list(cache._tables), ["a", "c"])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_persists_to_disk(self):
+        renders = 0
+
+        def render():
+            nonlocal renders
+            renders += 1
+            return counter()
+
+        with tempfile.TemporaryDirectory() as directory:
+            first = AnimationCache(4, directory, version="1").get("rainbow", render, 6)
+            second = AnimationCache(4, directory, version="1").get("rainbow", render, 6)
+            np.testing.assert_array_equal(first, second)
+            self.assertEqual(renders, 1)
+            # Tables baked by other code versions are ignored
+            AnimationCache(4, directory, version="2").get("rainbow", render, 6)
+            self.assertEqual(renders, 2)
+            self.assertFalse([name for name in os.listdir(directory) if name.endswith(".tmp")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Unit tests for the ring-buffer backed AudioBuffer and AudioConsumer.
+
+These tests verify arbitrary-length writes and reads, tail padding, O(1) clearing, the
+thread-to-event-loop handoff, blocking puts when the buffer is full, and per-consumer input
+reframing.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+# Mock hardware/audio modules before imports
+sys.modules['pyaudio'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from utils.ring_buffer import AsyncRingBuffer, RingBuffer
+from managers.audio_manager import AudioBuffer, AudioConsumer
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Test cases for the RingBuffer class."""
+
+    def test_wraparound_preserves_order(self):
+        ring = RingBuffer(10, dtype=np.int16)
+        ring.write(np.arange(8, dtype=np.int16))
+        np.testing.assert_array_equal(ring.read(6), np.arange(6))
+        # This write wraps around the end of the backing array
+        self.assertEqual(ring.write(np.arange(8, 16, dtype=np.int16)), 8)
+        np.testing.assert_array_equal(ring.read(10), np.arange(6, 16))
+
+    def test_write_is_partial_when_full(self):
+        ring = RingBuffer(4, dtype=np.int16)
+        self.assertEqual(ring.write(np.arange(6, dtype=np.int16)), 4)
+        self.assertEqual(ring.free, 0)
+        self.assertIsNone(ring.read(5))
+
+    def test_clear_discards_and_frees_space(self):
+        ring = RingBuffer(4, dtype=np.int16)
+        ring.write(np.arange(4, dtype=np.int16))
+        ring.clear()
+        self.assertEqual(ring.available, 0)
+        # Space is handed back once the consumer next touches the buffer
+        self.assertIsNone(ring.read(1))
+        self.assertEqual(ring.free, 4)
+        ring.write(np.array([7], dtype=np.int16))
+        np.testing.assert_array_equal(ring.read(1), [7])
+
+    def test_async_handoff_wakes_consumer(self):
+        async def run():
+            ring = AsyncRingBuffer(16, dtype=np.int16)
+            self.assertFalse(await ring.wait(timeout=0))
+            ring.bind()
+            self.assertFalse(await ring.wait(timeout=0.01))
+
+            def produce():
+                for start in range(0, 12, 4):
+                    time.sleep(0.01)
+                    ring.publish(np.arange(start, start + 4, dtype=np.int16))
+
+            thread = threading.Thread(target=produce)
+            thread.start()
+            received = []
+            while len(received) < 12:
+                self.assertTrue(await ring.wait(timeout=1.0))
+                received.extend(ring.take(max_count=6).tolist())
+            thread.join()
+            self.assertEqual(received, list(range(12)))
+            self.assertEqual(len(ring.take()), 0)
+
+        asyncio.run(run())
+
+
+class TestAudioBuffer(unittest.TestCase):
+    """Test cases for the AudioBuffer class."""
+
+    def test_arbitrary_length_put_reads_back_in_chunks(self):
+        buffer = AudioBuffer(maxsize=4, chunk_size=8)
+        buffer.put(np.arange(5, dtype=np.int16))
+        self.assertIsNone(buffer.get())
+        buffer.put(np.arange(5, 13, dtype=np.int16))
+        np.testing.assert_array_equal(buffer.get(), np.arange(8))
+        # The tail is only returned when padding is requested
+        self.assertIsNone(buffer.get())
+        tail = buffer.get(pad=True)
+        np.testing.assert_array_equal(tail, [8, 9, 10, 11, 12, 0, 0, 0])
+        self.assertTrue(buffer.empty())
+
+    def test_get_into_preallocated_output(self):
+        buffer = AudioBuffer(maxsize=2, chunk_size=4)
+        out = np.full(4, -1, dtype=np.int16)
+        buffer.put(np.array([1, 2], dtype=np.int16))
+        data = buffer.get(out=out, pad=True)
+        self.assertTrue(np.shares_memory(data, out))
+        np.testing.assert_array_equal(out, [1, 2, 0, 0])
+
+    def test_put_blocks_until_consumer_reads(self):
+        buffer = AudioBuffer(maxsize=2, chunk_size=4)
+        done = threading.Event()
+
+        def producer():
+            buffer.put(np.arange(12, dtype=np.int16))
+            done.set()
+
+        thread = threading.Thread(target=producer, daemon=True)
+        thread.start()
+        time.sleep(0.05)
+        self.assertFalse(done.is_set(), "put() should block while the buffer is full")
+
+        received = []
+        deadline = time.monotonic() + 2.0
+        while len(received) < 3 and time.monotonic() < deadline:
+            chunk = buffer.get()
+            if chunk is not None:
+                received.append(chunk.copy())
+            else:
+                time.sleep(0.001)
+        self.assertTrue(done.wait(1.0))
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(12))
+
+    def test_put_times_out_when_nobody_reads(self):
+        buffer = AudioBuffer(maxsize=1, chunk_size=4)
+        self.assertFalse(buffer.put(np.arange(8, dtype=np.int16), timeout=0.05))
+
+    def test_clear_unblocks_waiting_writer(self):
+        buffer = AudioBuffer(maxsize=1, chunk_size=4)
+        buffer.put(np.arange(4, dtype=np.int16))
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (buffer.put(np.arange(4, dtype=np.int16)), done.set()), daemon=True)
+        thread.start()
+        time.sleep(0.02)
+        buffer.clear()
+        # The consumer applies the clear on its next access
+        self.assertIsNone(buffer.get())
+        self.assertTrue(done.wait(1.0))
+        np.testing.assert_array_equal(buffer.get(), np.arange(4))
+
+    def test_on_put_hook_called(self):
+        buffer = AudioBuffer(maxsize=2, chunk_size=4)
+        buffer.on_put = MagicMock()
+        buffer.put(np.arange(3, dtype=np.int16))
+        buffer.on_put.assert_called()
+
+
+class TestAudioConsumer(unittest.TestCase):
+    """Test cases for the AudioConsumer input fan-out."""
+
+    def test_consumers_reframe_independently(self):
+        received = {512: [], 480: []}
+        consumers = [
+            AudioConsumer(lambda frame, size=size: received[size].append(frame.copy()), chunk_size=size, input_chunk_size=640)
+            for size in received
+        ]
+        audio = np.arange(640 * 6, dtype=np.int16)
+        for start in range(0, len(audio), 640):
+            for consumer in consumers:
+                consumer.feed(audio[start:start + 640])
+
+        for size, frames in received.items():
+            self.assertEqual(len(frames), len(audio) // size)
+            self.assertTrue(all(len(frame) == size for frame in frames))
+            np.testing.assert_array_equal(np.concatenate(frames), audio[:len(frames) * size])
+
+    def test_native_chunk_size_is_passed_through(self):
+        callback = MagicMock()
+        consumer = AudioConsumer(callback, chunk_size=640, input_chunk_size=640)
+        chunk = np.zeros(640, dtype=np.int16)
+        consumer.feed(chunk)
+        self.assertIs(callback.call_args[0][0], chunk)
+
+    def test_threaded_consumer_does_not_block_capture(self):
+        release = threading.Event()
+        received = []
+
+        def slow_callback(frame):
+            release.wait(2.0)
+            received.append(frame.copy())
+
+        consumer = AudioConsumer(slow_callback, chunk_size=512, threaded=True, input_chunk_size=640)
+        try:
+            audio = np.arange(640 * 10, dtype=np.int16)
+            start = time.monotonic()
+            for offset in range(0, len(audio), 640):
+                consumer.feed(audio[offset:offset + 640])
+            self.assertLess(time.monotonic() - start, 0.1, "feed() waited for a stalled callback")
+
+            release.set()
+            deadline = time.monotonic() + 2.0
+            while len(received) < len(audio) // 512 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            np.testing.assert_array_equal(np.concatenate(received), audio[:len(received) * 512])
+            self.assertEqual(len(received), len(audio) // 512)
+        finally:
+            consumer.stop()
+
+    def test_callback_errors_are_contained(self):
+        consumer = AudioConsumer(MagicMock(side_effect=RuntimeError("boom")), chunk_size=320, input_chunk_size=640)
+        consumer.feed(np.zeros(640, dtype=np.int16))
+        self.assertTrue(consumer.active)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+Unit tests for AudioManager's PortAudio callback backend.
+
+These tests drive the output callback through a fake stream and verify that each call mixes
+exactly one chunk into `bytes` without taking the producers lock, that the stream completes after
+DISABLE_DELAY of silence, that the output control thread gates the amplifier and restarts the
+stream on the next put, and that finished producers are removed and their on_finish callbacks run
+on the control thread rather than the callback thread.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Mock hardware/audio modules before imports
+sys.modules['pyaudio'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import AudioAmplifierConfig
+from managers import audio_manager
+from managers.audio_manager import AudioManager, AudioConfig
+
+
+def wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+class FakeStream:
+    """Stands in for a callback-mode pyaudio.Stream, opened stopped"""
+
+    def __init__(self, callback, frames_per_buffer):
+        self.callback = callback
+        self.frames_per_buffer = frames_per_buffer
+        self.active = False
+        self.starts = 0
+
+    def pull(self):
+        """Ask the callback for one buffer, checking its result the way PyAudio's "z#i" parse does"""
+        out, flag = self.callback(None, self.frames_per_buffer, {}, 0)
+        if type(out) is not bytes:
+            raise TypeError(f"callback must return bytes, not {type(out).__name__}")
+        return out, flag
+
+    def is_active(self):
+        return self.active
+
+    def start_stream(self):
+        self.active = True
+        self.starts += 1
+
+    def stop_stream(self):
+        self.active = False
+
+
+class FakeAmplifier:
+    """Records which thread enabled and disabled it"""
+
+    def __init__(self):
+        self.enabled = False
+        self.calls = []
+
+    def enable(self):
+        self.enabled = True
+        self.calls.append(("enable", threading.current_thread()))
+
+    def disable(self):
+        self.enabled = False
+        self.calls.append(("disable", threading.current_thread()))
+
+
+class TestAudioCallbackBackend(unittest.TestCase):
+    """Test cases for the callback-driven output path."""
+
+    def setUp(self):
+        self.config = AudioConfig(use_callback_streams=True, preload_sound_effects=False)
+        self.manager = AudioManager(self.config)
+        self.stream = FakeStream(self.manager._output_callback, self.config.chunk)
+        self.amplifier = FakeAmplifier()
+        self.manager._output_stream = self.stream
+        self.manager.set_amplifier(self.amplifier)
+        self.manager._running = True
+        self.control_thread = threading.Thread(target=self.manager._output_control_loop,
+                                               name="AudioOutputControlThread", daemon=True)
+        self.control_thread.start()
+
+    def tearDown(self):
+        self.manager._running = False
+        self.manager._output_control_queue.put(("stop", None))
+        self.control_thread.join(timeout=1.0)
+
+    def callback(self):
+        return self.stream.pull()
+
+    def test_callback_mixes_one_chunk_per_call(self):
+        chunk = self.config.chunk
+        producer = self.manager.add_producer("test", chunk_size=chunk)
+        producer.buffer.put(np.full(chunk * 3, 1000, dtype=np.int16))
+        self.assertTrue(wait_for(lambda: self.stream.active))
+
+        for remaining in (2, 1, 0):
+            data, flag = self.callback()
+            self.assertEqual(flag, audio_manager.pyaudio.paContinue)
+            self.assertEqual(len(data), chunk * np.dtype(np.int16).itemsize)
+            self.assertTrue(np.all(np.frombuffer(data, dtype=np.int16) > 0))
+            self.assertEqual(producer.buffer.available, remaining * chunk)
+
+    def test_stream_completes_after_disable_delay_and_restarts_on_put(self):
+        chunk = self.config.chunk
+        finished_threads = []
+        producer = self.manager.add_producer("first", chunk_size=chunk)
+        producer.on_finish = lambda name: finished_threads.append(threading.current_thread())
+        producer.buffer.put(np.full(chunk, 1000, dtype=np.int16))
+
+        # The first put wakes the stopped stream and powers up the amp
+        self.assertTrue(wait_for(lambda: self.stream.active))
+        self.assertTrue(self.amplifier.enabled)
+        self.assertEqual(self.callback()[1], audio_manager.pyaudio.paContinue)
+
+        # Keep playing silence until the callback completes the stream
+        silent_calls = 0
+        while True:
+            data, flag = self.callback()
+            silent_calls += 1
+            self.assertFalse(np.any(np.frombuffer(data, dtype=np.int16)))
+            if flag == audio_manager.pyaudio.paComplete:
+                break
+            self.assertEqual(flag, audio_manager.pyaudio.paContinue)
+            self.assertLess(silent_calls, 1000)
+        silence = silent_calls * chunk / self.config.rate
+        self.assertGreaterEqual(silence, AudioAmplifierConfig.DISABLE_DELAY)
+        self.assertLess(silence - chunk / self.config.rate, AudioAmplifierConfig.DISABLE_DELAY)
+
+        # The control thread stops the stream and powers down the amp
+        self.assertTrue(wait_for(lambda: not self.amplifier.enabled))
+        self.assertFalse(self.stream.active)
+        self.assertEqual(self.amplifier.calls[-1], ("disable", self.control_thread))
+
+        # The producer was removed and on_finish ran on the control thread, not the callback thread
+        self.assertTrue(wait_for(lambda: finished_threads))
+        self.assertEqual(finished_threads, [self.control_thread])
+        self.assertNotIn("first", self.manager._producers)
+        self.assertEqual(self.manager._mix_producers, ())
+
+        # The next put restarts the stream and re-enables the amp
+        second = self.manager.add_producer("second", chunk_size=chunk)
+        second.buffer.put(np.full(chunk, 1000, dtype=np.int16))
+        self.assertTrue(wait_for(lambda: self.stream.active))
+        self.assertTrue(self.amplifier.enabled)
+        self.assertEqual(self.stream.starts, 2)
+        self.assertEqual(self.amplifier.calls[-1], ("enable", self.control_thread))
+        self.assertEqual(self.callback()[1], audio_manager.pyaudio.paContinue)
+
+    def test_callback_does_not_take_the_producers_lock(self):
+        chunk = self.config.chunk
+        producer = self.manager.add_producer("test", chunk_size=chunk)
+        producer.buffer.put(np.full(chunk, 1000, dtype=np.int16))
+        results = []
+        with self.manager._producers_lock:
+            callback_thread = threading.Thread(target=lambda: results.extend([self.callback(), self.callback()]))
+            callback_thread.start()
+            callback_thread.join(timeout=1.0)
+            self.assertFalse(callback_thread.is_alive())
+            # The finished producer is only retired; removal waits for the control thread
+            self.assertTrue(producer.retired)
+            self.assertIn("test", self.manager._producers)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(wait_for(lambda: "test" not in self.manager._producers))
+
+    def test_sound_restarted_as_it_finishes_keeps_playing(self):
+        chunk = self.config.chunk
+        producer = self.manager.add_producer("test", chunk_size=chunk)
+        with self.manager._producers_lock:
+            producer.buffer.put(np.full(chunk, 1000, dtype=np.int16))
+            self.callback()
+            self.callback()
+            self.assertTrue(producer.retired)
+            # New audio arrives on the same producer before the control thread removes it
+            producer.buffer.put(np.full(chunk, 1000, dtype=np.int16))
+        self.assertTrue(wait_for(lambda: not producer.retired))
+        self.assertIs(self.manager._producers["test"], producer)
+        data, flag = self.callback()
+        self.assertTrue(np.all(np.frombuffer(data, dtype=np.int16) > 0))
+
+    def test_played_out_source_is_removed(self):
+        chunk = self.config.chunk
+        finished = []
+        producer = self.manager.add_producer("effect", chunk_size=chunk)
+        producer.on_finish = finished.append
+        producer.play_source(np.full(chunk + chunk // 2, 1000, dtype=np.int16))
+        self.callback()
+        self.callback()
+        self.assertFalse(producer.retired)
+        self.callback()
+        self.assertTrue(producer.retired)
+        self.assertTrue(wait_for(lambda: finished == ["effect"]))
+        self.assertNotIn("effect", self.manager._producers)
+
+
+if __name__ == '__main__':
+    unittest.main()
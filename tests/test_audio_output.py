@@ -0,0 +1,94 @@
+"""
+Unit tests for AudioManager's blocking output loop.
+
+The fake stream parses its frames the way PyAudio's write_stream does and rejects anything but
+`bytes`, so these tests fail if the output loop hands PyAudio a memoryview or an array.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Mock hardware/audio modules before imports
+sys.modules['pyaudio'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from managers.audio_manager import AudioManager, AudioConfig
+from utils.audio_processing import AudioMixer
+
+
+class StrictWriteStream:
+    """Blocking-mode stream that, like PyAudio, only accepts `bytes` frames"""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frames):
+        if type(frames) is not bytes:
+            raise TypeError(f"argument 1 must be read-only bytes-like object, not {type(frames).__name__}")
+        self.frames.append(frames)
+
+
+class TestAudioMixerOutput(unittest.TestCase):
+    """Test cases for the mixer's PyAudio-facing output."""
+
+    def test_output_bytes_is_bytes(self):
+        mixer = AudioMixer(chunk_size=8)
+        for num_sources in (0, 1):
+            mixer.begin()
+            for _ in range(num_sources):
+                mixer.add(np.full(8, 1000, dtype=np.int16))
+            output = mixer.finish()
+            self.assertIs(type(mixer.output_bytes), bytes)
+            self.assertEqual(mixer.output_bytes, output.tobytes())
+
+    def test_output_bytes_survive_the_next_mix(self):
+        mixer = AudioMixer(chunk_size=8)
+        mixer.begin()
+        mixer.add(np.full(8, 1000, dtype=np.int16))
+        mixer.finish()
+        first = mixer.output_bytes
+        mixer.begin()
+        mixer.finish()
+        self.assertEqual(np.frombuffer(first, dtype=np.int16)[0], 800)
+
+
+class TestBlockingOutputLoop(unittest.TestCase):
+    """Test cases for the default, blocking output path."""
+
+    def setUp(self):
+        self.config = AudioConfig(use_callback_streams=False, preload_sound_effects=False)
+        self.manager = AudioManager(self.config)
+        self.stream = StrictWriteStream()
+        self.manager._output_stream = self.stream
+        self.manager._running = True
+        self.output_thread = threading.Thread(target=self.manager._output_loop, daemon=True)
+
+    def tearDown(self):
+        self.manager._running = False
+        self.output_thread.join(timeout=1.0)
+
+    def test_mixed_chunks_reach_the_stream(self):
+        chunk = self.config.chunk
+        producer = self.manager.add_producer("test", chunk_size=chunk)
+        producer.buffer.put(np.full(chunk * 2, 1000, dtype=np.int16))
+        self.output_thread.start()
+
+        deadline = time.monotonic() + 1.0
+        while len(self.stream.frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(len(self.stream.frames), 2)
+        for frames in self.stream.frames:
+            self.assertEqual(len(frames), chunk * np.dtype(np.int16).itemsize)
+            self.assertTrue(np.all(np.frombuffer(frames, dtype=np.int16) > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Unit tests for the streaming pitch shift used by VoiceManager.
+
+These tests run offline: a fake async generator stands in for the ElevenLabs stream,
+splitting PCM into irregular network-sized chunks (including odd byte boundaries).
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import AudioBaseConfig
+from utils.audio_processing import StreamingPitchShifter, pitch_shift_stream
+
+SAMPLE_RATE = AudioBaseConfig.SAMPLE_RATE
+
+
+def sine(frequency, seconds=1.0, amplitude=10000):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * frequency * t) * amplitude).astype(np.int16)
+
+
+def dominant_frequency(samples):
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * SAMPLE_RATE / len(samples)
+
+
+async def fake_stream(pcm_bytes, chunk_sizes=(1001, 4096, 333, 2048), delay=0.0):
+    """Yield PCM bytes in irregular chunks, like a network stream"""
+    offset = 0
+    i = 0
+    while offset < len(pcm_bytes):
+        size = chunk_sizes[i % len(chunk_sizes)]
+        yield pcm_bytes[offset:offset + size]
+        offset += size
+        i += 1
+        await asyncio.sleep(delay)
+
+
+class TestStreamingPitchShifter(unittest.TestCase):
+    """Test cases for the StreamingPitchShifter class."""
+
+    def test_shifts_pitch_by_semitones(self):
+        shifter = StreamingPitchShifter.from_semitones(4)
+        source = sine(440)
+        shifted = np.concatenate([shifter.process_chunk(source), shifter.flush()])
+        expected = 440 * 2 ** (4 / 12)
+        self.assertAlmostEqual(dominant_frequency(shifted[2048:-2048]), expected, delta=5)
+
+    def test_output_length_matches_input(self):
+        shifter = StreamingPitchShifter.from_semitones(-3)
+        source = sine(300, seconds=0.77)
+        shifted = np.concatenate([shifter.process_chunk(source[i:i + 700]) for i in range(0, len(source), 700)]
+                                 + [shifter.flush()])
+        self.assertEqual(len(shifted), len(source))
+
+    def test_result_does_not_depend_on_chunking(self):
+        source = sine(500)
+        results = []
+        for chunk in (64, 640, len(source)):
+            shifter = StreamingPitchShifter.from_semitones(4)
+            parts = [shifter.process_chunk(source[i:i + chunk]) for i in range(0, len(source), chunk)]
+            results.append(np.concatenate(parts + [shifter.flush()]))
+        for result in results[1:]:
+            np.testing.assert_array_equal(result, results[0])
+
+    def test_unity_factor_reconstructs_input(self):
+        shifter = StreamingPitchShifter(1.0)
+        source = sine(440)
+        shifted = np.concatenate([shifter.process_chunk(source), shifter.flush()])
+        np.testing.assert_allclose(shifted[1024:-1024], source[1024:-1024], atol=2)
+
+    def test_first_output_after_one_frame(self):
+        shifter = StreamingPitchShifter.from_semitones(4)
+        source = sine(440)
+        self.assertEqual(len(shifter.process_chunk(source[:shifter.latency - 1])), 0)
+        self.assertGreater(len(shifter.process_chunk(source[shifter.latency - 1:shifter.latency])), 0)
+
+
+class TestPitchShiftStream(unittest.IsolatedAsyncioTestCase):
+    """Test cases for pitch_shift_stream over a fake network stream."""
+
+    async def test_stream_matches_offline_shift(self):
+        source = sine(440, seconds=2.0)
+        streamed = b"".join([chunk async for chunk in pitch_shift_stream(fake_stream(source.tobytes()), 4)])
+
+        shifter = StreamingPitchShifter.from_semitones(4)
+        offline = np.concatenate([shifter.process_chunk(source), shifter.flush()])
+        np.testing.assert_array_equal(np.frombuffer(streamed, dtype=np.int16), offline)
+
+    async def test_first_audio_arrives_before_stream_ends(self):
+        source = sine(440, seconds=2.0)
+        network_chunks = 0
+
+        async def counting_stream():
+            nonlocal network_chunks
+            async for chunk in fake_stream(source.tobytes(), chunk_sizes=(4096,)):
+                network_chunks += 1
+                yield chunk
+
+        stream = pitch_shift_stream(counting_stream(), 4)
+        first = await stream.__anext__()
+        self.assertGreater(len(first), 0)
+        # 4096 bytes is 2048 samples, already more than one 1024-sample STFT frame
+        self.assertEqual(network_chunks, 1)
+        await stream.aclose()
+
+
+if __name__ == '__main__':
+    unittest.main()
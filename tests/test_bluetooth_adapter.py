@@ -0,0 +1,200 @@
+"""
+Unit tests for the Bluetooth adapter health monitor.
+
+A fake adapter backend stands in for BlueZ. These tests check that the monitor caches the
+adapter's state instead of querying it per scan, that it powers a down adapter back on, and
+that scanning pauses while the adapter is down and resumes once it's back. A fake D-Bus checks
+that the BlueZ backend keeps a single PropertiesChanged handler across adapter lookups.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import sys
+import os
+
+# Mock bleak before imports
+if sys.modules.get('bleak') is None:
+    sys.modules['bleak'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from hardware import bluetooth_adapter
+from hardware.bluetooth_adapter import AdapterBackend, BlueZDBusBackend, BluetoothAdapterMonitor
+from managers import location_manager
+from managers.location_manager import LocationManager
+
+
+class FakeAdapterBackend(AdapterBackend):
+    """An adapter whose power can be flipped by the test, notifying like BlueZ does"""
+    def __init__(self, powered=True, can_power_on=True):
+        self.powered = powered
+        self.can_power_on = can_power_on
+        self.reads = 0
+        self.power_ons = 0
+        self.closed = False
+        self._on_change = None
+
+    async def start(self, on_change):
+        self._on_change = on_change
+
+    async def is_powered(self):
+        self.reads += 1
+        return self.powered
+
+    async def power_on(self):
+        self.power_ons += 1
+        if self.can_power_on:
+            self.set_powered(True)
+
+    async def close(self):
+        self.closed = True
+
+    def set_powered(self, powered):
+        self.powered = powered
+        if self._on_change:
+            self._on_change(powered)
+
+
+class TestBluetoothAdapterMonitor(unittest.TestCase):
+    """Test cases for the BluetoothAdapterMonitor class."""
+
+    def test_without_backend_is_always_ready(self):
+        async def run():
+            monitor = BluetoothAdapterMonitor(None)
+            await monitor.start()
+            self.assertTrue(monitor.is_ready)
+            self.assertTrue(await monitor.wait_ready(0))
+            await monitor.stop()
+        asyncio.run(run())
+
+    def test_state_is_cached(self):
+        async def run():
+            backend = FakeAdapterBackend()
+            monitor = BluetoothAdapterMonitor(backend, poll_interval=60)
+            await monitor.start()
+            self.assertTrue(await monitor.wait_ready(1))
+            for _ in range(100):
+                self.assertTrue(monitor.is_ready)
+            self.assertEqual(backend.reads, 1)
+            await monitor.stop()
+            self.assertTrue(backend.closed)
+        asyncio.run(run())
+
+    def test_powers_on_when_adapter_goes_down(self):
+        async def run():
+            backend = FakeAdapterBackend()
+            monitor = BluetoothAdapterMonitor(backend, poll_interval=60)
+            await monitor.start()
+            await monitor.wait_ready(1)
+            backend.set_powered(False)
+            self.assertFalse(monitor.is_ready)
+            # The notification wakes the monitor well before its next poll
+            self.assertTrue(await monitor.wait_ready(1))
+            self.assertEqual(backend.power_ons, 1)
+            await monitor.stop()
+        asyncio.run(run())
+
+    def test_keeps_retrying_power_on(self):
+        async def run():
+            backend = FakeAdapterBackend(powered=False, can_power_on=False)
+            monitor = BluetoothAdapterMonitor(backend, poll_interval=0.01)
+            await monitor.start()
+            self.assertFalse(await monitor.wait_ready(0.1))
+            self.assertGreater(backend.power_ons, 2)
+            backend.can_power_on = True
+            self.assertTrue(await monitor.wait_ready(1))
+            await monitor.stop()
+        asyncio.run(run())
+
+
+class TestBlueZDBusBackend(unittest.TestCase):
+    """Test cases for the D-Bus backend, with a fake bus."""
+
+    def test_backend_interface_is_enforced(self):
+        class Incomplete(AdapterBackend):
+            async def is_powered(self):
+                return True
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_relookup_keeps_one_change_handler(self):
+        handlers = []
+        properties = MagicMock()
+        properties.on_properties_changed.side_effect = handlers.append
+        properties.off_properties_changed.side_effect = handlers.remove
+        adapter = MagicMock()
+        adapter.get_powered = AsyncMock(side_effect=[OSError("adapter gone"), True, True])
+        proxy = MagicMock()
+        proxy.get_interface.side_effect = lambda name: (
+            properties if name == "org.freedesktop.DBus.Properties" else adapter)
+        bus = MagicMock(introspect=AsyncMock())
+        bus.get_proxy_object.return_value = proxy
+        message_bus = MagicMock()
+        message_bus.return_value.connect = AsyncMock(return_value=bus)
+
+        async def run():
+            changes = []
+            backend = BlueZDBusBackend("hci0")
+            await backend.start(changes.append)
+            with patch.object(bluetooth_adapter, "MessageBus", message_bus), \
+                    patch.object(bluetooth_adapter, "BusType", MagicMock(), create=True):
+                with self.assertRaises(OSError):
+                    await backend.is_powered()
+                self.assertEqual(handlers, [])
+                self.assertTrue(await backend.is_powered())
+                self.assertTrue(await backend.is_powered())
+            self.assertEqual(len(handlers), 1)
+            self.assertEqual(bus.introspect.await_count, 2)
+
+            # A change is reported once, not once per lookup
+            handlers[0]("org.bluez.Adapter1", {"Powered": SimpleNamespace(value=False)}, [])
+            self.assertEqual(changes, [False])
+
+            await backend.close()
+            self.assertEqual(handlers, [])
+            bus.disconnect.assert_called_once()
+
+        asyncio.run(run())
+
+
+class TestLocationManagerAdapter(unittest.TestCase):
+    """Scanning should follow the adapter's state without touching it."""
+
+    def test_streaming_scan_pauses_while_adapter_is_down(self):
+        async def run():
+            manager = LocationManager()
+            backend = FakeAdapterBackend(powered=False, can_power_on=False)
+            manager._adapter = BluetoothAdapterMonitor(backend, poll_interval=60)
+            scanners = []
+
+            def make_scanner(**kwargs):
+                scanners.append(SimpleNamespace(start=AsyncMock(), stop=AsyncMock()))
+                return scanners[-1]
+
+            with patch.object(location_manager, "BleakScanner", side_effect=make_scanner), \
+                    patch.object(location_manager.BLEConfig, "ADAPTER_READY_TIMEOUT", 0.05):
+                await manager.start()
+                await manager.scan_once()
+                self.assertEqual(scanners, [])
+
+                backend.set_powered(True)
+                await manager.scan_once()
+                self.assertEqual(len(scanners), 1)
+
+                backend.can_power_on = False
+                backend.set_powered(False)
+                reads = backend.reads
+                await manager.scan_once()
+                scanners[0].stop.assert_awaited_once()
+                self.assertIsNone(manager._stream_scanner)
+                self.assertEqual(backend.reads, reads)
+                await manager.stop()
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
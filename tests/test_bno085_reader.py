@@ -0,0 +1,281 @@
+"""
+Unit tests for the batched BNO085 report reader.
+
+A fake sensor hands out SH-2 packets built byte for byte, so these tests check the report
+decoding (scaling, report timestamps, batches mixing report types) and that the reader thread
+delivers every sample to the async side through the ring buffer. In low power mode, a simulated
+INT line wakes the reader, which must be back at full rate well within 100ms of the sensor
+reporting motion.
+"""
+
+import asyncio
+import struct
+import time
+import unittest
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock hardware modules before imports
+sys.modules['board'] = MagicMock()
+sys.modules['busio'] = MagicMock()
+sys.modules['adafruit_bno08x'] = MagicMock()
+sys.modules['adafruit_bno08x.i2c'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from hardware.acc_bno085 import BNO085Interface, SH2ReportDecoder
+from hardware.gpio_interrupt import SimulatedInterrupt
+
+
+def base_timestamp(ticks):
+    return struct.pack("<Bi", 0xFB, ticks)
+
+
+def vector_report(report_id, x, y, z, q_point, delay_ticks=0):
+    """An SH-2 vector report with the values given in SI units"""
+    scale = 2 ** q_point
+    status = (delay_ticks >> 8) << 2
+    return struct.pack("<BBBBhhh", report_id, 0, status, delay_ticks & 0xFF,
+                       round(x * scale), round(y * scale), round(z * scale))
+
+
+def accelerometer(x, y, z, delay_ticks=0):
+    return vector_report(0x01, x, y, z, 8, delay_ticks)
+
+
+def linear_acceleration(x, y, z, delay_ticks=0):
+    return vector_report(0x04, x, y, z, 8, delay_ticks)
+
+
+def gyro(x, y, z, delay_ticks=0):
+    return vector_report(0x02, x, y, z, 9, delay_ticks)
+
+
+def stability(classification, delay_ticks=0):
+    return struct.pack("<BBBBBB", 0x13, 0, (delay_ticks >> 8) << 2, delay_ticks & 0xFF, classification, 0)
+
+
+def shake(axes):
+    return struct.pack("<BBBBH", 0x19, 0, 0, 0, axes)
+
+
+def tap(flags):
+    return struct.pack("<BBBBB", 0x10, 0, 0, 0, flags)
+
+
+def packet(*reports, channel=3):
+    data = bytearray(b"".join(reports))
+    return SimpleNamespace(channel_number=channel, data=data, header=SimpleNamespace(data_length=len(data)))
+
+
+class FakeIMU:
+    """Stands in for BNO08X_I2C, handing out queued packets"""
+    def __init__(self):
+        self.packets = deque()
+        self.handled = []
+        self.features = {}  # Report ID: interval (us) last set
+        self.ready_checks = 0
+        self.interrupt = None
+
+    @property
+    def _data_ready(self):
+        self.ready_checks += 1
+        return bool(self.packets)
+
+    def _send_packet(self, channel, data):
+        report_id, interval = data[1], struct.unpack_from("<i", data, 5)[0]
+        self.features[report_id] = interval
+        if report_id == 0x01 and interval:
+            # The sensor starts reporting straight away
+            self.packets.append(packet(base_timestamp(0), accelerometer(0, 0, 9.8)))
+
+    def _read_packet(self):
+        return self.packets.popleft()
+
+    def _handle_packet(self, packet):
+        self.handled.append(packet)
+
+
+class TestSH2ReportDecoder(unittest.TestCase):
+    """Test cases for the SH2ReportDecoder class."""
+
+    def test_decodes_and_timestamps_a_batch(self):
+        decoder = SH2ReportDecoder(8)
+        # Base timestamp 5ms before the read, accelerometer reading 2ms after the base
+        p = packet(base_timestamp(50), accelerometer(0.5, -1.0, 9.75, delay_ticks=20),
+                   linear_acceleration(0.5, -1.0, 0.0), gyro(0.25, 0.0, -0.125))
+        self.assertTrue(decoder.decode(p.data, p.header.data_length, 100.0))
+        self.assertEqual(decoder.count, 1)
+        record = decoder.records[0]
+        self.assertAlmostEqual(record["timestamp"], 100.0 - 0.005 + 0.002)
+        self.assertEqual(record["acceleration"].tolist(), [0.5, -1.0, 9.75])
+        # Linear acceleration and gyro reported later in the same batch belong to the sample
+        self.assertEqual(record["linear_acceleration"].tolist(), [0.5, -1.0, 0.0])
+        self.assertEqual(record["gyro"].tolist(), [0.25, 0.0, -0.125])
+
+    def test_long_report_delays(self):
+        decoder = SH2ReportDecoder(8)
+        p = packet(base_timestamp(0), accelerometer(0, 0, 9.8, delay_ticks=300))
+        decoder.decode(p.data, p.header.data_length, 10.0)
+        self.assertAlmostEqual(decoder.records[0]["timestamp"], 10.03)
+
+    def test_unknown_reports_are_left_to_the_library(self):
+        decoder = SH2ReportDecoder(8)
+        p = packet(base_timestamp(0), accelerometer(0, 0, 9.8), bytes([0x1E, 0, 0, 0, 1, 0]))
+        self.assertFalse(decoder.decode(p.data, p.header.data_length, 1.0))
+        self.assertEqual(decoder.count, 1)
+
+    def test_stops_when_full(self):
+        decoder = SH2ReportDecoder(2)
+        p = packet(base_timestamp(0), *[accelerometer(0, 0, i) for i in range(3)])
+        decoder.decode(p.data, p.header.data_length, 1.0)
+        self.assertTrue(decoder.full)
+        self.assertEqual(decoder.dropped, 1)
+        self.assertEqual(decoder.records["acceleration"][:, 2].tolist(), [0.0, 1.0])
+
+
+class TestBNO085Reader(unittest.TestCase):
+    """The reader thread should deliver every sample to the event loop, in order."""
+
+    def setUp(self):
+        self.interface = BNO085Interface()
+        self.interface.imu = FakeIMU()
+
+    def test_reader_delivers_every_sample(self):
+        async def run():
+            imu = self.interface.imu
+            control = packet(bytes([0xF1, 0, 0, 0]), channel=2)
+            imu.packets.append(control)
+            for i in range(10):
+                imu.packets.append(packet(base_timestamp(0), accelerometer(0, 0, i)))
+            self.interface.start_reader()
+            try:
+                samples = []
+                while len(samples) < 10:
+                    self.assertTrue(await self.interface.wait_for_samples(1.0))
+                    samples.extend(self.interface.read_samples())
+            finally:
+                self.interface.stop_reader()
+            self.assertEqual([s["acceleration"][2] for s in samples], list(range(10)))
+            self.assertEqual(imu.handled, [control])
+        asyncio.run(run())
+
+    def test_read_sensor_data_optimized_returns_newest_sample(self):
+        async def run():
+            for i in range(3):
+                self.interface.imu.packets.append(packet(base_timestamp(0), accelerometer(0, 0, i),
+                                                         gyro(0.5, 0, 0)))
+            self.interface.start_reader()
+            try:
+                await self.interface.wait_for_samples(1.0)
+                # Let the reader finish the batch
+                await asyncio.sleep(0.05)
+                data = await self.interface.read_sensor_data_optimized()
+            finally:
+                self.interface.stop_reader()
+            self.assertEqual(data["acceleration"], (0.0, 0.0, 2.0))
+            self.assertEqual(data["gyro"], (0.5, 0.0, 0.0))
+            self.assertIsInstance(data["acceleration"][2], float)
+            self.assertEqual(data["samples"], 3)
+        asyncio.run(run())
+
+    def test_counts_samples_dropped_when_buffer_is_full(self):
+        async def run():
+            self.interface._loop = asyncio.get_running_loop()
+            self.interface.samples.bind()
+            capacity = self.interface.samples.capacity
+            for _ in range(capacity // 32 + 1):
+                self.interface.imu.packets.append(
+                    packet(base_timestamp(0), *[accelerometer(0, 0, 9.8)] * 32))
+            while self.interface.imu.packets:
+                self.interface._drain_reports()
+            self.assertEqual(self.interface.samples.available, capacity)
+            self.assertEqual(self.interface.dropped_samples, 32 * (capacity // 32 + 1) - capacity)
+        asyncio.run(run())
+
+    def test_decodes_motion_reports(self):
+        decoder = SH2ReportDecoder(8)
+        p = packet(base_timestamp(10), stability(1), shake(0), tap(0))
+        self.assertTrue(decoder.decode(p.data, p.header.data_length, 5.0))
+        self.assertEqual(decoder.stability, "On Table")
+        self.assertEqual(decoder.motion_events, [])
+        p = packet(base_timestamp(10), stability(4, delay_ticks=5), shake(0b010), tap(0b10000))
+        self.assertTrue(decoder.decode(p.data, p.header.data_length, 5.0))
+        self.assertEqual(decoder.stability, "In motion")
+        self.assertEqual([name for _, name in decoder.motion_events], ["stability", "shake", "tap"])
+        self.assertAlmostEqual(decoder.motion_events[0][0], 5.0 - 0.001 + 0.0005)
+        decoder.clear()
+        self.assertEqual(decoder.motion_events, [])
+
+
+class TestBNO085LowPower(unittest.TestCase):
+    """Low power mode should leave the bus alone until the sensor reports motion."""
+
+    def setUp(self):
+        self.interface = BNO085Interface()
+        self.interface.imu = FakeIMU()
+        self.interface.interrupt = SimulatedInterrupt()
+
+    def test_sleeps_on_interrupt_and_wakes_on_motion(self):
+        async def run():
+            imu = self.interface.imu
+            self.interface.start_reader()
+            try:
+                self.assertTrue(await self.interface.enter_low_power())
+                self.assertEqual(imu.features[0x01], 0)
+                self.assertEqual(imu.features[0x13], 50000)
+                self.assertIn(0x19, imu.features)
+                self.assertIn(0x10, imu.features)
+
+                # Still: the reader waits on INT rather than polling the sensor
+                await asyncio.sleep(0.05)
+                checks = imu.ready_checks
+                await asyncio.sleep(0.3)
+                self.assertLessEqual(imu.ready_checks - checks, 1)
+
+                # On the table: a classifier report wakes the reader, but not the sensor
+                imu.packets.append(packet(base_timestamp(0), stability(1)))
+                self.interface.interrupt.assert_line()
+                self.assertFalse(await self.interface.wait_for_wake(0.1))
+                self.assertFalse(imu.packets)
+
+                # Picked up: back to full rate, and the first sample, well within 100ms
+                start = time.monotonic()
+                imu.packets.append(packet(base_timestamp(0), stability(4)))
+                self.interface.interrupt.assert_line()
+                self.assertTrue(await self.interface.wait_for_wake(0.1))
+                self.assertTrue(await self.interface.wait_for_samples(0.1))
+                self.assertLess(time.monotonic() - start, 0.1)
+                self.assertAlmostEqual(self.interface.read_samples()[0]["acceleration"][2], 9.8, places=2)
+                self.assertFalse(self.interface.low_power)
+                self.assertEqual(self.interface.wake_reason, "stability")
+                self.assertEqual(self.interface.wakeups, 1)
+                self.assertEqual(imu.features[0x01], 5000)
+                self.assertEqual(imu.features[0x13], 0)
+            finally:
+                self.interface.stop_reader()
+        asyncio.run(run())
+
+    def test_polls_slowly_without_interrupt_line(self):
+        async def run():
+            self.interface.interrupt = None
+            self.interface.start_reader()
+            try:
+                await self.interface.enter_low_power()
+                self.interface.imu.packets.append(packet(base_timestamp(0), tap(0b1)))
+                self.assertTrue(await self.interface.wait_for_wake(0.2))
+                self.assertEqual(self.interface.wake_reason, "tap")
+            finally:
+                self.interface.stop_reader()
+        asyncio.run(run())
+
+    def test_not_available_without_reader(self):
+        self.assertFalse(asyncio.run(self.interface.enter_low_power()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+"""
+Unit tests for HapticManager's worker thread and waveform sequence compiler.
+
+A fake DRV2605 records register traffic, so these tests can check that the purr runs off
+the event loop, that the driver mode is never read back, that posted values are coalesced,
+and that sequences are compiled into wait-encoded waveform slots and played in chunks.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock hardware modules before imports
+for name in ('board', 'busio', 'adafruit_drv2605'):
+    if sys.modules.get(name) is None:
+        sys.modules[name] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import HapticConfig
+from managers.haptic_manager import (HapticManager, HapticWorker, WaveformEffect, compile_sequence,
+                                     purr_motor_value, MODE_INTTRIG, MODE_REALTIME)
+
+
+class FakeI2CDevice:
+    def __init__(self, drv):
+        self.drv = drv
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, data):
+        self.drv.writes.append(bytes(data))
+
+
+class FakeDRV2605:
+    """Counts mode reads and records register writes. Each waveform plays for play_seconds."""
+    def __init__(self, play_seconds=0.0):
+        self._mode = 0
+        self.mode_reads = 0
+        self.modes = []
+        self.values = []
+        self.writes = []
+        self.plays = []
+        self.play_seconds = play_seconds
+        self._playing_until = 0.0
+        self._device = FakeI2CDevice(self)
+
+    def play(self):
+        self.plays.append(time.monotonic())
+        self._playing_until = time.monotonic() + self.play_seconds
+
+    def stop(self):
+        self._playing_until = 0.0
+
+    def _read_u8(self, address):
+        return 1 if time.monotonic() < self._playing_until else 0
+
+    @property
+    def mode(self):
+        self.mode_reads += 1
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        self._mode = value
+        self.modes.append(value)
+
+    @property
+    def realtime_value(self):
+        return self.values[-1]
+
+    @realtime_value.setter
+    def realtime_value(self, value):
+        self.values.append(value)
+
+
+class TestPurrEnvelope(unittest.TestCase):
+    """Test cases for the purr envelope."""
+
+    def test_envelope_stays_in_erm_range(self):
+        for intensity in (0.1, 0.5, 1.0):
+            values = [purr_motor_value(intensity, t / 100) for t in range(300)]
+            self.assertTrue(all(0 <= value <= 127 for value in values))
+            # One full cycle swings between the intensity's min and max power
+            self.assertGreater(max(values) - min(values), 10)
+
+    def test_stronger_strokes_purr_harder(self):
+        peak = HapticConfig.PURR_CYCLE_PERIOD / 4
+        trough = 3 * HapticConfig.PURR_CYCLE_PERIOD / 4
+        self.assertLess(purr_motor_value(0.1, trough), purr_motor_value(0.9, trough))
+        self.assertLessEqual(purr_motor_value(0.1, peak), purr_motor_value(0.9, peak))
+
+
+class FakeDriver:
+    """Stands in for HapticManager's register I/O, recording what the worker asks of it"""
+    def __init__(self, write=None):
+        self.write = write or (lambda value: True)
+        self.values = []
+        self.waveforms = []
+        self.stops = 0
+        self.halts = 0
+
+    def set_realtime_value(self, value):
+        self.write(value)
+        self.values.append(value)
+        return True
+
+    def start_waveform(self, slots):
+        self.waveforms.append(slots)
+        return True
+
+    def waveform_playing(self):
+        return False
+
+    def stop_waveform(self):
+        self.stops += 1
+
+    def halt(self):
+        self.halts += 1
+
+
+class TestCompileSequence(unittest.TestCase):
+    """Test cases for compiling sequences into waveform sequencer slots."""
+
+    def test_effects_and_wait_slots(self):
+        chunks = compile_sequence([1, 0.5, WaveformEffect.BUZZ_1_100])
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].slots, bytes([1, 0x80 | 50, 47, 0, 0, 0, 0, 0]))
+        self.assertAlmostEqual(chunks[0].duration, 0.5 + 2 * HapticConfig.SEQUENCE_MIN_EFFECT_DURATION)
+
+    def test_long_pauses_span_several_wait_slots(self):
+        slots = compile_sequence([3.0])[0].slots
+        self.assertEqual(list(slots[:3]), [0x80 | 127, 0x80 | 127, 0x80 | 46])
+        self.assertEqual(slots[3], 0)
+
+    def test_long_sequences_are_chunked(self):
+        chunks = compile_sequence([1, 0.1] * 6)
+        self.assertEqual([len(chunk.slots) for chunk in chunks], [8, 8])
+        self.assertEqual(list(chunks[1].slots), [1, 0x80 | 10] * 2 + [0] * 4)
+
+    def test_rejects_invalid_items(self):
+        for sequence in ([0], [124], [1, -0.5]):
+            with self.assertRaises(ValueError):
+                compile_sequence(sequence)
+
+
+class TestHapticWorker(unittest.TestCase):
+    """Test cases for the HapticWorker class."""
+
+    def test_coalesces_posts(self):
+        gate = threading.Event()
+        driver = FakeDriver(write=lambda value: gate.wait())
+        worker = HapticWorker(driver)
+        for value in range(1, 50):
+            worker.post_value(value)
+        gate.set()
+        time.sleep(0.05)
+        worker.close()
+        # Whatever was in flight, then the newest value; never every post
+        self.assertLess(len(driver.values), 5)
+        self.assertEqual(driver.values[-1], 49)
+        self.assertEqual(driver.halts, 1)
+
+    def test_purrs_until_intensity_is_zero(self):
+        driver = FakeDriver()
+        worker = HapticWorker(driver, update_rate=200)
+        worker.set_intensity(0.8)
+        time.sleep(0.2)
+        worker.set_intensity(0.0)
+        time.sleep(0.05)
+        count = len(driver.values)
+        time.sleep(0.05)
+        self.assertEqual(len(driver.values), count)
+        self.assertEqual(driver.values[-1], 0)
+        self.assertGreater(count, 5)
+        worker.close()
+
+    def test_plays_chunks_in_order(self):
+        driver = FakeDriver()
+        worker = HapticWorker(driver)
+        chunks = compile_sequence([1, 0.01] * 8)
+        worker.play(chunks)
+        time.sleep(0.5)
+        self.assertEqual(driver.waveforms, [chunk.slots for chunk in chunks])
+        worker.close()
+
+    def test_new_post_cancels_sequence(self):
+        driver = FakeDriver()
+        worker = HapticWorker(driver)
+        worker.play(compile_sequence([1, 1.0] * 8))
+        time.sleep(0.05)
+        worker.set_intensity(0.5)
+        time.sleep(0.05)
+        self.assertEqual(len(driver.waveforms), 1)
+        self.assertEqual(driver.stops, 1)
+        self.assertTrue(driver.values)
+        worker.close()
+
+
+class TestHapticManager(unittest.TestCase):
+    """Test cases for HapticManager realtime control."""
+
+    def setUp(self):
+        self.manager = HapticManager()
+        self.drv = FakeDRV2605()
+        self.manager.drv = self.drv
+
+    def tearDown(self):
+        self.manager.close()
+
+    def test_mode_is_cached_not_read(self):
+        for value in (10, 20, 30):
+            self.assertTrue(self.manager.set_realtime_value(value))
+        self.assertEqual(self.drv.mode_reads, 0)
+        self.assertEqual(self.drv.modes, [MODE_REALTIME])
+        self.assertEqual(self.drv.values, [10, 20, 30])
+
+    def test_purr_runs_on_worker(self):
+        self.manager.set_purr_intensity(0.5)
+        time.sleep(0.1)
+        self.manager.set_purr_intensity(0.0)
+        self.manager.close()
+        self.assertGreater(len(self.drv.values), 2)
+        self.assertEqual(self.drv.values[-1], 0)
+        self.assertEqual(self.drv.mode_reads, 0)
+
+    def test_sequence_slots_written_in_one_transaction(self):
+        self.drv.play_seconds = 0.05
+        asyncio.run(self.manager.play_sequence([1, 0.01] * 6))
+        time.sleep(0.4)
+        self.assertEqual(self.drv.writes, [bytes([0x04]) + chunk.slots for chunk in compile_sequence([1, 0.01] * 6)])
+        # The second chunk starts once the chip has finished the first
+        self.assertGreaterEqual(self.drv.plays[1] - self.drv.plays[0], 0.05)
+        self.assertEqual(self.drv.modes, [MODE_INTTRIG])
+
+    def test_rejects_invalid_values(self):
+        self.assertFalse(self.manager.post_realtime_value(300))
+        self.assertFalse(self.manager.set_realtime_value(-200))
+        self.assertEqual(self.drv.values, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,274 @@
+"""
+Unit tests for the vectorized LED frame renderer.
+
+These tests check the numpy color helpers against colorsys, the vectorized power cap,
+that bulk frame writes produce the same strip bytes as setting pixels one at a time,
+that every LEDManager / LEDManagerRings effect generates well-formed frames, and how the
+compositor's layer stack blends, crossfades and expires effect layers.
+"""
+
+import asyncio
+import colorsys
+import itertools
+import threading
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Use the mock strip even where the NeoPixel libraries are installed
+sys.modules['board'] = None
+sys.modules['neopixel'] = None
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import LEDConfig
+from utils.led_render import (BlendMode, EffectLayer, LayerKind, LayerStack, PixelWriter, Twinkles, cap_power,
+                              hsv_to_rgb, hsv_to_rgb8)
+from managers.led_manager import LEDManager, LEDManagerRings
+
+
+class FakePixelBuf:
+    """Mirrors the buffer handling of Adafruit's PixelBuf for a 3-byte-per-pixel strip"""
+    def __init__(self, n, byteorder=(1, 0, 2), brightness=1.0):
+        self.n = n
+        self._bpp = 3
+        self._offset = 0
+        self._byteorder = byteorder
+        self._dotstar_mode = False
+        self._post_brightness_buffer = bytearray(n * 3)
+        self._pre_brightness_buffer = None
+        self._brightness = 1.0
+        if brightness != 1.0:
+            self._pre_brightness_buffer = bytearray(n * 3)
+            self._brightness = brightness
+
+    def __setitem__(self, index, color):
+        if isinstance(index, slice):
+            for i, c in zip(range(*index.indices(self.n)), color):
+                self[i] = c
+            return
+        offset = self._offset + index * self._bpp
+        for channel, value in zip(self._byteorder, color):
+            if self._pre_brightness_buffer is not None:
+                self._pre_brightness_buffer[offset + channel] = value
+            self._post_brightness_buffer[offset + channel] = int(value * self._brightness)
+
+
+class TestColorHelpers(unittest.TestCase):
+    """Test cases for the numpy color helpers."""
+
+    def test_hsv_to_rgb_matches_colorsys(self):
+        rng = np.random.default_rng(0)
+        h, s, v = rng.random((3, 2000))
+        expected = np.array([colorsys.hsv_to_rgb(*hsv) for hsv in zip(h, s, v)])
+        np.testing.assert_allclose(hsv_to_rgb(h, s, v), expected, atol=1e-12)
+        np.testing.assert_array_equal(hsv_to_rgb8(h, s, v), (expected * 255).astype(np.uint8))
+
+    def test_hsv_to_rgb_broadcasts_scalars(self):
+        self.assertEqual(hsv_to_rgb8(np.linspace(0, 1, 7), 1.0, 1.0).shape, (7, 3))
+        self.assertEqual(hsv_to_rgb8(0.3, 0.8, np.linspace(0, 1, 5)).shape, (5, 3))
+
+    def test_cap_power(self):
+        frame = np.full((32, 3), 255, dtype=np.uint8)
+        capped = cap_power(frame, 14000)
+        self.assertLessEqual(int(capped.sum()), 14000)
+        self.assertEqual(capped.dtype, np.uint8)
+        dim = np.full((32, 3), 10, dtype=np.uint8)
+        self.assertIs(cap_power(dim, 14000), dim)
+
+    def test_twinkles_stay_in_range(self):
+        twinkles = Twinkles(24, np.random.default_rng(1), chance=0.5, base_step=0.02)
+        for _ in range(500):
+            colors = twinkles.step()
+            self.assertTrue(((twinkles.brightness >= 0) & (twinkles.brightness <= 1)).all())
+        self.assertEqual(colors.shape, (24, 3))
+
+
+class TestPixelWriter(unittest.TestCase):
+    """Test cases for bulk frame writes."""
+
+    def test_bulk_write_matches_per_pixel_writes(self):
+        frame = np.random.default_rng(2).integers(0, 256, (16, 3), dtype=np.uint8)
+        for brightness in (1.0, 0.4):
+            bulk = FakePixelBuf(16, brightness=brightness)
+            per_pixel = FakePixelBuf(16, brightness=brightness)
+            writer = PixelWriter(bulk)
+            self.assertTrue(writer.is_bulk)
+            writer.write(frame)
+            for i, color in enumerate(frame.tolist()):
+                per_pixel[i] = color
+            self.assertEqual(bulk._post_brightness_buffer, per_pixel._post_brightness_buffer)
+            self.assertEqual(bulk._pre_brightness_buffer, per_pixel._pre_brightness_buffer)
+
+    def test_falls_back_to_slice_assignment(self):
+        pixels = FakePixelBuf(4)
+        del pixels._post_brightness_buffer
+        writer = PixelWriter(pixels)
+        self.assertFalse(writer.is_bulk)
+        pixels._post_brightness_buffer = bytearray(12)
+        writer.write(np.array([[1, 2, 3]] * 4, dtype=np.uint8))
+        self.assertEqual(bytes(pixels._post_brightness_buffer[:3]), bytes([2, 1, 3]))
+
+
+class TestEffectFrames(unittest.TestCase):
+    """Every effect should generate (LED_COUNT, 3) uint8 frames with a non-negative hold time."""
+
+    @classmethod
+    def setUpClass(cls):
+        asyncio.set_event_loop(asyncio.new_event_loop())
+
+    def check_effects(self, manager):
+        for effect, effect_info in manager._EFFECT_MAP.items():
+            with self.subTest(manager=type(manager).__name__, effect=effect):
+                speed = effect_info['default_speed']
+                manager._current_speed = speed
+                args = ("blue", speed) if effect in ("ROTATING_COLOR", "ROTATING_BEACON") else (speed,)
+                frames = getattr(manager, effect_info['method'])(*args)
+                lit = False
+                for frame, hold in itertools.islice(frames, 300):
+                    self.assertEqual(frame.shape, (LEDConfig.LED_COUNT, 3))
+                    self.assertEqual(frame.dtype, np.uint8)
+                    self.assertGreaterEqual(hold, 0)
+                    lit = lit or frame.any()
+                    manager._show_frame(frame)
+                frames.close()
+                self.assertTrue(lit, "effect never lit a pixel")
+
+    def test_strip_effects(self):
+        self.check_effects(LEDManager())
+
+    def test_ring_effects(self):
+        self.check_effects(LEDManagerRings())
+
+    def test_show_frame_writes_capped_frame(self):
+        manager = LEDManager()
+        manager.show_color((255, 255, 255))
+        total = sum(sum(manager.pixels[i]) for i in range(LEDConfig.LED_COUNT))
+        self.assertLessEqual(total, LEDConfig.MAX_TOTAL_BRIGHTNESS)
+        manager.clear()
+        self.assertEqual(manager.pixels[0], (0, 0, 0))
+
+
+def solid(value, n=4, hold=1.0, count=None):
+    """An effect generator showing one solid level, forever or for count frames"""
+    frame = np.full((n, 3), value, dtype=np.uint8)
+    for _ in itertools.count() if count is None else range(count):
+        yield frame, hold
+
+
+class TestLayerStack(unittest.TestCase):
+    """Test cases for compositing effect layers, driven with explicit timestamps."""
+
+    def test_layers_stack_by_kind(self):
+        stack = LayerStack(4)
+        stack.push(EffectLayer("flash", solid(1), kind=LayerKind.FLASH))
+        stack.push(EffectLayer("base", solid(2)))
+        stack.push(EffectLayer("overlay", solid(3), kind=LayerKind.OVERLAY))
+        self.assertEqual([layer.name for layer in stack.layers], ["base", "overlay", "flash"])
+        self.assertEqual(stack.top().name, "overlay")
+
+    def test_only_renders_changes(self):
+        stack = LayerStack(4)
+        stack.push(EffectLayer("base", solid(100, hold=0.5)))
+        self.assertEqual(stack.render(0.0)[0, 0], 100)
+        self.assertIsNone(stack.render(0.1))
+        self.assertIsNotNone(stack.render(0.5))
+
+    def test_speed_change_rescales_holds(self):
+        stack = LayerStack(4)
+        layer = EffectLayer("base", solid(100, hold=0.5), speed=0.5)
+        stack.push(layer)
+        stack.render(0.0)
+        self.assertIsNone(stack.render(0.4))
+        self.assertIsNotNone(stack.render(0.5))
+        # Half the speed value, so from the next frame on frames come twice as fast
+        layer.speed = 0.25
+        self.assertIsNone(stack.render(0.9))
+        self.assertIsNotNone(stack.render(1.0))
+        self.assertIsNone(stack.render(1.2))
+        self.assertIsNotNone(stack.render(1.25))
+
+    def test_crossfade_retires_old_base(self):
+        stack = LayerStack(4, fade_seconds=1.0)
+        old = EffectLayer("old", solid(200))
+        stack.push(old)
+        stack.render(0.0)
+        stack.push(EffectLayer("new", solid(100), fade_in=1.0, now=0.0))
+        self.assertAlmostEqual(stack.render(0.5)[0, 0], 150.0)
+        self.assertEqual(stack.render(1.0)[0, 0], 100)
+        self.assertEqual([layer.name for layer in stack.layers], ["new"])
+        with self.assertRaises(StopIteration):
+            next(old.frames)
+
+    def test_overlay_expires_and_reveals_base(self):
+        stack = LayerStack(4, fade_seconds=0.5)
+        stack.push(EffectLayer("base", solid(50)))
+        stack.push(EffectLayer("overlay", solid(250), kind=LayerKind.OVERLAY, expires_at=1.0))
+        self.assertEqual(stack.render(0.0)[0, 0], 250)
+        self.assertAlmostEqual(stack.render(1.25)[0, 0], 150.0)
+        self.assertEqual(stack.render(1.5)[0, 0], 50)
+        self.assertEqual([layer.name for layer in stack.layers], ["base"])
+
+    def test_blend_modes_and_brightness(self):
+        for blend, expected in ((BlendMode.NORMAL, 30), (BlendMode.ADD, 130), (BlendMode.MAX, 100)):
+            with self.subTest(blend=blend):
+                stack = LayerStack(4)
+                stack.push(EffectLayer("base", solid(100)))
+                stack.push(EffectLayer("top", solid(60), kind=LayerKind.OVERLAY, brightness=0.5, blend=blend))
+                self.assertEqual(stack.render(0.0)[0, 0], expected)
+
+    def test_finished_flash_is_removed(self):
+        stack = LayerStack(4)
+        stack.push(EffectLayer("base", solid(10)))
+        stack.push(EffectLayer("flash", solid(255, hold=0.1, count=1), kind=LayerKind.FLASH, blend=BlendMode.MAX))
+        self.assertEqual(stack.render(0.0)[0, 0], 255)
+        self.assertEqual(stack.render(0.1)[0, 0], 10)
+        self.assertEqual(len(stack), 1)
+
+
+class TestCompositor(unittest.IsolatedAsyncioTestCase):
+    """Test cases for LEDManager's compositor thread."""
+
+    async def asyncSetUp(self):
+        self.manager = LEDManager()
+
+    async def asyncTearDown(self):
+        self.manager.close()
+
+    async def test_switching_effects_starts_no_threads(self):
+        threads = threading.active_count()
+        for effect in ("RAINBOW", "TWINKLING", "BLUE_BREATHING", "RAINBOW"):
+            await self.manager.start_effect(effect)
+        await self.manager.start_effect("LIGHTNING", duration=50)
+        await self.manager.start_or_update_effect("RAINBOW", speed=0.01, brightness=0.5)
+        await self.manager.stop_effect("LIGHTNING")
+        self.assertEqual(threading.active_count(), threads)
+
+    async def test_renders_and_stops(self):
+        await self.manager.start_effect("RAINBOW")
+        await asyncio.sleep(LEDConfig.CROSSFADE_MS / 1000 + 0.1)
+        self.assertTrue(any(self.manager.pixels[i] != (0, 0, 0) for i in range(LEDConfig.LED_COUNT)))
+        self.assertEqual(len(self.manager._layers), 1)
+        await self.manager.stop_effect()
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(self.manager._layers), 0)
+        self.assertEqual(self.manager.pixels[0], (0, 0, 0))
+
+    async def test_timed_effect_reverts(self):
+        await self.manager.start_effect("BLUE_BREATHING")
+        await self.manager.start_or_update_effect("RAINBOW", duration=50)
+        self.assertEqual(self.manager._layers.top().name, "RAINBOW")
+        await asyncio.sleep(0.1 + LEDConfig.CROSSFADE_MS / 1000)
+        self.assertEqual([layer.name for layer in self.manager._layers.layers], ["BLUE_BREATHING"])
+
+    async def test_flash_removes_itself(self):
+        self.manager.flash("orange", pulses=1, on_ms=20, off_ms=20)
+        await asyncio.sleep(0.15)
+        self.assertEqual(len(self.manager._layers), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
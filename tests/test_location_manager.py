@@ -0,0 +1,109 @@
+"""
+Unit tests for LocationManager's streaming beacon scan.
+
+Fake advertisements are fed to the detection callback as a long-running scanner would deliver
+them. These tests check that only our beacons get past the prefix filter, that location is
+updated from whatever was heard recently, and that the scanner falls back to active scanning.
+"""
+
+import asyncio
+import struct
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+import sys
+import os
+
+# Mock bleak before imports
+if sys.modules.get('bleak') is None:
+    sys.modules['bleak'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import BLEConfig
+from hardware.bluetooth_adapter import BluetoothAdapterMonitor
+from managers import location_manager
+from managers.location_manager import LocationManager
+
+
+def advertisement(major, minor, rssi, uuid=BLEConfig.BEACON_UUID, company_id=0x004C):
+    """An iBeacon advertisement as bleak reports it, without the company ID in the data"""
+    data = bytes([0x02, 0x15]) + UUID(uuid).bytes + struct.pack(">HHb", major, minor, -59)
+    return SimpleNamespace(manufacturer_data={company_id: data}, rssi=rssi)
+
+
+class TestStreamingScan(unittest.TestCase):
+    """Test cases for the streaming scan mode."""
+
+    def setUp(self):
+        self.manager = LocationManager()
+        self.manager._adapter = BluetoothAdapterMonitor(None)
+        self.device = SimpleNamespace(address="DD:33:00:00:00:01")
+
+    def hear(self, major, minor, rssi, **kwargs):
+        self.manager._on_advertisement(self.device, advertisement(major, minor, rssi, **kwargs))
+
+    def test_filters_foreign_advertisements(self):
+        self.hear(1, 1, -60, uuid="00000000-0000-0000-0000-000000000000")
+        self.hear(1, 1, -60, company_id=0x0006)
+        self.hear(9, 9, -60)
+        self.manager._on_advertisement(self.device, SimpleNamespace(manufacturer_data={}, rssi=-60))
+        self.assertEqual(self.manager._heard, {})
+
+        self.hear(1, 2, -60)
+        self.hear(1, 2, -70)
+        smoothed = int(self.manager._rssi_filters[(1, 2)].value)
+        self.assertLess(-70, smoothed)
+        self.assertLess(smoothed, -60)
+        self.assertEqual(self.manager._visible_beacons(), [((1, 2), smoothed)])
+
+    def test_location_follows_advertisements(self):
+        self.manager._stream_scanner = MagicMock()
+        for _ in range(BLEConfig.MIN_READINGS_FOR_CHANGE):
+            self.hear(1, 1, -90)
+            self.hear(1, 2, -55)
+            info = asyncio.run(self.manager.scan_once())
+        self.assertEqual(info["location"], "blue_phoenix")
+        self.assertEqual(set(info["all_beacons"]), {"magical_sun_pendant", "blue_phoenix"})
+        self.assertEqual(info["all_beacons"]["blue_phoenix"]["smoothed_rssi"], -55)
+
+    def test_strongest_beacon_hysteresis(self):
+        self.manager._last_location = {"location": "magical_sun_pendant", "all_beacons": {}}
+        # Within the equality threshold once the current location's bonus is added, so stay put
+        self.assertEqual(self.manager._get_strongest_beacon([((1, 1), -70), ((1, 2), -62), ((1, 3), -90)]),
+                         ((1, 1), -70 + BLEConfig.CURRENT_LOCATION_RSSI_BONUS))
+        self.assertEqual(self.manager._get_strongest_beacon([((1, 1), -90), ((1, 2), -62), ((1, 3), -80)]),
+                         ((1, 2), -62))
+
+    def test_beacons_drop_out_of_visibility_window(self):
+        self.hear(1, 1, -60)
+        rssi, heard_at = self.manager._heard[(1, 1)]
+        self.manager._heard[(1, 1)] = (rssi, heard_at - BLEConfig.STREAM_VISIBILITY_WINDOW - 0.1)
+        self.assertEqual(self.manager._visible_beacons(), [])
+        self.assertEqual(self.manager._heard, {})
+
+    def test_falls_back_to_active_scan(self):
+        scanners = []
+
+        def make_scanner(**kwargs):
+            scanner = SimpleNamespace(kwargs=kwargs, start=AsyncMock(), stop=AsyncMock())
+            if kwargs["scanning_mode"] == "passive":
+                scanner.start.side_effect = RuntimeError("passive scanning not supported")
+            scanners.append(scanner)
+            return scanner
+
+        with patch.object(location_manager, "BleakScanner", side_effect=make_scanner):
+            self.assertTrue(asyncio.run(self.manager._start_streaming()))
+        self.assertEqual([s.kwargs["scanning_mode"] for s in scanners], ["passive", "active"])
+        self.assertIs(self.manager._stream_scanner, scanners[1])
+        self.assertEqual(scanners[1].kwargs["detection_callback"], self.manager._on_advertisement)
+
+        asyncio.run(self.manager.stop())
+        scanners[1].stop.assert_awaited_once()
+        self.assertIsNone(self.manager._stream_scanner)
+
+
+if __name__ == '__main__':
+    unittest.main()
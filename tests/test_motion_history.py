@@ -0,0 +1,164 @@
+"""
+Unit tests for the motion history and its rolling window statistics.
+
+The rolling statistics are checked against the statistics module on random data, and the
+AccelerometerManager's classifier is fed synthetic streams to check that the checks reading
+those statistics still recognise stillness, shaking and free fall.
+"""
+
+import asyncio
+import math
+import random
+import time
+import statistics
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock hardware modules before imports
+sys.modules['board'] = MagicMock()
+sys.modules['busio'] = MagicMock()
+sys.modules['adafruit_bno08x'] = MagicMock()
+sys.modules['adafruit_bno08x.i2c'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from utils.motion_history import MotionHistory, RollingStats
+from managers.accelerometer_manager import AccelerometerManager, SimplifiedState
+from hardware.acc_bno085 import BNO085Interface, IMU_SAMPLE_DTYPE
+import numpy as np
+
+
+class TestRollingStats(unittest.TestCase):
+    """Test cases for the RollingStats class."""
+
+    def test_matches_statistics_module(self):
+        rng = random.Random(0)
+        stats = RollingStats(30, track_extremes=True)
+        values = []
+        for _ in range(500):
+            value = rng.gauss(5.0, 3.0)
+            stats.push(value)
+            values.append(value)
+            window = values[-30:]
+            self.assertAlmostEqual(stats.mean, statistics.mean(window))
+            if len(window) > 1:
+                self.assertAlmostEqual(stats.variance, statistics.variance(window))
+            self.assertEqual(stats.max, max(window))
+            self.assertEqual(stats.min, min(window))
+            self.assertEqual(window[len(window) - 1 - stats.max_age], max(window))
+        self.assertEqual(stats.values().tolist(), values[-30:])
+        self.assertEqual(stats.latest, values[-1])
+
+    def test_clear(self):
+        stats = RollingStats(4, track_extremes=True)
+        for value in (1.0, 2.0, 3.0):
+            stats.push(value)
+        stats.clear()
+        self.assertEqual(len(stats), 0)
+        stats.push(10.0)
+        self.assertEqual((stats.mean, stats.max, stats.min), (10.0, 10.0, 10.0))
+        self.assertEqual(stats.values().tolist(), [10.0])
+
+
+class TestMotionHistory(unittest.TestCase):
+    """Test cases for the MotionHistory class."""
+
+    def test_keeps_last_samples_in_order(self):
+        history = MotionHistory(8)
+        for i in range(13):
+            history.append(i * 0.005, (3.0, 4.0, float(i)), (0.0, 3.0, 4.0), (0.0, 0.0, 0.0))
+        self.assertEqual(len(history), 8)
+        self.assertEqual(history.last(8, "timestamp").tolist(), [i * 0.005 for i in range(5, 13)])
+        self.assertEqual(history.get()["acceleration"].tolist(), [3.0, 4.0, 12.0])
+        self.assertEqual(history.get(7)["acceleration"][2], 5.0)
+        self.assertEqual(history.get()["linear_magnitude"], 5.0)
+        with self.assertRaises(IndexError):
+            history.get(8)
+
+
+def still(seconds, rate, rng):
+    for _ in range(int(seconds * rate)):
+        linear = tuple(rng.gauss(0, 0.05) for _ in range(3))
+        yield (linear[0], linear[1], linear[2] + 9.81), linear, tuple(rng.gauss(0, 0.01) for _ in range(3))
+
+
+def shaking(seconds, rate, rng, frequency=5.0, amplitude=18.0):
+    for i in range(int(seconds * rate)):
+        x = amplitude * math.sin(2 * math.pi * frequency * i / rate) + rng.gauss(0, 1)
+        linear = (x, rng.gauss(0, 1), rng.gauss(0, 1))
+        yield (linear[0], linear[1], linear[2] + 9.81), linear, (2.0, 2.0, 2.0)
+
+
+def thrown(rate):
+    # The throw itself, then tumbling in free fall
+    for _ in range(int(0.1 * rate)):
+        yield (15.0, 0.0, 15.0), (15.0, 0.0, 5.0), (3.0, 3.0, 0.0)
+    for _ in range(int(0.3 * rate)):
+        yield (0.5, 0.3, 0.2), (0.0, 0.0, -9.8), (4.0, 3.0, 1.0)
+
+
+class TestAccelerometerManagerClassifier(unittest.TestCase):
+    """The classifier's checks should work off the rolling statistics."""
+
+    rate = 50.0
+
+    def setUp(self):
+        self.manager = AccelerometerManager()
+        self.rng = random.Random(0)
+        self.t = 1000.0
+
+    def feed(self, samples):
+        states = []
+        for acceleration, linear, gyro in samples:
+            self.t += 1.0 / self.rate
+            data = self.manager.process_sample({
+                "acceleration": acceleration, "linear_acceleration": linear, "gyro": gyro, "timestamp": self.t,
+            })
+            states.append(data["current_state"])
+        return states
+
+    def test_still_becomes_stationary(self):
+        states = self.feed(still(3.0, self.rate, self.rng))
+        self.assertEqual(states[-1], SimplifiedState.STATIONARY.name)
+
+    def test_detects_shake(self):
+        self.feed(still(2.0, self.rate, self.rng))
+        states = self.feed(shaking(1.0, self.rate, self.rng))
+        self.assertIn(SimplifiedState.SHAKE.name, states)
+
+    def test_detects_free_fall(self):
+        self.feed(still(2.0, self.rate, self.rng))
+        states = self.feed(thrown(self.rate))
+        self.assertEqual(states[-1], SimplifiedState.FREE_FALL.name)
+
+    def test_failed_reads_are_not_stored(self):
+        self.feed(still(0.5, self.rate, self.rng))
+        length = len(self.manager.motion_history)
+        data = self.manager.process_sample({"timestamp": self.t + 0.02})
+        self.assertEqual(data["current_state"], SimplifiedState.UNKNOWN.name)
+        self.assertEqual(len(self.manager.motion_history), length)
+
+    def test_read_sensor_batch_classifies_every_buffered_sample(self):
+        records = np.zeros(120, dtype=IMU_SAMPLE_DTYPE)
+        now = time.monotonic()
+        for i, (acceleration, linear, gyro) in enumerate(still(120 / self.rate, self.rate, self.rng)):
+            records[i] = (now - (120 - i) / self.rate, acceleration, linear, gyro)
+        self.manager.interface = MagicMock(reader_running=True, sample_to_dict=BNO085Interface.sample_to_dict)
+        self.manager.interface.read_samples.side_effect = [records, records[:0]]
+
+        batch = asyncio.run(self.manager.read_sensor_batch())
+        self.assertEqual(len(batch), 120)
+        self.assertEqual(len(self.manager.motion_history), self.manager.motion_history.capacity)
+        # Sensor timestamps, on the time.time() clock
+        self.assertAlmostEqual(batch[-1]["timestamp"] - batch[0]["timestamp"], 119 / self.rate, places=3)
+        self.assertAlmostEqual(batch[-1]["timestamp"], time.time() - 1 / self.rate, delta=0.5)
+        self.assertEqual(batch[-1]["current_state"], SimplifiedState.STATIONARY.name)
+        # Nothing new: nothing to classify
+        self.assertEqual(asyncio.run(self.manager.read_sensor_batch()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
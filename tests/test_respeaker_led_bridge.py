@@ -0,0 +1,147 @@
+"""
+Unit tests for the ReSpeaker LED bridge.
+
+A fake USB device stands in for the ReSpeaker. These tests check that a slow USB link drops
+stale frames rather than queueing them, that unchanged frames aren't sent, and that the
+vectorized mapping modes sample the same colors as reading the pixels one at a time.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import numpy as np
+
+# Use the mock strip even where the NeoPixel libraries are installed, and a fake USB stack
+sys.modules['board'] = None
+sys.modules['neopixel'] = None
+usb = MagicMock()
+usb.core.USBError = type('USBError', (Exception,), {})
+sys.modules['usb'] = usb
+sys.modules['usb.core'] = usb.core
+sys.modules['usb.util'] = usb.util
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import LEDConfig
+from hardware.respeaker_led_bridge import MappingMode, ReSpeakerLEDBridge
+from managers.led_manager import LEDManagerRings
+
+
+class FakeReSpeaker:
+    """Records control transfers, taking transfer_seconds for each"""
+    def __init__(self, transfer_seconds=0.0):
+        self.transfer_seconds = transfer_seconds
+        self.frames = []
+        self.brightness = []
+        self.lock = threading.Lock()
+
+    def ctrl_transfer(self, request_type, request, cmd, index, data, timeout):
+        time.sleep(self.transfer_seconds)
+        with self.lock:
+            if cmd == ReSpeakerLEDBridge.CMD_SHOW:
+                self.frames.append(bytes(data))
+            else:
+                self.brightness.append(list(data))
+
+
+def wait_until_idle(bridge, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while bridge._frame_pending and time.monotonic() < deadline:
+        time.sleep(0.005)
+    # Let the last transfer finish
+    time.sleep(0.05)
+
+
+def packet(colors):
+    return bytes(np.hstack([np.asarray(colors, dtype=np.uint8), np.zeros((12, 1), dtype=np.uint8)]).reshape(-1))
+
+
+class TestReSpeakerLEDBridge(unittest.TestCase):
+    """Test cases for the ReSpeakerLEDBridge class."""
+
+    @classmethod
+    def setUpClass(cls):
+        asyncio.set_event_loop(asyncio.new_event_loop())
+
+    def setUp(self):
+        self.manager = LEDManagerRings()
+
+    def tearDown(self):
+        self.manager.close()
+
+    def make_bridge(self, transfer_seconds=0.0, mode=MappingMode.MIRROR_OUTER):
+        self.device = FakeReSpeaker(transfer_seconds)
+        usb.core.find.return_value = self.device
+        bridge = ReSpeakerLEDBridge(self.manager, mode)
+        self.addCleanup(bridge.close)
+        return bridge
+
+    def show(self, frame):
+        self.manager._writer.write(frame)
+
+    def test_slow_usb_drops_stale_frames(self):
+        bridge = self.make_bridge(transfer_seconds=0.02)
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            frame = rng.integers(0, 256, (LEDConfig.LED_COUNT, 3), dtype=np.uint8)
+            self.show(frame)
+            bridge.update()
+        wait_until_idle(bridge)
+        stats = bridge.stats
+        self.assertEqual(stats.submitted, 50)
+        self.assertEqual(stats.sent, len(self.device.frames))
+        self.assertEqual(stats.sent + stats.dropped + stats.skipped, stats.submitted)
+        self.assertLess(stats.sent, 10)
+        # The newest frame always gets through
+        self.assertEqual(self.device.frames[-1], packet(frame[bridge._outer_index]))
+
+    def test_unchanged_frames_are_not_sent(self):
+        bridge = self.make_bridge()
+        frame = np.full((LEDConfig.LED_COUNT, 3), 40, dtype=np.uint8)
+        for _ in range(5):
+            self.show(frame)
+            bridge.update()
+            wait_until_idle(bridge)
+        self.assertEqual(len(self.device.frames), 1)
+        self.assertEqual(bridge.stats.skipped, 4)
+        self.assertEqual(len(self.device.brightness), 1)
+
+    def test_close_sends_pending_clear(self):
+        bridge = self.make_bridge()
+        self.show(np.full((LEDConfig.LED_COUNT, 3), 200, dtype=np.uint8))
+        bridge.update()
+        bridge.close()
+        self.assertEqual(self.device.frames[-1], bytes(48))
+
+    def test_mapping_modes_match_per_pixel_sampling(self):
+        bridge = self.make_bridge()
+        frame = np.random.default_rng(1).integers(0, 256, (LEDConfig.LED_COUNT, 3), dtype=np.uint8)
+        self.show(frame)
+        pixels = [tuple(int(c) for c in color) for color in frame]
+        outer_count, inner_count = LEDConfig.LED_COUNT_RING1, LEDConfig.LED_COUNT_RING2
+        outer = [pixels[int(i * outer_count / 12)] for i in range(12)]
+        inner = [pixels[outer_count + int(i * inner_count / 12)] for i in range(12)]
+        average = sum(sum(c) for c in outer) / 36
+        expected = {
+            MappingMode.MIRROR_OUTER: outer,
+            MappingMode.MIRROR_INNER: inner,
+            MappingMode.SAMPLE_BOTH: [outer[i] if i % 2 == 0 else inner[i] for i in range(12)],
+            MappingMode.AVERAGE_BOTH: [tuple((o + i) // 2 for o, i in zip(c1, c2)) for c1, c2 in zip(outer, inner)],
+            MappingMode.COMPLEMENT: [(255 - r, 255 - g, 255 - b) for r, g, b in outer],
+            MappingMode.HIGHLIGHT: [tuple(min(255, int(c * 1.5)) for c in color) if sum(color) / 3 > average * 1.2
+                                    else tuple(int(c * 0.4) for c in color) for color in outer],
+        }
+        for mode, colors in expected.items():
+            with self.subTest(mode=mode):
+                bridge.set_mapping_mode(mode)
+                self.assertEqual([tuple(c) for c in bridge._sample_leds().tolist()], colors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Unit tests for the per-beacon RSSI estimators.
+
+These tests feed synthetic beacon traces with known ground truth, checking that the Kalman
+estimator is steadier than the EMA, shrugs off single deep fades, follows a real change in
+signal, and takes the time between advertisements into account.
+"""
+
+import math
+import random
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from utils.rssi_filter import EMARSSIEstimator, KalmanRSSIEstimator, RSSIEstimator, create_rssi_estimator
+
+
+def noisy_trace(true_rssi, seconds=20.0, interval=0.2, noise=4.0, seed=0):
+    """(timestamp, true RSSI, reading) every interval, with Gaussian noise"""
+    rng = random.Random(seed)
+    return [(i * interval, true_rssi(i * interval), true_rssi(i * interval) + rng.gauss(0, noise))
+            for i in range(int(seconds / interval))]
+
+
+def rms_error(estimator, trace, skip=25):
+    errors = [estimator.update(reading, t) - truth for t, truth, reading in trace][skip:]
+    return math.sqrt(sum(e * e for e in errors) / len(errors))
+
+
+class TestEMARSSIEstimator(unittest.TestCase):
+    """Test cases for the EMARSSIEstimator class."""
+
+    def test_matches_fixed_alpha_average(self):
+        estimator = EMARSSIEstimator(alpha=0.4)
+        self.assertEqual(estimator.update(-60, 0.0), -60)
+        self.assertAlmostEqual(estimator.update(-70, 0.2), -64)
+
+
+class TestKalmanRSSIEstimator(unittest.TestCase):
+    """Test cases for the KalmanRSSIEstimator class."""
+
+    def test_steadier_than_ema_on_a_stationary_beacon(self):
+        trace = noisy_trace(lambda t: -75.0)
+        self.assertLess(rms_error(KalmanRSSIEstimator(), trace), rms_error(EMARSSIEstimator(), trace))
+
+    def test_tracks_an_approaching_beacon(self):
+        # Walking toward the beacon at 2 dB/s
+        trace = noisy_trace(lambda t: -95.0 + 2.0 * t, seconds=15.0)
+        self.assertLess(rms_error(KalmanRSSIEstimator(), trace), 3.0)
+
+    def test_rejects_single_deep_fade(self):
+        estimator = KalmanRSSIEstimator()
+        for i in range(20):
+            estimator.update(-70, i * 0.2)
+        self.assertAlmostEqual(estimator.update(-100, 4.0), -70, delta=1.0)
+        self.assertEqual(estimator.rejected, 1)
+        self.assertAlmostEqual(estimator.update(-70, 4.2), -70, delta=1.0)
+
+    def test_restarts_after_persistent_change(self):
+        estimator = KalmanRSSIEstimator(max_outliers=3)
+        for i in range(20):
+            estimator.update(-90, i * 0.2)
+        for i in range(3):
+            value = estimator.update(-55, 4.0 + i * 0.2)
+        self.assertEqual(value, -55)
+
+    def test_gaps_widen_uncertainty(self):
+        """A reading after a long gap in advertisements should count for more"""
+        estimates = []
+        for gap in (0.2, 5.0):
+            estimator = KalmanRSSIEstimator()
+            for i in range(20):
+                estimator.update(-80, i * 0.2)
+            estimates.append(estimator.update(-72, 3.8 + gap))
+        self.assertGreater(estimates[1], estimates[0])
+
+    def test_create_rssi_estimator(self):
+        self.assertIsInstance(create_rssi_estimator("kalman"), KalmanRSSIEstimator)
+        self.assertIsInstance(create_rssi_estimator("ema"), EMARSSIEstimator)
+        with self.assertRaises(ValueError):
+            create_rssi_estimator("particle")
+
+    def test_estimators_must_implement_update(self):
+        class Incomplete(RSSIEstimator):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+if __name__ == '__main__':
+    unittest.main()
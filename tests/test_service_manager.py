@@ -0,0 +1,326 @@
+"""
+Unit tests for the ServiceManager event bus.
+
+These tests verify per-type routing from handled_events, wildcard subscriptions, inline sync
+handlers, direct and gathered async handlers, and that global state is reduced for every
+published event. They also cover the state reducer table and the versioned state snapshot.
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from services.service import ServiceManager, BaseService, GlobalState, WILDCARD_EVENT, _STATE_REDUCERS
+from config import Distance
+
+
+class RecordingService(BaseService):
+    """Service that records every event its handle_event receives"""
+
+    def __init__(self, service_manager, handled_events=None):
+        super().__init__(service_manager)
+        self.handled_events = handled_events
+        self.received = []
+
+    async def handle_event(self, event):
+        self.received.append(event["type"])
+
+
+class TestServiceManager(unittest.TestCase):
+    """Test cases for ServiceManager subscription and publishing."""
+
+    def setUp(self):
+        self.manager = ServiceManager()
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_service_receives_only_handled_events(self):
+        async def run():
+            service = RecordingService(self.manager, frozenset({"touch_state", "custom"}))
+            await self.manager.start_service("recording", service)
+            for event_type in ("touch_state", "custom", "other"):
+                await self.manager.publish({"type": event_type, "is_touching": True})
+            return service.received
+
+        self.assertEqual(self.run_async(run()), ["touch_state", "custom"])
+
+    def test_handled_events_none_subscribes_to_everything(self):
+        async def run():
+            service = RecordingService(self.manager, None)
+            await self.manager.start_service("recording", service)
+            await self.manager.publish({"type": "custom"})
+            await self.manager.publish({"type": "other"})
+            return service
+
+        service = self.run_async(run())
+        self.assertEqual(service.received, ["custom", "other"])
+        self.assertIn(service.handle_event, self.manager._subscribers[WILDCARD_EVENT])
+
+    def test_empty_handled_events_subscribes_to_nothing(self):
+        async def run():
+            service = RecordingService(self.manager, frozenset())
+            await self.manager.start_service("recording", service)
+            await self.manager.publish({"type": "custom"})
+            return service
+
+        service = self.run_async(run())
+        self.assertEqual(service.received, [])
+        self.assertEqual(len(self.manager._subscribers), 0)
+
+    def test_wildcard_handlers_are_merged_into_each_route(self):
+        calls = []
+
+        def on_any(event):
+            calls.append(("any", event["type"]))
+
+        def on_custom(event):
+            calls.append(("custom", event["type"]))
+
+        async def run():
+            await self.manager.subscribe("custom", on_custom)
+            await self.manager.subscribe(WILDCARD_EVENT, on_any)
+            await self.manager.publish({"type": "custom"})
+            await self.manager.publish({"type": "other"})
+
+        self.run_async(run())
+        self.assertCountEqual(calls[:2], [("any", "custom"), ("custom", "custom")])
+        self.assertEqual(calls[2:], [("any", "other")])
+        self.assertIn(on_any, self.manager._routes["custom"].sync_handlers)
+
+    def test_unsubscribe_removes_route(self):
+        calls = []
+
+        def on_custom(event):
+            calls.append(event["type"])
+
+        async def run():
+            await self.manager.subscribe("custom", on_custom)
+            await self.manager.publish({"type": "custom"})
+            await self.manager.unsubscribe("custom", on_custom)
+            await self.manager.publish({"type": "custom"})
+
+        self.run_async(run())
+        self.assertEqual(calls, ["custom"])
+        self.assertNotIn("custom", self.manager._routes)
+        self.assertNotIn("custom", self.manager._subscribers)
+
+    def test_sync_handlers_are_called_inline(self):
+        tasks = []
+
+        def on_custom(event):
+            tasks.append(asyncio.current_task())
+
+        async def run():
+            await self.manager.subscribe("custom", on_custom)
+            await self.manager.publish({"type": "custom"})
+            return asyncio.current_task()
+
+        publishing_task = self.run_async(run())
+        self.assertEqual(tasks, [publishing_task])
+
+    def test_single_async_handler_is_awaited_directly(self):
+        tasks = []
+
+        async def on_custom(event):
+            tasks.append(asyncio.current_task())
+
+        async def run():
+            await self.manager.subscribe("custom", on_custom)
+            await self.manager.publish({"type": "custom"})
+            return asyncio.current_task()
+
+        publishing_task = self.run_async(run())
+        # No task was spawned: the handler ran in the publisher's own task
+        self.assertEqual(tasks, [publishing_task])
+
+    def test_multiple_async_handlers_are_gathered(self):
+        tasks = []
+        started = []
+
+        async def failing(event):
+            started.append("failing")
+            await asyncio.sleep(0)
+            raise RuntimeError("handler failed")
+
+        async def succeeding(event):
+            started.append("succeeding")
+            await asyncio.sleep(0)
+            tasks.append(asyncio.current_task())
+
+        async def run():
+            await self.manager.subscribe("custom", failing)
+            await self.manager.subscribe("custom", succeeding)
+            # The failure is logged, not raised to the publisher
+            await self.manager.publish({"type": "custom"})
+            return asyncio.current_task()
+
+        with self.assertLogs(self.manager.logger, level="ERROR"):
+            publishing_task = self.run_async(run())
+        self.assertCountEqual(started, ["failing", "succeeding"])
+        self.assertEqual(len(tasks), 1)
+        self.assertIsNot(tasks[0], publishing_task)
+
+    def test_global_state_is_reduced_without_subscribers(self):
+        async def run():
+            await self.manager.publish({"type": "volume_changed", "volume": 0.25})
+
+        self.run_async(run())
+        self.assertNotIn("volume_changed", self.manager._routes)
+        self.assertEqual(self.manager.global_state.volume, 0.25)
+
+
+class TestGlobalStateReducers(unittest.TestCase):
+    """Test cases for the global state reducer table and state snapshots."""
+
+    def setUp(self):
+        self.manager = ServiceManager()
+
+    def publish(self, *events):
+        async def run():
+            for event in events:
+                await self.manager.publish(event)
+
+        asyncio.run(run())
+
+    def test_location_changed(self):
+        self.publish({"type": "location_changed", "data": {"location": "kitchen"}})
+        self.assertEqual(self.manager.global_state.current_location, "kitchen")
+
+    def test_proximity_changed_tracks_and_drops_beacons(self):
+        self.publish({"type": "proximity_changed",
+                      "data": {"location": "kitchen", "distance": Distance.NEAR, "rssi": -70}})
+        self.assertEqual(self.manager.global_state.location_beacons,
+                         {"kitchen": {"distance": Distance.NEAR, "rssi": -70}})
+
+        self.publish({"type": "proximity_changed",
+                      "data": {"location": "kitchen", "distance": Distance.UNKNOWN, "rssi": None}})
+        self.assertEqual(self.manager.global_state.location_beacons, {})
+
+    def test_conversation_starting_clears_error(self):
+        self.manager.global_state.conversation_error = "previous failure"
+        self.publish({"type": "conversation_starting"})
+        self.assertTrue(self.manager.global_state.conversation_active)
+        self.assertIsNone(self.manager.global_state.conversation_error)
+
+    def test_conversation_ended_and_error_reset_speaking(self):
+        for end_type in ("conversation_ended", "conversation_error"):
+            with self.subTest(end_type=end_type):
+                self.publish(
+                    {"type": "conversation_starting"},
+                    {"type": "speech-update", "role": "assistant", "status": "started"},
+                    {"type": "speech-update", "role": "user", "status": "started"},
+                    {"type": end_type},
+                )
+                state = self.manager.global_state
+                self.assertFalse(state.conversation_active)
+                self.assertFalse(state.assistant_speaking)
+                self.assertFalse(state.user_speaking)
+
+    def test_speech_update(self):
+        state = self.manager.global_state
+        self.publish({"type": "speech-update", "role": "assistant", "status": "started"})
+        self.assertTrue(state.assistant_speaking)
+        self.assertFalse(state.user_speaking)
+
+        self.publish({"type": "speech-update", "role": "user", "status": "started"},
+                     {"type": "speech-update", "role": "assistant", "status": "stopped"})
+        self.assertFalse(state.assistant_speaking)
+        self.assertTrue(state.user_speaking)
+
+    def test_sensor_and_touch_events(self):
+        sensor_data = {"energy": 0.5}
+        self.publish(
+            {"type": "sensor_data", "data": sensor_data},
+            {"type": "touch_state", "is_touching": True},
+            {"type": "touch_position", "position": 0.4},
+            {"type": "touch_stroke_intensity", "intensity": 0.8},
+        )
+        state = self.manager.global_state
+        self.assertIs(state.accelerometer_state, sensor_data)
+        self.assertTrue(state.touch_state)
+        self.assertEqual(state.touch_position, 0.4)
+        self.assertEqual(state.touch_stroke_intensity, 0.8)
+
+    def test_volume_and_microphone_events(self):
+        self.publish({"type": "volume_changed", "volume": 0.3},
+                     {"type": "microphone_state", "is_muted": True})
+        self.assertEqual(self.manager.global_state.volume, 0.3)
+        self.assertTrue(self.manager.global_state.is_muted)
+
+    def test_every_reducer_bumps_the_version_once(self):
+        events = {
+            "location_changed": {"data": {"location": "kitchen"}},
+            "proximity_changed": {"data": {"location": "kitchen", "distance": Distance.FAR, "rssi": -80}},
+            "conversation_starting": {},
+            "conversation_ended": {},
+            "conversation_error": {},
+            "speech-update": {"role": "user", "status": "started"},
+            "sensor_data": {"data": {}},
+            "touch_state": {"is_touching": False},
+            "touch_position": {"position": 0.1},
+            "touch_stroke_intensity": {"intensity": 0.2},
+            "volume_changed": {"volume": 0.5},
+            "microphone_state": {"is_muted": False},
+        }
+        self.assertEqual(set(events), set(_STATE_REDUCERS))
+        for event_type, fields in events.items():
+            version = self.manager.state_snapshot.version
+            self.publish({"type": event_type, **fields})
+            self.assertEqual(self.manager.state_snapshot.version, version + 1, event_type)
+
+    def test_version_unchanged_without_reducer(self):
+        snapshot = self.manager.state_snapshot
+        self.publish({"type": "custom"}, {"type": "intent_detection_started"})
+        self.assertIs(self.manager.state_snapshot, snapshot)
+        self.assertEqual(self.manager.state_snapshot.version, snapshot.version)
+
+    def test_snapshot_is_cached_until_next_change(self):
+        first = self.manager.state_snapshot
+        self.assertIs(self.manager.state_snapshot, first)
+
+        self.publish({"type": "volume_changed", "volume": 0.7})
+        second = self.manager.state_snapshot
+        self.assertIsNot(second, first)
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(second.volume, 0.7)
+        self.assertNotEqual(first.volume, 0.7)
+        self.assertIs(self.manager.state_snapshot, second)
+
+    def test_snapshot_mirrors_every_global_state_field(self):
+        self.manager.global_state.conversation_error = "stale failure"
+        self.publish(
+            {"type": "location_changed", "data": {"location": "kitchen"}},
+            {"type": "proximity_changed",
+             "data": {"location": "kitchen", "distance": Distance.NEAR, "rssi": -60}},
+            {"type": "speech-update", "role": "user", "status": "started"},
+            {"type": "sensor_data", "data": {"energy": 1.0}},
+            {"type": "touch_state", "is_touching": True},
+            {"type": "touch_position", "position": 0.5},
+            {"type": "touch_stroke_intensity", "intensity": 0.9},
+            {"type": "volume_changed", "volume": 0.2},
+            {"type": "microphone_state", "is_muted": True},
+        )
+        snapshot = self.manager.state_snapshot
+        fields = vars(GlobalState())
+        self.assertIn("conversation_error", fields)
+        for name in fields:
+            with self.subTest(field=name):
+                self.assertTrue(hasattr(snapshot, name))
+                value = getattr(snapshot, name)
+                if name == "location_beacons":
+                    value = dict(value)
+                self.assertEqual(value, getattr(self.manager.global_state, name))
+
+        # Starting a conversation clears the error, and the next snapshot reflects that
+        self.assertEqual(snapshot.conversation_error, "stale failure")
+        self.publish({"type": "conversation_starting"})
+        self.assertIsNone(self.manager.state_snapshot.conversation_error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the spectral shake detector and the IMU trace fixture suite.
+
+The sliding DFT is checked against numpy's FFT of the resampled window, the resampling against
+irregular and interrupted sample timing, and the recorded fixtures in tests/fixtures/imu are
+replayed through the AccelerometerManager classifier: traces named shake_* must be classified
+as SHAKE at some point, and no other trace may be.
+"""
+
+import glob
+import math
+import random
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock hardware modules before imports
+sys.modules['board'] = MagicMock()
+sys.modules['busio'] = MagicMock()
+sys.modules['adafruit_bno08x'] = MagicMock()
+sys.modules['adafruit_bno08x.i2c'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from utils.shake_detector import SpectralShakeDetector
+from utils.imu_trace import load_trace
+from managers.accelerometer_manager import AccelerometerManager, SimplifiedState
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'imu')
+
+
+def window_of(detector):
+    """The detector's resampled window, oldest first"""
+    return np.roll(detector._samples, -(detector._pushed % detector.window), axis=0)
+
+
+class TestSpectralShakeDetector(unittest.TestCase):
+    """Test cases for the SpectralShakeDetector class."""
+
+    def test_matches_fft_of_window(self):
+        rng = random.Random(0)
+        detector = SpectralShakeDetector(rate=50.0, window=40)
+        for i in range(173):
+            detector.update(i / 50.0, (rng.gauss(0, 5), 4 * math.sin(i / 2), rng.gauss(1, 1)))
+            if not detector.ready:
+                continue
+            x = window_of(detector)
+            x = x - x.mean(axis=0)
+            power = (np.abs(np.fft.rfft(x, axis=0)) ** 2).sum(axis=1)
+            frequencies = np.arange(len(power)) * 50.0 / 40
+            band = (frequencies >= 2.5) & (frequencies <= 15.0)
+            band_energy = 2 * power[band].sum() / 40
+            self.assertAlmostEqual(detector.band_rms, math.sqrt(band_energy / 40))
+            self.assertAlmostEqual(detector.band_ratio, band_energy / (x * x).sum())
+            self.assertEqual(detector.frequency, frequencies[band][power[band].argmax()])
+
+    def test_irregular_timestamps(self):
+        # 5 Hz shaking read at an uneven ~80 Hz: the window is resampled to 50 Hz first
+        rng = random.Random(1)
+        detector = SpectralShakeDetector(rate=50.0, window=40)
+        t = start = 0.01
+        added = detector.update(start, (18 * math.sin(2 * math.pi * 5 * start), 0.0, 0.0))
+        while t < 2.0:
+            t += rng.uniform(0.004, 0.021)
+            added += detector.update(t, (18 * math.sin(2 * math.pi * 5 * t), 0.0, 0.0))
+        self.assertEqual(added, math.floor((t - start) * 50) + 1)
+        self.assertTrue(detector.ready)
+        self.assertGreater(detector.band_ratio, 0.95)
+        self.assertAlmostEqual(detector.frequency, 5.0, delta=50.0 / 40)
+        self.assertAlmostEqual(detector.band_rms, 18 / math.sqrt(2), delta=1.0)
+        # Grid samples are interpolated between the readings either side of them
+        grid_time = start + (detector._pushed - 1) / 50.0
+        self.assertAlmostEqual(window_of(detector)[-1][0], 18 * math.sin(2 * math.pi * 5 * grid_time), delta=2.0)
+
+    def test_gap_restarts_window(self):
+        detector = SpectralShakeDetector(rate=50.0, window=40)
+        for i in range(60):
+            detector.update(i / 50.0, (18 * math.sin(i), 0.0, 0.0))
+        self.assertTrue(detector.ready)
+        detector.update(5.0, (0.0, 0.0, 0.0))
+        self.assertFalse(detector.ready)
+        self.assertEqual(detector.band_rms, 0.0)
+        # Out of order samples are ignored
+        self.assertEqual(detector.update(4.9, (1.0, 0.0, 0.0)), 0)
+
+    def test_step_is_not_periodic(self):
+        # Thrown: a push, then free fall
+        detector = SpectralShakeDetector(rate=50.0, window=40)
+        ratios = []
+        for i in range(80):
+            detector.update(i / 50.0, (15.0, 0.0, 5.0) if i < 20 else (0.0, 0.0, -9.8))
+            if detector.ready:
+                ratios.append(detector.band_ratio)
+        self.assertLess(max(ratios), 0.85)
+
+
+class TestShakeFixtures(unittest.TestCase):
+    """The recorded fixtures should all be classified as expected."""
+
+    def test_fixture_suite(self):
+        paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.csv')))
+        self.assertTrue(paths)
+        for path in paths:
+            name = os.path.basename(path)
+            with self.subTest(trace=name):
+                manager = AccelerometerManager()
+                states = {manager.process_sample(sample)["current_state"] for sample in load_trace(path)}
+                self.assertEqual(SimplifiedState.SHAKE.name in states, name.startswith("shake_"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for the SoundBank and cursor-based sound effect playback.
+
+These tests verify that the bank decodes the same samples as the wave module in both
+preload and memory-mapped modes, and that AudioProducer's source cursor plays sounds
+to the end, wraps loops between their loop points without a gap, and seeks.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import wave
+
+import numpy as np
+
+# Mock hardware/audio modules before imports
+sys.modules['pyaudio'] = MagicMock()
+
+# Add src directory to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(project_root, 'src'))
+
+from config import SoundEffect, AudioBaseConfig
+from utils.sound_bank import SoundBank
+from managers.audio_manager import AudioProducer
+
+
+def read_with_wave(effect):
+    with wave.open(os.path.join(project_root, SoundEffect.get_file_path(effect)), "rb") as wf:
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+class TestSoundBank(unittest.TestCase):
+    """Test cases for the SoundBank class."""
+
+    def setUp(self):
+        # Sound effect paths are relative to the project root
+        self._cwd = os.getcwd()
+        os.chdir(project_root)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+
+    def test_preload_and_mmap_match_wave_module(self):
+        for preload in (True, False):
+            bank = SoundBank(AudioBaseConfig.SAMPLE_RATE, preload=preload)
+            bank.load()
+            for effect in (SoundEffect.SQUEAK, SoundEffect.PURRING, SoundEffect.CHIRP1):
+                samples = bank.get(effect.name.lower())
+                np.testing.assert_array_equal(samples, read_with_wave(effect))
+                self.assertFalse(samples.flags.writeable)
+
+    def test_preloaded_sounds_share_one_buffer(self):
+        bank = SoundBank(AudioBaseConfig.SAMPLE_RATE, preload=True)
+        bank.load()
+        self.assertTrue(np.shares_memory(bank.get("SQUEAK"), bank._bank))
+        self.assertTrue(np.shares_memory(bank.get("RAIN"), bank._bank))
+
+    def test_info_reports_duration(self):
+        bank = SoundBank(AudioBaseConfig.SAMPLE_RATE)
+        bank.load()
+        info = bank.info(SoundEffect.SQUEAK)
+        self.assertEqual(info.num_samples, len(read_with_wave(SoundEffect.SQUEAK)))
+        self.assertAlmostEqual(info.duration, info.num_samples / AudioBaseConfig.SAMPLE_RATE)
+
+    def test_unknown_sound(self):
+        bank = SoundBank(AudioBaseConfig.SAMPLE_RATE)
+        self.assertIsNone(bank.get("not_a_sound"))
+        self.assertIsNone(bank.info("not_a_sound"))
+
+
+class TestSourcePlayback(unittest.TestCase):
+    """Test cases for AudioProducer's source cursor."""
+
+    def setUp(self):
+        self.producer = AudioProducer("test", chunk_size=4, buffer_size=1)
+        self.scratch = np.zeros(4, dtype=np.int16)
+
+    def test_plays_to_end_with_padded_tail(self):
+        self.producer.play_source(np.arange(1, 11, dtype=np.int16))
+        chunks = []
+        while True:
+            chunk = self.producer.read_source(4, self.scratch)
+            if chunk is None:
+                break
+            chunks.append(chunk.copy())
+        np.testing.assert_array_equal(np.concatenate(chunks), list(range(1, 11)) + [0, 0])
+
+    def test_loop_wraps_without_gap(self):
+        source = np.arange(1, 11, dtype=np.int16)
+        self.producer.play_source(source, loop=True)
+        played = np.concatenate([self.producer.read_source(4, self.scratch).copy() for _ in range(10)])
+        np.testing.assert_array_equal(played, np.tile(source, 4))
+
+    def test_loop_shorter_than_chunk(self):
+        self.producer.play_source(np.array([1, 2, 3], dtype=np.int16), loop=True)
+        np.testing.assert_array_equal(self.producer.read_source(4, self.scratch), [1, 2, 3, 1])
+        np.testing.assert_array_equal(self.producer.read_source(4, self.scratch), [2, 3, 1, 2])
+
+    def test_loop_points(self):
+        source = np.arange(10, dtype=np.int16)
+        self.producer.play_source(source, loop=True, loop_start=4, loop_end=8)
+        played = np.concatenate([self.producer.read_source(4, self.scratch).copy() for _ in range(4)])
+        # Intro, then the loop region repeated
+        np.testing.assert_array_equal(played, [0, 1, 2, 3] + [4, 5, 6, 7] * 3)
+
+    def test_seek_and_position(self):
+        source = np.arange(20, dtype=np.int16)
+        self.producer.play_source(source)
+        self.producer.read_source(4, self.scratch)
+        self.assertEqual(self.producer.position, 4)
+        self.producer.seek(15)
+        self.assertEqual(self.producer.position, 15)
+        np.testing.assert_array_equal(self.producer.read_source(4, self.scratch), [15, 16, 17, 18])
+        np.testing.assert_array_equal(self.producer.read_source(4, self.scratch), [19, 0, 0, 0])
+        self.assertIsNone(self.producer.read_source(4, self.scratch))
+
+    def test_seek_past_loop_end_restarts_loop(self):
+        self.producer.play_source(np.arange(10, dtype=np.int16), loop=True, loop_start=2, loop_end=6)
+        self.producer.seek(9)
+        np.testing.assert_array_equal(self.producer.read_source(4, self.scratch), [2, 3, 4, 5])
+
+    def test_full_chunks_are_zero_copy(self):
+        source = np.arange(8, dtype=np.int16)
+        self.producer.play_source(source)
+        self.assertTrue(np.shares_memory(self.producer.read_source(4, self.scratch), source))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Unit tests for the ADS1115 continuous conversion sampler and TouchManager's batch processing.
+
+A fake channel stands in for the ADC, counting conversions and taking a while over each read as
+the I2C bus does. These tests check that every conversion reaches the event loop in order and
+at the data rate, that a simulated ALERT/RDY line paces the reads, that the event loop isn't held
+up by the reads, and that strokes are still detected from the samples' own timestamps.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Mock hardware modules before imports
+sys.modules['board'] = MagicMock()
+sys.modules['busio'] = MagicMock()
+sys.modules['adafruit_ads1x15'] = MagicMock()
+sys.modules['adafruit_ads1x15.ads1115'] = MagicMock()
+sys.modules['adafruit_ads1x15.analog_in'] = MagicMock()
+sys.modules['adafruit_ads1x15.ads1x15'] = MagicMock()
+
+# Add src directory to path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from config import TouchConfig
+from hardware.adc_ads1115 import ADS1115Sampler, matching_data_rate
+from hardware.gpio_interrupt import SimulatedInterrupt
+from managers.touch_manager import TouchManager
+
+
+class CountingChannel:
+    """Each read returns the next conversion number, taking read_seconds"""
+    def __init__(self, read_seconds=0.0):
+        self.read_seconds = read_seconds
+        self.reads = 0
+
+    @property
+    def value(self):
+        time.sleep(self.read_seconds)
+        self.reads += 1
+        return self.reads - 1
+
+
+class StrokeChannel:
+    """A finger sliding left to right over `seconds`, then lifted"""
+    def __init__(self, seconds=0.4):
+        self.seconds = seconds
+        self.start = None
+
+    @property
+    def value(self):
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        progress = (now - self.start) / self.seconds
+        if progress > 1.0:
+            return TouchConfig.NO_TOUCH_THRESHOLD - 100
+        return int(TouchConfig.LEFT_MIN + 500 + progress * (TouchConfig.RIGHT_MAX - TouchConfig.LEFT_MIN - 1000))
+
+
+async def collect(sampler, seconds):
+    """Consume the sampler's batches for `seconds`, tracking how late the event loop ran"""
+    values, timestamps, batches = [], [], 0
+    max_lag = 0.0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        before = time.monotonic()
+        await asyncio.sleep(0.005)
+        max_lag = max(max_lag, time.monotonic() - before - 0.005)
+        if await sampler.wait_for_samples(timeout=0):
+            samples = sampler.read_samples()
+            values.extend(samples["value"].tolist())
+            timestamps.extend(samples["timestamp"].tolist())
+            batches += 1
+    return values, timestamps, batches, max_lag
+
+
+class TestADS1115Sampler(unittest.TestCase):
+    """Test cases for the ADS1115Sampler class."""
+
+    def test_matching_data_rate(self):
+        self.assertEqual(matching_data_rate(100), 128)
+        self.assertEqual(matching_data_rate(250), 250)
+        self.assertEqual(matching_data_rate(300), 475)
+        self.assertEqual(matching_data_rate(2000), 860)
+
+    def test_delivers_every_conversion_in_batches(self):
+        channel = CountingChannel(read_seconds=0.0005)
+        sampler = ADS1115Sampler(channel, 475, batch_interval=0.02)
+
+        async def run():
+            sampler.start()
+            try:
+                result = await collect(sampler, 0.5)
+            finally:
+                sampler.stop()
+            rest = sampler.read_samples()
+            return result, rest["value"].tolist()
+
+        (values, timestamps, batches, max_lag), rest = asyncio.run(run())
+        values += rest
+        # In order, none lost, at about the data rate
+        self.assertEqual(values, list(range(channel.reads)))
+        self.assertAlmostEqual(len(values), 475 * 0.5, delta=475 * 0.5 * 0.2)
+        self.assertEqual(timestamps, sorted(timestamps))
+        # A handful of wakeups, not one per conversion
+        self.assertLess(batches, len(values) / 4)
+        # The event loop never waited on a read
+        self.assertLess(max_lag, 0.05)
+        self.assertEqual(sampler.stats.samples, len(values))
+        self.assertEqual(sampler.stats.dropped, 0)
+
+    def test_full_buffer_drops_and_counts(self):
+        channel = CountingChannel()
+        sampler = ADS1115Sampler(channel, 860, capacity=16, batch_interval=0.005)
+
+        async def run():
+            sampler.start()
+            await asyncio.sleep(0.2)
+            sampler.stop()
+
+        asyncio.run(run())
+        self.assertEqual(sampler.samples.available, 16)
+        self.assertEqual(sampler.stats.dropped, sampler.stats.samples - 16)
+        # The oldest samples are kept
+        self.assertEqual(sampler.read_samples()["value"].tolist(), list(range(16)))
+
+    def test_ready_line_paces_reads(self):
+        channel = CountingChannel()
+        ready = SimulatedInterrupt()
+        # Slow enough that the ready timeout never fires during the test
+        sampler = ADS1115Sampler(channel, 8, ready=ready, batch_interval=0.1)
+
+        def conversions():
+            for _ in range(5):
+                time.sleep(0.01)
+                ready.assert_line()
+
+        async def run():
+            sampler.start()
+            thread = threading.Thread(target=conversions)
+            thread.start()
+            await asyncio.sleep(0.15)
+            thread.join()
+            sampler.stop()
+
+        asyncio.run(run())
+        self.assertEqual(channel.reads, 5)
+        self.assertEqual(sampler.stats.ready_timeouts, 0)
+        self.assertEqual(sampler.read_samples()["value"].tolist(), list(range(5)))
+
+    def test_read_errors_are_counted(self):
+        channel = MagicMock()
+        type(channel).value = property(lambda _self: (_ for _ in ()).throw(OSError("I2C error")))
+        sampler = ADS1115Sampler(channel, 250)
+
+        async def run():
+            sampler.start()
+            await asyncio.sleep(0.05)
+            sampler.stop()
+
+        asyncio.run(run())
+        self.assertGreaterEqual(sampler.stats.errors, 1)
+        self.assertEqual(sampler.samples.available, 0)
+
+
+class TestTouchManagerSampling(unittest.TestCase):
+    """TouchManager should detect strokes from the sampler's batches."""
+
+    def test_detects_stroke(self):
+        manager = TouchManager()
+        manager.ads = None
+        manager.chan = StrokeChannel()
+        strokes, touches, positions = [], [], []
+        manager.on_stroke(strokes.append)
+        manager.on_touch(touches.append)
+        manager.on_position(positions.append)
+
+        async def run():
+            await manager.start(250)
+            self.assertTrue(manager.sampler.running)
+            await asyncio.sleep(0.7)
+            manager.stop()
+
+        asyncio.run(run())
+        self.assertIsNone(manager.sampler)
+        self.assertEqual(strokes, ["right"])
+        self.assertEqual(touches, [True, False])
+        # Once per batch rather than per sample
+        self.assertTrue(positions)
+        self.assertLess(len(positions), 0.4 * 250 / 2)
+        # Left to right, apart from lift-off while the touch state's hysteresis holds
+        sliding = [position for position in positions if position > 0]
+        self.assertEqual(sliding, sorted(sliding))
+        self.assertGreater(manager.stroke_intensity_level, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import os
 import asyncio
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch, AsyncMock # Keep AsyncMock for specific cases
 import numpy as np
@@ -11,9 +13,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 from services.voice_service import VoiceService
 from services.service import ServiceManager
 from managers.voice_manager import VoiceManager
-from managers.audio_manager import AudioManager, AudioConfig
+from managers.audio_manager import AudioManager, AudioConfig, AudioProducer
 from config import AudioBaseConfig, ElevenLabsConfig
-import queue # For checking queue.Empty
 
 # Conditional skip for tests requiring API key
 ELEVENLABS_API_KEY_AVAILABLE = bool(ElevenLabsConfig.API_KEY)
@@ -97,17 +98,14 @@ class TestVoiceServiceIntegration(unittest.IsolatedAsyncioTestCase):
         data_was_queued = False
         queued_chunks_count = 0
         try:
-            # Drain the queue to check what was put, assuming _output_loop might also be consuming
-            while not tts_producer.buffer.buffer.empty():
-                chunk = tts_producer.buffer.buffer.get_nowait()
+            # Drain the buffer to check what was put, assuming _output_loop might also be consuming
+            while not tts_producer.buffer.empty():
+                chunk = tts_producer.buffer.get(pad=True)
                 if chunk is not None and isinstance(chunk, np.ndarray) and chunk.size > 0:
                     data_was_queued = True
                     queued_chunks_count +=1
-                tts_producer.buffer.buffer.task_done()
-        except queue.Empty:
-            pass # Expected if buffer becomes empty
         except Exception as e:
-            self.fail(f"Error checking TTS producer queue: {e}")
+            self.fail(f"Error checking TTS producer buffer: {e}")
 
         self.assertTrue(data_was_queued, "Audio data was not queued into the AudioManager's TTS producer buffer.")
         self.assertGreater(queued_chunks_count, 0, "Expected one or more audio chunks to be queued.")
@@ -142,5 +140,69 @@ class TestVoiceServiceIntegration(unittest.IsolatedAsyncioTestCase):
             self.assertTrue(vs_test_init_fail.audio_manager is self.audio_manager)
 
 
+class TestVoiceServiceEventLoopLag(unittest.IsolatedAsyncioTestCase):
+    """Buffering TTS audio must never stall the event loop, however long the clip."""
+
+    CLIP_SECONDS = 30
+    # The fake output loop drains this many times faster than real time, to keep the test short
+    PLAYBACK_SPEEDUP = 40
+    TICK_SECONDS = 0.005
+
+    async def asyncSetUp(self):
+        self.voice_service = VoiceService(MagicMock(spec=ServiceManager))
+        self.voice_service.audio_manager = MagicMock()
+        # Same buffer size VoiceService.speak uses
+        self.producer = AudioProducer(
+            VoiceService.TTS_PRODUCER_NAME,
+            chunk_size=AudioBaseConfig.CHUNK_SIZE,
+            buffer_size=AudioBaseConfig.BUFFER_SIZE * 10,
+            is_stream=True
+        )
+        self._drain_stop = threading.Event()
+        self.samples_played = 0
+        self._drain_thread = threading.Thread(target=self._drain, daemon=True)
+        self._drain_thread.start()
+
+    async def asyncTearDown(self):
+        self._drain_stop.set()
+        self._drain_thread.join(timeout=1.0)
+
+    def _drain(self):
+        """Stand-in for AudioManager's output loop: read one chunk per (sped up) chunk period."""
+        chunk_seconds = AudioBaseConfig.CHUNK_SIZE / AudioBaseConfig.SAMPLE_RATE
+        out = np.zeros(AudioBaseConfig.CHUNK_SIZE, dtype=np.int16)
+        while not self._drain_stop.is_set():
+            if self.producer.buffer.get(out=out, pad=True) is not None:
+                self.samples_played += AudioBaseConfig.CHUNK_SIZE
+            time.sleep(chunk_seconds / self.PLAYBACK_SPEEDUP)
+
+    async def test_cached_clip_does_not_stall_event_loop(self):
+        num_samples = self.CLIP_SECONDS * AudioBaseConfig.SAMPLE_RATE
+        clip = (np.sin(np.arange(num_samples) * 0.05) * 8000).astype(np.int16).tobytes()
+
+        lags = []
+        done = asyncio.Event()
+
+        async def measure_lag():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(self.TICK_SECONDS)
+                lags.append(time.perf_counter() - start - self.TICK_SECONDS)
+
+        lag_task = asyncio.create_task(measure_lag())
+        await self.voice_service._play_cached_audio(self.producer, clip)
+        done.set()
+        await lag_task
+
+        # The clip was paced by playback, not dumped into an unbounded buffer...
+        self.assertGreaterEqual(self.samples_played, num_samples - self.producer.buffer.capacity)
+        # ...and the event loop kept running smoothly the whole time
+        self.assertGreater(len(lags), 10, "Event loop was blocked for the whole clip")
+        max_lag_ms = max(lags) * 1000
+        self.assertLess(max_lag_ms, 50,
+                        f"Event loop was blocked while buffering TTS audio: max lag {max_lag_ms:.1f}ms, "
+                        f"mean {np.mean(lags) * 1000:.2f}ms over {len(lags)} ticks")
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file